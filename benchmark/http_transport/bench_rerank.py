@@ -0,0 +1,118 @@
+"""
+Connection setups and p50 latency of 1000 sequential rerank calls against a local
+stub server: a fresh httpx.AsyncClient per call (previous behaviour) versus the
+shared pooled clients from the HttpClientRegistry.
+
+    python benchmark/http_transport/bench_rerank.py --calls 1000
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import time
+from typing import Dict, List
+
+import httpx
+from dotenv import load_dotenv
+
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.resources.functions import (
+    get_async_http_client,
+    get_http_client_registry,
+)
+
+load_dotenv("/chatbot/.env")
+
+
+class StubServer:
+    def __init__(self, delay: float):
+        self.delay = delay
+        self.connections = 0
+
+    async def handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                body = json.loads(await reader.readexactly(length))
+                await asyncio.sleep(self.delay)
+                payload = json.dumps(
+                    {
+                        "results": [
+                            {"index": i, "relevance_score": 0.5}
+                            for i in range(len(body["documents"]))
+                        ]
+                    }
+                ).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _run(url: str, calls: int, pooled: bool) -> List[float]:
+    payload = {"query": "query", "documents": [f"document {i}" for i in range(20)]}
+    latencies = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        if pooled:
+            response = await get_async_http_client(url).post(url, json=payload)
+        else:
+            async with httpx.AsyncClient(timeout=3600.0) as client:
+                response = await client.post(url, json=payload)
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def _summary(latencies: List[float], connections: int) -> Dict[str, float]:
+    quantiles = statistics.quantiles(latencies, n=100)
+    return {
+        "connection_setups": connections,
+        "p50_ms": quantiles[49] * 1000,
+        "p99_ms": quantiles[98] * 1000,
+        "total_s": sum(latencies),
+    }
+
+
+async def main(calls: int, delay: float) -> None:
+    initialize_config_manager(cli_options_dict={"debug": False})
+    results = {}
+    for pooled in (False, True):
+        stub = StubServer(delay)
+        server = await asyncio.start_server(stub.handle, "127.0.0.1", 0)
+        host, port = server.sockets[0].getsockname()[:2]
+        url = f"http://{host}:{port}/rerank"
+
+        latencies = await _run(url, calls, pooled)
+        results["pooled" if pooled else "per_call_client"] = _summary(
+            latencies, stub.connections
+        )
+
+        if pooled:
+            results["registry"] = get_http_client_registry().get_stats()
+            # Close the kept-alive connections so that the server can shut down
+            await get_http_client_registry().aclose()
+        server.close()
+        await server.wait_closed()
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--calls", type=int, default=1000)
+    parser.add_argument("--delay", type=float, default=0.002)
+    args = parser.parse_args()
+    asyncio.run(main(args.calls, args.delay))
@@ -0,0 +1,103 @@
+"""
+Time-to-searchable against time-to-complete of DocumentProcessor with stubbed storage
+and model latencies (per item, scaled to a document of --items items), with and
+without tiered ingestion.
+
+    python benchmark/ingestion/bench_tiered_ingestion.py --items 500
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from types import SimpleNamespace
+
+import hirag_prod.hirag as hirag_module
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.configs.hi_rag_config import HiRAGConfig
+from hirag_prod.hirag import DocumentProcessor
+
+
+class StubStorage:
+    def __init__(self, args):
+        self.args = args
+
+    async def upsert_file_to_vdb(self, file):
+        pass
+
+    async def get_existing_chunks(self, *args):
+        return []
+
+    async def upsert_chunks_to_vdb(self, chunks):
+        await asyncio.sleep(self.args.embed_ms / 1000 * len(chunks))
+
+    async def upsert_items_to_vdb(self, items, on_stage_done=None):
+        await asyncio.sleep(self.args.translate_ms / 1000 * len(items))
+        await on_stage_done("translation")
+        await asyncio.sleep(self.args.tokenize_ms / 1000 * len(items))
+        await on_stage_done("tokenization")
+        await asyncio.sleep(self.args.embed_ms / 1000 * len(items))
+
+
+class StubKG:
+    def __init__(self, args):
+        self.args = args
+
+    async def construct_kg(self, chunks):
+        await asyncio.sleep(self.args.kg_ms / 1000 * len(chunks))
+        return [], []
+
+
+async def _measure(args, tiered: bool):
+    config = HiRAGConfig(embedding_dimension=1024, tiered_ingestion=tiered)
+    hirag_module.get_hi_rag_config = lambda: config
+    processor = DocumentProcessor(
+        storage=StubStorage(args), chunker=None, kg_constructor=StubKG(args)
+    )
+    chunks = [
+        SimpleNamespace(documentKey=f"chunk-{i}", uri="doc.pdf")
+        for i in range(args.items // 4)
+    ]
+    items = [SimpleNamespace(documentKey=f"item-{i}") for i in range(args.items)]
+
+    async def _load_and_chunk_document(*_):
+        return chunks, SimpleNamespace(), items
+
+    processor._load_and_chunk_document = _load_and_chunk_document
+
+    start = time.perf_counter()
+    await processor.process_document(
+        document_path="doc.pdf",
+        content_type="application/pdf",
+        workspace_id="ws",
+        knowledge_base_id="kb",
+        construct_graph=True,
+        document_meta={"documentKey": "doc-1"},
+    )
+    returned = time.perf_counter() - start
+    await processor.wait_for_enrichment()
+    metrics = processor.metrics.metrics
+    return {
+        "insert_returned_after": returned,
+        "time_to_searchable": metrics.time_to_searchable,
+        "time_to_complete": metrics.time_to_complete,
+    }
+
+
+async def main(args) -> None:
+    initialize_config_manager(cli_options_dict={"debug": False})
+    results = {
+        "inline": await _measure(args, tiered=False),
+        "tiered": await _measure(args, tiered=True),
+    }
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=500)
+    parser.add_argument("--embed-ms", type=float, default=0.5)
+    parser.add_argument("--translate-ms", type=float, default=4.0)
+    parser.add_argument("--tokenize-ms", type=float, default=2.0)
+    parser.add_argument("--kg-ms", type=float, default=40.0)
+    asyncio.run(main(parser.parse_args()))
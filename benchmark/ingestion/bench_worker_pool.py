@@ -0,0 +1,138 @@
+"""
+Ingest throughput of the CPU-bound steps (docling conversion, chunking and OpenCC
+normalization) over a corpus of the test documents repeated --copies times, with the
+steps on a thread of the main process (0 workers, previous behaviour) and on the
+ingestion worker pool with 1, 2, 4 and 8 processes. Pool start-up, including the model
+preload of every worker, is excluded from the timings.
+
+    python benchmark/ingestion/bench_worker_pool.py --copies 8 --workers 0 1 2 4 8
+
+Pass --chunk-max-tokens 0 where the tiktoken encoding cannot be downloaded.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import time
+from typing import Dict, List, Tuple
+
+from opencc import OpenCC
+
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.cross_language_search.functions import normalize_text_list
+from hirag_prod.loader import load_document
+from hirag_prod.loader.chunk_split import (
+    chunk_langchain_document,
+    items_to_chunks_recursive,
+)
+from hirag_prod.resources.resource_manager import ResourceManager
+from hirag_prod.resources.worker_pool import WorkerPool
+
+TEST_FILES_DIR = os.path.join(
+    os.path.dirname(__file__), "..", "..", "tests", "test_files"
+)
+CORPUS: List[Tuple[str, str]] = [
+    ("fresh_wiki_article.md", "text/markdown"),
+    ("wiki_labubu.html", "text/html"),
+    (
+        "word_sample.docx",
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ),
+    (
+        "Beamer.pptx",
+        "application/vnd.openxmlformats-officedocument.presentationml.presentation",
+    ),
+]
+
+
+def ingest_document(
+    document_path: str, content_type: str, document_meta: Dict, chunk_max_tokens: int
+) -> int:
+    """The CPU-bound part of ingesting one document, as one worker task"""
+    _, generated_md = load_document(
+        document_path=document_path,
+        content_type=content_type,
+        document_meta=document_meta,
+        loader_type="docling",
+    )
+    items = chunk_langchain_document(generated_md)
+    normalize_text_list([item.text for item in items])
+    chunks = items_to_chunks_recursive(
+        items=items, header_set=set(), chunk_max_tokens=chunk_max_tokens
+    )
+    return len(chunks)
+
+
+def _corpus(copies: int) -> List[Tuple[str, str, Dict]]:
+    documents = []
+    for copy in range(copies):
+        for filename, content_type in CORPUS:
+            document_path = os.path.abspath(os.path.join(TEST_FILES_DIR, filename))
+            documents.append(
+                (
+                    document_path,
+                    content_type,
+                    {
+                        "type": filename.rsplit(".", 1)[-1],
+                        "fileName": filename,
+                        "uri": document_path,
+                        "private": False,
+                        "knowledgeBaseId": f"kb-{copy}",
+                        "workspaceId": "bench",
+                    },
+                )
+            )
+    return documents
+
+
+async def _measure(workers: int, documents, chunk_max_tokens: int) -> Dict:
+    WorkerPool.reset()
+    pool = WorkerPool(max_workers=workers)
+    # Start every worker before timing
+    await pool.map(time.sleep, [(0.5,)] * max(1, workers))
+
+    start = time.perf_counter()
+    chunk_counts = await pool.map(
+        ingest_document,
+        [(*document, chunk_max_tokens) for document in documents],
+    )
+    elapsed = time.perf_counter() - start
+    await pool.shutdown()
+    return {
+        "seconds": elapsed,
+        "documents_per_second": len(documents) / elapsed,
+        "chunks": sum(chunk_counts),
+    }
+
+
+async def main(args) -> None:
+    initialize_config_manager(cli_options_dict={"debug": False})
+    # The steps run in this process with 0 workers
+    ResourceManager(
+        {
+            "chinese_convertor_simplified_to_hk_traditional": OpenCC("s2hk.json"),
+            "chinese_convertor_hk_traditional_to_simplified": OpenCC("hk2s.json"),
+        }
+    )
+    documents = _corpus(args.copies)
+
+    results = {"cpu_count": os.cpu_count(), "documents": len(documents)}
+    for workers in args.workers:
+        results[f"workers_{workers}"] = await _measure(
+            workers, documents, args.chunk_max_tokens
+        )
+    if "workers_1" in results:
+        baseline = results["workers_1"]["documents_per_second"]
+        for workers in args.workers:
+            result = results[f"workers_{workers}"]
+            result["speedup_over_1_worker"] = result["documents_per_second"] / baseline
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--copies", type=int, default=8)
+    parser.add_argument("--workers", type=int, nargs="+", default=[0, 1, 2, 4, 8])
+    parser.add_argument("--chunk-max-tokens", type=int, default=8192)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,143 @@
+"""
+Cost of the in-flight items and chunks of the ingestion pipeline, SQLAlchemy ORM
+objects (previous behaviour) against the slotted ChunkRecord and ItemRecord, for
+--items items of a synthetic document:
+
+- build: items created with the fields set by _create_item_base
+- item_to_chunk: items converted to chunks, the ORM baseline copies the columns
+  the way item_to_chunk did before the records
+- pickle: size of the items sent back from a worker process
+- items_to_chunks_recursive: recursive chunking of the record items
+
+Objects per second and the memory held by the built items (tracemalloc) are
+reported.
+
+    python benchmark/loader/bench_chunk_records.py --items 200000
+"""
+
+import argparse
+import gc
+import json
+import pickle
+import time
+import tracemalloc
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Tuple
+
+from hirag_prod._utils import compute_mdhash_id
+from hirag_prod.loader.chunk_split import items_to_chunks_recursive
+from hirag_prod.schema import Chunk, Item, ItemRecord, item_to_chunk
+
+WORDS = (
+    "patient insurance coverage hospital claim premium deductible provider network "
+    "emergency referral pharmacy benefit plan annual outpatient specialist"
+).split()
+
+
+def _item_fields(count: int) -> List[Dict[str, Any]]:
+    now = datetime.now()
+    fields = []
+    for idx in range(count):
+        text = " ".join(WORDS[(idx + i) % len(WORDS)] for i in range(20 + idx % 40))
+        fields.append(
+            {
+                "documentKey": compute_mdhash_id(f"doc_{idx}", prefix="item-"),
+                "text": text,
+                "chunkIdx": idx,
+                "documentId": "doc-bench",
+                "chunkType": "table" if idx % 50 == 0 else "text",
+                "pageNumber": idx // 40 + 1,
+                "pageImageUrl": None,
+                "pageWidth": 612.0,
+                "pageHeight": 792.0,
+                "bbox": [72.0, 18.0 * (idx % 40), 540.0, 18.0 * (idx % 40) + 14],
+                "caption": None,
+                "headers": None,
+                "children": None,
+                "id": "file-bench",
+                "type": "pdf",
+                "fileName": "bench.pdf",
+                "uri": "/tmp/bench.pdf",
+                "private": False,
+                "createdAt": now,
+                "updatedAt": now,
+                "createdBy": "bench",
+                "updatedBy": "bench",
+                "knowledgeBaseId": "kb-bench",
+                "workspaceId": "ws-bench",
+            }
+        )
+    return fields
+
+
+def _orm_item_to_chunk(item: Item) -> Chunk:
+    new_chunk = Chunk()
+    for col in dict(item):
+        if hasattr(new_chunk, col):
+            attr = getattr(item, col)
+            if col in ("bbox", "pageNumber"):
+                attr = [attr] if attr is not None else None
+            setattr(new_chunk, col, attr)
+    return new_chunk
+
+
+def _build(cls: Callable, fields: List[Dict[str, Any]]) -> Tuple[list, Dict]:
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    objects = [cls(**f) for f in fields]
+    elapsed = time.perf_counter() - start
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return objects, {
+        "seconds": round(elapsed, 3),
+        "objects_per_second": round(len(objects) / elapsed),
+        "held_mb": round(held / 2**20, 1),
+    }
+
+
+def _convert(convert: Callable, items: list) -> Dict:
+    start = time.perf_counter()
+    chunks = [convert(item) for item in items]
+    elapsed = time.perf_counter() - start
+    return {
+        "seconds": round(elapsed, 3),
+        "objects_per_second": round(len(chunks) / elapsed),
+    }
+
+
+def main(args) -> None:
+    fields = _item_fields(args.items)
+    report = {"items": args.items}
+
+    orm_items, report["orm_build"] = _build(Item, fields)
+    report["orm_item_to_chunk"] = _convert(_orm_item_to_chunk, orm_items)
+    report["orm_pickle_mb"] = round(len(pickle.dumps(orm_items)) / 2**20, 1)
+    del orm_items
+
+    record_items, report["record_build"] = _build(ItemRecord, fields)
+    report["record_item_to_chunk"] = _convert(item_to_chunk, record_items)
+    report["record_pickle_mb"] = round(len(pickle.dumps(record_items)) / 2**20, 1)
+
+    start = time.perf_counter()
+    chunks = items_to_chunks_recursive(record_items, chunk_max_tokens=0)
+    report["record_items_to_chunks_recursive"] = {
+        "seconds": round(time.perf_counter() - start, 3),
+        "chunks": len(chunks),
+    }
+
+    report["build_speedup"] = round(
+        report["record_build"]["objects_per_second"]
+        / report["orm_build"]["objects_per_second"],
+        2,
+    )
+    report["memory_ratio"] = round(
+        report["record_build"]["held_mb"] / report["orm_build"]["held_mb"], 2
+    )
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=200000)
+    main(parser.parse_args())
@@ -0,0 +1,112 @@
+"""
+Per-document latency of docling loading for small documents processed one after
+another: a new DocumentConverter per document (previous behaviour, models reloaded
+every time) against converters borrowed from the warm DocumentConverterPool.
+
+By default the documents are the first --pages pages of the test PDF written out as
+--documents one-page PDFs, loaded with the PDFLoader options (TableFormer ACCURATE).
+The layout and table models are downloaded on first use.
+
+    python benchmark/loader/bench_converter_pool.py --documents 20
+"""
+
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from typing import Dict, List
+
+import pypdfium2
+from docling.document_converter import DocumentConverter
+
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.loader import load_document
+from hirag_prod.loader.pdf_loader import PDFLoader
+from hirag_prod.resources.functions import get_document_converter_pool
+
+TEST_PDF = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "..",
+    "tests",
+    "test_files",
+    "Guide-to-U.S.-Healthcare-System.pdf",
+)
+
+
+def _write_small_pdfs(directory: str, documents: int, pages: int) -> List[str]:
+    source = pypdfium2.PdfDocument(TEST_PDF)
+    path_list = []
+    for i in range(documents):
+        pdf = pypdfium2.PdfDocument.new()
+        pdf.import_pages(source, [i % min(pages, len(source))])
+        path = os.path.join(directory, f"small-{i}.pdf")
+        pdf.save(path)
+        path_list.append(path)
+    return path_list
+
+
+def _document_meta(path: str) -> Dict:
+    return {
+        "type": "pdf",
+        "fileName": os.path.basename(path),
+        "uri": path,
+        "private": False,
+        "knowledgeBaseId": "bench",
+        "workspaceId": "bench",
+    }
+
+
+def _summary(latency_list: List[float]) -> Dict:
+    return {
+        "first_seconds": latency_list[0],
+        "p50_seconds": statistics.median(latency_list),
+        "mean_seconds": statistics.fmean(latency_list),
+        "total_seconds": sum(latency_list),
+    }
+
+
+def main(args) -> None:
+    initialize_config_manager(cli_options_dict={"debug": False})
+    with tempfile.TemporaryDirectory() as directory:
+        path_list = _write_small_pdfs(directory, args.documents, args.pages)
+
+        fresh_latency_list = []
+        for path in path_list:
+            start = time.perf_counter()
+            DocumentConverter(
+                format_options=PDFLoader().docling_format_options
+            ).convert(path)
+            fresh_latency_list.append(time.perf_counter() - start)
+
+        pooled_latency_list = []
+        for path in path_list:
+            start = time.perf_counter()
+            load_document(
+                document_path=path,
+                content_type="application/pdf",
+                document_meta=_document_meta(path),
+                loader_type="docling",
+            )
+            pooled_latency_list.append(time.perf_counter() - start)
+
+    print(
+        json.dumps(
+            {
+                "documents": args.documents,
+                "converter_per_document": _summary(fresh_latency_list),
+                "converter_pool": _summary(pooled_latency_list),
+                "pool_stats": get_document_converter_pool().get_stats(),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=20)
+    parser.add_argument("--pages", type=int, default=5)
+    main(parser.parse_args())
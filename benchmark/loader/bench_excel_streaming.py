@@ -0,0 +1,108 @@
+"""
+Peak RSS and time of turning a --rows row workbook into LaTeX, the way
+load_and_chunk_excel did it (pandas.read_excel and one to_latex per sheet) against
+the streamed row windows of read_excel_row_windows. Each mode runs in its own
+process so ru_maxrss is its own peak. --approximate-tokens counts four characters
+per token for machines without the tiktoken encodings.
+
+    python benchmark/loader/bench_excel_streaming.py --rows 500000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+
+def _generate(path: str, rows: int) -> None:
+    from openpyxl import Workbook
+
+    workbook = Workbook(write_only=True)
+    sheet = workbook.create_sheet("Claims")
+    sheet.append(["claim_id", "member", "provider", "service_date", "amount", "note"])
+    for i in range(rows):
+        sheet.append(
+            [
+                i,
+                f"member {i % 9973}",
+                f"provider {i % 211}",
+                f"2025-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                round(i * 0.37, 2),
+                "outpatient visit" if i % 3 else "pharmacy claim",
+            ]
+        )
+    workbook.save(path)
+
+
+def _run_pandas(path: str) -> dict:
+    import pandas as pd
+
+    rows = characters = 0
+    for df in pd.read_excel(path, None).values():
+        rows += len(df)
+        characters += len(df.to_latex(index=False))
+    return {"chunks": 1, "rows": rows, "characters": characters}
+
+
+def _run_streaming(path: str, approximate_tokens: bool) -> dict:
+    from hirag_prod.configs.functions import initialize_config_manager
+    from hirag_prod.loader import excel_loader
+
+    initialize_config_manager(cli_options_dict={"debug": False})
+    if approximate_tokens:
+        excel_loader._count_tokens = lambda text: len(text) // 4 + 1
+    windows = excel_loader.read_excel_row_windows(path, max_windows=10**9).windows
+    return {
+        "chunks": len(windows),
+        "rows": sum(window.last_row - window.first_row + 1 for window in windows),
+        "characters": sum(len(window.latex) for window in windows),
+    }
+
+
+def _child(args) -> None:
+    start = time.perf_counter()
+    if args.mode == "pandas":
+        result = _run_pandas(args.path)
+    else:
+        result = _run_streaming(args.path, args.approximate_tokens)
+    result["seconds"] = time.perf_counter() - start
+    result["peak_rss_mb"] = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(json.dumps(result))
+
+
+def main(args) -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "claims.xlsx")
+        start = time.perf_counter()
+        _generate(path, args.rows)
+        report = {
+            "rows": args.rows,
+            "file_mb": os.path.getsize(path) / 1024 / 1024,
+            "generate_seconds": time.perf_counter() - start,
+        }
+        for mode in ["pandas", "streaming"]:
+            command = [sys.executable, __file__, "--mode", mode, "--path", path]
+            if args.approximate_tokens:
+                command.append("--approximate-tokens")
+            output = subprocess.run(
+                command, check=True, capture_output=True, text=True
+            ).stdout
+            report[mode] = json.loads(output.strip().splitlines()[-1])
+    print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rows", type=int, default=500000)
+    parser.add_argument("--approximate-tokens", action="store_true")
+    parser.add_argument("--mode", choices=["pandas", "streaming"])
+    parser.add_argument("--path")
+    args = parser.parse_args()
+    if args.mode:
+        _child(args)
+    else:
+        main(args)
@@ -0,0 +1,104 @@
+"""
+Per-lookup time of _fuzzy_find_text against the plain SequenceMatcher scan it
+replaces, over the items of a synthetic --pages page markdown document whose
+paragraphs were lightly edited by the export so exact matching fails. The scan is
+only timed on --sample items, it takes about a second per lookup.
+
+    python benchmark/loader/bench_fuzzy_find_text.py --pages 500 --sample 30
+"""
+
+import argparse
+import json
+import random
+import time
+from difflib import SequenceMatcher
+
+from hirag_prod.loader.chunk_split import _fuzzy_find_text
+
+WORDS = (
+    "patient insurance coverage hospital claim premium deductible provider network "
+    "emergency referral pharmacy benefit plan medicare annual outpatient specialist "
+    "primary care physician copayment enrollment eligibility"
+).split()
+
+
+def _difflib_fuzzy_find_text(needle, haystack, start_pos=0, threshold=0.8):
+    if not needle or not haystack:
+        return None
+    needle_len = len(needle)
+    search_window = haystack[start_pos:]
+    search_text = search_window[: min(len(search_window), needle_len * 3 + 1000)]
+    best_ratio = 0.0
+    best_match_pos = None
+    for i in range(len(search_text) - needle_len + 1):
+        ratio = SequenceMatcher(None, needle, search_text[i : i + needle_len]).ratio()
+        if ratio > best_ratio and ratio >= threshold:
+            best_ratio = ratio
+            best_match_pos = i
+            if ratio > 0.95:
+                break
+    if best_match_pos is None:
+        return None
+    return (start_pos + best_match_pos, start_pos + best_match_pos + needle_len)
+
+
+def _build_document(pages: int, rng: random.Random):
+    paragraph_list = []
+    for _ in range(pages * 6):
+        paragraph_list.append(
+            " ".join(rng.choice(WORDS) for _ in range(rng.randint(30, 70)))
+        )
+    content = "\n\n".join(paragraph_list)
+    item_list = []
+    search_start = 0
+    for paragraph in paragraph_list:
+        # The item text differs from the exported text by a few characters
+        characters = list(paragraph)
+        for _ in range(3):
+            characters[rng.randrange(len(characters))] = "*"
+        item_list.append(("".join(characters), search_start))
+        search_start = content.index(paragraph, search_start) + len(paragraph)
+    return content, item_list
+
+
+def _time(find, content, item_list):
+    start = time.perf_counter()
+    result_list = [
+        find(needle, content, search_start) for needle, search_start in item_list
+    ]
+    return time.perf_counter() - start, result_list
+
+
+def main(args) -> None:
+    rng = random.Random(0)
+    content, item_list = _build_document(args.pages, rng)
+    sample_list = rng.sample(item_list, args.sample)
+
+    fast_seconds, _ = _time(_fuzzy_find_text, content, item_list)
+    sample_fast_seconds, sample_fast = _time(_fuzzy_find_text, content, sample_list)
+    sample_scan_seconds, sample_scan = _time(
+        _difflib_fuzzy_find_text, content, sample_list
+    )
+
+    print(
+        json.dumps(
+            {
+                "pages": args.pages,
+                "characters": len(content),
+                "items": len(item_list),
+                "all_items_seconds": fast_seconds,
+                "ms_per_lookup": 1000 * sample_fast_seconds / args.sample,
+                "scan_ms_per_lookup": 1000 * sample_scan_seconds / args.sample,
+                "speedup": sample_scan_seconds / sample_fast_seconds,
+                "same_matches": sample_fast == sample_scan,
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--sample", type=int, default=30)
+    main(parser.parse_args())
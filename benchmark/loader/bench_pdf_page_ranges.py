@@ -0,0 +1,108 @@
+"""
+Wall time of converting one synthetic --pages page PDF (the pages of the test PDF
+repeated) with docling in one piece on one worker process (previous behaviour) against
+page ranges of PDF_PAGE_RANGE_SIZE pages converted in parallel on --workers worker
+processes and merged. Pool start-up is excluded from the timings.
+
+    python benchmark/loader/bench_pdf_page_ranges.py --pages 300 --workers 8
+
+The layout and table models are downloaded on first use.
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import tempfile
+import time
+
+import pypdfium2
+
+from hirag_prod.configs.functions import get_envs, initialize_config_manager
+from hirag_prod.loader import load_document
+from hirag_prod.loader.pdf_page_ranges import load_pdf_in_page_ranges
+from hirag_prod.resources.worker_pool import WorkerPool
+
+TEST_PDF = os.path.join(
+    os.path.dirname(__file__),
+    "..",
+    "..",
+    "tests",
+    "test_files",
+    "Guide-to-U.S.-Healthcare-System.pdf",
+)
+
+
+def _write_long_pdf(path: str, pages: int) -> None:
+    source = pypdfium2.PdfDocument(TEST_PDF)
+    pdf = pypdfium2.PdfDocument.new()
+    while len(pdf) < pages:
+        pdf.import_pages(
+            source, list(range(min(len(source), pages - len(pdf)))), index=len(pdf)
+        )
+    pdf.save(path)
+
+
+async def _start_pool(workers: int) -> WorkerPool:
+    WorkerPool.reset()
+    pool = WorkerPool(max_workers=workers)
+    await pool.map(time.sleep, [(0.5,)] * workers)
+    return pool
+
+
+async def main(args) -> None:
+    initialize_config_manager(cli_options_dict={"debug": False})
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, "long.pdf")
+        _write_long_pdf(path, args.pages)
+        document_meta = {
+            "type": "pdf",
+            "fileName": "long.pdf",
+            "uri": path,
+            "private": False,
+            "knowledgeBaseId": "bench",
+            "workspaceId": "bench",
+        }
+
+        pool = await _start_pool(1)
+        start = time.perf_counter()
+        whole_doc, _ = await pool.run(
+            load_document,
+            document_path=path,
+            content_type="application/pdf",
+            loader_type="docling",
+            document_meta=document_meta,
+        )
+        serial_seconds = time.perf_counter() - start
+        await pool.shutdown()
+
+        pool = await _start_pool(args.workers)
+        start = time.perf_counter()
+        merged_doc, _ = await load_pdf_in_page_ranges(path, document_meta)
+        parallel_seconds = time.perf_counter() - start
+        await pool.shutdown()
+
+    print(
+        json.dumps(
+            {
+                "cpu_count": os.cpu_count(),
+                "pages": args.pages,
+                "page_range_size": get_envs().PDF_PAGE_RANGE_SIZE,
+                "workers": args.workers,
+                "one_piece_seconds": serial_seconds,
+                "page_ranges_seconds": parallel_seconds,
+                "speedup": serial_seconds / parallel_seconds,
+                "same_page_numbers": sorted(whole_doc.pages)
+                == sorted(merged_doc.pages),
+                "same_text_items": len(whole_doc.texts) == len(merged_doc.texts),
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--pages", type=int, default=300)
+    parser.add_argument("--workers", type=int, default=8)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,175 @@
+"""
+Fraction of the timestamp extraction LLM calls that extract_timestamp_from_items
+avoids, on two corpora:
+
+- synthetic: --documents generated documents with a known timestamp, written in
+  the layouts and locales ingestion sees (dated page headers and footers, dated
+  file names, "Published ..." lines, narrative dates only, no date at all). Their
+  deterministic picks are checked against the known timestamp.
+- 2wiki: the passages of benchmark/2wiki/2wikimultihopqa_corpus.json, one document
+  of a title and a text item each.
+
+The LLM is replaced by a stub answering the known timestamp, so only calls are
+counted.
+
+    python benchmark/loader/bench_timestamp_extraction.py --documents 2000
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+from datetime import datetime
+from types import SimpleNamespace
+
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.loader import chunk_split
+
+CORPUS_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "2wiki", "2wikimultihopqa_corpus.json"
+)
+WORDS = (
+    "patient insurance coverage hospital claim premium deductible provider network "
+    "emergency referral pharmacy benefit plan annual outpatient specialist"
+).split()
+
+
+class StubChatService:
+    def __init__(self):
+        self.calls = 0
+        self.answer = None
+
+    async def complete(self, prompt: str, **kwargs) -> str:
+        self.calls += 1
+        return json.dumps({"timestamp": self.answer})
+
+
+def _item(text, chunk_type="text", file_name="document.pdf"):
+    return SimpleNamespace(text=text, chunkType=chunk_type, fileName=file_name)
+
+
+def _paragraph(rng):
+    return " ".join(rng.choice(WORDS) for _ in range(rng.randint(40, 120)))
+
+
+def _format_date(date, rng):
+    return rng.choice(
+        [
+            date.strftime("%Y-%m-%d"),
+            date.strftime("%Y/%m/%d"),
+            date.strftime("%B %d, %Y"),
+            date.strftime("%d %b %Y"),
+            f"{date.year}年{date.month}月{date.day}日",
+        ]
+    )
+
+
+def _synthetic_document(rng):
+    date = datetime(rng.randint(2005, 2024), rng.randint(1, 12), rng.randint(1, 28))
+    other = datetime(rng.randint(2005, 2024), rng.randint(1, 12), rng.randint(1, 28))
+    body = [_item(_paragraph(rng)) for _ in range(rng.randint(5, 30))]
+    kind = rng.choice(
+        ["header", "footer", "filename", "published", "narrative", "none"]
+    )
+    file_name = "document.pdf"
+    if kind == "header":
+        items = [
+            _item("Quarterly report", "title"),
+            _item(f"Issued {_format_date(date, rng)}", "page_header"),
+        ] + body
+        items += [_item(f"Issued {_format_date(date, rng)}", "page_header")] * 3
+    elif kind == "footer":
+        items = body + [_item(f"Page 1 | {_format_date(date, rng)}", "page_footer")] * 4
+    elif kind == "filename":
+        file_name = f"minutes_{date.strftime('%Y%m%d')}.docx"
+        items = body
+    elif kind == "published":
+        items = [
+            _item(f"Published on {_format_date(date, rng)}. {_paragraph(rng)}")
+        ] + body
+    elif kind == "narrative":
+        # Dates about the content, the document date is up to the LLM
+        items = body[:3] + [
+            _item(f"The policy changed on {_format_date(date, rng)}."),
+            _item(f"Claims before {_format_date(other, rng)} are excluded."),
+        ]
+    else:
+        items = body
+        date = None
+    for item in items:
+        item.fileName = file_name
+    return kind, items, date
+
+
+async def _run_synthetic(documents, chat_service, rng):
+    report = {}
+    for _ in range(documents):
+        kind, items, date = _synthetic_document(rng)
+        chat_service.answer = date.strftime("%Y-%m-%d") if date else None
+        calls = chat_service.calls
+        timestamp = await chunk_split.extract_timestamp_from_items(items)
+        entry = report.setdefault(
+            kind, {"documents": 0, "llm_calls": 0, "deterministic_correct": 0}
+        )
+        entry["documents"] += 1
+        if chat_service.calls > calls:
+            entry["llm_calls"] += 1
+        elif timestamp == date:
+            entry["deterministic_correct"] += 1
+    return report
+
+
+async def _run_2wiki(passages, chat_service):
+    llm_calls = dated = 0
+    for passage in passages:
+        items = [
+            _item(passage["title"], "title", f"{passage['title']}.txt"),
+            _item(passage["text"], "text", f"{passage['title']}.txt"),
+        ]
+        dated += any(chunk_split.find_dates(item.text) for item in items)
+        calls = chat_service.calls
+        await chunk_split.extract_timestamp_from_items(items)
+        llm_calls += chat_service.calls > calls
+    return {"documents": len(passages), "with_dates": dated, "llm_calls": llm_calls}
+
+
+def main(args) -> None:
+    initialize_config_manager(cli_options_dict={"debug": False})
+    logging.getLogger(chunk_split.__name__).setLevel(logging.WARNING)
+    chat_service = StubChatService()
+    chunk_split.get_chat_service = lambda: chat_service
+    rng = random.Random(0)
+
+    synthetic = asyncio.run(_run_synthetic(args.documents, chat_service, rng))
+    with open(CORPUS_PATH) as f:
+        passages = json.load(f)[: args.passages]
+    wiki = asyncio.run(_run_2wiki(passages, chat_service))
+
+    synthetic_documents = sum(entry["documents"] for entry in synthetic.values())
+    synthetic_calls = sum(entry["llm_calls"] for entry in synthetic.values())
+    decided = synthetic_documents - synthetic_calls
+    correct = sum(entry["deterministic_correct"] for entry in synthetic.values())
+    print(
+        json.dumps(
+            {
+                "synthetic": synthetic,
+                "synthetic_llm_calls_avoided": 1
+                - synthetic_calls / synthetic_documents,
+                "synthetic_deterministic_accuracy": (
+                    correct / decided if decided else None
+                ),
+                "2wiki": wiki,
+                "2wiki_llm_calls_avoided": 1 - wiki["llm_calls"] / wiki["documents"],
+            },
+            indent=2,
+        )
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--documents", type=int, default=2000)
+    parser.add_argument("--passages", type=int, default=6119)
+    main(parser.parse_args())
@@ -0,0 +1,102 @@
+"""
+Token offset alignment of tokenize_sentence on mixed Chinese/English text: the previous
+slicing version (sentence[index:].find for every character) against the cursor based
+single pass. The hanlp model is replaced by a regex tokenizer so that only the
+alignment is measured. The slicing version is quadratic and is only run up to
+--max-reference-bytes.
+
+    python benchmark/tokenizer/bench_token_alignment.py --megabytes 1
+"""
+
+import argparse
+import json
+import random
+import re
+import time
+
+import hirag_prod.resources.functions as resource_functions
+from hirag_prod.resources.functions import tokenize_sentence
+
+TOKEN_PATTERN = re.compile(r"[一-鿿]{1,2}|[A-Za-z]+|\d+|[^\s\w]")
+ENGLISH = "revenue grew in the third quarter driven by lower operating costs".split()
+CHINESE = "公司第三季度的收入有所增加主要受营运成本下降带动"
+
+
+def regex_tokenizer(text):
+    if isinstance(text, list):
+        return [TOKEN_PATTERN.findall(t) for t in text]
+    return TOKEN_PATTERN.findall(text)
+
+
+def slicing_tokenize_sentence(sentence):
+    """tokenize_sentence before the cursor based alignment"""
+    result_list, token_start_index_list, token_end_index_list = [], [], []
+    current_text_index = 0
+    current_result_list_index = 0
+    finish = False
+    while (not finish) and (current_text_index < len(sentence)):
+        if current_text_index + 510 < len(sentence):
+            result_list.extend(
+                regex_tokenizer(
+                    sentence[current_text_index : current_text_index + 510]
+                )[:-1]
+            )
+        else:
+            result_list.extend(regex_tokenizer(sentence[current_text_index:]))
+            finish = True
+        for token in result_list[current_result_list_index:]:
+            token_start_index_list.append(
+                current_text_index + sentence[current_text_index:].find(token[0])
+            )
+            for char in token:
+                current_text_index += sentence[current_text_index:].find(char) + 1
+            token_end_index_list.append(current_text_index)
+        current_result_list_index = len(result_list)
+    return result_list, token_start_index_list, token_end_index_list
+
+
+def mixed_text(n_bytes: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts, size = [], 0
+    while size < n_bytes:
+        if rng.random() < 0.5:
+            part = " ".join(rng.choice(ENGLISH) for _ in range(rng.randint(3, 12)))
+        else:
+            start = rng.randrange(len(CHINESE) - 6)
+            part = CHINESE[start : start + rng.randint(4, 12)]
+        part += rng.choice([". ", "，", " 2024 ", "\n"])
+        parts.append(part)
+        size += len(part.encode("utf-8"))
+    return "".join(parts)
+
+
+def _time(function, text):
+    start = time.perf_counter()
+    result = function(text)
+    return time.perf_counter() - start, result
+
+
+def main(args) -> None:
+    resource_functions.get_sentence_tokenizer = lambda: regex_tokenizer
+    results = {}
+    size = 16 * 1024
+    while size <= args.megabytes * 1024 * 1024:
+        text = mixed_text(size)
+        cursor_seconds, (tokens, starts, ends) = _time(tokenize_sentence, text)
+        entry = {"chars": len(text), "tokens": len(tokens), "cursor_s": cursor_seconds}
+        if size <= args.max_reference_bytes:
+            slicing_seconds, reference = _time(slicing_tokenize_sentence, text)
+            assert reference == (tokens, starts.tolist(), ends.tolist())
+            entry["slicing_s"] = slicing_seconds
+            entry["speedup"] = slicing_seconds / cursor_seconds
+        entry["offsets_bytes_int32"] = starts.nbytes + ends.nbytes
+        results[f"{size // 1024}KB"] = entry
+        size *= 4
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--megabytes", type=int, default=1)
+    parser.add_argument("--max-reference-bytes", type=int, default=1024 * 1024)
+    main(parser.parse_args())
@@ -0,0 +1,91 @@
+"""
+Event loop lag while tokenizing the texts and translations of a 50k item upsert: hanlp
+called once per text on the event loop (previous behaviour) versus the batched
+TokenizerService. The hanlp model is replaced by a stub whose cost is a fixed
+per-call overhead plus a per-text cost spent outside the GIL, like torch inference.
+
+    python benchmark/tokenizer/bench_tokenizer_loop_lag.py --items 50000
+"""
+
+import argparse
+import asyncio
+import json
+import time
+from typing import Dict, List
+
+import numpy as np
+
+import hirag_prod.resources.functions as resource_functions
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.resources.tokenizer_service import TokenizerService
+
+
+class StubTokenizer:
+    def __init__(self, call_ms: float, text_ms: float):
+        self.call_ms = call_ms
+        self.text_ms = text_ms
+
+    def __call__(self, window_list):
+        time.sleep((self.call_ms + self.text_ms * len(window_list)) / 1000)
+        return [window.split() for window in window_list]
+
+
+async def _with_loop_lag(coro, interval: float = 0.005) -> Dict:
+    lags: List[float] = []
+    tick_start = time.perf_counter()
+
+    async def ticker():
+        nonlocal tick_start
+        while True:
+            tick_start = time.perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(time.perf_counter() - tick_start - interval)
+
+    ticker_task = asyncio.create_task(ticker())
+    await asyncio.sleep(0)
+    start = time.perf_counter()
+    await coro
+    elapsed = time.perf_counter() - start
+    # The tick that was waiting while the coroutine finished
+    lags.append(max(0.0, time.perf_counter() - tick_start - interval))
+    ticker_task.cancel()
+    lag_ms = np.array(lags) * 1000
+    return {
+        "seconds": elapsed,
+        "ticks": len(lags),
+        "loop_lag_p50_ms": float(np.percentile(lag_ms, 50)),
+        "loop_lag_p99_ms": float(np.percentile(lag_ms, 99)),
+        "loop_lag_max_ms": float(lag_ms.max()),
+    }
+
+
+async def _inline(texts: List[str]) -> None:
+    for text in texts:
+        resource_functions.tokenize_sentence(text)
+
+
+async def main(args) -> None:
+    initialize_config_manager(cli_options_dict={"debug": False})
+    tokenizer = StubTokenizer(args.call_ms, args.text_ms)
+    resource_functions.get_sentence_tokenizer = lambda: tokenizer
+    # Texts and their translations, as in upsert_texts for Items
+    texts = [f"item {i} revenue grew in the third quarter" for i in range(args.items)]
+    texts += [f"translation {i} of the item text" for i in range(args.items)]
+
+    TokenizerService.reset()
+    service = TokenizerService(tokenizer=tokenizer)
+    results = {
+        "inline_per_text": await _with_loop_lag(_inline(texts)),
+        "tokenizer_service": await _with_loop_lag(service.tokenize_many(texts)),
+    }
+    results["tokenizer_service_stats"] = service.get_stats()
+    TokenizerService.reset()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50000)
+    parser.add_argument("--call-ms", type=float, default=0.2)
+    parser.add_argument("--text-ms", type=float, default=0.02)
+    asyncio.run(main(parser.parse_args()))
@@ -0,0 +1,142 @@
+"""
+Throughput of LocalTranslator on many short texts (Items headers, table cells) against
+a local stub chat model serving a fixed number of requests at a time: one request per
+text (previous behaviour) versus the shared scheduler packing texts into numbered
+prompts under adaptive concurrency.
+
+    python benchmark/translation/bench_translation_scheduler.py --texts 2000
+"""
+
+import argparse
+import asyncio
+import json
+import re
+import time
+from typing import Dict
+
+from dotenv import load_dotenv
+
+from hirag_prod.configs.functions import get_envs, initialize_config_manager
+from hirag_prod.resources.functions import get_http_client_registry
+from hirag_prod.translator.local_translator import LocalTranslator
+from hirag_prod.translator.translation_scheduler import TranslationScheduler
+
+load_dotenv("/chatbot/.env")
+
+
+class StubChatModel:
+    """Answers chat completions after a per-request overhead plus a per-segment cost"""
+
+    def __init__(self, slots: int, request_latency: float, segment_latency: float):
+        self.slots = asyncio.Semaphore(slots)
+        self.request_latency = request_latency
+        self.segment_latency = segment_latency
+        self.requests = 0
+
+    def _reply(self, prompt: str) -> str:
+        body = prompt.split("\n\n", 1)[1]
+        segments = re.split(r"^\[(\d+)\] ", body, flags=re.MULTILINE)
+        if len(segments) == 1:
+            return f"EN({body})"
+        return "\n".join(
+            f"[{number}] EN({segment.strip()})"
+            for number, segment in zip(segments[1::2], segments[2::2])
+        )
+
+    async def handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                body = json.loads(await reader.readexactly(length))
+                prompt = body["messages"][0]["content"]
+                async with self.slots:
+                    self.requests += 1
+                    await asyncio.sleep(
+                        self.request_latency
+                        + self.segment_latency * max(1, prompt.count("\n["))
+                    )
+                payload = json.dumps(
+                    {
+                        "choices": [{"message": {"content": self._reply(prompt)}}],
+                        "usage": {"prompt_tokens": 0, "completion_tokens": 0},
+                    }
+                ).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+
+async def _measure(translator: LocalTranslator, texts, packed: bool) -> Dict:
+    start = time.perf_counter()
+    if packed:
+        results = await translator._translate_batch(texts, dest="en")
+    else:
+        results = await asyncio.gather(
+            *[translator._translate_single(text, dest="en") for text in texts]
+        )
+    elapsed = time.perf_counter() - start
+    assert [r.text for r in results] == [f"EN({t})" for t in texts]
+    return {"seconds": elapsed, "texts_per_second": len(texts) / elapsed}
+
+
+async def main(args) -> None:
+    stub = StubChatModel(args.slots, args.request_latency, args.segment_latency)
+    server = await asyncio.start_server(stub.handle, "127.0.0.1", 0)
+    host, port = server.sockets[0].getsockname()[:2]
+
+    initialize_config_manager(
+        cli_options_dict={"debug": False},
+        config_dict={
+            "is_main_process": True,
+            "TRANSLATOR_SERVICE_TYPE": "local",
+            "LOCAL_TRANSLATOR_BASE_URL": f"http://{host}:{port}/v1/chat/completions",
+            "LOCAL_TRANSLATOR_API_KEY": "stub",
+            "LOCAL_TRANSLATOR_MODEL_NAME": "stub",
+            "LOCAL_TRANSLATOR_ENTRY_POINT": "/v1/chat/completions",
+            "TRANSLATOR_RATE_LIMIT": 10**9,
+            "TRANSLATOR_RATE_LIMIT_TIME_UNIT": "second",
+            "TRANSLATOR_RATE_LIMIT_MIN_INTERVAL_SECONDS": 0.0,
+        },
+    )
+    texts = [f"Section {i} header" for i in range(args.texts)]
+    translator = LocalTranslator()
+    # Approximate token counts so that the benchmark does not need tiktoken files
+    translator._scheduler = TranslationScheduler(
+        max_concurrency=get_envs().TRANSLATOR_MAX_CONCURRENCY,
+        pack_token_budget=get_envs().TRANSLATOR_PACK_TOKEN_BUDGET,
+        pack_max_texts=get_envs().TRANSLATOR_PACK_MAX_TEXTS,
+        count_tokens=lambda text: len(text) // 4 + 1,
+    )
+
+    results = {}
+    for packed in (False, True):
+        stub.requests = 0
+        result = await _measure(translator, texts, packed)
+        result["model_requests"] = stub.requests
+        results["scheduler" if packed else "request_per_text"] = result
+    results["scheduler_stats"] = translator._get_scheduler().get_stats()
+
+    await get_http_client_registry().aclose()
+    server.close()
+    await server.wait_closed()
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--texts", type=int, default=2000)
+    parser.add_argument("--slots", type=int, default=8)
+    parser.add_argument("--request-latency", type=float, default=0.05)
+    parser.add_argument("--segment-latency", type=float, default=0.002)
+    asyncio.run(main(parser.parse_args()))
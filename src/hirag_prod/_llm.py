@@ -2,9 +2,8 @@ import logging
 import threading
 from abc import ABC
 from dataclasses import dataclass
-from typing import Any, Dict, List, Optional, Tuple, TypeVar, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple, TypeVar, Union
 
-import httpx
 import numpy as np
 from openai import APIConnectionError, AsyncOpenAI, RateLimitError
 from pydantic import BaseModel
@@ -25,7 +24,9 @@ from hirag_prod.configs.functions import (
     get_shared_variables,
 )
 from hirag_prod.configs.llm_config import LLMConfig
+from hirag_prod.load_balancer import create_endpoint_pool
 from hirag_prod.rate_limiter import RateLimiter
+from hirag_prod.resources.functions import get_async_http_client
 
 # ============================================================================
 # Constants
@@ -132,17 +133,36 @@ class SingletonMeta(type):
 class BaseAPIClient(ABC, metaclass=SingletonABCMeta):
     """Base class for API clients with singleton pattern"""
 
-    def __init__(self, config: Union[EmbeddingConfig, LLMConfig]):
+    def __init__(
+        self,
+        config: Union[EmbeddingConfig, LLMConfig],
+        name: str,
+        hedge_delay: Optional[float] = None,
+    ):
         if not hasattr(self, "_initialized"):
-            self._client = AsyncOpenAI(
-                api_key=config.api_key, base_url=config.base_url, max_retries=0
+            # One OpenAI client per endpoint of the (comma separated) base URL
+            self.endpoint_pool = create_endpoint_pool(
+                name, config.base_url, hedge_delay=hedge_delay
             )
+            self._clients: Dict[str, AsyncOpenAI] = {
+                url: AsyncOpenAI(api_key=config.api_key, base_url=url, max_retries=0)
+                for url in self.endpoint_pool.urls
+            }
+            self._client = self._clients[self.endpoint_pool.urls[0]]
             self._initialized = True
 
     @property
     def client(self) -> AsyncOpenAI:
         return self._client
 
+    async def request(self, send: Callable[[AsyncOpenAI], Awaitable[Any]]) -> Any:
+        """Run ``send(client)`` with the client of the endpoint chosen by the load balancer"""
+        return await self.endpoint_pool.request(lambda url: send(self._clients[url]))
+
+    async def close(self):
+        for client in self._clients.values():
+            await client.close()
+
 
 # ============================================================================
 # Client Implementations
@@ -154,7 +174,9 @@ class ChatClient(BaseAPIClient):
 
     def __init__(self):
         if not hasattr(self, "_initialized"):
-            super().__init__(get_llm_config())
+            super().__init__(
+                get_llm_config(), "llm", hedge_delay=get_envs().LLM_HEDGE_DELAY_SECONDS
+            )
 
 
 class EmbeddingClient(BaseAPIClient):
@@ -162,7 +184,11 @@ class EmbeddingClient(BaseAPIClient):
 
     def __init__(self):
         if not hasattr(self, "_initialized"):
-            super().__init__(get_embedding_config())
+            super().__init__(
+                get_embedding_config(),
+                "embedding",
+                hedge_delay=get_envs().EMBEDDING_HEDGE_DELAY_SECONDS,
+            )
 
 
 class LocalEmbeddingClient:
@@ -170,7 +196,19 @@ class LocalEmbeddingClient:
 
     def __init__(self):
         self._logger = logging.getLogger(LoggerNames.EMBEDDING)
-        self._http_client = httpx.AsyncClient(timeout=3600.0)
+        self.timeout: float = 3600.0
+        self.endpoint_pool = create_endpoint_pool(
+            "embedding",
+            get_embedding_config().base_url,
+            hedge_delay=get_envs().EMBEDDING_HEDGE_DELAY_SECONDS,
+        )
+
+    async def _post(self, base_url: str, headers: Dict, payload: Dict) -> Dict:
+        response = await get_async_http_client(base_url).post(
+            base_url, headers=headers, json=payload, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def create_embeddings(self, texts: List[str]) -> List[List[float]]:
         """Create embeddings using local service API"""
@@ -189,13 +227,10 @@ class LocalEmbeddingClient:
             "input": batch_texts_to_embed,
         }
 
-        response = await self._http_client.post(
-            get_embedding_config().base_url, headers=headers, json=payload
+        result = await self.endpoint_pool.request(
+            lambda base_url: self._post(base_url, headers, payload)
         )
 
-        response.raise_for_status()
-        result = response.json()
-
         if get_envs().ENABLE_TOKEN_COUNT:
             # embedding model only needs to count the prompt tokens
             get_shared_variables().input_token_count_dict["embedding"].value += (
@@ -217,15 +252,26 @@ class LocalEmbeddingClient:
                 )
 
     async def close(self):
-        """Close the HTTP client"""
-        await self._http_client.aclose()
+        """Nothing to close, the shared HTTP clients are closed by the ResourceManager"""
 
 
 class LocalLLMClient:
     """Client for local LLM service"""
 
     def __init__(self):
-        self._http_client = httpx.AsyncClient(timeout=3600.0)
+        self.timeout: float = 3600.0
+        self.endpoint_pool = create_endpoint_pool(
+            "llm",
+            get_llm_config().base_url,
+            hedge_delay=get_envs().LLM_HEDGE_DELAY_SECONDS,
+        )
+
+    async def _post(self, base_url: str, headers: Dict, payload: Dict) -> Dict:
+        response = await get_async_http_client(base_url).post(
+            base_url, headers=headers, json=payload, timeout=self.timeout
+        )
+        response.raise_for_status()
+        return response.json()
 
     async def create_chat_completion(
         self, messages: List[Dict[str, str]], **kwargs: Any
@@ -240,18 +286,12 @@ class LocalLLMClient:
 
         payload = {"messages": messages, **kwargs}
 
-        response = await self._http_client.post(
-            get_llm_config().base_url, headers=headers, json=payload
+        return await self.endpoint_pool.request(
+            lambda base_url: self._post(base_url, headers, payload)
         )
 
-        response.raise_for_status()
-        result = response.json()
-
-        return result
-
     async def close(self):
-        """Close the HTTP client"""
-        await self._http_client.aclose()
+        """Nothing to close, the shared HTTP clients are closed by the ResourceManager"""
 
 
 # ============================================================================
@@ -349,7 +389,8 @@ class ChatCompletion(metaclass=SingletonMeta):
 
     def __init__(self):
         if not hasattr(self, "_initialized"):
-            self.client = ChatClient().client
+            self._api_client = ChatClient()
+            self.client = self._api_client.client
             self._completion_limiter = None
             self._token_tracker = TokenUsageTracker()
             self._initialized = True
@@ -389,15 +430,19 @@ class ChatCompletion(metaclass=SingletonMeta):
         messages = self._build_messages(system_prompt, history_messages, prompt)
 
         if response_format is None:
-            response = await self.client.chat.completions.create(
-                model=model, messages=messages, **kwargs
+            response = await self._api_client.request(
+                lambda client: client.chat.completions.create(
+                    model=model, messages=messages, **kwargs
+                )
             )
         else:
-            response = await self.client.beta.chat.completions.parse(
-                model=model,
-                messages=messages,
-                response_format=response_format,
-                **kwargs,
+            response = await self._api_client.request(
+                lambda client: client.beta.chat.completions.parse(
+                    model=model,
+                    messages=messages,
+                    response_format=response_format,
+                    **kwargs,
+                )
             )
 
         # Track token usage
@@ -451,7 +496,7 @@ class ChatCompletion(metaclass=SingletonMeta):
 
     async def close(self):
         """Close underlying client"""
-        await self.client.close()
+        await self._api_client.close()
 
 
 class LocalChatService:
@@ -683,7 +728,8 @@ class EmbeddingService(metaclass=SingletonMeta):
 
     def __init__(self, default_batch_size: int = APIConstants.DEFAULT_BATCH_SIZE):
         if not hasattr(self, "_initialized"):
-            self.client = EmbeddingClient().client
+            self._api_client = EmbeddingClient()
+            self.client = self._api_client.client
             self._embedding_limiter = None
             self.default_batch_size = default_batch_size
             self._logger = logging.getLogger(LoggerNames.EMBEDDING)
@@ -709,8 +755,10 @@ class EmbeddingService(metaclass=SingletonMeta):
         self, texts: List[str], model: str = APIConstants.DEFAULT_EMBEDDING_MODEL
     ) -> np.ndarray:
         """Create embeddings for a single batch of texts (internal method)"""
-        response = await self.client.embeddings.create(
-            model=model, input=texts, encoding_format="float"
+        response = await self._api_client.request(
+            lambda client: client.embeddings.create(
+                model=model, input=texts, encoding_format="float"
+            )
         )
         token_usage = response.usage
         if get_envs().ENABLE_TOKEN_COUNT:
@@ -785,7 +833,7 @@ class EmbeddingService(metaclass=SingletonMeta):
 
     async def close(self):
         """Close underlying clients"""
-        await self.client.close()
+        await self._api_client.close()
 
 
 class LocalEmbeddingService:
@@ -86,19 +86,20 @@ def retry_async(
     return decorator
 
 
-def encode_string_by_tiktoken(content: str, model_name: str = "gpt-4o"):
+def get_tiktoken_encoder(model_name: str = "gpt-4o") -> tiktoken.Encoding:
     global ENCODER
     if ENCODER is None:
         ENCODER = tiktoken.encoding_for_model(model_name)
-    tokens = ENCODER.encode(content)
+    return ENCODER
+
+
+def encode_string_by_tiktoken(content: str, model_name: str = "gpt-4o"):
+    tokens = get_tiktoken_encoder(model_name).encode(content)
     return tokens
 
 
 def decode_tokens_by_tiktoken(tokens: list[int], model_name: str = "gpt-4o"):
-    global ENCODER
-    if ENCODER is None:
-        ENCODER = tiktoken.encoding_for_model(model_name)
-    content = ENCODER.decode(tokens)
+    content = get_tiktoken_encoder(model_name).decode(tokens)
     return content
 
 
@@ -21,7 +21,7 @@ class DotsChunkType(Enum):
     PAGE_FOOTER = "Page-footer"
 
 
-@dataclass
+@dataclass(slots=True)
 class DotsChunk:
     """A chunk from Dots OCR processing."""
 
@@ -3,7 +3,7 @@ from langchain_text_splitters.base import split_text_on_tokens
 
 from hirag_prod._utils import compute_mdhash_id
 from hirag_prod.chunk.base_chunk import BaseChunk
-from hirag_prod.schema import Chunk, File, file_to_chunk
+from hirag_prod.schema import ChunkRecord, File, file_to_chunk
 
 
 class FixTokenChunk(BaseChunk):
@@ -11,7 +11,7 @@ class FixTokenChunk(BaseChunk):
         self.chunk_size = chunk_size
         self.chunk_overlap = chunk_overlap
 
-    def chunk(self, document: File) -> list[Chunk]:
+    def chunk(self, document: File) -> list[ChunkRecord]:
         # TODO: Implement semantic-aware chunking to preserve context boundaries
         tokenizer = Tokenizer(
             tokens_per_chunk=self.chunk_size,
@@ -2,10 +2,10 @@ from dataclasses import dataclass
 from datetime import datetime
 from typing import Dict, List, Optional
 
-from hirag_prod.schema.item import Item
+from hirag_prod.schema.records import ItemRecord
 
 
-@dataclass
+@dataclass(slots=True)
 class DenseChunk:
     """Dense/recursive chunk schema aligned to this module's style."""
 
@@ -76,7 +76,7 @@ class UnifiedRecursiveChunker:
             return []
 
     def _build_bbox_list_for_pages(
-        self, items: List[Item], pages: List[int]
+        self, items: List[ItemRecord], pages: List[int]
     ) -> List[List[float]]:
         """Build bbox list for given pages from items."""
         bbox_list = []
@@ -91,7 +91,7 @@ class UnifiedRecursiveChunker:
         text: str,
         bbox_list: List[List[float]],
         pages_span: List[int],
-        reference_item: Item,
+        reference_item: ItemRecord,
     ) -> DenseChunk:
         """Create a DenseChunk with common fields from a reference item."""
         return DenseChunk(
@@ -121,7 +121,11 @@ class UnifiedRecursiveChunker:
         )
 
     def _build_separate_chunk(
-        self, id2item: Dict[str, Item], item: Item, chunk_idx: int, category: str
+        self,
+        id2item: Dict[str, ItemRecord],
+        item: ItemRecord,
+        chunk_idx: int,
+        category: str,
     ) -> DenseChunk:
         headers = item.headers or []
         cap = item.caption or ""
@@ -161,7 +165,7 @@ class UnifiedRecursiveChunker:
         )
 
     def chunk(
-        self, items: Optional[List[Item]], header_set: Optional[set[str]]
+        self, items: Optional[List[ItemRecord]], header_set: Optional[set[str]]
     ) -> List[DenseChunk]:
         if not items:
             return []
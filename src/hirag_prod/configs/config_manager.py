@@ -10,6 +10,7 @@ from hirag_prod.configs.llm_config import LLMConfig
 from hirag_prod.configs.reranker_config import RerankConfig
 from hirag_prod.configs.shared_variables import SharedVariables
 from hirag_prod.configs.translator_config import TranslatorConfig
+from hirag_prod.singleton_registry import register_singleton
 
 
 class ConfigManager:
@@ -21,6 +22,7 @@ class ConfigManager:
             with cls._lock:
                 if cls._instance is None:
                     cls._instance = super().__new__(cls)
+                    register_singleton(cls)
         return cls._instance
 
     def __init__(
@@ -11,6 +11,9 @@ class DotsOCRConfig(BaseSettings):
     timeout: int = 300
     polling_interval: int = 5  # Polling interval in seconds for async jobs
     polling_retries: int = 3  # Number of retries for polling requests
+    polling_initial_interval: float = 0.5  # First polling interval of the async client
+    polling_backoff_factor: float = 2.0  # Growth of the interval up to polling_interval
+    max_concurrent_jobs: int = 8  # Jobs in flight at once per event loop
 
     class Config:
         alias_generator = lambda x: f"dots_ocr_{x}".upper()
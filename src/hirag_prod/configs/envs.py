@@ -29,6 +29,10 @@ class Envs(BaseSettings):
     EMBEDDING_DIMENSION: int
     USE_HALF_VEC: bool = True
     ENABLE_TOKEN_COUNT: bool = False
+    ENABLE_TRANSLATION_CACHE: bool = True
+    TRANSLATION_CACHE_MAX_ENTRIES: int = 100000
+    TOKENIZER_BATCH_SIZE: int = 64
+    TOKENIZER_BATCH_WAIT_MS: float = 5.0
     CONSTRUCT_GRAPH: bool = False
 
     EMBEDDING_SERVICE_TYPE: Literal["openai", "local"] = "openai"
@@ -100,9 +104,71 @@ class Envs(BaseSettings):
     TRANSLATOR_RATE_LIMIT: int = 60
     TRANSLATOR_RATE_LIMIT_TIME_UNIT: Literal["second", "minute", "hour"] = "minute"
     TRANSLATOR_RATE_LIMIT_MIN_INTERVAL_SECONDS: float = 0.1
+    # Shared translation scheduler: numbered prompt packing and adaptive concurrency
+    TRANSLATOR_MAX_CONCURRENCY: int = 32
+    TRANSLATOR_PACK_TOKEN_BUDGET: int = 512
+    TRANSLATOR_PACK_MAX_TEXTS: int = 16
     DOTS_OCR_RATE_LIMIT: int = 60
     DOTS_OCR_RATE_LIMIT_TIME_UNIT: Literal["second", "minute", "hour"] = "minute"
     DOTS_OCR_RATE_LIMIT_MIN_INTERVAL_SECONDS: float = 0.1
+    # Background health probing and circuit breaking of the cloud converters
+    CLOUD_HEALTH_PROBE_INTERVAL_SECONDS: float = 15.0
+    CLOUD_CIRCUIT_FAILURE_THRESHOLD: int = 2
+    CLOUD_CIRCUIT_OPEN_SECONDS: float = 30.0
+    # Warm docling converters kept per set of pipeline options
+    DOCLING_CONVERTER_POOL_SIZE: int = 2
+    # Pages per range of PDFs converted in parallel on the ingestion worker pool
+    PDF_PAGE_RANGE_SIZE: int = 50
+    # Excel sheets are streamed in row windows, each under a token budget
+    EXCEL_WINDOW_MAX_TOKENS: int = 2000
+    EXCEL_WINDOW_MAX_ROWS: int = 200
+    # Windows a worker returns at once, in whole sheets
+    EXCEL_WINDOW_BATCH_MAX_WINDOWS: int = 64
+    EXCEL_SUMMARY_CONCURRENCY: int = 4
+    EXCEL_SUMMARIZED_WINDOWS_PER_SHEET: int = 20
+    # Cell text indexes of the sheets cited from, kept in memory
+    EXCEL_CELL_INDEX_CACHE_MAX_SIZE_MB: int = 256
+    # Table captions: short tables are their own caption, small tables share a prompt
+    TABLE_SUMMARY_CONCURRENCY: int = 8
+    TABLE_SUMMARY_MIN_CHARS: int = 200
+    TABLE_SUMMARY_PACK_MAX_CHARS: int = 6000
+    TABLE_SUMMARY_PACK_MAX_TABLES: int = 8
+    TABLE_SUMMARY_CACHE_MAX_ENTRIES: int = 10000
+    # Token counts cached by text hash, missing texts are encoded in threaded batches
+    TOKEN_COUNT_CACHE_MAX_ENTRIES: int = 100000
+    TOKEN_COUNT_NUM_THREADS: int = 8
+    # Document timestamps scored at least this confident skip the LLM
+    TIMESTAMP_CONFIDENCE_THRESHOLD: float = 0.75
+    # Conversion results on local disk, keyed by file content and converter options
+    ENABLE_CONVERSION_CACHE: bool = True
+    CONVERSION_CACHE_DIR: str = "/chatbot/files/conversion_cache"
+    CONVERSION_CACHE_MAX_SIZE_MB: int = 2048
+    # Stage checkpoints of ingestion jobs, a retried job resumes after its last stage
+    ENABLE_INGESTION_CHECKPOINTS: bool = True
+    INGESTION_CHECKPOINT_DIR: str = "/chatbot/files/ingestion_checkpoints"
+    INGESTION_CHECKPOINT_MAX_AGE_HOURS: int = 72
+    INGESTION_CHECKPOINT_KG_BATCH_SIZE: int = 32
+
+    # Shared HTTP client pool settings
+    HTTP_MAX_CONNECTIONS_PER_HOST: int = 100
+    HTTP_MAX_KEEPALIVE_CONNECTIONS_PER_HOST: int = 20
+    HTTP_KEEPALIVE_EXPIRY: float = 60.0
+    HTTP_ENABLE_HTTP2: bool = True
+    HTTP_DNS_CACHE_TTL: float = 300.0
+    # Pooled S3/OSS clients and parallel ranged downloads of large objects
+    OBJECT_STORAGE_MAX_POOL_CONNECTIONS: int = 32
+    OBJECT_STORAGE_MULTIPART_THRESHOLD_MB: int = 16
+    OBJECT_STORAGE_MULTIPART_CHUNK_SIZE_MB: int = 8
+    OBJECT_STORAGE_MAX_CONCURRENCY: int = 8
+    # Downloaded files kept for reuse while their ETag is unchanged
+    CLOUD_DOWNLOAD_CACHE_MAX_SIZE_MB: int = 10240
+
+    # Load balancing over comma separated *_BASE_URL endpoint lists
+    LOAD_BALANCER_EJECTION_FAILURES: int = 3
+    LOAD_BALANCER_EJECTION_SECONDS: float = 30.0
+    EMBEDDING_HEDGE_DELAY_SECONDS: Optional[float] = None
+    LLM_HEDGE_DELAY_SECONDS: Optional[float] = None
+    RERANKER_HEDGE_DELAY_SECONDS: Optional[float] = None
 
     @model_validator(mode="after")
     def validate_config_based_on_service_type(self) -> "Envs":
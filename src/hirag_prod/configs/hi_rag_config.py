@@ -21,11 +21,25 @@ class HiRAGConfig(BaseSettings):
     # whether to construct graph
     construct_graph: bool = False
 
+    # Return from ingestion once chunks are searchable and run tokenization,
+    # translation, Items and KG construction in the background
+    tiered_ingestion: bool = True
+
     # Batch processing configuration
     embedding_batch_size: int = 1000
     entity_upsert_concurrency: int = 32
     relation_upsert_concurrency: int = 32
 
+    # Per-tenant (workspace, knowledge base) fair scheduling of ingestion
+    ingestion_max_concurrent_jobs: int = 16
+    ingestion_max_concurrent_subtasks: int = 64
+    tenant_max_concurrent_jobs: int = 4
+    tenant_max_concurrent_subtasks: int = 16
+
+    # Processes for CPU-bound ingestion steps (conversion, chunking, OpenCC, hanlp),
+    # 0 runs them on threads of the main process
+    ingestion_worker_processes: int = 0
+
     # Retry configuration
     max_retries: int = 3
     retry_delay: float = 1.0
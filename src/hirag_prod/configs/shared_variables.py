@@ -2,6 +2,11 @@ import multiprocessing.synchronize
 from multiprocessing.sharedctypes import Synchronized
 from typing import Dict
 
+# Start method of the worker processes, the shared objects are created for it.
+# Forking a process that runs threads (event loop executors, HTTP pools, tokenizer
+# threads) can deadlock the child, so workers start from a clean fork server.
+MULTIPROCESSING_CONTEXT = multiprocessing.get_context("forkserver")
+
 
 class SharedVariables:
     def __init__(self, is_main_process: bool = True, **kwargs) -> None:
@@ -43,30 +48,34 @@ class SharedVariables:
             )
 
             if "internvl" not in self.input_token_count_dict:
-                self.input_token_count_dict["internvl"] = multiprocessing.Value("i", 0)
+                self.input_token_count_dict["internvl"] = MULTIPROCESSING_CONTEXT.Value(
+                    "i", 0
+                )
             if "internvl" not in self.output_token_count_dict:
-                self.output_token_count_dict["internvl"] = multiprocessing.Value("i", 0)
+                self.output_token_count_dict["internvl"] = (
+                    MULTIPROCESSING_CONTEXT.Value("i", 0)
+                )
 
             for rate_limiter_name in RATE_LIMITER_NAME_SET:
                 if rate_limiter_name not in self.rate_limiter_last_call_time_dict:
                     self.rate_limiter_last_call_time_dict[rate_limiter_name] = (
-                        multiprocessing.Value("d", 0.0)
+                        MULTIPROCESSING_CONTEXT.Value("d", 0.0)
                     )
                 if rate_limiter_name not in self.rate_limiter_call_time_queue_dict:
                     self.rate_limiter_call_time_queue_dict[rate_limiter_name] = (
-                        multiprocessing.Queue()
+                        MULTIPROCESSING_CONTEXT.Queue()
                     )
                 if rate_limiter_name not in self.rate_limiter_wait_lock_dict:
                     self.rate_limiter_wait_lock_dict[rate_limiter_name] = (
-                        multiprocessing.Lock()
+                        MULTIPROCESSING_CONTEXT.Lock()
                     )
                 if rate_limiter_name not in self.input_token_count_dict:
                     self.input_token_count_dict[rate_limiter_name] = (
-                        multiprocessing.Value("i", 0)
+                        MULTIPROCESSING_CONTEXT.Value("i", 0)
                     )
                 if rate_limiter_name not in self.output_token_count_dict:
                     self.output_token_count_dict[rate_limiter_name] = (
-                        multiprocessing.Value("i", 0)
+                        MULTIPROCESSING_CONTEXT.Value("i", 0)
                     )
 
     def to_dict(self):
@@ -10,6 +10,8 @@ from hirag_prod.resources.functions import (
     get_chat_service,
     get_chinese_convertor,
     get_embedding_service,
+    get_tokenizer_service,
+    get_worker_pool,
     tokenize_sentence,
 )
 
@@ -18,13 +20,91 @@ def has_traditional_chinese(text: str) -> bool:
     return get_chinese_convertor("hk2s").convert(text) != text
 
 
+def has_traditional_chinese_list(text_list: List[str]) -> List[bool]:
+    return [has_traditional_chinese(text) for text in text_list]
+
+
+ENGLISH_STOPWORD_SET: Set[str] = set(
+    "a an and are as at be by for from has have in is it its of on or that the this "
+    "to was were will with".split()
+)
+CODE_PATTERN = re.compile(
+    r"(==|!=|<=|>=|=>|->|::|&&|\|\||[{};]|\b(def|return|import|function|const|var|let|class|SELECT|FROM|WHERE)\b|\w+\(|\w+_\w+|\w+\.\w+\()"
+)
+WORD_PATTERN = re.compile(r"[A-Za-z\u00C0-\u024F]+")
+SKIP_TRANSLATION_LANGUAGE_SET: Set[str] = {"numeric", "code"}
+# Share of Latin words below which Latin-script text is mixed with another script
+MIN_LATIN_SCRIPT_SHARE: float = 0.9
+
+
+def detect_language(text: str) -> str:
+    """Classify text by script and a few cheap heuristics.
+
+    Returns a translator language code ("en", "zh", "ja", "ko") when the script is
+    conclusive, "numeric" for text without letters, "code" for code-like text,
+    "mixed" for Latin-script text with a notable share of another script, "latin"
+    for Latin-script text that is not recognised as English and "unknown"
+    otherwise. Text is only "en" when it contains English stopwords.
+    """
+    han = kana = hangul = latin = letters = 0
+    for char in text:
+        code = ord(char)
+        if 0x4E00 <= code <= 0x9FFF or 0x3400 <= code <= 0x4DBF:
+            han += 1
+        elif 0x3040 <= code <= 0x30FF:
+            kana += 1
+        elif 0xAC00 <= code <= 0xD7AF or 0x1100 <= code <= 0x11FF:
+            hangul += 1
+        elif char.isalpha():
+            if char.isascii() or 0x00C0 <= code <= 0x024F:
+                latin += 1
+            letters += 1
+
+    letters += han + kana + hangul
+    if letters == 0:
+        return "numeric"
+    if kana and kana + han >= letters / 2:
+        return "ja"
+    if hangul >= letters / 2:
+        return "ko"
+    if han >= letters / 2:
+        return "zh"
+    if latin < letters / 2:
+        return "unknown"
+
+    words = WORD_PATTERN.findall(text)
+    code_hits = len(CODE_PATTERN.findall(text))
+    if code_hits >= max(2, len(words) / 4):
+        return "code"
+    # A CJK character or a letter of another alphabet weighs as much as a Latin word
+    non_latin = letters - latin
+    if len(words) < (len(words) + non_latin) * MIN_LATIN_SCRIPT_SHARE:
+        return "mixed"
+    stopword_hits = sum(word.lower() in ENGLISH_STOPWORD_SET for word in words)
+    if stopword_hits and stopword_hits >= len(words) * 0.15:
+        return "en"
+    # Short labels such as headers and table cells are sent to the translator too
+    return "latin"
+
+
+def needs_translation(language: str, dest: str) -> bool:
+    """Whether text of the detected ``language`` has to be sent to the translator."""
+    if language in SKIP_TRANSLATION_LANGUAGE_SET:
+        return False
+    return language != dest.split("-")[0]
+
+
 def normalize_text(text: str) -> str:
     return get_chinese_convertor("hk2s").convert(
         re.sub(f"[{re.escape(string.punctuation)}]", "", text).strip().lower()
     )
 
 
-def normalize_tokenize_text(text: str) -> Tuple[str, List[str], List[int], List[int]]:
+def normalize_text_list(text_list: List[str]) -> List[str]:
+    return [normalize_text(text) for text in text_list]
+
+
+def normalize_tokenize_text(text: str) -> Tuple[str, List[str], np.ndarray, np.ndarray]:
     normalized_text: str = normalize_text(text)
     token_list, token_start_index_list, token_end_index_list = tokenize_sentence(
         normalized_text
@@ -32,6 +112,20 @@ def normalize_tokenize_text(text: str) -> Tuple[str, List[str], List[int], List[
     return normalized_text, token_list, token_start_index_list, token_end_index_list
 
 
+async def normalize_tokenize_texts(
+    text_list: List[str],
+) -> List[Tuple[str, List[str], np.ndarray, np.ndarray]]:
+    """Batched normalize_tokenize_text, OpenCC and tokenization run off the event loop."""
+    normalized_text_list: List[str] = await get_worker_pool().run(
+        normalize_text_list, text_list
+    )
+    tokenized_list = await get_tokenizer_service().tokenize_many(normalized_text_list)
+    return [
+        (normalized_text, *tokenized)
+        for normalized_text, tokenized in zip(normalized_text_list, tokenized_list)
+    ]
+
+
 async def get_synonyms_and_validate_and_translate(
     search: str,
 ) -> Tuple[List[str], np.ndarray, bool, List[str], np.ndarray]:
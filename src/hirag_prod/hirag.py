@@ -1,9 +1,20 @@
 import asyncio
 import logging
 import time
+from contextlib import nullcontext
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional, Tuple
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Set,
+    Tuple,
+)
 
 import numpy as np
 from docling_core.types.doc import DoclingDocument
@@ -16,6 +27,7 @@ from hirag_prod.chunk import BaseChunk, FixTokenChunk
 from hirag_prod.configs.cli_options import CliOptions
 from hirag_prod.configs.functions import (
     get_config_manager,
+    get_envs,
     get_hi_rag_config,
     get_llm_config,
     initialize_config_manager,
@@ -26,8 +38,18 @@ from hirag_prod.exceptions import (
     HiRAGException,
     KGConstructionError,
 )
-from hirag_prod.job_status_tracker import JobStatus, JobStatusTracker
-from hirag_prod.loader import load_document
+from hirag_prod.ingestion_checkpoint import (
+    IngestionCheckpoint,
+    get_ingestion_fingerprint,
+)
+from hirag_prod.job_status_tracker import (
+    ENRICHMENT_STAGES,
+    IngestionStage,
+    JobStatus,
+    JobStatusTracker,
+    StageProgress,
+)
+from hirag_prod.loader import load_document, load_document_in_workers
 from hirag_prod.loader.chunk_split import (
     build_rich_toc,
     chunk_docling_document,
@@ -45,16 +67,29 @@ from hirag_prod.resources.functions import (
     get_chat_service,
     get_chinese_convertor,
     get_embedding_service,
+    get_ingestion_checkpoint_store,
+    get_table_summarizer,
+    get_token_counter,
+    get_tokenizer_service,
+    get_translation_cache,
     get_translator,
+    get_worker_pool,
     initialize_resource_manager,
 )
-from hirag_prod.schema import Chunk, File, Item, LoaderType, item_to_chunk
+from hirag_prod.schema import (
+    ChunkRecord,
+    File,
+    ItemRecord,
+    LoaderType,
+    item_to_chunk,
+)
 from hirag_prod.storage import (
     BaseVDB,
 )
 from hirag_prod.storage.pgvector import PGVector
 from hirag_prod.storage.query_service import QueryService
 from hirag_prod.storage.storage_manager import StorageManager
+from hirag_prod.tenant_scheduler import HeldSlot, TenantFairScheduler, current_tenant
 
 # Configure Logging
 logging.basicConfig(
@@ -80,19 +115,30 @@ class DocumentProcessor:
         kg_constructor: BaseKG,
         job_status_tracker: Optional[JobStatusTracker] = None,
         metrics: Optional[MetricsCollector] = None,
+        scheduler: Optional[TenantFairScheduler] = None,
     ):
         self.storage = storage
         self.chunker = chunker
         self.kg_constructor = kg_constructor
         self.job_status_tracker = job_status_tracker
         self.metrics = metrics or MetricsCollector()
+        self.scheduler = scheduler
+        self._enrichment_tasks: Set[asyncio.Task] = set()
+
+    def _subtask_slot(self):
+        """Fair-share slot for an LLM/embedding heavy sub-task of the current tenant"""
+        if self.scheduler is None:
+            return nullcontext()
+        return self.scheduler.slot()
 
     async def clear_document(
         self,
         document_id: str,
         workspace_id: str,
         knowledge_base_id: str,
+        file_id: Optional[str] = None,
     ) -> ProcessingMetrics:
+        """With ``file_id``, only a document last written by that job is cleared"""
 
         async with self.metrics.track_operation("clear_document"):
             where_dict = {
@@ -100,6 +146,8 @@ class DocumentProcessor:
                 "workspaceId": workspace_id,
                 "knowledgeBaseId": knowledge_base_id,
             }
+            if file_id:
+                where_dict["id"] = file_id
             is_exist = await self.storage.clean_vdb_file(where=where_dict)
             if is_exist:
                 where_dict = {
@@ -122,19 +170,85 @@ class DocumentProcessor:
         loader_configs: Optional[Dict] = None,
         file_id: Optional[str] = None,
         loader_type: Optional[LoaderType] = None,
+        job_slot: Optional[HeldSlot] = None,
+        on_enrichment_failure: Optional[Callable[[], Awaitable[None]]] = None,
     ) -> ProcessingMetrics:
-        """Process a single document"""
+        """
+        Process a single document. With tiered ingestion, the returned metrics get
+        their ``time_to_complete`` once the background enrichment ends. The job slot
+        is then released by the enrichment, and ``on_enrichment_failure`` is awaited
+        when it fails.
+        """
         if construct_graph is None:
             construct_graph = get_hi_rag_config().construct_graph
+        tenant_token = current_tenant.set((workspace_id, knowledge_base_id))
+        try:
+            return await self._process_document(
+                document_path=document_path,
+                content_type=content_type,
+                workspace_id=workspace_id,
+                knowledge_base_id=knowledge_base_id,
+                construct_graph=construct_graph,
+                document_meta=document_meta,
+                loader_configs=loader_configs,
+                file_id=file_id,
+                loader_type=loader_type,
+                job_slot=job_slot,
+                on_enrichment_failure=on_enrichment_failure,
+            )
+        finally:
+            current_tenant.reset(tenant_token)
+
+    async def _process_document(
+        self,
+        document_path: str,
+        content_type: str,
+        workspace_id: str,
+        knowledge_base_id: str,
+        construct_graph: bool,
+        document_meta: Optional[Dict],
+        loader_configs: Optional[Dict],
+        file_id: Optional[str],
+        loader_type: Optional[LoaderType],
+        job_slot: Optional[HeldSlot],
+        on_enrichment_failure: Optional[Callable[[], Awaitable[None]]],
+    ) -> ProcessingMetrics:
+        start_time = time.perf_counter()
+        # Timings of this job, the shared collector is updated by concurrent jobs
+        job_metrics = ProcessingMetrics(file_id=file_id or "")
         async with self.metrics.track_operation(f"process_document"):
-            # Load and chunk document
-            chunks, file, items = await self._load_and_chunk_document(
-                document_path,
-                content_type,
-                document_meta,
-                loader_configs,
-                loader_type,
+            checkpoint = await self._load_checkpoint(
+                file_id, document_path, content_type, document_meta
             )
+            if checkpoint is not None and checkpoint.chunked:
+                chunks, file, items = (
+                    checkpoint.chunks,
+                    checkpoint.file,
+                    checkpoint.items,
+                )
+                logger.info(
+                    f"♻️ Resuming job {file_id} from its checkpoint: "
+                    f"{len(checkpoint.embedded_chunk_keys)}/{len(chunks)} chunks stored, "
+                    f"items stored: {checkpoint.items_stored}, "
+                    f"{len(checkpoint.kg_chunk_keys)} chunks in the knowledge graph"
+                )
+            else:
+                # Load and chunk document
+                chunks, file, items = await self._load_and_chunk_document(
+                    document_path,
+                    content_type,
+                    document_meta,
+                    loader_configs,
+                    loader_type,
+                )
+                if checkpoint is not None and chunks:
+                    await asyncio.to_thread(
+                        get_ingestion_checkpoint_store().save_documents,
+                        checkpoint,
+                        file,
+                        chunks,
+                        items,
+                    )
 
             if not chunks:
                 logger.warning("⚠️ No chunks created from document")
@@ -155,10 +269,11 @@ class DocumentProcessor:
                             "Failed to saving job status (failed) to Postgres",
                             e,
                         )
-                return self.metrics.metrics
+                return job_metrics
 
             self.metrics.metrics.total_chunks = len(chunks)
             self.metrics.metrics.file_id = file_id or ""
+            job_metrics.total_chunks = len(chunks)
 
             # Update job -> processing as soon as we know
             if self.job_status_tracker and file_id:
@@ -174,15 +289,113 @@ class DocumentProcessor:
                         e,
                     )
 
-            # Store file information after chunking but before processing chunks
-            await self.storage.upsert_file_to_vdb(file)
+            stages = [IngestionStage.SEARCHABLE] + [
+                stage
+                for stage in ENRICHMENT_STAGES
+                if (items or stage == IngestionStage.KG)
+                and (construct_graph or stage != IngestionStage.KG)
+            ]
+            progress = StageProgress(
+                stages=stages,
+                job_status_tracker=self.job_status_tracker,
+                file_id=file_id,
+                document_key=(document_meta or {}).get("documentKey", ""),
+                workspace_id=workspace_id,
+                knowledge_base_id=knowledge_base_id,
+            )
+            await progress.mark_pending()
 
-            # Process chunks
-            await self._process_chunks(chunks, items, workspace_id, knowledge_base_id)
+            # Fast phase: the document is searchable once its file and chunks are stored
+            await progress.begin(IngestionStage.SEARCHABLE)
+            try:
+                await self.storage.upsert_file_to_vdb(file)
+                await self._process_chunks(
+                    chunks, workspace_id, knowledge_base_id, checkpoint
+                )
+            except Exception:
+                await progress.fail()
+                raise
+            await progress.advance(IngestionStage.SEARCHABLE)
+            job_metrics.time_to_searchable = time.perf_counter() - start_time
+            logger.info(
+                f"🔎 Document searchable after {job_metrics.time_to_searchable:.3f}s"
+            )
 
-            # Process graph data
-            if construct_graph:
-                await self._construct_kg(chunks)
+        enrichment = self._enrich_document(
+            chunks,
+            items,
+            construct_graph,
+            progress,
+            file_id,
+            start_time,
+            job_metrics,
+            checkpoint,
+        )
+        if get_hi_rag_config().tiered_ingestion:
+            self._run_in_background(
+                enrichment, job_metrics, job_slot, on_enrichment_failure
+            )
+        else:
+            await enrichment
+
+        return job_metrics
+
+    async def _enrich_document(
+        self,
+        chunks: List[ChunkRecord],
+        items: List[ItemRecord],
+        construct_graph: bool,
+        progress: StageProgress,
+        file_id: Optional[str],
+        start_time: float,
+        job_metrics: ProcessingMetrics,
+        checkpoint: Optional[IngestionCheckpoint] = None,
+    ) -> None:
+        """Tokenize and translate items, store them and construct the KG"""
+        async with self.metrics.track_operation("enrich_document"):
+            try:
+                if items and checkpoint is not None and checkpoint.items_stored:
+                    for stage in (
+                        IngestionStage.TRANSLATION,
+                        IngestionStage.TOKENIZATION,
+                        IngestionStage.ITEMS,
+                    ):
+                        await progress.advance(stage)
+                    logger.info(f"⏭️ {len(items)} items already stored")
+                elif items:
+                    async with self._subtask_slot():
+                        await self.storage.upsert_items_to_vdb(
+                            items,
+                            on_stage_done=lambda step: progress.advance(
+                                IngestionStage(step)
+                            ),
+                        )
+                    if checkpoint is not None:
+                        await asyncio.to_thread(
+                            get_ingestion_checkpoint_store().mark_items_stored,
+                            checkpoint,
+                        )
+                    await progress.advance(IngestionStage.ITEMS)
+                    logger.info(f"✅ Processed {len(items)} items")
+                else:
+                    logger.info("⚠️ No items to process")
+
+                # Process graph data
+                if construct_graph:
+                    await self._construct_kg(chunks, checkpoint)
+                    await progress.advance(IngestionStage.KG)
+            except Exception:
+                await progress.fail()
+                if self.job_status_tracker and file_id:
+                    await self.job_status_tracker.set_job_status(
+                        file_id=file_id, status=JobStatus.FAILED
+                    )
+                raise
+
+            if checkpoint is not None:
+                await asyncio.to_thread(
+                    get_ingestion_checkpoint_store().delete, checkpoint.job_id
+                )
 
             # Mark as complete
             if self.job_status_tracker and file_id:
@@ -197,7 +410,76 @@ class DocumentProcessor:
                         e,
                     )
 
-            return self.metrics.metrics
+            job_metrics.time_to_complete = time.perf_counter() - start_time
+            logger.info(
+                f"🏁 Document searchable after {job_metrics.time_to_searchable:.3f}s, "
+                f"complete after {job_metrics.time_to_complete:.3f}s "
+                f"(stages: {progress.durations})"
+            )
+
+    def _run_in_background(
+        self,
+        enrichment: Awaitable[None],
+        job_metrics: ProcessingMetrics,
+        job_slot: Optional[HeldSlot] = None,
+        on_failure: Optional[Callable[[], Awaitable[None]]] = None,
+    ) -> None:
+        """
+        Run enrichment of a searchable document without blocking its ingestion. The
+        enrichment keeps the job slot, so the tenant job limit still bounds it.
+        """
+        if job_slot is not None:
+            job_slot.hand_over()
+
+        async def _run() -> None:
+            try:
+                await enrichment
+            except Exception as e:
+                job_metrics.error_count += 1
+                log_error_info(logging.ERROR, "❌ Background enrichment failed", e)
+                if on_failure is not None:
+                    try:
+                        await on_failure()
+                    except Exception as e:
+                        log_error_info(
+                            logging.ERROR, "Failed to handle the failed enrichment", e
+                        )
+            finally:
+                if job_slot is not None:
+                    job_slot.release()
+
+        # The task inherits the current tenant, so its sub-tasks stay fairly scheduled
+        task = asyncio.create_task(_run())
+        self._enrichment_tasks.add(task)
+        task.add_done_callback(self._enrichment_tasks.discard)
+
+    async def wait_for_enrichment(self) -> None:
+        """Wait until the background enrichment of every ingested document ends"""
+        while self._enrichment_tasks:
+            await asyncio.gather(*list(self._enrichment_tasks))
+
+    async def _load_checkpoint(
+        self,
+        file_id: Optional[str],
+        document_path: str,
+        content_type: str,
+        document_meta: Optional[Dict],
+    ) -> Optional[IngestionCheckpoint]:
+        """Checkpoint of the job, None without a job id or with checkpoints disabled"""
+        if not file_id:
+            return None
+        document_meta = document_meta or {}
+        fingerprint = get_ingestion_fingerprint(
+            document_meta.get("documentKey", ""), document_path, content_type
+        )
+        checkpoint = await asyncio.to_thread(
+            get_ingestion_checkpoint_store().load, file_id, fingerprint
+        )
+        if checkpoint is not None:
+            checkpoint.document_key = document_meta.get("documentKey", "")
+            checkpoint.workspace_id = document_meta.get("workspaceId", "")
+            checkpoint.knowledge_base_id = document_meta.get("knowledgeBaseId", "")
+        return checkpoint
 
     async def _load_and_chunk_document(
         self,
@@ -206,14 +488,14 @@ class DocumentProcessor:
         document_meta: Optional[Dict],
         loader_configs: Optional[Dict],
         loader_type: Optional[LoaderType],
-    ) -> Tuple[List[Chunk], File, List[Item]]:
+    ) -> Tuple[List[ChunkRecord], File, List[ItemRecord]]:
         """Load and chunk document"""
         async with self.metrics.track_operation("load_and_chunk"):
             generated_md = None
             items = None
             try:
                 if content_type == "text/plain":
-                    _, generated_md = await asyncio.to_thread(
+                    _, generated_md = await get_worker_pool().run(
                         load_document,
                         document_path=document_path,
                         content_type=content_type,
@@ -221,7 +503,9 @@ class DocumentProcessor:
                         loader_configs=loader_configs,
                         loader_type="langchain",
                     )
-                    items = chunk_langchain_document(generated_md)
+                    items = await get_worker_pool().run(
+                        chunk_langchain_document, generated_md
+                    )
                     extracted_timestamp = await extract_and_apply_timestamp_to_items(
                         items
                     )
@@ -249,8 +533,7 @@ class DocumentProcessor:
                         content_type in ["application/pdf", "multimodal/image"]
                         or loader_type == "dots_ocr"
                     ):
-                        json_doc, generated_md = await asyncio.to_thread(
-                            load_document,
+                        json_doc, generated_md = await load_document_in_workers(
                             document_path=document_path,
                             content_type=content_type,
                             document_meta=document_meta,
@@ -259,8 +542,7 @@ class DocumentProcessor:
                         )
 
                     else:
-                        json_doc, generated_md = await asyncio.to_thread(
-                            load_document,
+                        json_doc, generated_md = await load_document_in_workers(
                             document_path=document_path,
                             content_type=content_type,
                             document_meta=document_meta,
@@ -268,47 +550,52 @@ class DocumentProcessor:
                             loader_type="docling",
                         )
 
-                    # summarize each table into a concise caption using LLM
-                    async def summarize_table(idx: int):
-                        table_item = items[idx]
-                        system_prompt = PROMPTS["summary_table_en"].format(
-                            table_content=table_item.text
+                    # summarize the tables into concise captions using LLM
+                    async def summarize_tables(
+                        items: List[ItemRecord], table_items_idx: List[int]
+                    ) -> None:
+                        captions = await get_table_summarizer().summarize(
+                            [items[idx].text for idx in table_items_idx],
+                            slot=self._subtask_slot,
                         )
-                        try:
-                            caption = await get_chat_service().complete(
-                                prompt=system_prompt,
-                                model=get_llm_config().model_name,
-                            )
+                        for idx, caption in zip(table_items_idx, captions):
                             items[idx].caption = caption
-                        except Exception:
-                            items[idx].caption = None
-                            logger.warning(
-                                f"Failed to summarize table {table_item.documentKey}"
-                            )
+                            if caption is None:
+                                logger.warning(
+                                    f"Failed to summarize table {items[idx].documentKey}"
+                                )
 
                     # Validate instance, as it may fall back to docling if cloud service unavailable
                     if isinstance(json_doc, list):
                         # Chunk the Dots OCR document
-                        items, header_set, table_items_idx = chunk_dots_document(
-                            json_doc=json_doc, md_doc=generated_md
+                        (
+                            items,
+                            header_set,
+                            table_items_idx,
+                        ) = await get_worker_pool().run(
+                            chunk_dots_document,
+                            json_doc=json_doc,
+                            md_doc=generated_md,
                         )
 
-                        await asyncio.gather(
-                            *[summarize_table(i) for i in table_items_idx]
-                        )
+                        await summarize_tables(items, table_items_idx)
 
                     elif isinstance(json_doc, DoclingDocument):
                         # Chunk the Docling document
-                        items, header_set, table_items_idx = chunk_docling_document(
-                            json_doc, generated_md
+                        (
+                            items,
+                            header_set,
+                            table_items_idx,
+                        ) = await get_worker_pool().run(
+                            chunk_docling_document, json_doc, generated_md
                         )
 
-                        await asyncio.gather(
-                            *[summarize_table(i) for i in table_items_idx]
-                        )
+                        await summarize_tables(items, table_items_idx)
 
                         if content_type == "text/markdown":
-                            items = obtain_docling_md_bbox(json_doc, items)
+                            items = await get_worker_pool().run(
+                                obtain_docling_md_bbox, json_doc, items
+                            )
 
                     else:
                         raise DocumentProcessingError(
@@ -321,7 +608,8 @@ class DocumentProcessor:
                     )
 
                     # Unified chunking method :)
-                    chunks = items_to_chunks_recursive(
+                    chunks = await get_worker_pool().run(
+                        items_to_chunks_recursive,
                         items=items,
                         header_set=header_set,
                     )
@@ -348,10 +636,10 @@ class DocumentProcessor:
 
     async def _process_chunks(
         self,
-        chunks: List[Chunk],
-        items: List[Item],
+        chunks: List[ChunkRecord],
         workspace_id: str,
         knowledge_base_id: str,
+        checkpoint: Optional[IngestionCheckpoint] = None,
     ) -> None:
         """Process chunks for vector storage"""
         async with self.metrics.track_operation("process_chunks"):
@@ -359,6 +647,12 @@ class DocumentProcessor:
             pending_chunks = await self._get_pending_chunks(
                 chunks, workspace_id, knowledge_base_id
             )
+            if checkpoint is not None:
+                pending_chunks = [
+                    chunk
+                    for chunk in pending_chunks
+                    if chunk.documentKey not in checkpoint.embedded_chunk_keys
+                ]
 
             if not pending_chunks:
                 logger.info("⏭️ All chunks already processed")
@@ -367,22 +661,24 @@ class DocumentProcessor:
             logger.info(f"📤 Processing {len(pending_chunks)} pending chunks...")
 
             # Batch storage
-            await self.storage.upsert_chunks_to_vdb(pending_chunks)
+            async with self._subtask_slot():
+                await self.storage.upsert_chunks_to_vdb(pending_chunks)
+            if checkpoint is not None:
+                await asyncio.to_thread(
+                    get_ingestion_checkpoint_store().add_embedded_chunks,
+                    checkpoint,
+                    [chunk.documentKey for chunk in pending_chunks],
+                )
             self.metrics.metrics.processed_chunks += len(pending_chunks)
-            await self.storage.upsert_items_to_vdb(items)
 
             logger.info(f"✅ Processed {len(pending_chunks)} chunks")
-            if items:
-                logger.info(f"✅ Processed {len(items)} items")
-            else:
-                logger.info("⚠️ No items to process")
 
     async def _get_pending_chunks(
         self,
-        chunks: List[Chunk],
+        chunks: List[ChunkRecord],
         workspace_id: str,
         knowledge_base_id: str,
-    ) -> List[Chunk]:
+    ) -> List[ChunkRecord]:
         """Get chunks that need processing"""
         if not chunks:
             return []
@@ -399,29 +695,33 @@ class DocumentProcessor:
 
         return chunks
 
-    async def _construct_kg(self, chunks: List[Chunk]) -> None:
+    async def _construct_kg(
+        self,
+        chunks: List[ChunkRecord],
+        checkpoint: Optional[IngestionCheckpoint] = None,
+    ) -> None:
         """Construct knowledge graph from chunks"""
+        # With a checkpoint, the graph is stored and checkpointed batch by batch
+        batch_size = len(chunks) or 1
+        if checkpoint is not None:
+            chunks = [
+                chunk
+                for chunk in chunks
+                if chunk.documentKey not in checkpoint.kg_chunk_keys
+            ]
+            batch_size = get_envs().INGESTION_CHECKPOINT_KG_BATCH_SIZE
         logger.info(f"🔍 Constructing knowledge graph from {len(chunks)} chunks...")
 
         try:
-            entities, relations = await self.kg_constructor.construct_kg(chunks)
-
-            if entities:
-                self.metrics.metrics.total_entities += len(entities)
-
-            # Store relations to both graph database and vector database
-            if relations:
-                # use pgvector to mimic graphdb
-                await self.storage.vdb.upsert_graph(relations)
-
-                # Store to vector database for semantic search
-                await self.storage.upsert_relations_to_vdb(relations)
-
-                self.metrics.metrics.total_relations += len(relations)
-
-            logger.info(
-                f"✅ Extracted and stored {len(entities)} entities and {len(relations)} relations"
-            )
+            for start in range(0, len(chunks), batch_size):
+                batch = chunks[start : start + batch_size]
+                await self._construct_kg_batch(batch)
+                if checkpoint is not None:
+                    await asyncio.to_thread(
+                        get_ingestion_checkpoint_store().add_kg_chunks,
+                        checkpoint,
+                        [chunk.documentKey for chunk in batch],
+                    )
 
         except Exception as e:
             log_error_info(
@@ -432,6 +732,27 @@ class DocumentProcessor:
                 new_error_class=KGConstructionError,
             )
 
+    async def _construct_kg_batch(self, chunks: List[ChunkRecord]) -> None:
+        async with self._subtask_slot():
+            entities, relations = await self.kg_constructor.construct_kg(chunks)
+
+        if entities:
+            self.metrics.metrics.total_entities += len(entities)
+
+        # Store relations to both graph database and vector database
+        if relations:
+            # use pgvector to mimic graphdb
+            await self.storage.vdb.upsert_graph(relations)
+
+            # Store to vector database for semantic search
+            await self.storage.upsert_relations_to_vdb(relations)
+
+            self.metrics.metrics.total_relations += len(relations)
+
+        logger.info(
+            f"✅ Extracted and stored {len(entities)} entities and {len(relations)} relations"
+        )
+
 
 # ============================================================================
 # Main HiRAG class
@@ -452,6 +773,8 @@ class HiRAG:
     _query_service: Optional[QueryService] = field(default=None, init=False)
     _metrics: Optional[MetricsCollector] = field(default=None, init=False)
     _kg_constructor: Optional[VanillaKG] = field(default=None, init=False)
+    _job_scheduler: Optional[TenantFairScheduler] = field(default=None, init=False)
+    _subtask_scheduler: Optional[TenantFairScheduler] = field(default=None, init=False)
 
     @classmethod
     async def create(
@@ -528,6 +851,18 @@ class HiRAG:
             job_status_tracker = JobStatusTracker()
             logger.info("Using job status tracker (no cache)")
 
+        # Fair scheduling of ingestion jobs and their sub-tasks across tenants
+        self._job_scheduler = TenantFairScheduler(
+            name="ingestion_jobs",
+            max_concurrency=get_hi_rag_config().ingestion_max_concurrent_jobs,
+            default_tenant_concurrency=get_hi_rag_config().tenant_max_concurrent_jobs,
+        )
+        self._subtask_scheduler = TenantFairScheduler(
+            name="ingestion_subtasks",
+            max_concurrency=get_hi_rag_config().ingestion_max_concurrent_subtasks,
+            default_tenant_concurrency=get_hi_rag_config().tenant_max_concurrent_subtasks,
+        )
+
         # Initialize components
         self._metrics = MetricsCollector()
         self._processor = DocumentProcessor(
@@ -536,8 +871,11 @@ class HiRAG:
             kg_constructor=self._kg_constructor,
             job_status_tracker=job_status_tracker,
             metrics=self._metrics,
+            scheduler=self._subtask_scheduler,
+        )
+        self._query_service = QueryService(
+            self._storage, job_status_tracker=job_status_tracker
         )
-        self._query_service = QueryService(self._storage)
 
     # ========================================================================
     # Chat service methods
@@ -938,6 +1276,38 @@ class HiRAG:
         if construct_graph is None:
             construct_graph = get_hi_rag_config().construct_graph
 
+        # Held until the job ends, including its background enrichment
+        job_slot = await self._job_scheduler.hold((workspace_id, knowledge_base_id))
+        try:
+            return await self._insert_to_kb(
+                document_path=document_path,
+                workspace_id=workspace_id,
+                knowledge_base_id=knowledge_base_id,
+                content_type=content_type,
+                construct_graph=construct_graph,
+                file_id=file_id,
+                document_meta=document_meta,
+                loader_configs=loader_configs,
+                loader_type=loader_type,
+                job_slot=job_slot,
+            )
+        finally:
+            if not job_slot.handed_over:
+                job_slot.release()
+
+    async def _insert_to_kb(
+        self,
+        document_path: str,
+        workspace_id: str,
+        knowledge_base_id: str,
+        content_type: str,
+        construct_graph: bool,
+        file_id: Optional[str],
+        document_meta: Optional[Dict],
+        loader_configs: Optional[Dict],
+        loader_type: Optional[LoaderType],
+        job_slot: Optional[HeldSlot] = None,
+    ) -> ProcessingMetrics:
         logger.info(f"🚀 Starting document processing: {document_path}")
         start_time = time.perf_counter()
         document_uri = (
@@ -969,14 +1339,25 @@ class HiRAG:
                     logging.WARNING, f"Failed to initialize external job {file_id}", e
                 )
 
-        try:
-            await self._processor.clear_document(
-                document_id, workspace_id, knowledge_base_id
-            )
-        except Exception as e:
-            log_error_info(
-                logging.WARNING, f"Failed to clear document {document_id}", e
-            )
+        await self._clear_expired_jobs()
+
+        # A retried job keeps what its checkpoint says is already stored
+        fingerprint = get_ingestion_fingerprint(
+            document_id, document_path, content_type
+        )
+        if file_id and await asyncio.to_thread(
+            get_ingestion_checkpoint_store().has_progress, file_id, fingerprint
+        ):
+            logger.info(f"♻️ Job {file_id} resumes from its checkpoint")
+        else:
+            try:
+                await self._processor.clear_document(
+                    document_id, workspace_id, knowledge_base_id
+                )
+            except Exception as e:
+                log_error_info(
+                    logging.WARNING, f"Failed to clear document {document_id}", e
+                )
 
         try:
             metrics = await self._processor.process_document(
@@ -989,6 +1370,10 @@ class HiRAG:
                 workspace_id=workspace_id,
                 knowledge_base_id=knowledge_base_id,
                 loader_type=loader_type,
+                job_slot=job_slot,
+                on_enrichment_failure=lambda: self._fail_job(
+                    file_id, fingerprint, document_id, workspace_id, knowledge_base_id
+                ),
             )
 
             total_time = time.perf_counter() - start_time
@@ -1006,27 +1391,75 @@ class HiRAG:
                 f"❌ Document processing failed after {total_time:.3f}s",
                 e,
             )
-            if (
-                self._processor
-                and self._processor.job_status_tracker is not None
-                and file_id
+            await self._fail_job(
+                file_id, fingerprint, document_id, workspace_id, knowledge_base_id
+            )
+            raise
+
+    async def _fail_job(
+        self,
+        file_id: Optional[str],
+        fingerprint: str,
+        document_id: str,
+        workspace_id: str,
+        knowledge_base_id: str,
+    ) -> None:
+        """Mark a job failed, inline or in its background enrichment, for its retry"""
+        if not (
+            self._processor
+            and self._processor.job_status_tracker is not None
+            and file_id
+        ):
+            return
+        try:
+            await self._processor.job_status_tracker.set_job_status(
+                file_id=file_id, status=JobStatus.FAILED
+            )
+            # A retry resumes from the checkpoint and its rows, without a retry
+            # they are cleared once the checkpoint expires
+            if not await asyncio.to_thread(
+                get_ingestion_checkpoint_store().has_progress,
+                file_id,
+                fingerprint,
             ):
-                try:
-                    await self._processor.job_status_tracker.set_job_status(
-                        file_id=file_id, status=JobStatus.FAILED
-                    )
+                await self._processor.clear_document(
+                    document_id=document_id,
+                    workspace_id=workspace_id,
+                    knowledge_base_id=knowledge_base_id,
+                )
+        except Exception as e:
+            log_error_info(
+                logging.ERROR,
+                "Failed to saving job status (failed) to Postgres",
+                e,
+            )
+
+    async def _clear_expired_jobs(self) -> None:
+        """Clear the partial rows of failed jobs whose checkpoint expired unretried"""
+        store = get_ingestion_checkpoint_store()
+        try:
+            expired = await asyncio.to_thread(store.get_expired)
+        except Exception as e:
+            log_error_info(logging.WARNING, "Failed to list expired checkpoints", e)
+            return
+        for checkpoint in expired:
+            try:
+                if checkpoint.document_key:
+                    # Rows of a later job of the same document are kept
                     await self._processor.clear_document(
-                        document_id=document_id,
-                        workspace_id=workspace_id,
-                        knowledge_base_id=knowledge_base_id,
+                        document_id=checkpoint.document_key,
+                        workspace_id=checkpoint.workspace_id,
+                        knowledge_base_id=checkpoint.knowledge_base_id,
+                        file_id=checkpoint.job_id,
                     )
-                except Exception as e:
-                    log_error_info(
-                        logging.ERROR,
-                        "Failed to saving job status (failed) to Postgres",
-                        e,
-                    )
-            raise
+                await asyncio.to_thread(store.delete, checkpoint.job_id)
+                logger.info(f"🧹 Cleared job {checkpoint.job_id}, never retried")
+            except Exception as e:
+                log_error_info(
+                    logging.WARNING,
+                    f"Failed to clear expired job {checkpoint.job_id}",
+                    e,
+                )
 
     async def query_chunks(self, *args, **kwargs) -> List[Dict[str, Any]]:
         """Query document chunks"""
@@ -1089,22 +1522,27 @@ class HiRAG:
             translate_to_traditional = True
             translation.remove("zh-t-hk")
 
-        # Translate to each specified language
-        for target_language in translation:
+        async def _translate(target_language: str) -> Optional[str]:
             try:
                 # Following the same pattern as cross_language_search
                 translated_result = await translator.translate(
                     original_query, dest=target_language
                 )
-                if target_language == "zh":
-                    simplified_text = translated_result.text
-                if translated_result.text and translated_result.text != original_query:
-                    translated_queries.append(translated_result.text)
-                    logger.info(
-                        f"🌐 Translated query to {target_language}: {translated_result.text}"
-                    )
+                return translated_result.text
             except Exception as e:
                 logger.warning(f"⚠️ Failed to translate to {target_language}: {e}")
+                return None
+
+        # Translate to all specified languages concurrently, keeping the request order
+        translated_texts = await asyncio.gather(
+            *[_translate(target_language) for target_language in translation]
+        )
+        for target_language, text in zip(translation, translated_texts):
+            if target_language == "zh" and text:
+                simplified_text = text
+            if text and text != original_query:
+                translated_queries.append(text)
+                logger.info(f"🌐 Translated query to {target_language}: {text}")
 
         if translate_to_traditional and simplified_text:
             query_t = get_chinese_convertor("s2hk").convert(simplified_text)
@@ -1163,21 +1601,124 @@ class HiRAG:
 
         original_query = query
         query_list = [original_query]
+        use_graph = strategy in ["pagerank", "hybrid"]
+        topk = get_hi_rag_config().default_query_top_k
+        recall_kwargs = {
+            "workspace_id": workspace_id,
+            "knowledge_base_id": knowledge_base_id,
+            "topk": topk,
+            "topn": get_hi_rag_config().default_query_top_n,
+            "file_list": file_list,
+        }
+        timings: Dict[str, float] = {}
+        query_start = time.perf_counter()
 
-        if translation:
-            translated_queries = await self._translate_query(
-                original_query, translation
+        async def _timed(stage: str, coro):
+            stage_start = time.perf_counter()
+            try:
+                return await coro
+            finally:
+                timings[stage] = time.perf_counter() - stage_start
+
+        # Recall for the original query does not depend on the translations, so start
+        # chunk and triplet recall (including their embeddings) while translating
+        recall_tasks = [
+            asyncio.create_task(
+                _timed(
+                    "chunk_recall",
+                    self._query_service.query_chunks(
+                        query=original_query, **recall_kwargs
+                    ),
+                )
+            )
+        ]
+        if use_graph:
+            recall_tasks.append(
+                asyncio.create_task(
+                    _timed(
+                        "triplet_recall",
+                        self._query_service.query_triplets(
+                            query=original_query, **recall_kwargs
+                        ),
+                    )
+                )
             )
-            query_list.extend(translated_queries)
 
-        query_results = await self._query_service.query(
-            query=query_list if len(query_list) > 1 else original_query,
-            workspace_id=workspace_id,
-            knowledge_base_id=knowledge_base_id,
-            strategy=strategy,
-            filter_by_clustering=filter_by_clustering,
-            file_list=file_list,
+        try:
+            if translation:
+                translated_queries = await _timed(
+                    "translation", self._translate_query(original_query, translation)
+                )
+                query_list.extend(translated_queries)
+
+            # Only the translated texts are left to embed and recall
+            translated_recalls: List[Any] = []
+            if len(query_list) > 1:
+                translated_recalls = [
+                    _timed(
+                        "translated_chunk_recall",
+                        self._query_service.query_chunks(
+                            query=query_list[1:], **recall_kwargs
+                        ),
+                    )
+                ]
+                if use_graph:
+                    translated_recalls.append(
+                        _timed(
+                            "translated_triplet_recall",
+                            self._query_service.query_triplets(
+                                query=query_list[1:], **recall_kwargs
+                            ),
+                        )
+                    )
+            recalled = await asyncio.gather(*recall_tasks, *translated_recalls)
+        except BaseException:
+            for task in recall_tasks:
+                task.cancel()
+            raise
+
+        original_recalls = recalled[: len(recall_tasks)]
+        translated_recalls = recalled[len(recall_tasks) :]
+        chunks = self._query_service.merge_recalled_rows(
+            [original_recalls[0]] + translated_recalls[:1],
+            key=lambda row: row.get("documentKey"),
+            limit=topk,
         )
+        triplet_recall = None
+        if use_graph:
+            triplet_recall = self._query_service.build_triplet_recall(
+                self._query_service.merge_recalled_rows(
+                    original_recalls[1:] + translated_recalls[1:],
+                    key=lambda row: (
+                        row.get("source"),
+                        row.get("target"),
+                        row.get("description"),
+                    ),
+                    limit=topk,
+                )
+            )
+        timings["preparation"] = time.perf_counter() - query_start
+
+        if strategy == "raw":
+            query_results = {
+                "chunks": chunks,
+                "chunk_ids": [
+                    c.get("documentKey") for c in chunks if c.get("documentKey")
+                ],
+            }
+        else:
+            query_results = await _timed(
+                "strategy",
+                self._query_service.apply_strategy_to_chunks(
+                    chunks=chunks,
+                    workspace_id=workspace_id,
+                    knowledge_base_id=knowledge_base_id,
+                    query=query_list if len(query_list) > 1 else original_query,
+                    filter_by_clustering=filter_by_clustering,
+                    strategy=strategy,
+                    triplet_recall=triplet_recall,
+                ),
+            )
 
         query_results["query"] = query_list
 
@@ -1188,6 +1729,7 @@ class HiRAG:
             )
 
         if summary:
+            summary_start = time.perf_counter()
             text_summary = await self.generate_summary(
                 workspace_id=workspace_id,
                 knowledge_base_id=knowledge_base_id,
@@ -1195,9 +1737,35 @@ class HiRAG:
                 chunks=query_results["chunks"],
             )
             query_results["summary"] = text_summary
+            timings["summary"] = time.perf_counter() - summary_start
+
+        timings["total"] = time.perf_counter() - query_start
+        query_results["timings"] = self._query_timings_with_critical_path(timings)
 
         return query_results
 
+    @staticmethod
+    def _query_timings_with_critical_path(timings: Dict[str, float]) -> Dict[str, Any]:
+        """Add the longest chain of dependent stages (the critical path) to the timings"""
+        translation_chain = ["translation"] + [
+            max(
+                ["translated_chunk_recall", "translated_triplet_recall"],
+                key=lambda stage: timings.get(stage, 0.0),
+            )
+        ]
+        preparation_chains = [["chunk_recall"], ["triplet_recall"], translation_chain]
+        critical_path = max(
+            preparation_chains,
+            key=lambda chain: sum(timings.get(stage, 0.0) for stage in chain),
+        ) + ["strategy", "summary"]
+        critical_path = [stage for stage in critical_path if stage in timings]
+
+        return {
+            **timings,
+            "critical_path": sum(timings[stage] for stage in critical_path),
+            "critical_path_stages": critical_path,
+        }
+
     async def get_health_status(self) -> Dict[str, Any]:
         """Get system health status"""
         if not self._storage:
@@ -1219,13 +1787,44 @@ class HiRAG:
         return {
             "metrics": self._metrics.metrics.to_dict(),
             "operation_times": self._metrics.operation_times,
+            "tenant_scheduling": {
+                "jobs": self._job_scheduler.get_metrics(),
+                "subtasks": self._subtask_scheduler.get_metrics(),
+            },
+            "translation_cache": get_translation_cache().get_stats(),
+            "tokenizer": get_tokenizer_service().get_stats(),
+            "token_counter": get_token_counter().get_stats(),
+            "ingestion_checkpoints": get_ingestion_checkpoint_store().get_stats(),
+            "worker_pool": get_worker_pool().get_stats(),
         }
 
+    def set_tenant_ingestion_limits(
+        self,
+        workspace_id: str,
+        knowledge_base_id: str,
+        max_concurrent_jobs: Optional[int] = None,
+        max_concurrent_subtasks: Optional[int] = None,
+        weight: Optional[float] = None,
+    ) -> None:
+        """Adjust the ingestion concurrency caps and fair-share weight of a tenant at runtime"""
+        if not self._job_scheduler or not self._subtask_scheduler:
+            raise HiRAGException("HiRAG instance not properly initialized")
+
+        tenant = (workspace_id, knowledge_base_id)
+        self._job_scheduler.set_tenant_limit(
+            tenant, max_concurrency=max_concurrent_jobs, weight=weight
+        )
+        self._subtask_scheduler.set_tenant_limit(
+            tenant, max_concurrency=max_concurrent_subtasks, weight=weight
+        )
+
     async def clean_up(self) -> None:
         """Clean up resources"""
         logger.info("🧹 Cleaning up HiRAG resources...")
 
         try:
+            if self._processor:
+                await self._processor.wait_for_enrichment()
             if self._storage:
                 await self._storage.cleanup()
 
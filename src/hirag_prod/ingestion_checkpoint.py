@@ -0,0 +1,286 @@
+import hashlib
+import json
+import logging
+import os
+import pickle
+import shutil
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from hirag_prod._utils import log_error_info
+from hirag_prod.configs.functions import get_envs
+from hirag_prod.schema import ChunkRecord, File, ItemRecord
+from hirag_prod.singleton_registry import register_singleton
+
+logger = logging.getLogger("HiRAG")
+
+STATE_FILE_NAME = "state.json"
+DOCUMENTS_FILE_NAME = "documents.pkl"
+
+
+def get_ingestion_fingerprint(
+    document_id: str, document_path: str, content_type: str
+) -> str:
+    """Identity of the input of a job, a checkpoint of another input is not resumed"""
+    return hashlib.sha256(
+        "\x1f".join([document_id, document_path, content_type]).encode("utf-8")
+    ).hexdigest()
+
+
+@dataclass
+class IngestionCheckpoint:
+    """Completed work of one ingestion job, see IngestionCheckpointStore"""
+
+    job_id: str
+    fingerprint: str
+    created_at: float = field(default_factory=time.time)
+    # Document the job writes, its partial rows are cleared if it is never retried
+    document_key: str = ""
+    workspace_id: str = ""
+    knowledge_base_id: str = ""
+    # Loaded, converted and chunked documents, None until chunking completed
+    file: Optional[File] = None
+    chunks: Optional[List[ChunkRecord]] = None
+    items: Optional[List[ItemRecord]] = None
+    # Keys of the chunks stored with their embeddings
+    embedded_chunk_keys: Set[str] = field(default_factory=set)
+    items_stored: bool = False
+    # Keys of the chunks whose entities and relations are stored
+    kg_chunk_keys: Set[str] = field(default_factory=set)
+
+    @property
+    def chunked(self) -> bool:
+        return self.chunks is not None
+
+    def _state(self) -> Dict[str, Any]:
+        return {
+            "job_id": self.job_id,
+            "fingerprint": self.fingerprint,
+            "created_at": self.created_at,
+            "document_key": self.document_key,
+            "workspace_id": self.workspace_id,
+            "knowledge_base_id": self.knowledge_base_id,
+            "chunked": self.chunked,
+            "embedded_chunk_keys": sorted(self.embedded_chunk_keys),
+            "items_stored": self.items_stored,
+            "kg_chunk_keys": sorted(self.kg_chunk_keys),
+        }
+
+
+class IngestionCheckpointStore:
+    """
+    Checkpoints of ingestion jobs on local disk, keyed by job id.
+
+    A job records each stage as it completes: the chunked documents (after
+    conversion, table summaries and timestamp extraction), the keys of the chunks
+    stored with their embeddings, the stored items and the keys of the chunks whose
+    knowledge graph is stored. Retrying a failed job with the same input resumes
+    after its last completed stage instead of starting over. The conversion itself
+    is reused from the conversion cache. Checkpoints are removed once their job
+    completes, and ignored after ``INGESTION_CHECKPOINT_MAX_AGE_HOURS``. The owner
+    of the store clears the partial rows of expired jobs, see ``get_expired``.
+    Every file is written atomically, so a job killed mid-write leaves its previous
+    checkpoint. Checkpoint errors are logged and treated as missing checkpoints.
+    """
+
+    _instance: Optional["IngestionCheckpointStore"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs) -> "IngestionCheckpointStore":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    register_singleton(cls)
+        return cls._instance
+
+    def __init__(self, checkpoint_dir: Optional[str] = None) -> None:
+        if getattr(self, "_created", False):
+            return
+        self.checkpoint_dir: str = checkpoint_dir or get_envs().INGESTION_CHECKPOINT_DIR
+        self.max_age_seconds: float = (
+            get_envs().INGESTION_CHECKPOINT_MAX_AGE_HOURS * 3600
+        )
+        self.resumed: int = 0
+        self.writes: int = 0
+        self._created: bool = True
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._instance = None
+
+    @property
+    def enabled(self) -> bool:
+        return get_envs().ENABLE_INGESTION_CHECKPOINTS
+
+    def _job_dir(self, job_id: str) -> str:
+        job_hash = hashlib.sha256(job_id.encode("utf-8")).hexdigest()
+        return os.path.join(self.checkpoint_dir, job_hash)
+
+    def _write(self, path: str, data: bytes) -> None:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "wb", dir=os.path.dirname(path), suffix=".tmp", delete=False
+        ) as f:
+            f.write(data)
+        os.replace(f.name, path)
+        self.writes += 1
+
+    def _write_state(self, checkpoint: IngestionCheckpoint) -> None:
+        self._write(
+            os.path.join(self._job_dir(checkpoint.job_id), STATE_FILE_NAME),
+            json.dumps(checkpoint._state()).encode("utf-8"),
+        )
+
+    def _read_state(self, job_id: str, fingerprint: str) -> Optional[Dict[str, Any]]:
+        """State of the checkpoint of ``job_id``, None when there is none to resume"""
+        try:
+            with open(os.path.join(self._job_dir(job_id), STATE_FILE_NAME), "rb") as f:
+                state = json.loads(f.read())
+        except FileNotFoundError:
+            return None
+        if state["fingerprint"] != fingerprint:
+            logger.info(f"Ingestion checkpoint of job {job_id} has another input")
+            self.delete(job_id)
+            return None
+        if time.time() - state["created_at"] > self.max_age_seconds:
+            self.delete(job_id)
+            return None
+        return state
+
+    def load(self, job_id: str, fingerprint: str) -> Optional[IngestionCheckpoint]:
+        """
+        Checkpoint to resume ``job_id`` from, an empty one when the job has none or
+        only one of another input or too old. None when checkpoints are disabled.
+        """
+        if not self.enabled:
+            return None
+        checkpoint = IngestionCheckpoint(job_id=job_id, fingerprint=fingerprint)
+        try:
+            state = self._read_state(job_id, fingerprint)
+            if state is None:
+                return checkpoint
+            if state["chunked"]:
+                documents_path = os.path.join(
+                    self._job_dir(job_id), DOCUMENTS_FILE_NAME
+                )
+                with open(documents_path, "rb") as f:
+                    checkpoint.file, checkpoint.chunks, checkpoint.items = pickle.load(
+                        f
+                    )
+            checkpoint.created_at = state["created_at"]
+            checkpoint.embedded_chunk_keys = set(state["embedded_chunk_keys"])
+            checkpoint.items_stored = state["items_stored"]
+            checkpoint.kg_chunk_keys = set(state["kg_chunk_keys"])
+        except Exception as e:
+            log_error_info(
+                logging.WARNING, f"Failed to read ingestion checkpoint of {job_id}", e
+            )
+            return IngestionCheckpoint(job_id=job_id, fingerprint=fingerprint)
+        if checkpoint.chunked:
+            self.resumed += 1
+        return checkpoint
+
+    def has_progress(self, job_id: str, fingerprint: str) -> bool:
+        """Whether ``job_id`` has a checkpoint of this input to resume from"""
+        if not self.enabled:
+            return False
+        try:
+            state = self._read_state(job_id, fingerprint)
+        except Exception as e:
+            log_error_info(
+                logging.WARNING, f"Failed to read ingestion checkpoint of {job_id}", e
+            )
+            return False
+        return state is not None and state["chunked"]
+
+    def _save(self, checkpoint: IngestionCheckpoint, what: str, write) -> None:
+        try:
+            write()
+        except Exception as e:
+            log_error_info(
+                logging.WARNING,
+                f"Failed to checkpoint {what} of job {checkpoint.job_id}",
+                e,
+            )
+
+    def save_documents(
+        self,
+        checkpoint: IngestionCheckpoint,
+        file: File,
+        chunks: List[ChunkRecord],
+        items: Optional[List[ItemRecord]],
+    ) -> None:
+        checkpoint.file, checkpoint.chunks, checkpoint.items = file, chunks, items
+
+        def write() -> None:
+            self._write(
+                os.path.join(self._job_dir(checkpoint.job_id), DOCUMENTS_FILE_NAME),
+                pickle.dumps((file, chunks, items), protocol=pickle.HIGHEST_PROTOCOL),
+            )
+            self._write_state(checkpoint)
+
+        self._save(checkpoint, "documents", write)
+
+    def add_embedded_chunks(
+        self, checkpoint: IngestionCheckpoint, chunk_keys: Iterable[str]
+    ) -> None:
+        checkpoint.embedded_chunk_keys.update(chunk_keys)
+        self._save(checkpoint, "chunks", lambda: self._write_state(checkpoint))
+
+    def mark_items_stored(self, checkpoint: IngestionCheckpoint) -> None:
+        checkpoint.items_stored = True
+        self._save(checkpoint, "items", lambda: self._write_state(checkpoint))
+
+    def add_kg_chunks(
+        self, checkpoint: IngestionCheckpoint, chunk_keys: Iterable[str]
+    ) -> None:
+        checkpoint.kg_chunk_keys.update(chunk_keys)
+        self._save(checkpoint, "knowledge graph", lambda: self._write_state(checkpoint))
+
+    def delete(self, job_id: str) -> None:
+        shutil.rmtree(self._job_dir(job_id), ignore_errors=True)
+
+    def get_expired(self) -> List[IngestionCheckpoint]:
+        """
+        Checkpoints of jobs that were never retried, without their documents.
+        Unreadable checkpoints are removed right away, the others are left to the
+        caller to ``delete`` once the partial rows of their job are cleared.
+        """
+        if not self.enabled or not os.path.isdir(self.checkpoint_dir):
+            return []
+        now = time.time()
+        expired = []
+        for entry in os.scandir(self.checkpoint_dir):
+            try:
+                if now - entry.stat().st_mtime <= self.max_age_seconds:
+                    continue
+            except FileNotFoundError:
+                continue
+            try:
+                with open(os.path.join(entry.path, STATE_FILE_NAME), "rb") as f:
+                    state = json.loads(f.read())
+                expired.append(
+                    IngestionCheckpoint(
+                        job_id=state["job_id"],
+                        fingerprint=state["fingerprint"],
+                        created_at=state["created_at"],
+                        document_key=state.get("document_key", ""),
+                        workspace_id=state.get("workspace_id", ""),
+                        knowledge_base_id=state.get("knowledge_base_id", ""),
+                    )
+                )
+            except Exception as e:
+                log_error_info(
+                    logging.WARNING,
+                    f"Removing unreadable ingestion checkpoint {entry.name}",
+                    e,
+                )
+                shutil.rmtree(entry.path, ignore_errors=True)
+        return expired
+
+    def get_stats(self) -> Dict[str, int]:
+        return {"resumed": self.resumed, "writes": self.writes}
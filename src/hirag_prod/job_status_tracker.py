@@ -1,10 +1,16 @@
 import logging
+import time
 from datetime import datetime
 from enum import Enum
+from typing import Dict, List, Optional, Set
 
 from hirag_prod._utils import log_error_info
 from hirag_prod.resources.functions import get_db_session_maker
-from hirag_prod.storage.pg_utils import update_job_status
+from hirag_prod.storage.pg_utils import (
+    get_documents_with_pending_stage,
+    update_job_status,
+    upsert_job_stage,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -18,6 +24,29 @@ class JobStatus(Enum):
     FAILED = "failed"
 
 
+class IngestionStage(Enum):
+    """
+    Ingestion stages tracked per job.
+
+    A document is searchable once its file and chunks are stored; the remaining stages
+    enrich it in the background.
+    """
+
+    SEARCHABLE = "searchable"
+    TRANSLATION = "translation"
+    TOKENIZATION = "tokenization"
+    ITEMS = "items"
+    KG = "kg"
+
+
+ENRICHMENT_STAGES: List[IngestionStage] = [
+    IngestionStage.TRANSLATION,
+    IngestionStage.TOKENIZATION,
+    IngestionStage.ITEMS,
+    IngestionStage.KG,
+]
+
+
 class JobStatusTracker:
     """
     Minimal job tracker without any caching.
@@ -53,3 +82,113 @@ class JobStatusTracker:
         status: JobStatus,
     ) -> None:
         await self.save_job_status_to_postgres(file_id, status.value)
+
+    async def set_stage_status(
+        self,
+        file_id: str,
+        stage: IngestionStage,
+        status: JobStatus,
+        document_key: str,
+        workspace_id: str,
+        knowledge_base_id: str,
+    ) -> None:
+        """Persist the status of one ingestion stage of a job to PostgreSQL."""
+        try:
+            async with get_db_session_maker()() as session:
+                await upsert_job_stage(
+                    session,
+                    file_id,
+                    stage.value,
+                    status.value,
+                    document_key=document_key,
+                    workspace_id=workspace_id,
+                    knowledge_base_id=knowledge_base_id,
+                    updated_at=datetime.now(),
+                )
+        except Exception as e:
+            log_error_info(
+                logging.ERROR,
+                f"Failed to save {stage.value} stage status to Postgres",
+                e,
+            )
+
+    async def get_pending_documents(
+        self,
+        workspace_id: str,
+        knowledge_base_id: str,
+        stages: List[IngestionStage],
+    ) -> Set[str]:
+        """Document keys of a knowledge base whose ``stages`` have not completed yet."""
+        async with get_db_session_maker()() as session:
+            return await get_documents_with_pending_stage(
+                session,
+                workspace_id,
+                knowledge_base_id,
+                stages=[stage.value for stage in stages],
+                statuses=[JobStatus.PENDING.value, JobStatus.PROCESSING.value],
+            )
+
+
+class StageProgress:
+    """
+    Moves one job through its ingestion stages in order.
+
+    Every transition is persisted through the job status tracker when there is one and
+    the job has a file id; stage durations are kept either way.
+    """
+
+    def __init__(
+        self,
+        stages: List[IngestionStage],
+        job_status_tracker: Optional[JobStatusTracker] = None,
+        file_id: Optional[str] = None,
+        document_key: str = "",
+        workspace_id: str = "",
+        knowledge_base_id: str = "",
+    ):
+        self.stages = stages
+        self.job_status_tracker = job_status_tracker
+        self.file_id = file_id
+        self.document_key = document_key
+        self.workspace_id = workspace_id
+        self.knowledge_base_id = knowledge_base_id
+        self.current: Optional[IngestionStage] = None
+        self.statuses: Dict[IngestionStage, JobStatus] = {}
+        self.durations: Dict[str, float] = {}
+        self._stage_start: float = 0.0
+
+    async def _set(self, stage: IngestionStage, status: JobStatus) -> None:
+        self.statuses[stage] = status
+        if self.job_status_tracker and self.file_id:
+            await self.job_status_tracker.set_stage_status(
+                file_id=self.file_id,
+                stage=stage,
+                status=status,
+                document_key=self.document_key,
+                workspace_id=self.workspace_id,
+                knowledge_base_id=self.knowledge_base_id,
+            )
+
+    async def mark_pending(self) -> None:
+        for stage in self.stages:
+            await self._set(stage, JobStatus.PENDING)
+
+    async def begin(self, stage: IngestionStage) -> None:
+        self.current = stage
+        self._stage_start = time.perf_counter()
+        await self._set(stage, JobStatus.PROCESSING)
+
+    async def advance(self, stage: IngestionStage) -> None:
+        """Complete ``stage`` and begin the one after it, if any"""
+        if self.current == stage:
+            self.durations[stage.value] = time.perf_counter() - self._stage_start
+            self.current = None
+        await self._set(stage, JobStatus.COMPLETED)
+        index = self.stages.index(stage)
+        if index + 1 < len(self.stages):
+            await self.begin(self.stages[index + 1])
+
+    async def fail(self) -> None:
+        if self.current is not None:
+            await self._set(self.current, JobStatus.FAILED)
+            self.current = None
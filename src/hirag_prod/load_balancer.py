@@ -0,0 +1,265 @@
+import asyncio
+import logging
+import random
+import time
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, TypeVar
+
+import httpx
+import openai
+
+from hirag_prod.configs.functions import get_envs
+
+logger = logging.getLogger("HiRAG")
+
+T = TypeVar("T")
+
+
+def parse_endpoint_list(value: Optional[str]) -> List[str]:
+    """Split a comma separated base URL setting into a list of endpoints"""
+    if not value:
+        return []
+    return [url.strip() for url in value.split(",") if url.strip()]
+
+
+# Errors of the connection to the endpoint rather than of the request
+TRANSPORT_ERRORS = (
+    httpx.TransportError,
+    openai.APIConnectionError,
+    ConnectionError,
+    TimeoutError,
+)
+
+
+def is_endpoint_failure(error: BaseException) -> bool:
+    """
+    Transport errors, 5xx and 429 are failures of the endpoint. Anything else, such
+    as other 4xx or an invalid response, is caused by the request.
+    """
+    if isinstance(error, TRANSPORT_ERRORS):
+        return True
+    status_code = getattr(error, "status_code", None)
+    if status_code is None:
+        status_code = getattr(getattr(error, "response", None), "status_code", None)
+    return isinstance(status_code, int) and (status_code >= 500 or status_code == 429)
+
+
+@dataclass
+class Endpoint:
+    url: str
+    outstanding: int = 0
+    latency_ewma: Optional[float] = None
+    consecutive_failures: int = 0
+    ejected_until: float = 0.0
+    ejection_count: int = 0
+    request_count: int = 0
+    failure_count: int = 0
+
+    def is_ejected(self, now: float) -> bool:
+        return self.ejected_until > now
+
+
+class EndpointPool:
+    """
+    Client side load balancer over several equivalent endpoints
+
+    - Routing picks the endpoint with the lowest ``(outstanding + 1) * latency``, i.e.
+      least outstanding requests weighted by the moving average latency.
+    - Endpoints failing ``ejection_failures`` times in a row are ejected for
+      ``ejection_seconds`` (doubling on repeated ejections). If every endpoint is
+      ejected, the one closest to recovery is used anyway.
+    - With ``hedge_delay`` set, a request still running after that delay is sent to a
+      second endpoint as well and the first successful response wins.
+    - A failed request is retried on another endpoint up to ``failover_attempts`` times.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        urls: Iterable[str],
+        ejection_failures: int = 3,
+        ejection_seconds: float = 30.0,
+        hedge_delay: Optional[float] = None,
+        failover_attempts: int = 1,
+        latency_alpha: float = 0.2,
+    ):
+        self.name = name
+        self.endpoints: List[Endpoint] = [Endpoint(url=url) for url in urls]
+        if not self.endpoints:
+            raise ValueError(f"No endpoint configured for {name}")
+        self.ejection_failures = ejection_failures
+        self.ejection_seconds = ejection_seconds
+        self.hedge_delay = hedge_delay
+        self.failover_attempts = failover_attempts
+        self.latency_alpha = latency_alpha
+        self.hedged_count: int = 0
+        self.hedge_win_count: int = 0
+
+    @property
+    def urls(self) -> List[str]:
+        return [endpoint.url for endpoint in self.endpoints]
+
+    # ========================================================================
+    # Routing
+    # ========================================================================
+
+    def _score(self, endpoint: Endpoint, default_latency: float) -> float:
+        latency = (
+            endpoint.latency_ewma
+            if endpoint.latency_ewma is not None
+            else default_latency
+        )
+        return (endpoint.outstanding + 1) * latency
+
+    def pick(self, exclude: Iterable[str] = ()) -> Optional[Endpoint]:
+        excluded = set(exclude)
+        candidates = [e for e in self.endpoints if e.url not in excluded]
+        if not candidates:
+            return None
+
+        now = time.monotonic()
+        healthy = [e for e in candidates if not e.is_ejected(now)]
+        if not healthy:
+            # Panic mode: better to try an ejected endpoint than to fail outright
+            return min(candidates, key=lambda e: e.ejected_until)
+
+        known = [e.latency_ewma for e in healthy if e.latency_ewma is not None]
+        default_latency = sum(known) / len(known) if known else 1.0
+        return min(
+            healthy,
+            key=lambda e: (self._score(e, default_latency), random.random()),
+        )
+
+    # ========================================================================
+    # Passive health tracking
+    # ========================================================================
+
+    def _record_success(self, endpoint: Endpoint, latency: float) -> None:
+        endpoint.consecutive_failures = 0
+        endpoint.ejection_count = 0
+        if endpoint.latency_ewma is None:
+            endpoint.latency_ewma = latency
+        else:
+            endpoint.latency_ewma += self.latency_alpha * (
+                latency - endpoint.latency_ewma
+            )
+
+    def _record_failure(self, endpoint: Endpoint, error: BaseException) -> None:
+        endpoint.failure_count += 1
+        endpoint.consecutive_failures += 1
+        if endpoint.consecutive_failures >= self.ejection_failures:
+            duration = self.ejection_seconds * (2 ** min(endpoint.ejection_count, 5))
+            endpoint.ejected_until = time.monotonic() + duration
+            endpoint.ejection_count += 1
+            endpoint.consecutive_failures = 0
+            logger.warning(
+                f"⚠️ Ejecting {self.name} endpoint {endpoint.url} for {duration:.0f}s: {error}"
+            )
+
+    async def _call(self, endpoint: Endpoint, send: Callable[[str], Awaitable[T]]) -> T:
+        endpoint.outstanding += 1
+        endpoint.request_count += 1
+        start = time.perf_counter()
+        try:
+            result = await send(endpoint.url)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            if is_endpoint_failure(e):
+                self._record_failure(endpoint, e)
+            raise
+        else:
+            self._record_success(endpoint, time.perf_counter() - start)
+            return result
+        finally:
+            endpoint.outstanding -= 1
+
+    # ========================================================================
+    # Requests
+    # ========================================================================
+
+    async def _request_once(self, send: Callable[[str], Awaitable[T]], tried: set) -> T:
+        primary = self.pick(exclude=tried)
+        tried.add(primary.url)
+        if self.hedge_delay is None or len(self.endpoints) < 2:
+            return await self._call(primary, send)
+
+        primary_task = asyncio.ensure_future(self._call(primary, send))
+        tasks = {primary_task}
+        try:
+            done, _ = await asyncio.wait(tasks, timeout=self.hedge_delay)
+            if done:
+                return primary_task.result()
+
+            secondary = self.pick(exclude=tried)
+            if secondary is None or secondary.is_ejected(time.monotonic()):
+                return await primary_task
+            tried.add(secondary.url)
+            self.hedged_count += 1
+            tasks.add(asyncio.ensure_future(self._call(secondary, send)))
+
+            error: Optional[BaseException] = None
+            pending = set(tasks)
+            while pending:
+                done, pending = await asyncio.wait(
+                    pending, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary_task:
+                            self.hedge_win_count += 1
+                        return task.result()
+                    error = task.exception()
+            raise error
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
+    async def request(self, send: Callable[[str], Awaitable[T]]) -> T:
+        """Run ``send(endpoint_url)`` on the best endpoint, failing over on errors"""
+        tried: set = set()
+        attempts = 1 + min(self.failover_attempts, len(self.endpoints) - 1)
+        last_error: Optional[BaseException] = None
+        for _ in range(attempts):
+            if len(tried) >= len(self.endpoints):
+                break
+            try:
+                return await self._request_once(send, tried)
+            except Exception as e:
+                last_error = e
+                if not is_endpoint_failure(e):
+                    raise
+        raise last_error
+
+    def get_stats(self) -> Dict[str, Any]:
+        now = time.monotonic()
+        return {
+            "name": self.name,
+            "hedged_count": self.hedged_count,
+            "hedge_win_count": self.hedge_win_count,
+            "endpoints": [
+                {
+                    "url": e.url,
+                    "outstanding": e.outstanding,
+                    "latency_ewma": e.latency_ewma,
+                    "request_count": e.request_count,
+                    "failure_count": e.failure_count,
+                    "ejected": e.is_ejected(now),
+                }
+                for e in self.endpoints
+            ],
+        }
+
+
+def create_endpoint_pool(
+    name: str, base_url: str, hedge_delay: Optional[float] = None
+) -> EndpointPool:
+    """Endpoint pool for a (comma separated) base URL setting"""
+    return EndpointPool(
+        name,
+        parse_endpoint_list(base_url),
+        ejection_failures=get_envs().LOAD_BALANCER_EJECTION_FAILURES,
+        ejection_seconds=get_envs().LOAD_BALANCER_EJECTION_SECONDS,
+        hedge_delay=hedge_delay,
+    )
@@ -1,19 +1,26 @@
+import asyncio
 import logging
-from typing import Any, Literal, Optional, Tuple
-
-import requests
+from typing import Any, Optional, Tuple
 
 from hirag_prod._utils import log_error_info
-from hirag_prod.configs.functions import get_document_converter_config
+from hirag_prod.loader.cloud_health import check_cloud_health
+from hirag_prod.loader.conversion_cache import get_dots_ocr_document_cache_key
 from hirag_prod.loader.csv_loader import CSVLoader
 from hirag_prod.loader.html_loader import HTMLLoader
 from hirag_prod.loader.image_loader import ImageLoader
 from hirag_prod.loader.md_loader import MdLoader
 from hirag_prod.loader.pdf_loader import PDFLoader
+from hirag_prod.loader.pdf_page_ranges import load_pdf_in_page_ranges
 from hirag_prod.loader.ppt_loader import PowerPointLoader
 from hirag_prod.loader.txt_loader import TxtLoader
 from hirag_prod.loader.utils import route_file_path, validate_document_path
 from hirag_prod.loader.word_loader import WordLoader
+from hirag_prod.resources.functions import (
+    get_cloud_health_monitor,
+    get_conversion_cache,
+    get_dots_ocr_client,
+    get_worker_pool,
+)
 from hirag_prod.schema import File, LoaderType
 
 # Configure Logging
@@ -60,43 +67,16 @@ DEFAULT_LOADER_CONFIGS = {
 }
 
 
-def check_cloud_health(
-    document_converter_type: Literal["dots_ocr"],
-) -> bool:
-    """Check the health of the cloud service"""
-    try:
-        health_url = f"{get_document_converter_config(document_converter_type).base_url.rstrip('/')}/health"
-
-        headers = {
-            "Content-Type": "application/json",
-            "Model-Name": get_document_converter_config(
-                document_converter_type
-            ).model_name,
-            "Authorization": f"Bearer {get_document_converter_config(document_converter_type).api_key}",
-        }
-
-        resp = requests.get(health_url, headers=headers)
-
-        # Check if response is empty/null (success case)
-        if resp.status_code == 200 and not resp.text.strip():
-            return True
-
-        # Try to parse JSON response
-        try:
-            data = resp.json()
-            # Return True if the JSON response indicates success (which is not possible now)
-            if data.get("success") == "true":
-                return True
-            # Otherwise False
-            return False
-        except Exception as e:
-            # If we can't parse JSON but got a response, treat as failure
-            log_error_info(logging.ERROR, "Failed to parsing JSON response", e)
-            return False
-
-    except Exception as e:
-        log_error_info(logging.ERROR, "Failed to check cloud health", e)
-        return False
+def resolve_loader_type(loader_type: LoaderType) -> LoaderType:
+    """Fall back to docling when the circuit of the cloud service is open"""
+    if loader_type in ["dots_ocr"]:
+        if not get_cloud_health_monitor().is_available(loader_type):
+            # Show warning in log
+            logger.warning(
+                f"Cloud health check failed for {loader_type}, falling back to docling."
+            )
+            loader_type = "docling"
+    return loader_type
 
 
 def load_document(
@@ -121,17 +101,7 @@ def load_document(
     Returns:
         Tuple[Any, File]: The loaded document.
     """
-    if loader_type in ["dots_ocr"]:
-        cloud_check = False
-        if loader_type == "dots_ocr":
-            cloud_check = check_cloud_health("dots_ocr")
-
-        if not cloud_check:
-            # Show warning in log
-            logger.warning(
-                f"Cloud health check failed for {loader_type}, falling back to docling."
-            )
-            loader_type = "docling"
+    loader_type = resolve_loader_type(loader_type)
 
     if loader_configs is None:
         loader_configs = DEFAULT_LOADER_CONFIGS
@@ -162,11 +132,94 @@ def load_document(
         return None, langchain_doc
 
 
+async def load_dots_ocr_document(
+    document_path: str,
+    content_type: str,
+    document_meta: dict,
+    loader_configs: dict,
+) -> Tuple[Any, File]:
+    """load_document with Dots OCR, converted by the async client"""
+    if content_type not in loader_configs:
+        raise ValueError(f"Unsupported document type: {content_type}")
+    loader = loader_configs[content_type]["loader"]()
+
+    assert document_meta.get("private") is not None, "private is required"
+    assert document_path.startswith("s3://") or document_path.startswith("oss://")
+    cache_key = await asyncio.to_thread(get_dots_ocr_document_cache_key, document_path)
+    processed_doc = (
+        await asyncio.to_thread(get_conversion_cache().get_dict, cache_key)
+        if cache_key
+        else None
+    )
+    if processed_doc is None:
+        client = get_dots_ocr_client()
+        try:
+            processed_doc = await client.convert(
+                document_path,
+                workspace_id=document_meta.get("workspaceId", None),
+                knowledge_base_id=document_meta.get("knowledgeBaseId", None),
+            )
+        except Exception:
+            get_cloud_health_monitor().record_failure("dots_ocr")
+            raise
+        if processed_doc is not None:
+            get_cloud_health_monitor().record_success("dots_ocr")
+            if cache_key:
+                await asyncio.to_thread(
+                    get_conversion_cache().put_dict, cache_key, processed_doc
+                )
+        elif await client.input_exists(document_path):
+            # The job failed or timed out, or its status could not be polled
+            get_cloud_health_monitor().record_failure("dots_ocr")
+    return loader.create_dots_ocr_file(processed_doc, document_meta)
+
+
+async def load_document_in_workers(
+    document_path: str,
+    content_type: str,
+    loader_type: LoaderType,
+    document_meta: Optional[dict] = None,
+    loader_configs: Optional[dict] = None,
+) -> Tuple[Any, File]:
+    """load_document on the ingestion worker pool.
+
+    PDFs converted by docling with the default loaders are split into page ranges
+    that are converted in parallel and merged again. Dots OCR jobs are awaited on
+    the event loop by the async client instead of blocking a worker.
+    """
+    loader_type = await asyncio.to_thread(resolve_loader_type, loader_type)
+    if loader_type == "dots_ocr":
+        return await load_dots_ocr_document(
+            document_path,
+            content_type,
+            document_meta,
+            loader_configs or DEFAULT_LOADER_CONFIGS,
+        )
+    if (
+        loader_type == "docling"
+        and content_type == "application/pdf"
+        and loader_configs is None
+    ):
+        result = await load_pdf_in_page_ranges(document_path, document_meta)
+        if result is not None:
+            return result
+    return await get_worker_pool().run(
+        load_document,
+        document_path=document_path,
+        content_type=content_type,
+        loader_type=loader_type,
+        document_meta=document_meta,
+        loader_configs=loader_configs,
+    )
+
+
 __all__ = [
+    "check_cloud_health",
     "PowerPointLoader",
     "PDFLoader",
     "WordLoader",
     "load_document",
+    "load_document_in_workers",
     "HTMLLoader",
     "CSVLoader",
     "TxtLoader",
@@ -1,20 +1,30 @@
 #! /usr/bin/env python3
 from abc import ABC
-from typing import Optional, Tuple, Type
+from typing import Dict, Optional, Tuple, Type
 
-from docling.document_converter import DocumentConverter
+from docling.datamodel.base_models import InputFormat
+from docling.document_converter import FormatOption
 from docling_core.types.doc import DoclingDocument
 from langchain_core.document_loaders import BaseLoader as LangchainBaseLoader
 
 from hirag_prod._utils import compute_mdhash_id
 from hirag_prod.loader import document_converter
+from hirag_prod.loader.conversion_cache import (
+    get_docling_document_cache_key,
+    get_dots_ocr_document_cache_key,
+)
+from hirag_prod.resources.functions import (
+    get_conversion_cache,
+    get_document_converter_pool,
+)
 from hirag_prod.schema import File, create_file
 
 
 class BaseLoader(ABC):
     """Base class for all loaders"""
 
-    loader_docling: Type[DocumentConverter]
+    # Format options of the docling converter, converters are shared per options
+    docling_format_options: Dict[InputFormat, FormatOption] = {}
     loader_langchain: Type[LangchainBaseLoader]
 
     def load_dots_ocr(
@@ -34,13 +44,26 @@ class BaseLoader(ABC):
         assert document_path.startswith("s3://") or document_path.startswith("oss://")
         workspace_id = document_meta.get("workspaceId", None)
         knowledge_base_id = document_meta.get("knowledgeBaseId", None)
-        processed_doc = document_converter.convert(
-            "dots_ocr",
-            document_path,
-            workspace_id=workspace_id,
-            knowledge_base_id=knowledge_base_id,
+        cache_key = get_dots_ocr_document_cache_key(document_path)
+        processed_doc = (
+            get_conversion_cache().get_dict(cache_key) if cache_key else None
         )
-
+        if processed_doc is None:
+            processed_doc = document_converter.convert(
+                "dots_ocr",
+                document_path,
+                workspace_id=workspace_id,
+                knowledge_base_id=knowledge_base_id,
+            )
+            if cache_key and processed_doc is not None:
+                get_conversion_cache().put_dict(cache_key, processed_doc)
+
+        return self.create_dots_ocr_file(processed_doc, document_meta)
+
+    def create_dots_ocr_file(
+        self, processed_doc: Optional[dict], document_meta: dict
+    ) -> Tuple[list, File]:
+        """Split a Dots OCR result into its JSON pages and the File of the document"""
         assert processed_doc is not None, "Failed to receive parsed document."
 
         json_doc = processed_doc.get("json", None)
@@ -72,9 +95,27 @@ class BaseLoader(ABC):
             File: the loaded document
         """
         assert document_meta.get("private") is not None, "private is required"
-        docling_doc: DoclingDocument = self.loader_docling.convert(
-            document_path
-        ).document
+        cache_key = get_docling_document_cache_key(
+            document_path, self.docling_format_options
+        )
+        docling_doc: Optional[DoclingDocument] = (
+            get_conversion_cache().get_docling_document(cache_key)
+            if cache_key
+            else None
+        )
+        if docling_doc is None:
+            with get_document_converter_pool().acquire(
+                self.docling_format_options
+            ) as converter:
+                docling_doc = converter.convert(document_path).document
+            if cache_key:
+                get_conversion_cache().put_docling_document(cache_key, docling_doc)
+        return docling_doc, self.create_docling_file(docling_doc, document_meta)
+
+    def create_docling_file(
+        self, docling_doc: DoclingDocument, document_meta: dict
+    ) -> File:
+        """Export a converted docling document to the File of the document"""
         file_type = document_meta.get("type", None)
         if file_type == "md" or file_type == "markdown":
             # For markdown files, use export_to_text to better match original pattern
@@ -88,7 +129,7 @@ class BaseLoader(ABC):
             ),
             text=md_str,
         )
-        return docling_doc, doc_md
+        return doc_md
 
     def load_langchain(
         self, document_path: str, document_meta: Optional[dict] = None, **loader_args
@@ -10,22 +10,22 @@ from typing import Any, Dict, List, Optional, Union
 from docling_core.transforms.chunker import HierarchicalChunker
 from docling_core.types.doc import DocItemLabel, DoclingDocument
 from langchain_text_splitters import RecursiveCharacterTextSplitter
+from rapidfuzz import fuzz
 
-from hirag_prod._utils import (
-    compute_mdhash_id,
-    decode_tokens_by_tiktoken,
-    encode_string_by_tiktoken,
-)
+from hirag_prod._utils import compute_mdhash_id, decode_tokens_by_tiktoken
 from hirag_prod.chunk import DotsHierarchicalChunker, UnifiedRecursiveChunker
-from hirag_prod.configs.functions import get_config_manager
+from hirag_prod.configs.functions import get_config_manager, get_envs
 from hirag_prod.prompt import PROMPTS
-from hirag_prod.resources.functions import get_chat_service
-from hirag_prod.schema import Chunk, File, Item
+from hirag_prod.resources.functions import get_chat_service, get_token_counter
+from hirag_prod.schema import ChunkRecord, File, ItemRecord
+from hirag_prod.schema._utils import CHUNK_COLUMNS
 
 logger = logging.getLogger(__name__)
 
 CHUNK_SIZE = 1200
 CHUNK_OVERLAP = 200
+# Slack for the rounding of rapidfuzz scores when pruning fuzzy match windows
+FUZZY_BOUND_TOLERANCE = 1e-6
 
 
 class ChunkType(Enum):
@@ -85,43 +85,52 @@ LABEL_TO_CHUNK_TYPE = {
 
 
 # ======================== Helper Functions ========================
-def _copy_chunk_with_updates(source_chunk: Chunk, **updates) -> Chunk:
-    """Create a new Chunk by copying all fields from source and applying updates."""
-    new_chunk = Chunk()
-    for col in dict(source_chunk):
-        if hasattr(new_chunk, col):
-            setattr(new_chunk, col, getattr(source_chunk, col))
+def _copy_chunk_with_updates(source_chunk: ChunkRecord, **updates) -> ChunkRecord:
+    """Create a new ChunkRecord by copying all fields from source and applying updates."""
+    values = {col: value for col, value in source_chunk if col in CHUNK_COLUMNS}
 
     # Apply updates
     for key, value in updates.items():
-        if hasattr(new_chunk, key):
-            setattr(new_chunk, key, value)
+        if key in CHUNK_COLUMNS:
+            values[key] = value
 
-    return new_chunk
+    return ChunkRecord(**values)
 
 
-def split_long_text_chunks(chunks: List[Chunk], chunk_max_tokens: int = 8192):
+def split_long_text_chunks(chunks: List[ChunkRecord], chunk_max_tokens: int = 8192):
     """Split chunks that exceed token limit into smaller chunks."""
     if not chunks or not chunk_max_tokens:
         return chunks
 
-    splitted_chunks: List[Chunk] = []
-
-    for ck in chunks:
+    # Text chunks are encoded once, in one threaded batch, and keep their token count
+    text_chunk_idx = [
+        i
+        for i, ck in enumerate(chunks)
         # Skip chunks that embed from caption, not text
-        if getattr(ck, "chunkType", None) in ("table", "excel_sheet"):
+        if getattr(ck, "chunkType", None) not in ("table", "excel_sheet")
+    ]
+    token_lists = get_token_counter().encode_batch(
+        [chunks[i].text or "" for i in text_chunk_idx]
+    )
+    tokens_by_idx = dict(zip(text_chunk_idx, token_lists))
+
+    splitted_chunks: List[ChunkRecord] = []
+
+    for idx, ck in enumerate(chunks):
+        toks = tokens_by_idx.get(idx)
+        if toks is None:
             splitted_chunks.append(ck)
             continue
 
-        text = ck.text or ""
-        toks = encode_string_by_tiktoken(text)
         if len(toks) <= chunk_max_tokens:
+            ck.tokenCount = len(toks)
             splitted_chunks.append(ck)
             continue
 
         # Split into contiguous token windows (no overlap)
         for i in range(0, len(toks), chunk_max_tokens):
-            part_text = decode_tokens_by_tiktoken(toks[i : i + chunk_max_tokens])
+            part_tokens = toks[i : i + chunk_max_tokens]
+            part_text = decode_tokens_by_tiktoken(part_tokens)
             new_key = compute_mdhash_id(part_text, prefix="chunk-")
 
             # Create new chunk by copying all fields and updating text & documentKey
@@ -130,6 +139,7 @@ def split_long_text_chunks(chunks: List[Chunk], chunk_max_tokens: int = 8192):
                     ck,
                     documentKey=new_key,
                     text=part_text,
+                    tokenCount=len(part_tokens),
                 )
             )
 
@@ -187,11 +197,11 @@ def _create_item_base(
     caption: Optional[str] = None,
     headers: Optional[List[str]] = None,
     children: Optional[List[str]] = None,
-) -> Item:
-    """Create an Item object with standard fields and inherited metadata."""
+) -> ItemRecord:
+    """Create an ItemRecord with standard fields and inherited metadata."""
     file_metadata = _inherit_file_metadata(source_file)
 
-    return Item(
+    return ItemRecord(
         documentKey=compute_mdhash_id(f"{document_id}_{chunk_idx}", prefix="item-"),
         text=text,
         chunkIdx=chunk_idx,
@@ -222,9 +232,9 @@ def _create_chunk_base(
     caption: Optional[str] = None,
     headers: Optional[List[str]] = None,
     children: Optional[List[str]] = None,
-) -> Chunk:
-    """Create a Chunk object with standard fields and provided metadata."""
-    return Chunk(
+) -> ChunkRecord:
+    """Create a ChunkRecord with standard fields and provided metadata."""
+    return ChunkRecord(
         documentKey=compute_mdhash_id(text, prefix="chunk-"),
         text=text,
         chunkIdx=chunk_idx,
@@ -313,36 +323,206 @@ def _build_doc_pages_map(doc: DoclingDocument) -> dict[int, tuple[float, float]]
     return size_map
 
 
-async def extract_timestamp_from_items(items: List[Item]) -> Optional[datetime]:
+_MONTH_NAME = (
+    r"(?P<mon>jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?|dec(?:ember)?)\.?"
+)
+_MONTH_NUMBERS = {
+    name: number
+    for number, names in enumerate(
+        [
+            ("jan", "january"),
+            ("feb", "february"),
+            ("mar", "march"),
+            ("apr", "april"),
+            ("may",),
+            ("jun", "june"),
+            ("jul", "july"),
+            ("aug", "august"),
+            ("sep", "sept", "september"),
+            ("oct", "october"),
+            ("nov", "november"),
+            ("dec", "december"),
+        ],
+        start=1,
+    )
+    for name in names
+}
+
+# Date formats of the supported locales, compiled once and tried in order, the
+# most specific first. A later format never matches inside an earlier match.
+# (pattern, granularity, only in file names)
+DATE_PATTERNS: List[tuple[re.Pattern, str, bool]] = [
+    (re.compile(pattern, re.IGNORECASE), granularity, filename_only)
+    for pattern, granularity, filename_only in [
+        # 2023-10-15, 2023/10/15, 2023.10.15
+        (
+            r"(?<!\d)(?P<y>\d{4})[-/.](?P<m>\d{1,2})[-/.](?P<d>\d{1,2})(?!\d)",
+            "day",
+            False,
+        ),
+        # 2023年10月15日
+        (
+            r"(?P<y>\d{4})\s*年\s*(?P<m>\d{1,2})\s*月\s*(?P<d>\d{1,2})\s*[日号號]",
+            "day",
+            False,
+        ),
+        # October 15, 2023
+        (
+            rf"\b{_MONTH_NAME}\s+(?P<d>\d{{1,2}})(?:st|nd|rd|th)?,?\s+(?P<y>\d{{4}})(?!\d)",
+            "day",
+            False,
+        ),
+        # 15 October 2023
+        (
+            rf"(?<!\d)(?P<d>\d{{1,2}})(?:st|nd|rd|th)?\s+{_MONTH_NAME},?\s+(?P<y>\d{{4}})(?!\d)",
+            "day",
+            False,
+        ),
+        # 15/10/2023 or 10/15/2023
+        (
+            r"(?<!\d)(?P<a>\d{1,2})[-/.](?P<b>\d{1,2})[-/.](?P<y>\d{4})(?!\d)",
+            "day",
+            False,
+        ),
+        # report_20231015.pdf
+        (
+            r"(?<!\d)(?P<y>(?:19|20)\d{2})(?P<m>0[1-9]|1[0-2])(?P<d>0[1-9]|[12]\d|3[01])(?!\d)",
+            "day",
+            True,
+        ),
+        # 2023年10月
+        (r"(?P<y>\d{4})\s*年\s*(?P<m>\d{1,2})\s*月", "month", False),
+        # October 2023
+        (rf"\b{_MONTH_NAME},?\s+(?P<y>\d{{4}})(?!\d)", "month", False),
+        # 2023-10, 2023/10
+        (r"(?<!\d)(?P<y>\d{4})[-/](?P<m>\d{1,2})(?![\d/-])", "month", False),
+        # 2023
+        (r"(?<!\d)(?P<y>(?:19|20)\d{2})(?!\d)", "year", False),
+    ]
+]
+
+# Words announcing the date of the document itself
+TIMESTAMP_KEYWORD_PATTERN = re.compile(
+    r"(published|publication|created|creation|dated?|updated?|last modified|revised"
+    r"|revision|issued?|effective|as of|version|发布|發布|發佈|日期|更新|修订|修訂|生效|版本)"
+    r"[^\d\n]{0,20}$",
+    re.IGNORECASE,
+)
+
+_TIMESTAMP_SOURCE_WEIGHTS = {"header": 3.0, "filename": 2.5, "content": 1.0}
+_TIMESTAMP_GRANULARITY_WEIGHTS = {"day": 1.0, "month": 0.7, "year": 0.3}
+# Score of a date that is trusted on its own, e.g. a full date in a page header
+_TIMESTAMP_STRONG_SCORE = 2.0
+
+
+def find_dates(
+    text: str, filename: bool = False
+) -> List[tuple[tuple[int, int], datetime, str, bool]]:
+    """
+    Dates written in ``text`` as (span, date, granularity, ambiguous), in the order
+    of DATE_PATTERNS. Dates after today or before 1900 are left out, a numeric date
+    whose day and month could be swapped is ambiguous.
+    """
+    dates = []
+    if not text:
+        return dates
+    today = datetime.now()
+    taken: List[tuple[int, int]] = []
+    for pattern, granularity, filename_only in DATE_PATTERNS:
+        if filename_only and not filename:
+            continue
+        for match in pattern.finditer(text):
+            start, end = match.span()
+            if any(
+                start < taken_end and taken_start < end
+                for taken_start, taken_end in taken
+            ):
+                continue
+            groups = match.groupdict()
+            ambiguous = False
+            try:
+                year = int(groups["y"])
+                day = int(groups.get("d") or 1)
+                if groups.get("mon"):
+                    month = _MONTH_NUMBERS[groups["mon"].lower().rstrip(".")]
+                elif groups.get("a"):
+                    first, second = int(groups["a"]), int(groups["b"])
+                    # Month first unless the first number can only be a day
+                    month, day = (second, first) if first > 12 else (first, second)
+                    ambiguous = first <= 12 and second <= 12 and first != second
+                else:
+                    month = int(groups.get("m") or 1)
+                date = datetime(year, month, day)
+            except (KeyError, ValueError):
+                continue
+            if date.year < 1900 or date > today:
+                continue
+            taken.append((start, end))
+            dates.append(((start, end), date, granularity, ambiguous))
+    return dates
+
+
+def score_timestamp_candidates(
+    candidates: List[tuple[datetime, str, str, int, bool, bool]],
+) -> tuple[Optional[datetime], float]:
+    """
+    Pick the document timestamp among (date, granularity, source, position,
+    after keyword, ambiguous) candidates without the LLM.
+
+    Every mention adds to the score of its date, weighted by its source (headers
+    and titles, then the file name, then content), its position (earlier items
+    weigh more), its granularity, a preceding keyword such as "Published" and
+    whether day and month could be swapped. The confidence is the share of the
+    best date in the two best scores, damped when the best score is weak.
+    """
+    scores: Dict[tuple[datetime, str], float] = {}
+    for date, granularity, source, position, keyword, ambiguous in candidates:
+        score = (
+            _TIMESTAMP_SOURCE_WEIGHTS[source]
+            * _TIMESTAMP_GRANULARITY_WEIGHTS[granularity]
+            / (1 + position / 20)
+        )
+        if keyword:
+            score *= 1.5
+        if ambiguous:
+            score *= 0.5
+        scores[(date, granularity)] = scores.get((date, granularity), 0.0) + score
+    if not scores:
+        return None, 0.0
+
+    ranked = sorted(scores.items(), key=lambda entry: entry[1], reverse=True)
+    (best_date, _), best_score = ranked[0]
+    second_score = ranked[1][1] if len(ranked) > 1 else 0.0
+    confidence = (best_score / (best_score + second_score)) * min(
+        1.0, best_score / _TIMESTAMP_STRONG_SCORE
+    )
+    return best_date, confidence
+
+
+async def extract_timestamp_from_items(items: List[ItemRecord]) -> Optional[datetime]:
     """
     Extract timestamp from document items following priority order:
     1. Header & footer content with dates
     2. Filename with dates
     3. In-text date patterns
 
-    Uses LLM to validate and extract the most relevant document timestamp.
+    Dates are scored deterministically first, see score_timestamp_candidates. The
+    LLM validates and extracts the most relevant document timestamp only when the
+    confidence of the best date is below TIMESTAMP_CONFIDENCE_THRESHOLD.
     """
     if not items:
         logger.warning("No items provided for timestamp extraction.")
         return None
 
-    # Common date patterns to look for
-    date_patterns = [
-        r"\b\d{4}[-/]\d{1,2}[-/]\d{1,2}\b",  # YYYY-MM-DD or YYYY/MM/DD
-        r"\b\d{1,2}[-/]\d{1,2}[-/]\d{4}\b",  # MM-DD-YYYY or MM/DD/YYYY
-        r"\b\d{4}[-/]\d{1,2}\b",  # YYYY-MM or YYYY/MM
-        r"\b\d{4}\b",  # YYYY (year only)
-        r"\b(?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{1,2},? \d{4}\b",  # Month DD, YYYY
-        r"\b\d{1,2} (?:Jan|Feb|Mar|Apr|May|Jun|Jul|Aug|Sep|Oct|Nov|Dec)[a-z]* \d{4}\b",  # DD Month YYYY
-    ]
-
     # Collect content by priority
     header_footer_content = []
     content_snippets = []
+    candidates = []
 
-    def extract_snippet_around_date(text: str, match) -> str:
+    def extract_snippet_around_date(text: str, span: tuple[int, int]) -> str:
         """Extract ~100 words around date match, using ... for truncation."""
-        start, end = match.span()
+        start, end = span
         words = text.split()
 
         # Find word positions around the match
@@ -377,21 +557,23 @@ async def extract_timestamp_from_items(items: List[Item]) -> Optional[datetime]:
 
         return snippet
 
-    def find_date_snippets(text: str) -> List[tuple[str, int]]:
-        """Find date patterns and extract snippets around them."""
-        snippets = []
-        if not text:
-            return snippets
-
-        for pattern in date_patterns:
-            for match in re.finditer(pattern, text, re.IGNORECASE):
-                snippet = extract_snippet_around_date(text, match)
-                snippets.append((snippet, len(snippet)))
+    def add_candidates(text: str, source: str, position: int, filename: bool = False):
+        for span, date, granularity, ambiguous in find_dates(text, filename):
+            keyword = bool(
+                TIMESTAMP_KEYWORD_PATTERN.search(text[max(0, span[0] - 40) : span[0]])
+            )
+            candidates.append((date, granularity, source, position, keyword, ambiguous))
+            if not filename:
+                snippet = extract_snippet_around_date(text, span)
+                if source == "header":
+                    header_footer_content.append((snippet, len(snippet)))
+                else:
+                    content_snippets.append((snippet, len(snippet)))
 
-        return snippets
+    add_candidates(items[0].fileName or "", "filename", 0, filename=True)
 
     # Process items by type and priority
-    for item in items:
+    for position, item in enumerate(items):
         if not item.text:
             continue
 
@@ -403,12 +585,18 @@ async def extract_timestamp_from_items(items: List[Item]) -> Optional[datetime]:
             ChunkType.SECTION_HEADER.value,
         ]
 
-        snippets = find_date_snippets(item.text)
+        add_candidates(item.text, "header" if is_header_footer else "content", position)
+
+    if not candidates:
+        # Not even a year to validate
+        return None
 
-        if is_header_footer:
-            header_footer_content.extend(snippets)
-        else:
-            content_snippets.extend(snippets)
+    timestamp, confidence = score_timestamp_candidates(candidates)
+    if confidence >= get_envs().TIMESTAMP_CONFIDENCE_THRESHOLD:
+        logger.info(
+            f"Extracted timestamp: {timestamp} (confidence {confidence:.2f}, without LLM)"
+        )
+        return timestamp
 
     # Sort snippets by length (shorter first) and limit quantities
     header_footer_content.sort(key=lambda x: x[1])
@@ -513,7 +701,9 @@ async def extract_timestamp_from_items(items: List[Item]) -> Optional[datetime]:
     return None
 
 
-async def extract_and_apply_timestamp_to_items(items: List[Item]) -> Optional[datetime]:
+async def extract_and_apply_timestamp_to_items(
+    items: List[ItemRecord],
+) -> Optional[datetime]:
     """
     Extract timestamp from items and apply to all items' extracted_timestamp field.
     """
@@ -553,7 +743,7 @@ def determine_docling_chunk_type(chunk) -> ChunkType:
 
 def chunk_docling_document(
     docling_doc: DoclingDocument, doc_md: File
-) -> tuple[List[Item], set[str], List[int]]:
+) -> tuple[List[ItemRecord], set[str], List[int]]:
     """
     Split a docling document into chunks and return a list of Item objects.
     Each chunk will inherit metadata from the original document.
@@ -655,11 +845,10 @@ def _fuzzy_find_text(
         return None
 
     needle_len = len(needle)
-    search_window = haystack[start_pos:]
 
-    # Limit search to reasonable window to avoid performance issues
-    max_search_len = min(len(search_window), needle_len * 3 + 1000)
-    search_text = search_window[:max_search_len]
+    # Limit search to reasonable window to avoid performance issues, without
+    # copying the rest of the document
+    search_text = haystack[start_pos : start_pos + needle_len * 3 + 1000]
 
     best_ratio = 0.0
     best_match_pos = None
@@ -667,6 +856,17 @@ def _fuzzy_find_text(
     # Slide window across the search text
     for i in range(len(search_text) - needle_len + 1):
         window = search_text[i : i + needle_len]
+
+        # The Indel similarity of rapidfuzz comes from the longest common subsequence,
+        # which bounds SequenceMatcher's ratio from above. Windows whose bound cannot
+        # beat the best match so far are skipped without running SequenceMatcher.
+        if not fuzz.ratio(
+            needle,
+            window,
+            score_cutoff=max(best_ratio, threshold) * 100 - FUZZY_BOUND_TOLERANCE,
+        ):
+            continue
+
         ratio = SequenceMatcher(None, needle, window).ratio()
 
         if ratio > best_ratio and ratio >= threshold:
@@ -687,8 +887,8 @@ def _fuzzy_find_text(
 
 def obtain_docling_md_bbox(
     docling_doc: DoclingDocument,
-    items: List[Item] = None,
-) -> List[Item]:
+    items: List[ItemRecord] = None,
+) -> List[ItemRecord]:
     """
     Finish the bbox for items after docling chunking if the file is markdown format.
     This function adds character position information as bbox for markdown text chunks.
@@ -842,20 +1042,20 @@ def _transform_bbox_dims(bbox: List[float], height) -> List[float]:
     return [x_0, height - y_0, x_1, height - y_1]
 
 
-def get_toc_from_items(items: List[Item]) -> List[Dict[str, Any]]:
+def get_toc_from_items(items: List[ItemRecord]) -> List[Dict[str, Any]]:
     ToC = []
     vis_items = set()
     item_to_index = {}
     for idx, item in enumerate(items):
         item_to_index[item.documentKey] = idx
 
-    def _is_header(item: Item) -> bool:
+    def _is_header(item: ItemRecord) -> bool:
         return item.chunkType in [
             ChunkType.TITLE.value,
             ChunkType.SECTION_HEADER.value,
         ]
 
-    def _extract_term(item: Item) -> Dict[str, Any]:
+    def _extract_term(item: ItemRecord) -> Dict[str, Any]:
         if not _is_header(item):
             return None
 
@@ -890,7 +1090,7 @@ def get_toc_from_items(items: List[Item]) -> List[Dict[str, Any]]:
     return ToC
 
 
-def build_rich_toc(items: List[Item], file: File) -> Dict[str, Any]:
+def build_rich_toc(items: List[ItemRecord], file: File) -> Dict[str, Any]:
     id2item = {i.documentKey: i for i in items}
     tree = get_toc_from_items(items)
     blocks: List[Dict[str, Any]] = []
@@ -952,7 +1152,7 @@ def chunk_dots_document(
     json_doc: List[Dict[str, Any]],
     md_doc: File,
     dots_left_bottom_origin: bool = True,
-) -> tuple[List[Item], set[str], List[int]]:
+) -> tuple[List[ItemRecord], set[str], List[int]]:
     """
     Split a dots document into chunks and return a list of Chunk objects.
     Each chunk will inherit metadata from the original document.
@@ -1043,7 +1243,7 @@ def chunk_langchain_document(
     chunk_overlap: int = CHUNK_OVERLAP,
     separators: Optional[List[str]] = None,
     keep_separator: bool = True,
-) -> List[Item]:
+) -> List[ItemRecord]:
     """
     Split a langchain document into chunks and return a list of Chunk objects.
     Each chunk will inherit metadata from the original document.
@@ -1087,10 +1287,10 @@ def chunk_langchain_document(
 
 
 def items_to_chunks_recursive(
-    items: Optional[List[Item]] = None,
+    items: Optional[List[ItemRecord]] = None,
     header_set: Optional[set[str]] = None,
     chunk_max_tokens: Optional[int] = 8192,
-) -> List[Chunk]:
+) -> List[ChunkRecord]:
     """
     Split a dots document into chunks using UnifiedRecursiveChunker and return a list of Chunk objects.
     This produces aggregated chunks that may span multiple pages, with pageNumber and bbox aligned by page.
@@ -1098,7 +1298,7 @@ def items_to_chunks_recursive(
     chunker = UnifiedRecursiveChunker()
     dense_chunks = chunker.chunk(items, header_set)
 
-    chunks: List[Chunk] = []
+    chunks: List[ChunkRecord] = []
     for dchunk in dense_chunks:
         tbbox_list = dchunk.bbox
 
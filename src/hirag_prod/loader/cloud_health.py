@@ -0,0 +1,247 @@
+import logging
+import threading
+import time
+from typing import Dict, Literal, Optional
+
+from hirag_prod._utils import log_error_info
+from hirag_prod.configs.functions import get_document_converter_config, get_envs
+from hirag_prod.resources.functions import get_sync_http_session
+from hirag_prod.singleton_registry import register_singleton
+
+logger = logging.getLogger("HiRAG")
+
+CloudConverterType = Literal["dots_ocr"]
+
+
+def check_cloud_health(
+    document_converter_type: CloudConverterType,
+) -> bool:
+    """Check the health of the cloud service"""
+    try:
+        health_url = f"{get_document_converter_config(document_converter_type).base_url.rstrip('/')}/health"
+
+        headers = {
+            "Content-Type": "application/json",
+            "Model-Name": get_document_converter_config(
+                document_converter_type
+            ).model_name,
+            "Authorization": f"Bearer {get_document_converter_config(document_converter_type).api_key}",
+        }
+
+        resp = get_sync_http_session().get(health_url, headers=headers, timeout=10)
+
+        # Check if response is empty/null (success case)
+        if resp.status_code == 200 and not resp.text.strip():
+            return True
+
+        # Try to parse JSON response
+        try:
+            data = resp.json()
+            # Return True if the JSON response indicates success (which is not possible now)
+            if data.get("success") == "true":
+                return True
+            # Otherwise False
+            return False
+        except Exception as e:
+            # If we can't parse JSON but got a response, treat as failure
+            log_error_info(logging.ERROR, "Failed to parsing JSON response", e)
+            return False
+
+    except Exception as e:
+        log_error_info(logging.ERROR, "Failed to check cloud health", e)
+        return False
+
+
+class CircuitBreaker:
+    """
+    Circuit breaker in front of a remote service.
+
+    - closed: calls go through, ``failure_threshold`` failures in a row or a failed
+      health check open it.
+    - open: calls are refused for ``open_seconds``, then it becomes half-open.
+    - half-open: a single trial call goes through, its success closes the breaker
+      and its failure opens it again.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int, open_seconds: float):
+        self.name = name
+        self.failure_threshold = max(1, failure_threshold)
+        self.open_seconds = open_seconds
+        self._state: str = self.CLOSED
+        self._opened_at: float = 0.0
+        self._trial_started_at: Optional[float] = None
+        self.consecutive_failures: int = 0
+        self.open_count: int = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            return self._current_state()
+
+    def _current_state(self) -> str:
+        if (
+            self._state == self.OPEN
+            and time.monotonic() - self._opened_at >= self.open_seconds
+        ):
+            self._state = self.HALF_OPEN
+            self._trial_started_at = None
+        return self._state
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            state = self._current_state()
+            if state == self.CLOSED:
+                return True
+            # A trial whose outcome is never reported does not block the next one
+            if state == self.HALF_OPEN and (
+                self._trial_started_at is None
+                or time.monotonic() - self._trial_started_at >= self.open_seconds
+            ):
+                self._trial_started_at = time.monotonic()
+                return True
+            return False
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._state != self.CLOSED:
+                logger.info(f"✅ {self.name} recovered, closing its circuit")
+            self._state = self.CLOSED
+            self._trial_started_at = None
+            self.consecutive_failures = 0
+
+    def _open(self) -> None:
+        if self._state != self.OPEN:
+            self.open_count += 1
+            logger.warning(
+                f"⚠️ {self.name} is unhealthy, opening its circuit for {self.open_seconds}s"
+            )
+        self._state = self.OPEN
+        self._opened_at = time.monotonic()
+        self._trial_started_at = None
+        self.consecutive_failures = 0
+
+    def record_failure(self) -> None:
+        with self._lock:
+            self.consecutive_failures += 1
+            if (
+                self._current_state() == self.HALF_OPEN
+                or self.consecutive_failures >= self.failure_threshold
+            ):
+                self._open()
+
+    def trip(self) -> None:
+        """Open the breaker right away"""
+        with self._lock:
+            self._open()
+
+
+class CloudHealthMonitor:
+    """
+    Cached health of the cloud document converters.
+
+    A background thread probes the health endpoint of every converter in use every
+    ``CLOUD_HEALTH_PROBE_INTERVAL_SECONDS`` and feeds a circuit breaker per
+    converter, together with the outcome of real conversions. Routing a document
+    only reads the breaker, so it costs no round trip except the very first probe.
+    """
+
+    _instance: Optional["CloudHealthMonitor"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs) -> "CloudHealthMonitor":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    register_singleton(cls)
+        return cls._instance
+
+    def __init__(self, probe_interval: Optional[float] = None) -> None:
+        if getattr(self, "_created", False):
+            return
+        self.probe_interval: float = (
+            probe_interval
+            if probe_interval is not None
+            else get_envs().CLOUD_HEALTH_PROBE_INTERVAL_SECONDS
+        )
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._probed: Dict[str, threading.Event] = {}
+        self._monitor_lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.probe_count: int = 0
+        self._created: bool = True
+
+    @classmethod
+    def reset(cls) -> None:
+        if cls._instance is not None and getattr(cls._instance, "_created", False):
+            cls._instance.stop()
+        cls._instance = None
+
+    def get_breaker(self, converter_type: CloudConverterType) -> CircuitBreaker:
+        with self._monitor_lock:
+            breaker = self._breakers.get(converter_type)
+            if breaker is None:
+                breaker = CircuitBreaker(
+                    converter_type,
+                    failure_threshold=get_envs().CLOUD_CIRCUIT_FAILURE_THRESHOLD,
+                    open_seconds=get_envs().CLOUD_CIRCUIT_OPEN_SECONDS,
+                )
+                self._breakers[converter_type] = breaker
+                self._probed[converter_type] = threading.Event()
+            if self._thread is None or not self._thread.is_alive():
+                self._stop_event.clear()
+                self._thread = threading.Thread(
+                    target=self._probe_loop, name="cloud-health-prober", daemon=True
+                )
+                self._thread.start()
+            return breaker
+
+    def _probe(self, converter_type: CloudConverterType) -> None:
+        breaker = self._breakers[converter_type]
+        if breaker.allow_request():
+            self.probe_count += 1
+            if check_cloud_health(converter_type):
+                breaker.record_success()
+            else:
+                # The service reports itself down, no need to wait for failures
+                breaker.trip()
+        self._probed[converter_type].set()
+
+    def _probe_loop(self) -> None:
+        while not self._stop_event.is_set():
+            with self._monitor_lock:
+                converter_type_list = list(self._breakers)
+            for converter_type in converter_type_list:
+                try:
+                    self._probe(converter_type)
+                except Exception as e:
+                    log_error_info(logging.WARNING, "Cloud health probe failed", e)
+            self._stop_event.wait(self.probe_interval)
+
+    def is_available(self, converter_type: CloudConverterType) -> bool:
+        """Whether a document may be sent to the converter now"""
+        breaker = self.get_breaker(converter_type)
+        # Only the first document of the process waits, for the first probe
+        self._probed[converter_type].wait(timeout=15)
+        return breaker.allow_request()
+
+    def record_success(self, converter_type: CloudConverterType) -> None:
+        self.get_breaker(converter_type).record_success()
+
+    def record_failure(self, converter_type: CloudConverterType) -> None:
+        self.get_breaker(converter_type).record_failure()
+
+    def stop(self) -> None:
+        self._stop_event.set()
+
+    def get_stats(self) -> Dict[str, str]:
+        return {
+            converter_type: breaker.state
+            for converter_type, breaker in self._breakers.items()
+        }
@@ -0,0 +1,254 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from functools import lru_cache
+from importlib.metadata import version
+from typing import Any, Dict, Optional
+from urllib.parse import urlparse
+
+from docling.datamodel.base_models import InputFormat
+from docling.document_converter import FormatOption
+from docling_core.types.doc import DoclingDocument
+
+from hirag_prod._utils import log_error_info
+from hirag_prod.configs.functions import get_document_converter_config, get_envs
+from hirag_prod.loader.converter_pool import get_format_options_key
+from hirag_prod.loader.utils import get_cloud_file_etag
+from hirag_prod.resources.functions import get_conversion_cache
+from hirag_prod.singleton_registry import register_singleton
+
+logger = logging.getLogger("HiRAG")
+
+HASH_BLOCK_SIZE = 1024 * 1024
+
+
+def get_file_content_hash(document_path: str) -> str:
+    """SHA-256 of the content of a local file"""
+    content_hash = hashlib.sha256()
+    with open(document_path, "rb") as f:
+        for block in iter(lambda: f.read(HASH_BLOCK_SIZE), b""):
+            content_hash.update(block)
+    return content_hash.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def _get_package_version(package_name: str) -> str:
+    try:
+        return version(package_name)
+    except Exception:
+        return "unknown"
+
+
+def _cache_key(*parts: str) -> str:
+    return hashlib.sha256("\x1f".join(parts).encode("utf-8")).hexdigest()
+
+
+def get_docling_cache_key(
+    content_hash: str, format_options: Dict[InputFormat, FormatOption]
+) -> str:
+    """Key of a docling conversion, changes with the docling version and options"""
+    return _cache_key(
+        "docling",
+        _get_package_version("docling"),
+        get_format_options_key(format_options),
+        content_hash,
+    )
+
+
+def get_dots_ocr_cache_key(content_hash: str) -> str:
+    """Key of a Dots OCR conversion, changes with the served model and entry point"""
+    config = get_document_converter_config("dots_ocr")
+    return _cache_key("dots_ocr", config.model_name, config.entry_point, content_hash)
+
+
+def get_docling_document_cache_key(
+    document_path: str, format_options: Dict[InputFormat, FormatOption]
+) -> Optional[str]:
+    """Cache key of converting a local file with docling, None if the cache is off"""
+    if not get_conversion_cache().enabled:
+        return None
+    return get_docling_cache_key(get_file_content_hash(document_path), format_options)
+
+
+def get_dots_ocr_document_cache_key(document_path: str) -> Optional[str]:
+    """Cache key of converting a bucket file with Dots OCR, None if the cache is off"""
+    if not get_conversion_cache().enabled:
+        return None
+    parsed_url = urlparse(document_path)
+    etag = get_cloud_file_etag(
+        parsed_url.scheme, parsed_url.netloc, parsed_url.path.lstrip("/")
+    )
+    return get_dots_ocr_cache_key(etag) if etag else None
+
+
+class ConversionCache:
+    """
+    Serialized conversion results on local disk, keyed by file content and converter.
+
+    Re-uploading a file into another knowledge base or re-ingesting it reads the
+    DoclingDocument JSON or the Dots OCR outputs from here instead of converting the
+    file again. Entries are written atomically so worker processes can share the
+    directory, reads refresh their mtime and the least recently used entries are
+    evicted once the directory grows past ``CONVERSION_CACHE_MAX_SIZE_MB``. Cache
+    errors are logged and treated as misses.
+    """
+
+    _instance: Optional["ConversionCache"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs) -> "ConversionCache":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    register_singleton(cls)
+        return cls._instance
+
+    def __init__(
+        self, cache_dir: Optional[str] = None, max_size_bytes: Optional[int] = None
+    ) -> None:
+        if getattr(self, "_created", False):
+            return
+        self.cache_dir: str = cache_dir or get_envs().CONVERSION_CACHE_DIR
+        self.max_size_bytes: int = (
+            max_size_bytes
+            if max_size_bytes is not None
+            else get_envs().CONVERSION_CACHE_MAX_SIZE_MB * 1024 * 1024
+        )
+        # Size of the directory, scanned on the first write and after evictions
+        self._size_bytes: Optional[int] = None
+        self._size_lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+        self.writes: int = 0
+        self.evictions: int = 0
+        self._created: bool = True
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._instance = None
+
+    @property
+    def enabled(self) -> bool:
+        return get_envs().ENABLE_CONVERSION_CACHE and self.max_size_bytes > 0
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def get(self, key: str) -> Optional[str]:
+        if not self.enabled:
+            return None
+        path = self._path(key)
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                data = f.read()
+            os.utime(path)
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        except Exception as e:
+            log_error_info(logging.WARNING, "Failed to read conversion cache", e)
+            self.misses += 1
+            return None
+        self.hits += 1
+        return data
+
+    def put(self, key: str, data: str) -> None:
+        if not self.enabled:
+            return
+        path = self._path(key)
+        try:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w",
+                encoding="utf-8",
+                dir=os.path.dirname(path),
+                suffix=".tmp",
+                delete=False,
+            ) as f:
+                f.write(data)
+            os.replace(f.name, path)
+        except Exception as e:
+            log_error_info(logging.WARNING, "Failed to write conversion cache", e)
+            return
+        self.writes += 1
+
+        with self._size_lock:
+            if self._size_bytes is None:
+                self._size_bytes = self._scan_size()
+            else:
+                self._size_bytes += os.path.getsize(path)
+            if self._size_bytes > self.max_size_bytes:
+                self._evict()
+
+    def _list_entries(self) -> list:
+        entry_list = []
+        for directory, _, file_name_list in os.walk(self.cache_dir):
+            for file_name in file_name_list:
+                if not file_name.endswith(".json"):
+                    continue
+                path = os.path.join(directory, file_name)
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+                entry_list.append((stat.st_mtime, stat.st_size, path))
+        return entry_list
+
+    def _scan_size(self) -> int:
+        return sum(size for _, size, _ in self._list_entries())
+
+    def _evict(self) -> None:
+        """Remove the least recently used entries until the cache fits again"""
+        entry_list = sorted(self._list_entries())
+        size_bytes = sum(size for _, size, _ in entry_list)
+        for _, size, path in entry_list:
+            if size_bytes <= self.max_size_bytes:
+                break
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+            size_bytes -= size
+            self.evictions += 1
+        self._size_bytes = size_bytes
+        logger.info(f"🗑️ Conversion cache evicted down to {size_bytes} bytes")
+
+    def get_docling_document(self, key: str) -> Optional[DoclingDocument]:
+        data = self.get(key)
+        if data is None:
+            return None
+        try:
+            return DoclingDocument.model_validate_json(data)
+        except Exception as e:
+            log_error_info(logging.WARNING, "Invalid cached docling document", e)
+            return None
+
+    def put_docling_document(self, key: str, docling_doc: DoclingDocument) -> None:
+        if self.enabled:
+            self.put(key, docling_doc.model_dump_json())
+
+    def get_dict(self, key: str) -> Optional[Dict[str, Any]]:
+        data = self.get(key)
+        if data is None:
+            return None
+        try:
+            return json.loads(data)
+        except Exception as e:
+            log_error_info(logging.WARNING, "Invalid cached conversion result", e)
+            return None
+
+    def put_dict(self, key: str, value: Dict[str, Any]) -> None:
+        if self.enabled:
+            self.put(key, json.dumps(value, ensure_ascii=False))
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "writes": self.writes,
+            "evictions": self.evictions,
+        }
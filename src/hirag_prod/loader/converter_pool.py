@@ -0,0 +1,143 @@
+import hashlib
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from docling.datamodel.base_models import InputFormat
+from docling.document_converter import DocumentConverter, FormatOption
+
+from hirag_prod.configs.functions import get_envs
+from hirag_prod.singleton_registry import register_singleton
+
+logger = logging.getLogger("HiRAG")
+
+
+def get_format_options_key(format_options: Dict[InputFormat, FormatOption]) -> str:
+    """Key of the converters built with ``format_options``, equal options share it"""
+    option_list = sorted(
+        (
+            input_format.value,
+            format_option.pipeline_cls.__name__,
+            format_option.backend.__name__,
+            (
+                str(format_option.pipeline_options.model_dump())
+                if format_option.pipeline_options is not None
+                else ""
+            ),
+        )
+        for input_format, format_option in format_options.items()
+    )
+    return hashlib.md5(
+        str(option_list).encode("utf-8"), usedforsecurity=False
+    ).hexdigest()
+
+
+class _ConverterSlot:
+    def __init__(self, converter: DocumentConverter) -> None:
+        self.converter = converter
+        self.last_thread_id: Optional[int] = None
+        self.uses: int = 0
+
+
+class DocumentConverterPool:
+    """
+    Warm docling DocumentConverters, keyed by their format options.
+
+    A converter loads its layout, OCR and table models on its first conversion, so
+    loaders borrow converters from here instead of building a new one per document.
+    Converters are created lazily, at most ``DOCLING_CONVERTER_POOL_SIZE`` per key,
+    and used by one thread at a time. A thread gets back the converter it used last
+    when that one is idle.
+    """
+
+    _instance: Optional["DocumentConverterPool"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs) -> "DocumentConverterPool":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    register_singleton(cls)
+        return cls._instance
+
+    def __init__(self, max_size: Optional[int] = None) -> None:
+        if getattr(self, "_created", False):
+            return
+        self.max_size: int = max(1, max_size or get_envs().DOCLING_CONVERTER_POOL_SIZE)
+        self._condition = threading.Condition()
+        self._idle_slot_dict: Dict[str, List[_ConverterSlot]] = {}
+        self._size_dict: Dict[str, int] = {}
+        self.acquisitions: int = 0
+        self.affinity_hits: int = 0
+        self.waits: int = 0
+        self._created: bool = True
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._instance = None
+
+    def _take_idle_slot(self, key: str, thread_id: int) -> Optional[_ConverterSlot]:
+        idle_slot_list = self._idle_slot_dict.get(key)
+        if not idle_slot_list:
+            return None
+        for i, slot in enumerate(idle_slot_list):
+            if slot.last_thread_id == thread_id:
+                self.affinity_hits += 1
+                return idle_slot_list.pop(i)
+        return idle_slot_list.pop()
+
+    def _checkout(
+        self, key: str, format_options: Dict[InputFormat, FormatOption]
+    ) -> _ConverterSlot:
+        thread_id = threading.get_ident()
+        with self._condition:
+            self.acquisitions += 1
+            while True:
+                slot = self._take_idle_slot(key, thread_id)
+                if slot is not None:
+                    return slot
+                if self._size_dict.get(key, 0) < self.max_size:
+                    self._size_dict[key] = self._size_dict.get(key, 0) + 1
+                    break
+                self.waits += 1
+                self._condition.wait()
+        try:
+            converter = DocumentConverter(format_options=format_options or None)
+        except Exception:
+            with self._condition:
+                self._size_dict[key] -= 1
+                self._condition.notify_all()
+            raise
+        logger.info(
+            f"🔥 Created docling converter {self._size_dict[key]}/{self.max_size} for options {key[:8]}"
+        )
+        return _ConverterSlot(converter)
+
+    @contextmanager
+    def acquire(
+        self, format_options: Optional[Dict[InputFormat, FormatOption]] = None
+    ) -> Iterator[DocumentConverter]:
+        """Borrow a converter for ``format_options`` for the duration of the block"""
+        format_options = format_options or {}
+        key = get_format_options_key(format_options)
+        slot = self._checkout(key, format_options)
+        try:
+            yield slot.converter
+        finally:
+            slot.last_thread_id = threading.get_ident()
+            slot.uses += 1
+            with self._condition:
+                self._idle_slot_dict.setdefault(key, []).append(slot)
+                self._condition.notify_all()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                "converters": sum(self._size_dict.values()),
+                "idle": sum(len(slots) for slots in self._idle_slot_dict.values()),
+                "acquisitions": self.acquisitions,
+                "affinity_hits": self.affinity_hits,
+                "waits": self.waits,
+            }
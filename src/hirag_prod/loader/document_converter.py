@@ -19,6 +19,7 @@ from hirag_prod.configs.functions import (
 )
 from hirag_prod.loader.utils import download_load_file, exists_cloud_file
 from hirag_prod.rate_limiter import RateLimiter
+from hirag_prod.resources.functions import get_sync_http_session
 
 rate_limiter = RateLimiter()
 logger: logging.Logger = logging.getLogger(__name__)
@@ -68,7 +69,9 @@ def _poll_dots_job_status(
 
     while time.time() - start_time < timeout:
         try:
-            response = requests.post(status_url, headers=headers, data=data, timeout=10)
+            response = get_sync_http_session().post(
+                status_url, headers=headers, data=data, timeout=10
+            )
             response.raise_for_status()
 
             # Reset failure counter on successful request
@@ -145,7 +148,9 @@ def _get_dots_token_usage(
 
     for attempt in range(retries):
         try:
-            response = requests.get(status_url, headers=headers, timeout=timeout)
+            response = get_sync_http_session().get(
+                status_url, headers=headers, timeout=timeout
+            )
             response.raise_for_status()
             status_data = response.json()
             logger.info(f"Token usage for job {job_id}: {status_data}")
@@ -254,7 +259,7 @@ def convert(
         else:
             raise ValueError(f"Unsupported scheme: '{parsed_url.scheme}'")
 
-        response = requests.post(
+        response = get_sync_http_session().post(
             get_document_converter_config(converter_type).base_url,
             headers=headers,
             files=files,
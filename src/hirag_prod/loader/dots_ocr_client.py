@@ -0,0 +1,305 @@
+"""
+Asyncio Dots OCR client
+"""
+
+import asyncio
+import json
+import logging
+import os
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+import httpx
+
+from hirag_prod._utils import log_error_info
+from hirag_prod.configs.document_loader_config import DotsOCRConfig
+from hirag_prod.configs.functions import (
+    get_document_converter_config,
+    get_envs,
+    get_shared_variables,
+)
+from hirag_prod.loader import utils
+from hirag_prod.loader.document_converter import OUTPUT_DIR_PREFIX, rate_limiter
+from hirag_prod.resources.functions import get_async_http_client
+from hirag_prod.singleton_registry import register_singleton
+
+logger: logging.Logger = logging.getLogger(__name__)
+
+PARSE_FILE_ENTRY_POINTS = ("/parse/file", "parse/file")
+
+
+class DotsOCRClient:
+    """
+    Dots OCR client running on the event loop.
+
+    Jobs are submitted concurrently, at most ``max_concurrent_jobs`` at a time per
+    event loop, their status is polled with exponential backoff and the results are
+    read from the bucket straight into memory. A document therefore waits on the
+    loop instead of holding a thread for the whole OCR duration.
+    """
+
+    _instance: Optional["DotsOCRClient"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs) -> "DotsOCRClient":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    register_singleton(cls)
+        return cls._instance
+
+    def __init__(self, config: Optional[DotsOCRConfig] = None) -> None:
+        if getattr(self, "_created", False):
+            return
+        self._config = config
+        self._semaphores: Dict[int, asyncio.Semaphore] = {}
+        self.jobs: int = 0
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self.status_polls: int = 0
+        self._created: bool = True
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._instance = None
+
+    @property
+    def config(self) -> DotsOCRConfig:
+        return self._config or get_document_converter_config("dots_ocr")
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphores.get(id(loop))
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, self.config.max_concurrent_jobs))
+            self._semaphores[id(loop)] = semaphore
+        return semaphore
+
+    def _headers(self, entry_point: str) -> Dict[str, str]:
+        return {
+            "Authorization": f"Bearer {self.config.api_key}",
+            "Model-Name": self.config.model_name,
+            "Entry-Point": entry_point,
+        }
+
+    @rate_limiter.limit(
+        "dotsocr",
+        "DOTS_OCR_RATE_LIMIT_MIN_INTERVAL_SECONDS",
+        "DOTS_OCR_RATE_LIMIT",
+        "DOTS_OCR_RATE_LIMIT_TIME_UNIT",
+    )
+    async def _submit_job(self, files: Dict[str, Tuple[None, str]]) -> httpx.Response:
+        response = await get_async_http_client(self.config.base_url).post(
+            self.config.base_url,
+            headers=self._headers(self.config.entry_point),
+            files=files,
+            timeout=self.config.timeout,
+        )
+        response.raise_for_status()
+        return response
+
+    async def wait_for_job(self, job_id: str) -> bool:
+        """
+        Poll the status of a job with exponential backoff, from
+        ``polling_initial_interval`` up to ``polling_interval`` seconds.
+
+        Returns:
+            bool: True if the job completed successfully, False otherwise
+        """
+        config = self.config
+        interval = config.polling_initial_interval
+        deadline = time.monotonic() + config.timeout
+        consecutive_failures = 0
+        while time.monotonic() < deadline:
+            self.status_polls += 1
+            try:
+                response = await get_async_http_client(config.base_url).post(
+                    config.base_url,
+                    headers=self._headers("/status"),
+                    data={"OCRJobId": job_id},
+                    timeout=10,
+                )
+                response.raise_for_status()
+                consecutive_failures = 0
+                status = response.json().get("status", "").lower()
+                logger.info(f"Job {job_id} status: {status}")
+
+                # "pending", "retrying", "processing", "completed", "failed", "canceled"
+                if status == "completed":
+                    return True
+                if status in ["failed", "error", "cancelled", "canceled"]:
+                    logger.error(f"Job {job_id} failed with status: {status}")
+                    return False
+            except Exception as e:
+                consecutive_failures += 1
+                logger.warning(
+                    f"Failed to check job status (attempt {consecutive_failures}/{config.polling_retries}): {e}"
+                )
+                if consecutive_failures >= config.polling_retries:
+                    log_error_info(
+                        logging.ERROR,
+                        f"Max consecutive failures ({config.polling_retries}) reached, stopping polling",
+                        e,
+                    )
+                    return False
+
+            await asyncio.sleep(min(interval, max(0.0, deadline - time.monotonic())))
+            interval = min(
+                interval * config.polling_backoff_factor, config.polling_interval
+            )
+        logger.error(f"Job {job_id} polling timed out after {config.timeout} seconds")
+        return False
+
+    async def _count_tokens(self, job_id: str) -> None:
+        config = self.config
+        for attempt in range(config.polling_retries):
+            try:
+                response = await get_async_http_client(config.base_url).get(
+                    config.base_url,
+                    headers=self._headers(f"/token_usage/{job_id}"),
+                    timeout=config.timeout,
+                )
+                response.raise_for_status()
+                token_usage_dict = response.json()
+                break
+            except Exception as e:
+                if attempt < config.polling_retries - 1:
+                    logger.warning(
+                        f"Failed to get token usage for job {job_id} (attempt {attempt + 1}/{config.polling_retries}): {e}"
+                    )
+                    await asyncio.sleep(1)
+                else:
+                    log_error_info(
+                        logging.WARNING,
+                        f"Failed to get token usage for job {job_id} after {config.polling_retries} attempts",
+                        e,
+                    )
+                    return
+        logger.info(f"Token usage for job {job_id}: {token_usage_dict}")
+        if get_envs().ENABLE_TOKEN_COUNT:
+            dots_tokens = token_usage_dict.get("dotsocr", {})
+            internal_tokens = token_usage_dict.get("InternVL3_5-2B", {})
+            shared_variables = get_shared_variables()
+            shared_variables.input_token_count_dict["dotsocr"].value += dots_tokens.get(
+                "prompt_tokens", 0
+            )
+            shared_variables.output_token_count_dict[
+                "dotsocr"
+            ].value += dots_tokens.get("completion_tokens", 0)
+            shared_variables.input_token_count_dict[
+                "internvl"
+            ].value += internal_tokens.get("prompt_tokens", 0)
+            shared_variables.output_token_count_dict[
+                "internvl"
+            ].value += internal_tokens.get("completion_tokens", 0)
+
+    async def _read_output(
+        self, storage_type: str, bucket_name: str, cloud_file_path: str
+    ) -> bytes:
+        return await asyncio.to_thread(
+            utils.read_cloud_file, storage_type, bucket_name, cloud_file_path
+        )
+
+    async def input_exists(self, input_file_path: str) -> bool:
+        parsed_url = urlparse(input_file_path)
+        return await asyncio.to_thread(
+            utils.exists_cloud_file,
+            parsed_url.scheme,
+            parsed_url.netloc,
+            parsed_url.path.lstrip("/"),
+        )
+
+    async def convert(
+        self,
+        input_file_path: str,
+        workspace_id: Optional[str] = None,
+        knowledge_base_id: Optional[str] = None,
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Convert a document in a bucket with Dots OCR, as document_converter.convert.
+
+        Returns:
+            Optional[Dict[str, Any]]: The parsed "json" pages and the "md" and
+                "md_nohf" texts, None when the input file does not exist or the
+                job did not complete.
+        """
+        parsed_url = urlparse(input_file_path)
+        if parsed_url.scheme not in ["s3", "oss"]:
+            raise ValueError(f"Unsupported scheme: '{parsed_url.scheme}'")
+        bucket_name = parsed_url.netloc
+        file_path = parsed_url.path.lstrip("/")
+        file_name_without_ext = os.path.splitext(os.path.basename(file_path))[0]
+        output_relative_path = f"{OUTPUT_DIR_PREFIX}/{file_name_without_ext}"
+        output_path = f"{parsed_url.scheme}://{bucket_name}/{output_relative_path}"
+
+        is_job = self.config.entry_point in PARSE_FILE_ENTRY_POINTS
+        files = {
+            "input_s3_path": (None, input_file_path),
+            "output_s3_path": (None, output_path),
+        }
+        if is_job:
+            if not workspace_id or not knowledge_base_id:
+                raise ValueError(
+                    "workspace_id and knowledge_base_id are required for /parse/file endpoint"
+                )
+            files["workspaceId"] = (None, workspace_id)
+            files["knowledgebaseId"] = (None, knowledge_base_id)
+
+        if not await self.input_exists(input_file_path):
+            logger.error(
+                f"Input {parsed_url.scheme.upper()} path does not exist: {input_file_path}"
+            )
+            return None
+
+        async with self._get_semaphore():
+            self.jobs += 1
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+            try:
+                logger.info(
+                    f"Sending document conversion request for {input_file_path}"
+                )
+                response = await self._submit_job(files)
+                if is_job:
+                    job_id = response.json().get("OCRJobId", None)
+                    if not job_id:
+                        raise ValueError(
+                            "No job ID found in the response for async processing"
+                        )
+                    logger.info(f"Document conversion job submitted with ID: {job_id}")
+                    if not await self.wait_for_job(job_id):
+                        logger.error(f"Job {job_id} did not complete successfully")
+                        return None
+                    logger.info(f"Job {job_id} completed successfully")
+                    await self._count_tokens(job_id)
+
+                json_bytes, md_bytes, md_nohf_bytes = await asyncio.gather(
+                    *[
+                        self._read_output(
+                            parsed_url.scheme,
+                            bucket_name,
+                            f"{output_relative_path}/{file_name_without_ext}{suffix}",
+                        )
+                        for suffix in [".json", ".md", "_nohf.md"]
+                    ]
+                )
+            finally:
+                self.in_flight -= 1
+
+        logger.info(f"Document conversion of {input_file_path} saved to {output_path}")
+        return {
+            "json": json.loads(json_bytes),
+            "md": md_bytes.decode("utf-8"),
+            "md_nohf": md_nohf_bytes.decode("utf-8"),
+        }
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "jobs": self.jobs,
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "status_polls": self.status_polls,
+        }
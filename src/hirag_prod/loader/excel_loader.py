@@ -1,20 +1,25 @@
 import asyncio
 import os
-from typing import Dict, List, Tuple
+from dataclasses import dataclass
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 from urllib.parse import unquote, urlparse
 
-import pandas as pd
+from openpyxl import load_workbook
 
 from hirag_prod._utils import compute_mdhash_id
-from hirag_prod.configs.functions import get_llm_config
+from hirag_prod.configs.functions import get_envs, get_llm_config
 from hirag_prod.exceptions import HiRAGException
 from hirag_prod.loader.utils import route_file_path
 from hirag_prod.prompt import PROMPTS
-from hirag_prod.resources.functions import get_chat_service
+from hirag_prod.resources.functions import (
+    get_chat_service,
+    get_token_counter,
+    get_worker_pool,
+)
 from hirag_prod.schema import (
-    Chunk,
+    ChunkRecord,
     File,
-    Item,
+    ItemRecord,
     create_file,
     file_to_item,
     item_to_chunk,
@@ -26,6 +31,151 @@ def _keep_sheet(name: str) -> bool:
     return ("cache" not in s) and ("detail" not in s)
 
 
+@dataclass
+class ExcelRowWindow:
+    """Consecutive rows of a sheet rendered as one LaTeX table with the sheet header"""
+
+    sheet_name: str
+    # 1-based sheet row numbers of the first and last data row
+    first_row: int
+    last_row: int
+    latex: str
+
+
+def _count_tokens(text: str) -> int:
+    # Rows are counted once, caching them would only evict the counts of chunks
+    return get_token_counter().count_uncached(text)
+
+
+def _format_row(values: Sequence[Any]) -> List[str]:
+    cells = ["" if value is None else str(value).replace("\n", " ") for value in values]
+    while cells and not cells[-1].strip():
+        cells.pop()
+    return cells
+
+
+def _latex_line(cells: List[str]) -> str:
+    return " & ".join(cells) + r" \\"
+
+
+def _render_latex(header: List[str], rows: List[List[str]]) -> str:
+    column_count = max([len(header)] + [len(row) for row in rows]) or 1
+
+    def line(cells: List[str]) -> str:
+        return _latex_line(cells + [""] * (column_count - len(cells)))
+
+    lines = [
+        r"\begin{tabular}{" + "l" * column_count + "}",
+        r"\toprule",
+        line(header),
+        r"\midrule",
+        *[line(row) for row in rows],
+        r"\bottomrule",
+        r"\end{tabular}",
+    ]
+    return "\n".join(lines)
+
+
+@dataclass
+class ExcelWindowBatch:
+    """Row windows of consecutive sheets of a workbook, see read_excel_row_windows"""
+
+    # Kept sheets of the whole workbook
+    sheet_names: List[str]
+    windows: List[ExcelRowWindow]
+    # Index of the worksheet the next batch starts at, None once the workbook is read
+    next_sheet: Optional[int]
+
+
+def read_excel_row_windows(
+    local_path: str,
+    max_tokens: Optional[int] = None,
+    max_rows: Optional[int] = None,
+    first_sheet: int = 0,
+    max_windows: Optional[int] = None,
+) -> ExcelWindowBatch:
+    """
+    Stream the kept sheets of a workbook from ``first_sheet`` on and cut them into
+    row windows.
+
+    Rows are read one at a time in openpyxl read-only mode, so at most one window of
+    rows is held besides the rendered windows. The first non-empty row of a sheet is
+    its header and is repeated at the top of every window, a window is closed before
+    it would exceed ``max_tokens`` tokens or ``max_rows`` rows.
+
+    Reading stops after the sheet that brings the batch to ``max_windows`` windows,
+    so a worker returns one bounded batch at a time instead of the whole workbook.
+    Windows are in sheet and row order, a sheet is never split across batches.
+    """
+    max_tokens = max_tokens or get_envs().EXCEL_WINDOW_MAX_TOKENS
+    max_rows = max_rows or get_envs().EXCEL_WINDOW_MAX_ROWS
+    max_windows = max_windows or get_envs().EXCEL_WINDOW_BATCH_MAX_WINDOWS
+
+    windows: List[ExcelRowWindow] = []
+    next_sheet: Optional[int] = None
+    workbook = load_workbook(local_path, read_only=True, data_only=True)
+    try:
+        sheet_names = [name for name in workbook.sheetnames if _keep_sheet(name)]
+        worksheets = workbook.worksheets
+        for sheet_index in range(first_sheet, len(worksheets)):
+            if len(windows) >= max_windows:
+                next_sheet = sheet_index
+                break
+            worksheet = worksheets[sheet_index]
+            if not _keep_sheet(worksheet.title):
+                continue
+
+            header: Optional[List[str]] = None
+            header_tokens = 0
+            rows: List[List[str]] = []
+            tokens = 0
+            first_row = last_row = 0
+            sheet_window_count = 0
+
+            for row_number, values in enumerate(
+                worksheet.iter_rows(values_only=True), start=1
+            ):
+                cells = _format_row(values)
+                if not cells:
+                    continue
+                if header is None:
+                    header = cells
+                    header_tokens = _count_tokens(_latex_line(header))
+                    tokens = header_tokens
+                    continue
+                row_tokens = _count_tokens(_latex_line(cells))
+                if rows and (tokens + row_tokens > max_tokens or len(rows) >= max_rows):
+                    windows.append(
+                        ExcelRowWindow(
+                            worksheet.title,
+                            first_row,
+                            last_row,
+                            _render_latex(header, rows),
+                        )
+                    )
+                    sheet_window_count += 1
+                    rows, tokens = [], header_tokens
+                if not rows:
+                    first_row = row_number
+                rows.append(cells)
+                tokens += row_tokens
+                last_row = row_number
+
+            # A sheet with only a header row still gets its table
+            if header is not None and (rows or sheet_window_count == 0):
+                windows.append(
+                    ExcelRowWindow(
+                        worksheet.title,
+                        first_row,
+                        last_row,
+                        _render_latex(header, rows),
+                    )
+                )
+    finally:
+        workbook.close()
+    return ExcelWindowBatch(sheet_names, windows, next_sheet)
+
+
 async def _summarize_excel_sheet(sheet_name: str, latex: str) -> str:
     system_prompt = PROMPTS["summary_excel_en"].format(
         sheet_name=sheet_name, latex=latex
@@ -38,10 +188,61 @@ async def _summarize_excel_sheet(sheet_name: str, latex: str) -> str:
         raise HiRAGException(f"Failed to summarize excel sheet {sheet_name}") from e
 
 
+async def _summarize_excel_windows(
+    windows: List[ExcelRowWindow], semaphore: Optional[asyncio.Semaphore] = None
+) -> List[str]:
+    """
+    Summarize the row windows with at most ``EXCEL_SUMMARY_CONCURRENCY`` LLM calls in
+    flight, or as many as ``semaphore`` allows. Only the first
+    ``EXCEL_SUMMARIZED_WINDOWS_PER_SHEET`` windows of a sheet are summarized, later
+    windows reuse the summary of the sheet's first window with their row range, so a
+    huge sheet does not cost one call per window.
+    """
+    semaphore = semaphore or asyncio.Semaphore(get_envs().EXCEL_SUMMARY_CONCURRENCY)
+    summarized_limit = get_envs().EXCEL_SUMMARIZED_WINDOWS_PER_SHEET
+
+    window_counts: Dict[str, int] = {}
+    for window in windows:
+        window_counts[window.sheet_name] = window_counts.get(window.sheet_name, 0) + 1
+
+    async def summarize(window: ExcelRowWindow) -> str:
+        sheet_name = window.sheet_name
+        if window_counts[sheet_name] > 1:
+            sheet_name = f"{sheet_name} (rows {window.first_row}-{window.last_row})"
+        async with semaphore:
+            return await _summarize_excel_sheet(sheet_name, window.latex)
+
+    window_indices: Dict[str, int] = {}
+    summarized_windows: List[ExcelRowWindow] = []
+    sheet_window_index: List[int] = []
+    for window in windows:
+        sheet_window_index.append(window_indices.get(window.sheet_name, 0))
+        window_indices[window.sheet_name] = sheet_window_index[-1] + 1
+        if sheet_window_index[-1] < summarized_limit:
+            summarized_windows.append(window)
+
+    summaries = iter(
+        await asyncio.gather(*[summarize(window) for window in summarized_windows])
+    )
+
+    captions: List[str] = []
+    sheet_captions: Dict[str, str] = {}
+    for window, index in zip(windows, sheet_window_index):
+        if index < summarized_limit:
+            captions.append(next(summaries))
+            sheet_captions.setdefault(window.sheet_name, captions[-1])
+        else:
+            captions.append(
+                f"{sheet_captions[window.sheet_name]} (rows {window.first_row}-"
+                f"{window.last_row} of sheet {window.sheet_name})"
+            )
+    return captions
+
+
 async def load_and_chunk_excel(
     document_path: str,
     document_meta: Dict,
-) -> Tuple[List[Chunk], File, List[Item]]:
+) -> Tuple[List[ChunkRecord], File, List[ItemRecord]]:
     try:
         if document_path.startswith("file://"):
             p = urlparse(document_path)
@@ -53,11 +254,9 @@ async def load_and_chunk_excel(
             except Exception:
                 local_path = document_path
 
-        all_sheets: Dict[str, pd.DataFrame] = pd.read_excel(local_path, None)
-
-        filtered_sheets = [
-            (name, df) for name, df in all_sheets.items() if _keep_sheet(name)
-        ]
+        # Windows come back one bounded batch at a time, each batch is turned into
+        # chunks while the summaries of the previous ones are still running
+        batch = await get_worker_pool().run(read_excel_row_windows, local_path)
 
         document_id = document_meta.get("documentKey", "")
         file_name = document_meta.get("fileName", os.path.basename(local_path))
@@ -66,55 +265,78 @@ async def load_and_chunk_excel(
             metadata=document_meta,
             documentKey=document_id,
             text=file_name,
-            pageNumber=len(filtered_sheets),
+            pageNumber=len(batch.sheet_names),
             fileName=file_name,
             uri=document_meta.get("uri", document_path),
             private=bool(document_meta.get("private", False)),
         )
 
-        latex_list: List[str] = []
-        sheet_names: List[str] = []
-        for sheet_name, df in filtered_sheets:
-            try:
-                latex_list.append(df.to_latex(index=False))
-            except Exception:
-                latex_list.append(df.to_string(index=False))
-            sheet_names.append(sheet_name)
+        semaphore = asyncio.Semaphore(get_envs().EXCEL_SUMMARY_CONCURRENCY)
+        summary_tasks: List[asyncio.Future] = []
+        items: List[ItemRecord] = []
+        chunks: List[ChunkRecord] = []
 
-        captions = await asyncio.gather(
-            *[
-                _summarize_excel_sheet(sheet_name, latex)
-                for sheet_name, latex in zip(sheet_names, latex_list)
-            ]
-        )
+        try:
+            while True:
+                summary_tasks.append(
+                    asyncio.ensure_future(
+                        _summarize_excel_windows(batch.windows, semaphore)
+                    )
+                )
+                window_counts: Dict[str, int] = {}
+                for window in batch.windows:
+                    window_counts[window.sheet_name] = (
+                        window_counts.get(window.sheet_name, 0) + 1
+                    )
 
-        items: List[Item] = []
-        chunks: List[Chunk] = []
+                for window in batch.windows:
+                    name = window.sheet_name
+                    if window_counts[name] == 1:
+                        sheet_key = compute_mdhash_id(
+                            f"{document_id}:{name}", prefix="chunk-"
+                        )
+                    else:
+                        sheet_key = compute_mdhash_id(
+                            f"{document_id}:{name}:{window.first_row}-{window.last_row}",
+                            prefix="chunk-",
+                        )
 
-        for idx, (name, latex, caption) in enumerate(
-            zip(sheet_names, latex_list, captions), start=1
-        ):
-            sheet_key = compute_mdhash_id(f"{document_id}:{name}", prefix="chunk-")
+                    item = file_to_item(
+                        generated_md,
+                        documentKey=sheet_key,
+                        text=(window.latex or "").strip(),
+                        documentId=document_id,
+                        chunkIdx=len(items) + 1,
+                    )
+                    item.chunkType = "excel_sheet"
+                    item.headers = [name]
 
-            item = file_to_item(
-                generated_md,
-                documentKey=sheet_key,
-                text=(latex or "").strip(),
-                documentId=document_id,
-                chunkIdx=idx,
-            )
-            item.caption = (caption or "None").strip()
-            item.chunkType = "excel_sheet"
-            item.headers = [name]
+                    chunk = item_to_chunk(item)
+                    chunk.text = (window.latex or "None").strip()
+                    chunk.chunkType = "excel_sheet"
+                    chunk.headers = [name]
+
+                    items.append(item)
+                    chunks.append(chunk)
 
-            chunk = item_to_chunk(item)
-            chunk.text = (latex or "None").strip()
-            chunk.caption = (caption or "None").strip()
-            chunk.chunkType = "excel_sheet"
-            chunk.headers = [name]
+                if batch.next_sheet is None:
+                    break
+                batch = await get_worker_pool().run(
+                    read_excel_row_windows, local_path, None, None, batch.next_sheet
+                )
 
-            items.append(item)
-            chunks.append(chunk)
+            captions = [
+                caption
+                for batch_captions in await asyncio.gather(*summary_tasks)
+                for caption in batch_captions
+            ]
+        finally:
+            for task in summary_tasks:
+                task.cancel()
+
+        for item, chunk, caption in zip(items, chunks, captions):
+            item.caption = (caption or "None").strip()
+            chunk.caption = item.caption
 
         return chunks, generated_md, items
 
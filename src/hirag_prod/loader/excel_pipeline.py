@@ -1,20 +1,126 @@
+import asyncio
 import logging
-from typing import Dict, List, Optional, Tuple
+import os
+import sys
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Set, Tuple
 from urllib.parse import unquote, urlparse
 
 import json_repair
-from openpyxl import Workbook, load_workbook
+from openpyxl import load_workbook
 from openpyxl.utils import get_column_letter
 
 from hirag_prod._utils import log_error_info
-from hirag_prod.configs.functions import get_config_manager, get_llm_config
+from hirag_prod.configs.functions import get_config_manager, get_envs, get_llm_config
 from hirag_prod.loader.utils import route_file_path
 from hirag_prod.prompt import PROMPTS
 from hirag_prod.resources.functions import get_chat_service
 
 logger = logging.getLogger(__name__)
 
-_WORKBOOK_CACHE: Dict[str, "Workbook"] = {}
+CellPosition = Tuple[int, int]
+# (local path, modification time, file size, sheet name)
+SheetKey = Tuple[str, int, int, str]
+
+
+class SheetCellIndex:
+    """
+    Cell text of one sheet, indexed once when the sheet is first cited from.
+
+    Maps the stripped text of every non-empty cell to its first (row, column) in
+    row-major order, so the labels the LLM copies from the table are found with one
+    dict lookup. Labels that are only part of a cell fall back to a scan of the
+    distinct cell texts, whose result is remembered.
+    """
+
+    def __init__(self, worksheet) -> None:
+        self.cells: Dict[str, CellPosition] = {}
+        for row, values in enumerate(worksheet.iter_rows(values_only=True), start=1):
+            for column, value in enumerate(values, start=1):
+                if value is None:
+                    continue
+                text = str(value).strip()
+                if text and text not in self.cells:
+                    self.cells[text] = (row, column)
+        self._contained: Dict[str, Optional[CellPosition]] = {}
+        self.size_bytes: int = sys.getsizeof(self.cells) + sum(
+            sys.getsizeof(text) + sys.getsizeof(position)
+            for text, position in self.cells.items()
+        )
+
+    def find(self, needle: str) -> Optional[CellPosition]:
+        """Position of the cell whose text is ``needle``, else of the first containing it"""
+        if not needle:
+            return None
+        target = str(needle).strip()
+        if not target:
+            return None
+        position = self.cells.get(target)
+        if position is not None:
+            return position
+        if target not in self._contained:
+            self._contained[target] = next(
+                (position for text, position in self.cells.items() if target in text),
+                None,
+            )
+        return self._contained[target]
+
+
+class SheetCellIndexCache:
+    """LRU of sheet cell indexes bounded by their estimated size in bytes"""
+
+    def __init__(self, max_size_bytes: Optional[int] = None) -> None:
+        self.max_size_bytes: Optional[int] = max_size_bytes
+        self._lru: "OrderedDict[SheetKey, SheetCellIndex]" = OrderedDict()
+        self._size_bytes: int = 0
+        self._lock = threading.Lock()
+        self.hits: int = 0
+        self.misses: int = 0
+
+    def _max_size_bytes(self) -> int:
+        if self.max_size_bytes is not None:
+            return self.max_size_bytes
+        return get_envs().EXCEL_CELL_INDEX_CACHE_MAX_SIZE_MB * 1024 * 1024
+
+    def get(self, key: SheetKey) -> Optional[SheetCellIndex]:
+        with self._lock:
+            index = self._lru.get(key)
+            if index is None:
+                self.misses += 1
+                return None
+            self._lru.move_to_end(key)
+            self.hits += 1
+            return index
+
+    def put(self, key: SheetKey, index: SheetCellIndex) -> None:
+        with self._lock:
+            previous = self._lru.pop(key, None)
+            if previous is not None:
+                self._size_bytes -= previous.size_bytes
+            self._lru[key] = index
+            self._size_bytes += index.size_bytes
+            # The newest index stays even when it alone is over the bound
+            while self._size_bytes > self._max_size_bytes() and len(self._lru) > 1:
+                _, evicted = self._lru.popitem(last=False)
+                self._size_bytes -= evicted.size_bytes
+
+    def clear(self) -> None:
+        with self._lock:
+            self._lru.clear()
+            self._size_bytes = 0
+
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "sheets": len(self._lru),
+                "size_bytes": self._size_bytes,
+                "hits": self.hits,
+                "misses": self.misses,
+            }
+
+
+_SHEET_INDEX_CACHE = SheetCellIndexCache()
 
 
 def _resolve_local_path(excel_uri: str) -> Optional[str]:
@@ -34,38 +140,40 @@ def _resolve_local_path(excel_uri: str) -> Optional[str]:
         return None
 
 
-def _get_workbook(excel_uri: str):
+def _get_sheet_index(excel_uri: str, sheet_name: str) -> Optional[SheetCellIndex]:
     local = _resolve_local_path(excel_uri)
     if not local:
         return None
-    if local in _WORKBOOK_CACHE:
-        return _WORKBOOK_CACHE[local]
+    try:
+        stat = os.stat(local)
+    except OSError as e:
+        log_error_info(logging.ERROR, f"Failed to open workbook: {local}", e)
+        return None
+    # A re-downloaded file at the same path gets a new key
+    key = (local, stat.st_mtime_ns, stat.st_size, sheet_name)
+    index = _SHEET_INDEX_CACHE.get(key)
+    if index is not None:
+        return index
     try:
         wb = load_workbook(local, data_only=True, read_only=True)
-        _WORKBOOK_CACHE[local] = wb
-        return wb
     except Exception as e:
         log_error_info(logging.ERROR, f"Failed to open workbook: {local}", e)
         return None
+    try:
+        if sheet_name not in wb.sheetnames:
+            return None
+        index = SheetCellIndex(wb[sheet_name])
+    finally:
+        wb.close()
+    _SHEET_INDEX_CACHE.put(key, index)
+    return index
 
 
-def _find_first_cell_containing(ws, needle: str) -> Optional[Tuple[int, int]]:
-    if not needle:
-        return None
-    target = str(needle).strip()
-    for row in ws.iter_rows():
-        for cell in row:
-            try:
-                if cell.value is not None and target in str(cell.value):
-                    return (cell.row, cell.column)
-            except Exception:
-                continue
-    return None
-
-
-def _find_cell_by_xy(ws, x_label: str, y_label: str) -> Optional[Tuple[str, str]]:
-    x_pos = _find_first_cell_containing(ws, x_label) if x_label else None
-    y_pos = _find_first_cell_containing(ws, y_label) if y_label else None
+def _find_cell_by_xy(
+    index: SheetCellIndex, x_label: Optional[str], y_label: Optional[str]
+) -> Optional[Tuple[str, str]]:
+    x_pos = index.find(x_label) if x_label else None
+    y_pos = index.find(y_label) if y_label else None
 
     if x_pos and y_pos:
         row = x_pos[0] if x_pos[1] < y_pos[1] else y_pos[0]
@@ -76,6 +184,14 @@ def _find_cell_by_xy(ws, x_label: str, y_label: str) -> Optional[Tuple[str, str]
         return None
 
 
+def _decode_coord(decoded_obj) -> Tuple[Optional[str], Optional[str]]:
+    if not isinstance(decoded_obj, dict):
+        return None, None
+    x = str(decoded_obj.get("x") or "").strip() or None
+    y = str(decoded_obj.get("y") or "").strip() or None
+    return x, y
+
+
 async def _extract_excel_cell_coord_by_llm(
     text_to_be_cited: str, excel_latex: str
 ) -> Tuple[Optional[str], Optional[str]]:
@@ -92,58 +208,164 @@ async def _extract_excel_cell_coord_by_llm(
         decoded_obj = json_repair.repair_json(
             excel_cell_coord_result, return_objects=True
         )
-        x = str(decoded_obj.get("x") or "").strip() or None
-        y = str(decoded_obj.get("y") or "").strip() or None
-        return x, y
+        return _decode_coord(decoded_obj)
     except Exception as e:
         log_error_info(logging.ERROR, "excel cell coordinate extraction failed", e)
         return None, None
 
 
+async def _extract_excel_cell_coords_by_llm(
+    texts_to_be_cited: List[str], excel_latex: str
+) -> List[Tuple[Optional[str], Optional[str]]]:
+    """x/y labels of the cells cited by several passages, with one LLM request"""
+    if len(texts_to_be_cited) == 1:
+        return [
+            await _extract_excel_cell_coord_by_llm(texts_to_be_cited[0], excel_latex)
+        ]
+    try:
+        locate_excel_cells_prompt = PROMPTS[
+            "locate_excel_cells_" + get_config_manager().language
+        ].format(
+            count=len(texts_to_be_cited),
+            texts_to_be_cited="\n\n".join(
+                f"{i}. {text}" for i, text in enumerate(texts_to_be_cited, start=1)
+            ),
+            excel_latex=excel_latex,
+        )
+        excel_cell_coords_result = await get_chat_service().complete(
+            prompt=locate_excel_cells_prompt,
+            model=get_llm_config().model_name,
+            timeout=get_llm_config().timeout,
+            max_tokens=get_llm_config().max_tokens,
+        )
+        decoded_list = json_repair.repair_json(
+            excel_cell_coords_result, return_objects=True
+        )
+        if isinstance(decoded_list, dict):
+            decoded_list = [decoded_list]
+        if not isinstance(decoded_list, list):
+            decoded_list = []
+        coords = [_decode_coord(decoded_obj) for decoded_obj in decoded_list]
+        if len(coords) != len(texts_to_be_cited):
+            logger.warning(
+                f"Excel cell location returned {len(coords)} answers "
+                f"for {len(texts_to_be_cited)} passages"
+            )
+        coords = coords[: len(texts_to_be_cited)]
+        return coords + [(None, None)] * (len(texts_to_be_cited) - len(coords))
+    except Exception as e:
+        log_error_info(logging.ERROR, "excel cell coordinate extraction failed", e)
+        return [(None, None)] * len(texts_to_be_cited)
+
+
+def _excel_chunk_target(chunk_like: Dict) -> Optional[Tuple[str, str, str]]:
+    """(workbook uri, sheet name, LaTeX text) of an excel_sheet chunk"""
+    if not chunk_like:
+        return None
+    chunk_type = (chunk_like.get("chunkType") or chunk_like.get("type") or "").lower()
+    if chunk_type != "excel_sheet":
+        return None
+
+    excel_latex = (chunk_like.get("text") or "").strip()
+    if not excel_latex:
+        return None
+
+    headers = chunk_like.get("headers") or []
+    sheet_name = headers[0] if headers else None
+    if not sheet_name:
+        return None
+
+    return chunk_like.get("uri") or "", sheet_name, excel_latex
+
+
+async def annotate_excel_cell_bboxes(
+    texts_to_cite: List[str], chunk_like: Dict
+) -> List[Optional[List[str]]]:
+    """
+    Compute numeric bboxes of several sentences citing the same excel_sheet chunk,
+    with a single LLM request for all of them. Returns one bbox or None per sentence,
+    see annotate_excel_cell_bbox.
+    """
+    bbox_list: List[Optional[List[str]]] = [None] * len(texts_to_cite)
+    try:
+        target = _excel_chunk_target(chunk_like)
+        if target is None or not texts_to_cite:
+            return bbox_list
+        excel_uri, sheet_name, excel_latex = target
+
+        index = await asyncio.to_thread(_get_sheet_index, excel_uri, sheet_name)
+        if index is None:
+            return bbox_list
+
+        distinct_texts = list(dict.fromkeys(texts_to_cite))
+        coords = await _extract_excel_cell_coords_by_llm(distinct_texts, excel_latex)
+        bbox_by_text: Dict[str, Optional[List[str]]] = {}
+        for text, (x_label, y_label) in zip(distinct_texts, coords):
+            pos = (
+                _find_cell_by_xy(index, x_label, y_label)
+                if x_label or y_label
+                else None
+            )
+            bbox_by_text[text] = [pos[1], pos[0]] if pos else None
+        return [bbox_by_text[text] for text in texts_to_cite]
+    except Exception as e:
+        log_error_info(logging.ERROR, "annotate_excel_cell_bboxes failed", e)
+        return bbox_list
+
+
+# Sentences waiting to be located, per event loop and cited sheet
+_BatchKey = Tuple[int, str, str, str]
+_PENDING_BATCHES: Dict[_BatchKey, List[Tuple[str, "asyncio.Future"]]] = {}
+_BATCH_TASKS: Set[asyncio.Task] = set()
+
+
+async def _flush_batch(key: _BatchKey, chunk_like: Dict) -> None:
+    batch = _PENDING_BATCHES.pop(key, [])
+    bbox_list: List[Optional[List[str]]] = [None] * len(batch)
+    try:
+        bbox_list = await annotate_excel_cell_bboxes(
+            [text for text, _ in batch], chunk_like
+        )
+    finally:
+        for (_, future), bbox in zip(batch, bbox_list):
+            if not future.done():
+                future.set_result(bbox)
+
+
 async def annotate_excel_cell_bbox(
     text_to_cite: str, chunk_like: Dict
 ) -> Optional[List[str]]:
     """
     Compute numeric bbox for an excel_sheet chunk:
     - Uses LLM to get x/y labels from the sentence and the chunk's LaTeX.
-    - Finds cell via openpyxl (sheet from headers[0], workbook from uri).
+    - Finds cell via the cell text index of the sheet (sheet from headers[0],
+      workbook from uri).
     - Returns bbox as [col_index, row_index] (1-based), or None if not found.
+
+    Calls for the same chunk that are started together (e.g. gathered over the
+    sentences of an answer) are answered by one LLM request.
     """
     try:
-        if not chunk_like:
-            return None
-        chunk_type = (
-            chunk_like.get("chunkType") or chunk_like.get("type") or ""
-        ).lower()
-        if chunk_type != "excel_sheet":
+        target = _excel_chunk_target(chunk_like)
+        if target is None:
             return None
 
-        excel_latex = (chunk_like.get("text") or "").strip()
-        if not excel_latex:
-            return None
+        loop = asyncio.get_running_loop()
+        key = (id(loop), *target)
+        batch = _PENDING_BATCHES.get(key)
+        if batch is None:
+            batch = _PENDING_BATCHES[key] = []
 
-        headers = chunk_like.get("headers") or []
-        sheet_name = headers[0] if headers else None
-        if not sheet_name:
-            return None
-
-        excel_uri = chunk_like.get("uri") or ""
-        wb = _get_workbook(excel_uri)
-        if wb is None or sheet_name not in wb.sheetnames:
-            return None
-
-        ws = wb[sheet_name]
-        x_label, y_label = await _extract_excel_cell_coord_by_llm(
-            text_to_cite, excel_latex
-        )
-        if not (x_label or y_label):
-            return None
-        pos = _find_cell_by_xy(ws, x_label, y_label)
-        if not pos:
-            return None
+            def flush() -> None:
+                task = loop.create_task(_flush_batch(key, chunk_like))
+                _BATCH_TASKS.add(task)
+                task.add_done_callback(_BATCH_TASKS.discard)
 
-        row_idx, col_idx = pos[0], pos[1]
-        return [col_idx, row_idx]
+            # Runs once every call already scheduled on the loop has joined the batch
+            loop.call_soon(flush)
+        future = loop.create_future()
+        batch.append((text_to_cite, future))
+        return await future
     except Exception as e:
         log_error_info(logging.ERROR, "annotate_excel_cell_bbox failed", e)
         return None
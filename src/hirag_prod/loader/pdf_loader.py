@@ -1,6 +1,6 @@
 from docling.datamodel.base_models import InputFormat
 from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
-from docling.document_converter import DocumentConverter, PdfFormatOption
+from docling.document_converter import PdfFormatOption
 
 from hirag_prod.loader.base_loader import BaseLoader
 
@@ -13,8 +13,6 @@ class PDFLoader(BaseLoader):
         pipeline_options.table_structure_options.mode = (
             TableFormerMode.ACCURATE
         )  # use more accurate TableFormer model
-        self.loader_docling = DocumentConverter(
-            format_options={
-                InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
-            }
-        )
+        self.docling_format_options = {
+            InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)
+        }
@@ -0,0 +1,135 @@
+import logging
+from typing import List, Optional, Tuple
+
+import pypdfium2
+from docling_core.types.doc import DoclingDocument
+
+from hirag_prod.configs.functions import get_envs
+from hirag_prod.loader.conversion_cache import get_docling_document_cache_key
+from hirag_prod.loader.pdf_loader import PDFLoader
+from hirag_prod.loader.utils import route_file_path, validate_document_path
+from hirag_prod.resources.functions import (
+    get_conversion_cache,
+    get_document_converter_pool,
+    get_worker_pool,
+)
+from hirag_prod.schema import File
+
+logger = logging.getLogger("HiRAG")
+
+
+def get_pdf_page_count(document_path: str) -> int:
+    pdf = pypdfium2.PdfDocument(document_path)
+    try:
+        return len(pdf)
+    finally:
+        pdf.close()
+
+
+def prepare_pdf(document_path: str) -> Tuple[str, int, Optional[str]]:
+    """Download the PDF once, count its pages and get its conversion cache key"""
+    try:
+        document_path = route_file_path("docling", document_path)
+    except Exception as e:
+        logger.warning(f"Unexpected error in route_file_path, using original path: {e}")
+    validate_document_path(document_path)
+    return (
+        document_path,
+        get_pdf_page_count(document_path),
+        get_docling_document_cache_key(
+            document_path, PDFLoader().docling_format_options
+        ),
+    )
+
+
+def load_cached_pdf_document(
+    cache_key: str, document_meta: dict
+) -> Optional[Tuple[DoclingDocument, File]]:
+    docling_doc = get_conversion_cache().get_docling_document(cache_key)
+    if docling_doc is None:
+        return None
+    return docling_doc, PDFLoader().create_docling_file(docling_doc, document_meta)
+
+
+def split_page_ranges(page_count: int, range_size: int) -> List[Tuple[int, int]]:
+    """1-based inclusive page ranges of at most ``range_size`` pages"""
+    return [
+        (start, min(start + range_size - 1, page_count))
+        for start in range(1, page_count + 1, range_size)
+    ]
+
+
+def convert_pdf_page_range(
+    document_path: str, page_range: Tuple[int, int]
+) -> DoclingDocument:
+    """Convert the pages of ``page_range`` only, page numbers stay those of the file"""
+    with get_document_converter_pool().acquire(
+        PDFLoader().docling_format_options
+    ) as converter:
+        return converter.convert(document_path, page_range=page_range).document
+
+
+def merge_docling_documents(document_list: List[DoclingDocument]) -> DoclingDocument:
+    """Concatenate the documents of consecutive page ranges of one file.
+
+    Items keep their order, page numbers and bboxes, so headings and the table of
+    contents built from them come out as for a document converted in one piece.
+    """
+    if len(document_list) == 1:
+        return document_list[0]
+    merged_document = DoclingDocument.concatenate(document_list)
+    merged_document.name = document_list[0].name
+    merged_document.origin = document_list[0].origin
+    return merged_document
+
+
+def merge_page_range_documents(
+    document_list: List[DoclingDocument],
+    document_meta: dict,
+    cache_key: Optional[str] = None,
+) -> Tuple[DoclingDocument, File]:
+    docling_doc = merge_docling_documents(document_list)
+    if cache_key:
+        get_conversion_cache().put_docling_document(cache_key, docling_doc)
+    return docling_doc, PDFLoader().create_docling_file(docling_doc, document_meta)
+
+
+async def load_pdf_in_page_ranges(
+    document_path: str, document_meta: dict
+) -> Optional[Tuple[DoclingDocument, File]]:
+    """
+    Convert a PDF with docling in page ranges on the ingestion worker pool.
+
+    Returns None when the PDF is not longer than one range or the worker pool is
+    disabled, the caller then converts it in one piece.
+    """
+    range_size = get_envs().PDF_PAGE_RANGE_SIZE
+    if (
+        not get_worker_pool().enabled
+        or range_size <= 0
+        or not hasattr(DoclingDocument, "concatenate")
+    ):
+        return None
+    local_document_path, page_count, cache_key = await get_worker_pool().run(
+        prepare_pdf, document_path
+    )
+    if page_count <= range_size:
+        return None
+    if cache_key:
+        result = await get_worker_pool().run(
+            load_cached_pdf_document, cache_key, document_meta
+        )
+        if result is not None:
+            return result
+
+    page_range_list = split_page_ranges(page_count, range_size)
+    logger.info(
+        f"📑 Converting {page_count} pages of {document_path} in {len(page_range_list)} page ranges"
+    )
+    document_list = await get_worker_pool().map(
+        convert_pdf_page_range,
+        [(local_document_path, page_range) for page_range in page_range_list],
+    )
+    return await get_worker_pool().run(
+        merge_page_range_documents, document_list, document_meta, cache_key
+    )
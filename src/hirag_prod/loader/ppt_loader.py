@@ -1,8 +1,5 @@
-from docling.document_converter import DocumentConverter
-
 from hirag_prod.loader.base_loader import BaseLoader
 
 
 class PowerPointLoader(BaseLoader):
-    def __init__(self):
-        self.loader_docling = DocumentConverter()
+    """Loads PowerPoint documents"""
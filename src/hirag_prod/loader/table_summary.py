@@ -0,0 +1,300 @@
+import asyncio
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import Any, AsyncContextManager, Callable, Dict, List, Optional
+
+import json_repair
+
+from hirag_prod._utils import log_error_info
+from hirag_prod.configs.functions import get_envs, get_llm_config
+from hirag_prod.prompt import PROMPTS
+from hirag_prod.resources.functions import get_chat_service, get_redis
+from hirag_prod.singleton_registry import register_singleton
+
+logger = logging.getLogger("HiRAG")
+
+
+def normalize_table_text(text: str) -> str:
+    """Table text with runs of whitespace collapsed, the same table exported twice
+    with different indentation or line breaks gets the same summary"""
+    return " ".join((text or "").split())
+
+
+class TableSummarizer:
+    """
+    Captions of document tables for retrieval.
+
+    - Tables shorter than ``TABLE_SUMMARY_MIN_CHARS`` are their own caption, an LLM
+      summary would not be shorter or more searchable than the table.
+    - Summaries are cached by the hash of the normalized table text and the model,
+      in an in-process LRU and in Redis when it is initialized.
+    - Small tables missing from the cache are packed up to
+      ``TABLE_SUMMARY_PACK_MAX_TABLES`` tables and ``TABLE_SUMMARY_PACK_MAX_CHARS``
+      characters per prompt.
+    - At most ``TABLE_SUMMARY_CONCURRENCY`` summarization requests are in flight.
+    """
+
+    _instance: Optional["TableSummarizer"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs) -> "TableSummarizer":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    register_singleton(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_created", False):
+            return
+        self.max_entries: int = get_envs().TABLE_SUMMARY_CACHE_MAX_ENTRIES
+        self._lru: "OrderedDict[str, str]" = OrderedDict()
+        self._lru_lock = threading.Lock()
+        self._semaphores: Dict[int, asyncio.Semaphore] = {}
+        self.inline_captions: int = 0
+        self.lru_hits: int = 0
+        self.redis_hits: int = 0
+        self.deduplicated: int = 0
+        self.requests: int = 0
+        self.packed_tables: int = 0
+        self.failures: int = 0
+        self._created: bool = True
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._instance = None
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # A semaphore belongs to the event loop it is first used in
+        loop_id = id(asyncio.get_running_loop())
+        semaphore = self._semaphores.get(loop_id)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(get_envs().TABLE_SUMMARY_CONCURRENCY)
+            self._semaphores[loop_id] = semaphore
+        return semaphore
+
+    @staticmethod
+    def _cache_key(normalized_text: str, model: str) -> str:
+        text_hash = hashlib.sha256(normalized_text.encode("utf-8")).hexdigest()
+        return f"{model or ''}:{text_hash}"
+
+    @staticmethod
+    def _redis_key(key: str) -> str:
+        return f"{get_envs().REDIS_KEY_PREFIX}:table_summary:{key}"
+
+    @staticmethod
+    def _redis():
+        try:
+            return get_redis()
+        except RuntimeError:
+            # Redis is not initialized, only the in-process LRU is used
+            return None
+
+    def _lru_get(self, key: str) -> Optional[str]:
+        with self._lru_lock:
+            value = self._lru.get(key)
+            if value is not None:
+                self._lru.move_to_end(key)
+            return value
+
+    def _lru_set(self, key: str, value: str) -> None:
+        with self._lru_lock:
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    async def _get_cached(self, keys: List[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        remote: List[str] = []
+        for key in keys:
+            value = self._lru_get(key)
+            if value is not None:
+                found[key] = value
+                self.lru_hits += 1
+            else:
+                remote.append(key)
+
+        redis = self._redis() if remote else None
+        if redis is None:
+            return found
+        try:
+            values = await redis.mget([self._redis_key(key) for key in remote])
+        except Exception as e:
+            log_error_info(logging.WARNING, "Table summary lookup in Redis failed", e)
+            return found
+        for key, value in zip(remote, values):
+            if value is None:
+                continue
+            value = value.decode("utf-8") if isinstance(value, bytes) else value
+            found[key] = value
+            self._lru_set(key, value)
+            self.redis_hits += 1
+        return found
+
+    async def _set_cached(self, summaries: Dict[str, str]) -> None:
+        for key, value in summaries.items():
+            self._lru_set(key, value)
+
+        redis = self._redis()
+        if redis is None or not summaries:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, value in summaries.items():
+                    pipe.set(
+                        self._redis_key(key), value, ex=get_envs().REDIS_EXPIRE_TTL
+                    )
+                await pipe.execute()
+        except Exception as e:
+            log_error_info(logging.WARNING, "Table summary write to Redis failed", e)
+
+    @staticmethod
+    def _pack(table_texts: List[str]) -> List[List[int]]:
+        """Group table indexes into prompts, larger tables than the budget go alone"""
+        max_chars = get_envs().TABLE_SUMMARY_PACK_MAX_CHARS
+        max_tables = get_envs().TABLE_SUMMARY_PACK_MAX_TABLES
+        packs: List[List[int]] = []
+        current: List[int] = []
+        current_chars = 0
+        for index in sorted(range(len(table_texts)), key=lambda i: len(table_texts[i])):
+            size = len(table_texts[index])
+            if current and (
+                current_chars + size > max_chars or len(current) >= max_tables
+            ):
+                packs.append(current)
+                current, current_chars = [], 0
+            current.append(index)
+            current_chars += size
+        if current:
+            packs.append(current)
+        return packs
+
+    async def _complete(self, prompt: str, slot: Callable[[], Any]) -> str:
+        async with self._get_semaphore():
+            async with slot():
+                self.requests += 1
+                return await get_chat_service().complete(
+                    prompt=prompt, model=get_llm_config().model_name
+                )
+
+    async def _summarize_one(
+        self, table_text: str, slot: Callable[[], Any]
+    ) -> Optional[str]:
+        try:
+            return await self._complete(
+                PROMPTS["summary_table_en"].format(table_content=table_text), slot
+            )
+        except Exception as e:
+            log_error_info(logging.WARNING, "Failed to summarize table", e)
+            self.failures += 1
+            return None
+
+    async def _summarize_pack(
+        self, table_texts: List[str], slot: Callable[[], Any]
+    ) -> List[Optional[str]]:
+        if len(table_texts) == 1:
+            return [await self._summarize_one(table_texts[0], slot)]
+
+        prompt = PROMPTS["summary_tables_en"].format(
+            count=len(table_texts),
+            tables="\n\n".join(
+                f'<table id="{i}">\n{table_text}\n</table>'
+                for i, table_text in enumerate(table_texts, start=1)
+            ),
+        )
+        try:
+            decoded = json_repair.repair_json(
+                await self._complete(prompt, slot), return_objects=True
+            )
+            if (
+                isinstance(decoded, list)
+                and len(decoded) == len(table_texts)
+                and all(isinstance(summary, str) and summary for summary in decoded)
+            ):
+                self.packed_tables += len(table_texts)
+                return decoded
+            logger.warning(
+                f"Packed table summary did not return {len(table_texts)} summaries, "
+                "summarizing the tables one by one"
+            )
+        except Exception as e:
+            log_error_info(logging.WARNING, "Failed to summarize packed tables", e)
+        return list(
+            await asyncio.gather(
+                *[self._summarize_one(table_text, slot) for table_text in table_texts]
+            )
+        )
+
+    async def summarize(
+        self,
+        table_texts: List[str],
+        slot: Optional[Callable[[], AsyncContextManager]] = None,
+    ) -> List[Optional[str]]:
+        """
+        Captions of ``table_texts`` in order, None for tables whose summarization
+        failed. ``slot`` wraps every LLM request, e.g. a fair-share scheduler slot.
+        """
+        slot = slot or nullcontext
+        min_chars = get_envs().TABLE_SUMMARY_MIN_CHARS
+        model = get_llm_config().model_name
+
+        captions: List[Optional[str]] = [None] * len(table_texts)
+        indexes_by_key: Dict[str, List[int]] = {}
+        text_by_key: Dict[str, str] = {}
+        for i, table_text in enumerate(table_texts):
+            normalized_text = normalize_table_text(table_text)
+            if len(normalized_text) < min_chars:
+                captions[i] = (table_text or "").strip() or None
+                self.inline_captions += 1
+                continue
+            key = self._cache_key(normalized_text, model)
+            indexes_by_key.setdefault(key, []).append(i)
+            text_by_key.setdefault(key, table_text)
+        self.deduplicated += sum(
+            len(indexes) - 1 for indexes in indexes_by_key.values()
+        )
+
+        summaries = await self._get_cached(list(indexes_by_key))
+        missing_keys = [key for key in indexes_by_key if key not in summaries]
+        if missing_keys:
+            missing_texts = [text_by_key[key] for key in missing_keys]
+            packs = self._pack(missing_texts)
+            pack_summaries = await asyncio.gather(
+                *[
+                    self._summarize_pack([missing_texts[i] for i in pack], slot)
+                    for pack in packs
+                ]
+            )
+            summarized: Dict[str, str] = {}
+            for pack, pack_summary in zip(packs, pack_summaries):
+                for i, summary in zip(pack, pack_summary):
+                    if summary:
+                        summarized[missing_keys[i]] = summary
+            await self._set_cached(summarized)
+            summaries.update(summarized)
+
+        for key, indexes in indexes_by_key.items():
+            for i in indexes:
+                captions[i] = summaries.get(key)
+        return captions
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._lru),
+            "inline_captions": self.inline_captions,
+            "lru_hits": self.lru_hits,
+            "redis_hits": self.redis_hits,
+            "deduplicated": self.deduplicated,
+            "requests": self.requests,
+            "packed_tables": self.packed_tables,
+            "failures": self.failures,
+        }
+
+    def clear(self) -> None:
+        with self._lru_lock:
+            self._lru.clear()
@@ -1,12 +1,16 @@
+import hashlib
 import json
 import logging
 import os
+import shutil
 import tempfile
+import threading
 from pathlib import Path
-from typing import Dict, Literal, Union
+from typing import Dict, Literal, Optional, Union
 from urllib.parse import ParseResult, urlparse
 
 import boto3
+from boto3.s3.transfer import TransferConfig
 from botocore.client import BaseClient
 from botocore.config import Config
 from botocore.exceptions import ClientError
@@ -15,8 +19,10 @@ from docling_core.types import DoclingDocument
 from hirag_prod._utils import log_error_info
 from hirag_prod.configs.functions import (
     get_cloud_storage_config,
+    get_envs,
     initialize_config_manager,
 )
+from hirag_prod.resources.functions import get_object_storage_client
 from hirag_prod.schema import LoaderType
 
 S3_DOWNLOAD_DIR = "/chatbot/files/s3"
@@ -75,25 +81,45 @@ def download_load_file(
 
 
 def create_s3_client(storage_type: Literal["s3", "oss"]) -> BaseClient:
+    """Create a new client, use get_object_storage_client for the pooled one"""
     config_dict: Dict = {
         "aws_access_key_id": get_cloud_storage_config(storage_type).access_key_id,
         "aws_secret_access_key": get_cloud_storage_config(
             storage_type
         ).access_key_secret,
     }
+    max_pool_connections: int = get_envs().OBJECT_STORAGE_MAX_POOL_CONNECTIONS
     if storage_type == "oss":
         config_dict["endpoint_url"] = get_cloud_storage_config(storage_type).end_point
         config_dict["config"] = Config(
-            s3={"addressing_style": "virtual"}, signature_version="v4"
+            s3={"addressing_style": "virtual"},
+            signature_version="v4",
+            max_pool_connections=max_pool_connections,
         )
+    else:
+        config_dict["config"] = Config(max_pool_connections=max_pool_connections)
 
     return boto3.client("s3", **config_dict)
 
 
+def get_transfer_config() -> TransferConfig:
+    """Objects above the threshold are downloaded in parallel ranged GETs"""
+    return TransferConfig(
+        multipart_threshold=get_envs().OBJECT_STORAGE_MULTIPART_THRESHOLD_MB
+        * 1024
+        * 1024,
+        multipart_chunksize=get_envs().OBJECT_STORAGE_MULTIPART_CHUNK_SIZE_MB
+        * 1024
+        * 1024,
+        max_concurrency=get_envs().OBJECT_STORAGE_MAX_CONCURRENCY,
+        use_threads=True,
+    )
+
+
 def exists_cloud_file(
     storage_type: Literal["s3", "oss"], bucket_name: str, cloud_file_path: str
 ) -> bool:
-    s3_client: BaseClient = create_s3_client(storage_type)
+    s3_client: BaseClient = get_object_storage_client(storage_type)
     try:
         s3_client.head_object(Bucket=bucket_name, Key=cloud_file_path)
         return True
@@ -104,6 +130,20 @@ def exists_cloud_file(
         return False
 
 
+def get_cloud_file_etag(
+    storage_type: Literal["s3", "oss"], bucket_name: str, cloud_file_path: str
+) -> Optional[str]:
+    """ETag of a file in a cloud bucket, a hash of its content. None if unavailable."""
+    s3_client: BaseClient = get_object_storage_client(storage_type)
+    try:
+        response = s3_client.head_object(Bucket=bucket_name, Key=cloud_file_path)
+    except ClientError as e:
+        log_error_info(logging.WARNING, f"Failed to get file ETag", e)
+        return None
+    etag = response.get("ETag", "").strip('"')
+    return etag or None
+
+
 # List files in s3
 def list_cloud_files(storage_type: Literal["s3", "oss"], prefix: str = None) -> bool:
     """
@@ -116,7 +156,7 @@ def list_cloud_files(storage_type: Literal["s3", "oss"], prefix: str = None) ->
     Returns:
         bool: True if the file list was successfully printed, False otherwise.
     """
-    s3_client: BaseClient = create_s3_client(storage_type)
+    s3_client: BaseClient = get_object_storage_client(storage_type)
     try:
         if prefix is None:
             response = s3_client.list_objects_v2(
@@ -160,9 +200,14 @@ def download_cloud_file(
     Returns:
         bool: True if the file was downloaded successfully, False otherwise.
     """
-    s3_client: BaseClient = create_s3_client(storage_type)
+    s3_client: BaseClient = get_object_storage_client(storage_type)
     try:
-        s3_client.download_file(bucket_name, cloud_file_path, download_file_path)
+        s3_client.download_file(
+            bucket_name,
+            cloud_file_path,
+            download_file_path,
+            Config=get_transfer_config(),
+        )
         logger.info(
             f"✅ Successfully downloaded {cloud_file_path} to {download_file_path}"
         )
@@ -172,6 +217,103 @@ def download_cloud_file(
         return False
 
 
+def read_cloud_file(
+    storage_type: Literal["s3", "oss"], bucket_name: str, cloud_file_path: str
+) -> bytes:
+    """Read a file from a cloud bucket into memory, without a local copy."""
+    s3_client: BaseClient = get_object_storage_client(storage_type)
+    response = s3_client.get_object(Bucket=bucket_name, Key=cloud_file_path)
+    with response["Body"] as body:
+        return body.read()
+
+
+def _evict_download_cache(download_dir: str, keep_dir: str) -> None:
+    """Remove the least recently used downloads until the directory fits again"""
+    max_size_bytes: int = get_envs().CLOUD_DOWNLOAD_CACHE_MAX_SIZE_MB * 1024 * 1024
+    entry_list = []
+    for entry in os.scandir(download_dir):
+        if not entry.is_dir():
+            continue
+        size_bytes = sum(
+            os.path.getsize(os.path.join(directory, file_name))
+            for directory, _, file_name_list in os.walk(entry.path)
+            for file_name in file_name_list
+        )
+        entry_list.append((entry.stat().st_mtime, size_bytes, entry.path))
+    total_size_bytes = sum(size_bytes for _, size_bytes, _ in entry_list)
+    for _, size_bytes, path in sorted(entry_list):
+        if total_size_bytes <= max_size_bytes:
+            break
+        if path == keep_dir:
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        total_size_bytes -= size_bytes
+        logger.info(f"🗑️ Evicted cached download {path}")
+
+
+def download_cloud_file_cached(
+    storage_type: Literal["s3", "oss"],
+    bucket_name: str,
+    cloud_file_path: str,
+    download_dir: str,
+) -> str:
+    """
+    Download a file into ``download_dir`` and reuse it while its ETag is unchanged.
+
+    Every object gets its own directory, so files of the same name in different
+    buckets or prefixes do not overwrite each other and keep their file name.
+
+    Returns:
+        str: The local path of the file.
+    """
+    object_dir = os.path.join(
+        download_dir,
+        hashlib.md5(
+            f"{storage_type}://{bucket_name}/{cloud_file_path}".encode("utf-8"),
+            usedforsecurity=False,
+        ).hexdigest(),
+    )
+    local_file_path = os.path.join(object_dir, os.path.basename(cloud_file_path))
+    etag_path = os.path.join(object_dir, ".etag")
+
+    etag = get_cloud_file_etag(storage_type, bucket_name, cloud_file_path)
+    if etag is not None and os.path.exists(local_file_path):
+        try:
+            with open(etag_path, "r") as f:
+                cached_etag = f.read()
+        except FileNotFoundError:
+            cached_etag = None
+        if cached_etag == etag:
+            os.utime(object_dir)
+            logger.info(f"♻️ Reusing downloaded {cloud_file_path} (ETag {etag})")
+            return local_file_path
+
+    os.makedirs(object_dir, exist_ok=True)
+    part_path = f"{local_file_path}.{os.getpid()}-{threading.get_ident()}.part"
+    try:
+        if not download_cloud_file(
+            storage_type, bucket_name, cloud_file_path, part_path
+        ):
+            raise ValueError(f"Failed to download {cloud_file_path} from {bucket_name}")
+        os.replace(part_path, local_file_path)
+    finally:
+        if os.path.exists(part_path):
+            os.remove(part_path)
+    # A file replaced during the download keeps the older ETag here, so the next
+    # call sees the mismatch and downloads it again
+    if etag is not None:
+        with open(etag_path, "w") as f:
+            f.write(etag)
+    else:
+        try:
+            os.remove(etag_path)
+        except FileNotFoundError:
+            pass
+
+    _evict_download_cache(download_dir, keep_dir=object_dir)
+    return local_file_path
+
+
 # ========================================================================
 # File path router
 # ========================================================================
@@ -191,22 +333,13 @@ def route_file_path(loader_type: LoaderType, url_path: str) -> str:
 
     bucket_name = parsed_url.netloc
     file_path = parsed_url.path.lstrip("/")
-    file_name = os.path.basename(file_path)
 
     if parsed_url.scheme == "s3":
-        local_file_path = os.path.join(S3_DOWNLOAD_DIR, file_name)
-        os.makedirs(S3_DOWNLOAD_DIR, exist_ok=True)
-        flag = download_cloud_file("s3", bucket_name, file_path, local_file_path)
-        if not flag:
-            raise ValueError(f"Failed to download {file_path} from {bucket_name}")
-        return local_file_path
+        return download_cloud_file_cached("s3", bucket_name, file_path, S3_DOWNLOAD_DIR)
     elif parsed_url.scheme == "oss":
-        local_file_path = os.path.join(OSS_DOWNLOAD_DIR, file_name)
-        os.makedirs(OSS_DOWNLOAD_DIR, exist_ok=True)
-        flag = download_cloud_file("oss", bucket_name, file_path, local_file_path)
-        if not flag:
-            raise ValueError(f"Failed to download {file_path} from {bucket_name}")
-        return local_file_path
+        return download_cloud_file_cached(
+            "oss", bucket_name, file_path, OSS_DOWNLOAD_DIR
+        )
     else:
         raise ValueError(f"Unsupported scheme: '{parsed_url.scheme}'")
 
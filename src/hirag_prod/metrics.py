@@ -18,6 +18,9 @@ class ProcessingMetrics:
     total_entities: int = 0
     total_relations: int = 0
     processing_time: float = 0.0
+    # Seconds from the start of processing until chunks are queryable / all stages end
+    time_to_searchable: float = 0.0
+    time_to_complete: float = 0.0
     error_count: int = 0
     file_id: str = ""
 
@@ -28,6 +31,8 @@ class ProcessingMetrics:
             "total_entities": self.total_entities,
             "total_relations": self.total_relations,
             "processing_time": self.processing_time,
+            "time_to_searchable": self.time_to_searchable,
+            "time_to_complete": self.time_to_complete,
             "error_count": self.error_count,
             "file_id": self.file_id,
         }
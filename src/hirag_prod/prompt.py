@@ -361,6 +361,22 @@ Table content:
 **Output:**
 """
 
+PROMPTS[
+    "summary_tables_en"
+] = """
+You are an expert assistant in interpreting tables rendered in html or markdown format. 
+Given {count} numbered tables, generate for each table a concise, keyword-rich description that captures the table's structure, key columns, data themes, and essential details. 
+Each description should be optimized for embedding-based semantic search, enabling precise and efficient retrieval when queried, and must only describe its own table.
+
+Return exactly one JSON array of {count} strings, the description of table 1 first, in the order of the table ids, and nothing other than the JSON (do not use code block markers).
+
+**Input:**
+Tables:
+{tables}
+
+**Output (JSON array):**
+"""
+
 PROMPTS[
     "locate_excel_cell_en"
 ] = """
@@ -401,6 +417,46 @@ Please strictly output a standard JSON, using the exact text as it appears in th
 **Output (JSON format):**
 """
 
+PROMPTS[
+    "locate_excel_cells_en"
+] = """
+You are a meticulous Excel cell-location assistant. I will provide you with several numbered passages and one reference Excel table (LaTeX format).
+For every passage, locate the cell it cites, using the exact text as it appears in the Excel table (do not modify a single token or omit a single character).
+
+<Definitions>
+- Column label (x): the topmost row of the table (the horizontal header describing each column). Output to x.
+- Row label (y): the leftmost column of the table (the vertical header describing each row). Output to y.
+</Definitions>
+
+<Requirements>
+1. Return exactly one JSON array with one object per passage, in the order of the passages, and do not output anything other than the JSON (do not use code block markers).
+2. Never swap x and y: if it is a column name → put it in x; if it is a row name → put it in y.
+3. If only one can be determined, output an empty string "" for the other.
+4. Every object uses the fixed structure below, and keeps x and y exactly identical to the original text from the Excel table (including case, spaces, and newline characters):
+{{
+  x: string
+  y: string
+}}
+5. If you cannot determine the answer for a passage, output {{"x": "", "y": ""}} at its position.
+</Requirements>
+
+<Self-checklist>
+- Does the array have exactly {count} objects, in the order of the passages?
+- Does x come from the top header? Does y come from the leftmost column?
+- Did you output only one JSON array, with no extra text or punctuation?
+</Self-checklist>
+
+<Input passages>
+{texts_to_be_cited}
+</Input passages>
+
+<Reference Excel (LaTeX format)>
+{excel_latex}
+</Reference Excel (LaTeX format)>
+
+**Output (JSON format):**
+"""
+
 # ===============================
 # Prompt(CN-Simplified): 简体中文提示词
 # ===============================
@@ -758,6 +814,46 @@ PROMPTS[
 **输出 (JSON 格式):**
 """
 
+PROMPTS[
+    "locate_excel_cells_cn-s"
+] = """
+你是一个严谨的 excel 定位助手。我将给你若干段带编号的文本和一个参考的 excel (Latex 格式)。
+请为每段文本定位其引用的单元格，使用 excel 中出现的原文 (一个词元都不能改，一个字符都不能少)
+
+<定义>
+- 列标签(x): 位于表格最上方的一行（横向表头，描述每一列）。输出到 x。
+- 行标签(y): 位于表格最左侧的一列（纵向表头，描述每一行）。输出到 y。
+</定义>
+
+<要求>
+1. 仅返回一个 JSON 数组，每段文本对应一个对象，顺序与文本编号一致，且不要输出除 JSON 之外的任何内容（不要使用代码块标记）。
+2. 绝不要交换 x 和 y：确定是列名 → 放到 x；确定是行名 → 放到 y。
+3. 如果只能确定其中一项，另一项请输出空字符串 ""。
+4. 每个对象的固定结构如下，并保持与 excel 原文完全一致（包括大小写、空格、换行符）：
+{{
+  x: string
+  y: string
+}}
+5. 如果某段文本无法判断，在其位置输出 {{"x": "", "y": ""}}。
+</要求>
+
+<自检清单>
+- 数组是否恰好有 {count} 个对象，且顺序与文本编号一致？
+- x 是否来自顶端表头？y 是否来自最左列？
+- 是否只输出了一个 JSON 数组，且没有多余文本或标点？
+</自检清单>
+
+<输入文本>
+{texts_to_be_cited}
+</输入文本>
+
+<参考的 excel (Latex 格式)>
+{excel_latex}
+</参考的 excel (Latex 格式)>
+
+**输出 (JSON 格式):**
+"""
+
 # ===============================
 # Prompt(CN-Traditional): 繁體中文提示詞
 # ===============================
@@ -1191,3 +1287,43 @@ PROMPTS[
 
 **輸出 (JSON 格式):**
 """
+
+PROMPTS[
+    "locate_excel_cells_cn-t"
+] = """
+你是一個嚴謹的 excel 定位助手。我將給你若干段帶編號的文本和一個參考的 excel (Latex 格式)。
+請為每段文本定位其引用的儲存格，使用 excel 中出現的原文 (一個詞元都不能改，一個字元都不能少)
+
+<定義>
+- 列標籤(x): 位於表格最上方的一行（橫向表頭，描述每一列）。輸出到 x。
+- 行標籤(y): 位於表格最左側的一列（縱向表頭，描述每一行）。輸出到 y。
+</定義>
+
+<要求>
+1. 僅返回一個 JSON 陣列，每段文本對應一個對象，順序與文本編號一致，且不要輸出除 JSON 之外的任何內容（不要使用代碼塊標記）。
+2. 絕不要交換 x 和 y：確定是列名 → 放到 x；確定是行名 → 放到 y。
+3. 如果只能確定其中一項，另一項請輸出空字串 ""。
+4. 每個對象的固定結構如下，並保持與 excel 原文完全一致（包括大小寫、空格、換行符）：
+{{
+  x: string
+  y: string
+}}
+5. 如果某段文本無法判斷，在其位置輸出 {{"x": "", "y": ""}}。
+</要求>
+
+<自檢清單>
+- 陣列是否恰好有 {count} 個對象，且順序與文本編號一致？
+- x 是否來自頂端表頭？y 是否來自最左列？
+- 是否只輸出了一個 JSON 陣列，且沒有多餘文本或標點？
+</自檢清單>
+
+<輸入文本>
+{texts_to_be_cited}
+</輸入文本>
+
+<參考的 excel (Latex 格式)>
+{excel_latex}
+</參考的 excel (Latex 格式)>
+
+**輸出 (JSON 格式):**
+"""
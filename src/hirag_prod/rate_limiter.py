@@ -9,6 +9,7 @@ from multiprocessing.sharedctypes import Synchronized
 from typing import Any, AsyncGenerator, Callable, Dict, List, Optional, Set, Union
 
 from hirag_prod.configs.functions import get_envs, get_shared_variables, is_main_process
+from hirag_prod.configs.shared_variables import MULTIPROCESSING_CONTEXT
 
 RATE_LIMITER_NAME_SET: Set[str] = set()
 
@@ -69,14 +70,14 @@ class RateLimiter:
 
             if is_main_process():
                 get_shared_variables().rate_limiter_last_call_time_dict[self.name] = (
-                    multiprocessing.Value("d", 0.0)
+                    MULTIPROCESSING_CONTEXT.Value("d", 0.0)
                 )
                 get_shared_variables().rate_limiter_call_time_queue_dict[
                     self.name
-                ] = multiprocessing.Queue()
+                ] = MULTIPROCESSING_CONTEXT.Queue()
                 get_shared_variables().rate_limiter_wait_lock_dict[
                     self.name
-                ] = multiprocessing.Lock()
+                ] = MULTIPROCESSING_CONTEXT.Lock()
             self.last_call_time: Synchronized[float] = (
                 get_shared_variables().rate_limiter_last_call_time_dict[self.name]
             )
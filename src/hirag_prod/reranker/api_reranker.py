@@ -1,10 +1,9 @@
 from typing import List
 
-import httpx
-
 from hirag_prod.configs.functions import get_envs, get_shared_variables
 from hirag_prod.rate_limiter import RateLimiter
 from hirag_prod.reranker.base import Reranker
+from hirag_prod.resources.functions import get_async_http_client
 
 rate_limiter = RateLimiter()
 
@@ -34,18 +33,17 @@ class ApiReranker(Reranker):
             "model": self.model,
         }
 
-        async with httpx.AsyncClient(timeout=3600.0) as client:
-            response = await client.post(self.endpoint, headers=headers, json=payload)
-
-            if response.status_code != 200:
-                error_text = response.text
-                raise Exception(
-                    f"Reranker API error {response.status_code}: {error_text}"
-                )
-
-            result = response.json()
-            if get_envs().ENABLE_TOKEN_COUNT:
-                get_shared_variables().input_token_count_dict[
-                    "reranker"
-                ].value += result.get("usage", {}).get("total_tokens", 0)
-            return result.get("data", [])
+        response = await get_async_http_client(self.endpoint).post(
+            self.endpoint, headers=headers, json=payload, timeout=3600.0
+        )
+
+        if response.status_code != 200:
+            error_text = response.text
+            raise Exception(f"Reranker API error {response.status_code}: {error_text}")
+
+        result = response.json()
+        if get_envs().ENABLE_TOKEN_COUNT:
+            get_shared_variables().input_token_count_dict[
+                "reranker"
+            ].value += result.get("usage", {}).get("total_tokens", 0)
+        return result.get("data", [])
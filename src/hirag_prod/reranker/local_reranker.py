@@ -1,13 +1,15 @@
 """Local deployment reranker implementation"""
 
 import logging
-from typing import List
+from typing import Dict, List
 
 import httpx
 
 from hirag_prod.configs.functions import get_envs, get_shared_variables
+from hirag_prod.load_balancer import create_endpoint_pool
 from hirag_prod.rate_limiter import RateLimiter
 from hirag_prod.reranker.base import Reranker
+from hirag_prod.resources.functions import get_async_http_client
 
 rate_limiter = RateLimiter()
 
@@ -21,13 +23,35 @@ class LocalReranker(Reranker):
         auth_token: str,
         timeout: int = 3600,
     ) -> None:
-        self.base_url = base_url.rstrip("/")
+        # base_url may be a comma separated list of equivalent endpoints
+        self.endpoint_pool = create_endpoint_pool(
+            "reranker",
+            ",".join(url.strip().rstrip("/") for url in base_url.split(",")),
+            hedge_delay=get_envs().RERANKER_HEDGE_DELAY_SECONDS,
+        )
+        self.base_url = self.endpoint_pool.urls[0]
         self.model_name = model_name
         self.entry_point = entry_point
         self.auth_token = auth_token
         self.timeout = timeout
         self.logger = logging.getLogger(__name__)
 
+    async def _post(self, base_url: str, headers: Dict, payload: Dict) -> Dict:
+        url = f"{base_url}{self.entry_point}"
+        response = await get_async_http_client(url).post(
+            url, headers=headers, json=payload, timeout=self.timeout
+        )
+
+        if response.status_code != 200:
+            error_text = response.text
+            raise httpx.HTTPStatusError(
+                f"Reranker API error {response.status_code}: {error_text}",
+                request=response.request,
+                response=response,
+            )
+
+        return response.json()
+
     @rate_limiter.limit(
         "reranker",
         "RERANKER_RATE_LIMIT_MIN_INTERVAL_SECONDS",
@@ -68,20 +92,11 @@ class LocalReranker(Reranker):
             "documents": formatted_documents,
         }
 
-        url = f"{self.base_url}{self.entry_point}"
-
-        async with httpx.AsyncClient(timeout=self.timeout) as client:
-            response = await client.post(url, headers=headers, json=payload)
-
-            if response.status_code != 200:
-                error_text = response.text
-                raise Exception(
-                    f"Reranker API error {response.status_code}: {error_text}"
-                )
-
-            result = response.json()
-            if get_envs().ENABLE_TOKEN_COUNT:
-                get_shared_variables().input_token_count_dict[
-                    "reranker"
-                ].value += result.get("usage", {}).get("total_tokens", 0)
-            return result.get("results", [])
+        result = await self.endpoint_pool.request(
+            lambda base_url: self._post(base_url, headers, payload)
+        )
+        if get_envs().ENABLE_TOKEN_COUNT:
+            get_shared_variables().input_token_count_dict[
+                "reranker"
+            ].value += result.get("usage", {}).get("total_tokens", 0)
+        return result.get("results", [])
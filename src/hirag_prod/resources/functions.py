@@ -3,7 +3,9 @@ import functools
 import logging
 import os
 import time
-from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
 
 from hirag_prod._utils import log_error_info
 
@@ -80,37 +82,200 @@ def get_sentence_tokenizer():
     return get_resource_manager().get_sentence_tokenizer()
 
 
-def tokenize_sentence(sentence: str) -> Tuple[List[str], List[int], List[int]]:
-    if len(sentence.strip()) == 0:
-        return [], [], []
-    else:
-        result_list: List[str] = []
-        token_start_index_list: List[int] = []
-        token_end_index_list: List[int] = []
+# hanlp tokenizes at most 512 positions, longer sentences are tokenized window by window
+SENTENCE_TOKENIZER_WINDOW_SIZE: int = 510
+
+TokenizedSentence = Tuple[List[str], np.ndarray, np.ndarray]
+
+
+def align_tokens(
+    sentence: str, token_list: List[str], start_index: int
+) -> Tuple[np.ndarray, np.ndarray, int]:
+    """Find the character span of every token, in order, from ``start_index`` on.
+
+    Returns the start and end indices as int32 arrays and the index after the last
+    token. A cursor moves forward through the sentence and every search starts at
+    it, so long sentences are not sliced again for every character. A character that
+    cannot be found leaves the cursor where it is.
+    """
+    token_start_index_array = np.empty(len(token_list), dtype=np.int32)
+    token_end_index_array = np.empty(len(token_list), dtype=np.int32)
+    find = sentence.find
+    cursor: int = start_index
+    for i, token in enumerate(token_list):
+        position = find(token[0], cursor)
+        token_start_index_array[i] = position if position >= 0 else cursor - 1
+        if position >= 0 and sentence.startswith(token, position):
+            cursor = position + len(token)
+        else:
+            for char in token:
+                position = find(char, cursor)
+                if position >= 0:
+                    cursor = position + 1
+        token_end_index_array[i] = cursor
+    return token_start_index_array, token_end_index_array, cursor
+
+
+def tokenize_sentence_windows(
+    tokenizer: Callable[[List[str]], List[List[str]]],
+    sentence_list: List[str],
+    start_index_list: List[int],
+) -> List[Tuple[List[str], np.ndarray, np.ndarray, int, bool]]:
+    """Tokenize the next window of every sentence with one batched tokenizer call.
+
+    For each sentence returns its tokens, their start and end indices, the index to
+    continue from and whether the sentence is done. The last token of a window that
+    does not reach the end of its sentence may be cut, so it is tokenized again as
+    part of the next window.
+    """
+    window_list: List[str] = []
+    is_last_list: List[bool] = []
+    for sentence, start_index in zip(sentence_list, start_index_list):
+        is_last = start_index + SENTENCE_TOKENIZER_WINDOW_SIZE >= len(sentence)
+        window_list.append(
+            sentence[start_index:]
+            if is_last
+            else sentence[start_index : start_index + SENTENCE_TOKENIZER_WINDOW_SIZE]
+        )
+        is_last_list.append(is_last)
+
+    result_list = []
+    for sentence, start_index, token_list, is_last in zip(
+        sentence_list, start_index_list, tokenizer(window_list), is_last_list
+    ):
+        token_list = list(token_list)
+        if not is_last and len(token_list) > 1:
+            token_list = token_list[:-1]
+        token_start_index_list, token_end_index_list, next_index = align_tokens(
+            sentence, token_list, start_index
+        )
+        result_list.append(
+            (
+                token_list,
+                token_start_index_list,
+                token_end_index_list,
+                next_index,
+                is_last or next_index >= len(sentence),
+            )
+        )
+    return result_list
+
+
+def concatenate_tokenized_windows(
+    window_result_list: List[Tuple[List[str], np.ndarray, np.ndarray]],
+) -> TokenizedSentence:
+    token_list: List[str] = []
+    for window_token_list, _, _ in window_result_list:
+        token_list.extend(window_token_list)
+    if not window_result_list:
+        return token_list, np.empty(0, np.int32), np.empty(0, np.int32)
+    return (
+        token_list,
+        np.concatenate([starts for _, starts, _ in window_result_list]),
+        np.concatenate([ends for _, _, ends in window_result_list]),
+    )
+
+
+def tokenize_sentence_windows_with_process_tokenizer(
+    sentence_list: List[str], start_index_list: List[int]
+) -> List[Tuple[List[str], np.ndarray, np.ndarray, int, bool]]:
+    """tokenize_sentence_windows with the tokenizer loaded by this (worker) process"""
+    return tokenize_sentence_windows(
+        get_sentence_tokenizer(), sentence_list, start_index_list
+    )
+
+
+def tokenize_sentence(sentence: str) -> TokenizedSentence:
+    window_result_list = []
+    if len(sentence.strip()) > 0:
         current_text_index: int = 0
-        current_result_list_index: int = 0
         finish: bool = False
-        while (not finish) and (current_text_index < len(sentence)):
-            if current_text_index + 510 < len(sentence):
-                result_list.extend(
-                    get_sentence_tokenizer()(
-                        sentence[current_text_index : current_text_index + 510]
-                    )[:-1]
-                )
-            else:
-                result_list.extend(
-                    get_sentence_tokenizer()(sentence[current_text_index:])
-                )
-                finish = True
-            for token in result_list[current_result_list_index:]:
-                token_start_index_list.append(
-                    current_text_index + sentence[current_text_index:].find(token[0])
-                )
-                for char in token:
-                    current_text_index += sentence[current_text_index:].find(char) + 1
-                token_end_index_list.append(current_text_index)
-            current_result_list_index = len(result_list)
-        return result_list, token_start_index_list, token_end_index_list
+        while not finish:
+            token_list, start_array, end_array, current_text_index, finish = (
+                tokenize_sentence_windows(
+                    get_sentence_tokenizer(), [sentence], [current_text_index]
+                )[0]
+            )
+            window_result_list.append((token_list, start_array, end_array))
+    return concatenate_tokenized_windows(window_result_list)
+
+
+def get_tokenizer_service():
+    from hirag_prod.resources.tokenizer_service import TokenizerService
+
+    return TokenizerService()
+
+
+def get_worker_pool():
+    from hirag_prod.resources.worker_pool import WorkerPool
+
+    return WorkerPool()
+
+
+def get_document_converter_pool():
+    from hirag_prod.loader.converter_pool import DocumentConverterPool
+
+    return DocumentConverterPool()
+
+
+def get_cloud_health_monitor():
+    from hirag_prod.loader.cloud_health import CloudHealthMonitor
+
+    return CloudHealthMonitor()
+
+
+def get_conversion_cache():
+    from hirag_prod.loader.conversion_cache import ConversionCache
+
+    return ConversionCache()
+
+
+def get_ingestion_checkpoint_store():
+    from hirag_prod.ingestion_checkpoint import IngestionCheckpointStore
+
+    return IngestionCheckpointStore()
+
+
+def get_dots_ocr_client():
+    from hirag_prod.loader.dots_ocr_client import DotsOCRClient
+
+    return DotsOCRClient()
+
+
+def get_http_client_registry():
+    from hirag_prod.resources.http_client_registry import HttpClientRegistry
+
+    return HttpClientRegistry()
+
+
+def get_async_http_client(url: str):
+    return get_http_client_registry().get_async_client(url)
+
+
+def get_sync_http_session():
+    return get_http_client_registry().get_sync_session()
+
+
+def get_object_storage_client(storage_type: str):
+    return get_http_client_registry().get_object_storage_client(storage_type)
+
+
+def get_table_summarizer():
+    from hirag_prod.loader.table_summary import TableSummarizer
+
+    return TableSummarizer()
+
+
+def get_token_counter():
+    from hirag_prod.resources.token_counter import TokenCounter
+
+    return TokenCounter()
+
+
+def get_translation_cache():
+    from hirag_prod.translator.translation_cache import TranslationCache
+
+    return TranslationCache()
 
 
 def get_translator():
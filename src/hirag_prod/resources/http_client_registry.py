@@ -0,0 +1,347 @@
+import asyncio
+import importlib.util
+import logging
+import socket
+import threading
+import time
+import urllib.request
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple, Type
+from urllib.parse import urlsplit
+
+import httpcore
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+from hirag_prod.configs.functions import get_envs
+from hirag_prod.singleton_registry import register_singleton
+
+logger = logging.getLogger("HiRAG")
+
+HTTP2_AVAILABLE: bool = importlib.util.find_spec("h2") is not None
+
+
+def _origin_of(url: str) -> str:
+    parts = urlsplit(url)
+    scheme = parts.scheme or "http"
+    port = parts.port or (443 if scheme == "https" else 80)
+    return f"{scheme}://{parts.hostname}:{port}"
+
+
+def _uses_environment_proxy(origin: str) -> bool:
+    """Whether ``HTTP(S)_PROXY``/``ALL_PROXY`` apply to ``origin`` despite ``NO_PROXY``"""
+    parts = urlsplit(origin)
+    proxies = urllib.request.getproxies()
+    if not (proxies.get(parts.scheme) or proxies.get("all")):
+        return False
+    return not urllib.request.proxy_bypass(f"{parts.hostname}:{parts.port}")
+
+
+class CachingDNSBackend(httpcore.AsyncNetworkBackend):
+    """
+    Network backend resolving host names once per TTL instead of on every new connection.
+    TLS still uses the original host name for SNI and certificate verification.
+    """
+
+    def __init__(
+        self, ttl: float, inner: Optional[httpcore.AsyncNetworkBackend] = None
+    ):
+        self.ttl = ttl
+        self._inner = inner or httpcore.AnyIOBackend()
+        self._cache: Dict[Tuple[str, int], Tuple[float, List[str]]] = {}
+        self._lock = threading.Lock()
+        self.dns_lookups: int = 0
+        self.dns_cache_hits: int = 0
+        self.connections_opened: int = 0
+
+    async def _resolve(self, host: str, port: int) -> List[str]:
+        key = (host, port)
+        with self._lock:
+            cached = self._cache.get(key)
+            if cached and cached[0] > time.monotonic():
+                self.dns_cache_hits += 1
+                return cached[1]
+            self.dns_lookups += 1
+
+        infos = await asyncio.get_running_loop().getaddrinfo(
+            host, port, type=socket.SOCK_STREAM
+        )
+        addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        with self._lock:
+            self._cache[key] = (time.monotonic() + self.ttl, addresses)
+        return addresses
+
+    def invalidate(self, host: Optional[str] = None) -> None:
+        with self._lock:
+            if host is None:
+                self._cache.clear()
+            else:
+                for key in [k for k in self._cache if k[0] == host]:
+                    del self._cache[key]
+
+    async def connect_tcp(
+        self,
+        host: str,
+        port: int,
+        timeout: Optional[float] = None,
+        local_address: Optional[str] = None,
+        socket_options: Any = None,
+    ) -> httpcore.AsyncNetworkStream:
+        try:
+            addresses = await self._resolve(host, port)
+        except OSError:
+            addresses = [host]
+
+        last_error: Optional[Exception] = None
+        for address in addresses:
+            try:
+                stream = await self._inner.connect_tcp(
+                    address,
+                    port,
+                    timeout=timeout,
+                    local_address=local_address,
+                    socket_options=socket_options,
+                )
+                with self._lock:
+                    self.connections_opened += 1
+                return stream
+            except (httpcore.ConnectError, httpcore.ConnectTimeout) as e:
+                last_error = e
+        # Stale record, resolve again on the next attempt
+        self.invalidate(host)
+        raise last_error
+
+    async def connect_unix_socket(self, *args: Any, **kwargs: Any):
+        return await self._inner.connect_unix_socket(*args, **kwargs)
+
+    async def sleep(self, seconds: float) -> None:
+        await self._inner.sleep(seconds)
+
+
+# httpcore errors and the httpx errors they surface as, most specific first
+HTTPCORE_TO_HTTPX_ERRORS: List[Tuple[Type[Exception], Type[httpx.HTTPError]]] = [
+    (httpcore.ConnectTimeout, httpx.ConnectTimeout),
+    (httpcore.ReadTimeout, httpx.ReadTimeout),
+    (httpcore.WriteTimeout, httpx.WriteTimeout),
+    (httpcore.PoolTimeout, httpx.PoolTimeout),
+    (httpcore.TimeoutException, httpx.TimeoutException),
+    (httpcore.ConnectError, httpx.ConnectError),
+    (httpcore.ReadError, httpx.ReadError),
+    (httpcore.WriteError, httpx.WriteError),
+    (httpcore.NetworkError, httpx.NetworkError),
+    (httpcore.ProxyError, httpx.ProxyError),
+    (httpcore.UnsupportedProtocol, httpx.UnsupportedProtocol),
+    (httpcore.LocalProtocolError, httpx.LocalProtocolError),
+    (httpcore.RemoteProtocolError, httpx.RemoteProtocolError),
+    (httpcore.ProtocolError, httpx.ProtocolError),
+]
+
+
+def _to_httpx_error(error: Exception) -> Exception:
+    for httpcore_error, httpx_error in HTTPCORE_TO_HTTPX_ERRORS:
+        if isinstance(error, httpcore_error):
+            return httpx_error(str(error))
+    return error
+
+
+class _PooledResponseStream(httpx.AsyncByteStream):
+    def __init__(self, stream: Any) -> None:
+        self._stream = stream
+
+    async def __aiter__(self) -> AsyncIterator[bytes]:
+        try:
+            async for part in self._stream:
+                yield part
+        except Exception as e:
+            mapped = _to_httpx_error(e)
+            if mapped is e:
+                raise
+            raise mapped from e
+
+    async def aclose(self) -> None:
+        if hasattr(self._stream, "aclose"):
+            await self._stream.aclose()
+
+
+class PooledTransport(httpx.AsyncBaseTransport):
+    """
+    httpx transport over an ``httpcore.AsyncConnectionPool`` built with a given
+    network backend, the public way of plugging the DNS cache into the pool.
+    """
+
+    def __init__(
+        self,
+        network_backend: httpcore.AsyncNetworkBackend,
+        limits: httpx.Limits,
+        http2: bool = False,
+    ) -> None:
+        self._pool = httpcore.AsyncConnectionPool(
+            ssl_context=httpx.create_ssl_context(),
+            max_connections=limits.max_connections,
+            max_keepalive_connections=limits.max_keepalive_connections,
+            keepalive_expiry=limits.keepalive_expiry,
+            http1=True,
+            http2=http2,
+            network_backend=network_backend,
+        )
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        core_request = httpcore.Request(
+            method=request.method,
+            url=httpcore.URL(
+                scheme=request.url.raw_scheme,
+                host=request.url.raw_host,
+                port=request.url.port,
+                target=request.url.raw_path,
+            ),
+            headers=request.headers.raw,
+            content=request.stream,
+            extensions=request.extensions,
+        )
+        try:
+            core_response = await self._pool.handle_async_request(core_request)
+        except Exception as e:
+            mapped = _to_httpx_error(e)
+            if mapped is e:
+                raise
+            raise mapped from e
+        return httpx.Response(
+            status_code=core_response.status,
+            headers=core_response.headers,
+            stream=_PooledResponseStream(core_response.stream),
+            extensions=core_response.extensions,
+        )
+
+    async def aclose(self) -> None:
+        await self._pool.aclose()
+
+
+class HttpClientRegistry:
+    """
+    Process-wide registry of pooled HTTP clients, one per (event loop, origin).
+
+    Clients keep connections alive between calls, negotiate HTTP/2 when ``h2`` is
+    installed, cap the number of connections per host and share one DNS cache.
+    Origins behind an environment proxy get a client going through that proxy.
+    """
+
+    _instance: Optional["HttpClientRegistry"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs) -> "HttpClientRegistry":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    register_singleton(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_created", False):
+            return
+        self._async_clients: Dict[Tuple[int, str], httpx.AsyncClient] = {}
+        self._client_loops: Dict[Tuple[int, str], asyncio.AbstractEventLoop] = {}
+        self._sync_session: Optional[requests.Session] = None
+        self._object_storage_clients: Dict[str, Any] = {}
+        self._dns_backend = CachingDNSBackend(ttl=get_envs().HTTP_DNS_CACHE_TTL)
+        self._registry_lock = threading.Lock()
+        self._created: bool = True
+
+    def _limits(self) -> httpx.Limits:
+        return httpx.Limits(
+            max_connections=get_envs().HTTP_MAX_CONNECTIONS_PER_HOST,
+            max_keepalive_connections=get_envs().HTTP_MAX_KEEPALIVE_CONNECTIONS_PER_HOST,
+            keepalive_expiry=get_envs().HTTP_KEEPALIVE_EXPIRY,
+        )
+
+    def _create_async_client(self, origin: str) -> httpx.AsyncClient:
+        http2 = HTTP2_AVAILABLE and get_envs().HTTP_ENABLE_HTTP2
+        timeout = httpx.Timeout(3600.0)
+        if _uses_environment_proxy(origin):
+            # httpx only mounts the environment proxies on its own transports, the
+            # proxy resolves the host so the DNS cache has nothing to do
+            logger.info(f"🔗 Created proxied HTTP client for {origin} (http2={http2})")
+            return httpx.AsyncClient(
+                limits=self._limits(), http2=http2, timeout=timeout
+            )
+        # Share the DNS cache across every pool of this process
+        transport = PooledTransport(self._dns_backend, self._limits(), http2=http2)
+        logger.info(f"🔗 Created pooled HTTP client for {origin} (http2={http2})")
+        return httpx.AsyncClient(transport=transport, timeout=timeout)
+
+    def get_async_client(self, url: str) -> httpx.AsyncClient:
+        """Get the pooled async client for the origin of ``url`` on the running loop"""
+        loop = asyncio.get_running_loop()
+        key = (id(loop), _origin_of(url))
+        with self._registry_lock:
+            client = self._async_clients.get(key)
+            if (
+                client is None
+                or client.is_closed
+                or self._client_loops.get(key) is not loop
+            ):
+                client = self._create_async_client(key[1])
+                self._async_clients[key] = client
+                self._client_loops[key] = loop
+            # Forget clients of loops that are gone
+            for stale_key in [
+                k for k, l in self._client_loops.items() if l.is_closed()
+            ]:
+                self._async_clients.pop(stale_key, None)
+                self._client_loops.pop(stale_key, None)
+            return client
+
+    def get_sync_session(self) -> requests.Session:
+        """Get the pooled blocking session used by code running in worker threads"""
+        with self._registry_lock:
+            if self._sync_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=16,
+                    pool_maxsize=get_envs().HTTP_MAX_CONNECTIONS_PER_HOST,
+                )
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                self._sync_session = session
+            return self._sync_session
+
+    def get_object_storage_client(self, storage_type: str) -> Any:
+        """Get the pooled boto3 client of ``storage_type``, boto3 clients are thread-safe"""
+        from hirag_prod.loader.utils import create_s3_client
+
+        with self._registry_lock:
+            client = self._object_storage_clients.get(storage_type)
+            if client is None:
+                # Creating clients is not thread-safe, so it happens under the lock
+                client = create_s3_client(storage_type)
+                self._object_storage_clients[storage_type] = client
+                logger.info(f"🔗 Created pooled {storage_type.upper()} client")
+            return client
+
+    def get_stats(self) -> Dict[str, int]:
+        return {
+            "async_clients": len(self._async_clients),
+            "object_storage_clients": len(self._object_storage_clients),
+            "connections_opened": self._dns_backend.connections_opened,
+            "dns_lookups": self._dns_backend.dns_lookups,
+            "dns_cache_hits": self._dns_backend.dns_cache_hits,
+        }
+
+    async def aclose(self) -> None:
+        """Close the clients owned by the running loop and the blocking session"""
+        loop = asyncio.get_running_loop()
+        with self._registry_lock:
+            keys = [k for k, l in self._client_loops.items() if l is loop]
+            clients = [self._async_clients.pop(k) for k in keys]
+            for key in keys:
+                self._client_loops.pop(key, None)
+            session, self._sync_session = self._sync_session, None
+        for client in clients:
+            await client.aclose()
+        if session is not None:
+            session.close()
+
+    @classmethod
+    def reset(cls):
+        del cls._instance
+        cls._instance = None
@@ -27,9 +27,14 @@ from hirag_prod.configs.functions import (
     get_hi_rag_config,
 )
 from hirag_prod.reranker import Reranker, create_reranker
-from hirag_prod.resources.functions import timing_logger
+from hirag_prod.resources.functions import (
+    get_http_client_registry,
+    get_worker_pool,
+    timing_logger,
+)
 from hirag_prod.resources.postgres_functions import search_by_search_list
 from hirag_prod.schema import Base
+from hirag_prod.singleton_registry import register_singleton
 from hirag_prod.translator.local_translator import LocalTranslator
 from hirag_prod.translator.qwen_translator import QwenTranslator
 
@@ -44,6 +49,7 @@ class ResourceManager:
             with cls._lock:  # Move lock outside to prevent race condition
                 if cls._instance is None:
                     cls._instance = super().__new__(cls)
+                    register_singleton(cls)
         return cls._instance
 
     def __init__(self, resource_dict: Optional[Dict] = None):
@@ -139,6 +145,15 @@ class ResourceManager:
             logging.info(f"🔄 Initializing ResourceManager...")
 
             try:
+                # Pooled HTTP clients shared by all model clients are created lazily
+                self._cleanup_operation_list.append(
+                    ("http clients", get_http_client_registry().aclose)
+                )
+                # Ingestion worker processes are spawned on first use
+                self._cleanup_operation_list.append(
+                    ("worker pool", get_worker_pool().shutdown)
+                )
+
                 # Initialize database engine with connection pool
                 if (not self._db_engine) or (not self._session_maker):
                     await self._initialize_database()
@@ -257,6 +272,15 @@ class ResourceManager:
             await conn.execute(text("CREATE EXTENSION IF NOT EXISTS plpython3u;"))
             await conn.execute(text("CREATE EXTENSION IF NOT EXISTS vector;"))
             await conn.run_sync(Base.metadata.create_all)
+            # Columns added after the tables were first created
+            await conn.execute(
+                text('ALTER TABLE "Items" ADD COLUMN IF NOT EXISTS language VARCHAR;')
+            )
+            await conn.execute(
+                text(
+                    'ALTER TABLE "Chunks" ADD COLUMN IF NOT EXISTS "tokenCount" INTEGER;'
+                )
+            )
             await conn.execute(search_by_search_list)
 
         logging.info(f"✅ Database engine initialized successfully")
@@ -0,0 +1,120 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from hirag_prod._utils import get_tiktoken_encoder
+from hirag_prod.configs.functions import get_envs
+from hirag_prod.singleton_registry import register_singleton
+
+
+class TokenCounter:
+    """
+    Token counts of texts with the tiktoken encoding of the pipeline.
+
+    Counts are cached by the hash of the text in an in-process LRU of
+    ``TOKEN_COUNT_CACHE_MAX_ENTRIES`` entries. Texts missing from the cache are
+    encoded together with ``encode_batch`` on ``TOKEN_COUNT_NUM_THREADS`` threads,
+    and every encoding records the count, so a text is encoded once whether it is
+    counted, split or both.
+    """
+
+    _instance: Optional["TokenCounter"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs) -> "TokenCounter":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    register_singleton(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_created", False):
+            return
+        self.max_entries: int = get_envs().TOKEN_COUNT_CACHE_MAX_ENTRIES
+        self.num_threads: int = get_envs().TOKEN_COUNT_NUM_THREADS
+        self._lru: "OrderedDict[bytes, int]" = OrderedDict()
+        self._lru_lock = threading.Lock()
+        self.hits: int = 0
+        self.encoded_texts: int = 0
+        self.encoded_batches: int = 0
+        self._created: bool = True
+
+    @classmethod
+    def reset(cls) -> None:
+        cls._instance = None
+
+    @staticmethod
+    def _key(text: str) -> bytes:
+        return hashlib.md5(text.encode("utf-8")).digest()
+
+    def _remember(self, keys: List[bytes], counts: List[int]) -> None:
+        with self._lru_lock:
+            for key, count in zip(keys, counts):
+                self._lru[key] = count
+                self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    def encode_batch(self, texts: List[str]) -> List[List[int]]:
+        """Tokens of ``texts``, their counts are cached on the way"""
+        if not texts:
+            return []
+        encoder = get_tiktoken_encoder()
+        if len(texts) == 1:
+            token_lists = [encoder.encode(texts[0])]
+        else:
+            token_lists = encoder.encode_batch(texts, num_threads=self.num_threads)
+        self.encoded_texts += len(texts)
+        self.encoded_batches += 1
+        self._remember(
+            [self._key(text) for text in texts], [len(tokens) for tokens in token_lists]
+        )
+        return token_lists
+
+    def count_batch(self, texts: List[str]) -> List[int]:
+        """Token counts of ``texts`` in order, only texts missing from the cache are encoded"""
+        keys = [self._key(text or "") for text in texts]
+        counts: List[Optional[int]] = [None] * len(texts)
+        missing: Dict[bytes, List[int]] = {}
+        with self._lru_lock:
+            for i, key in enumerate(keys):
+                count = self._lru.get(key)
+                if count is None:
+                    missing.setdefault(key, []).append(i)
+                else:
+                    self._lru.move_to_end(key)
+                    counts[i] = count
+                    self.hits += 1
+
+        if missing:
+            indexes_list = list(missing.values())
+            token_lists = self.encode_batch(
+                [texts[indexes[0]] or "" for indexes in indexes_list]
+            )
+            for indexes, tokens in zip(indexes_list, token_lists):
+                for i in indexes:
+                    counts[i] = len(tokens)
+        return counts
+
+    def count(self, text: str) -> int:
+        return self.count_batch([text])[0]
+
+    def count_uncached(self, text: str) -> int:
+        """Token count of a text counted only once, such as an Excel row, not cached"""
+        self.encoded_texts += 1
+        return len(get_tiktoken_encoder().encode(text or ""))
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "entries": len(self._lru),
+            "hits": self.hits,
+            "encoded_texts": self.encoded_texts,
+            "encoded_batches": self.encoded_batches,
+        }
+
+    def clear(self) -> None:
+        with self._lru_lock:
+            self._lru.clear()
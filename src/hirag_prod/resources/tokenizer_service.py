@@ -0,0 +1,194 @@
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+
+from hirag_prod.configs.functions import get_envs
+from hirag_prod.resources.functions import (
+    TokenizedSentence,
+    concatenate_tokenized_windows,
+    get_sentence_tokenizer,
+    get_worker_pool,
+    tokenize_sentence_windows,
+    tokenize_sentence_windows_with_process_tokenizer,
+)
+from hirag_prod.singleton_registry import register_singleton
+
+logger = logging.getLogger("HiRAG")
+
+_WindowRequest = Tuple[str, int, "asyncio.Future"]
+
+
+class TokenizerService:
+    """
+    Batched sentence tokenization off the event loop.
+
+    Callers get futures. Pending sentence windows are collected into batches of up to
+    ``TOKENIZER_BATCH_SIZE`` (or whatever arrived within ``TOKENIZER_BATCH_WAIT_MS``)
+    and tokenized with one hanlp call on a dedicated thread, together with the offset
+    alignment, so the event loop only hands batches over and resolves futures. When
+    the ingestion worker pool is enabled, batches go to its processes instead, each
+    with its own hanlp model.
+    """
+
+    _instance: Optional["TokenizerService"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs) -> "TokenizerService":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    register_singleton(cls)
+        return cls._instance
+
+    def __init__(
+        self,
+        tokenizer: Optional[Callable[[List[str]], List[List[str]]]] = None,
+        batch_size: Optional[int] = None,
+        batch_wait_ms: Optional[float] = None,
+    ) -> None:
+        if getattr(self, "_created", False):
+            return
+        self._tokenizer = tokenizer
+        self.batch_size: int = batch_size or get_envs().TOKENIZER_BATCH_SIZE
+        self.batch_wait: float = (
+            batch_wait_ms
+            if batch_wait_ms is not None
+            else get_envs().TOKENIZER_BATCH_WAIT_MS
+        ) / 1000
+        # hanlp models are not thread safe, one worker runs every batch in order
+        self._executor = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="hirag-tokenizer"
+        )
+        self._pending: List[_WindowRequest] = []
+        self._flush_handle: Optional[asyncio.TimerHandle] = None
+        self._batch_tasks: Set[asyncio.Task] = set()
+        self.batches: int = 0
+        self.windows: int = 0
+        self.busy_seconds: float = 0.0
+        self._created: bool = True
+
+    @classmethod
+    def reset(cls) -> None:
+        if cls._instance is not None and getattr(cls._instance, "_created", False):
+            cls._instance._executor.shutdown(wait=False)
+        cls._instance = None
+
+    def _get_tokenizer(self) -> Callable[[List[str]], List[List[str]]]:
+        if self._tokenizer is None:
+            self._tokenizer = get_sentence_tokenizer()
+        return self._tokenizer
+
+    def _run_batch(
+        self, sentence_list: List[str], start_index_list: List[int]
+    ) -> Tuple[List[Any], float]:
+        start = time.perf_counter()
+        result_list = tokenize_sentence_windows(
+            self._get_tokenizer(), sentence_list, start_index_list
+        )
+        return result_list, time.perf_counter() - start
+
+    def _flush(self) -> None:
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        if self._pending:
+            batch, self._pending = self._pending, []
+            task = asyncio.ensure_future(self._tokenize_batch(batch))
+            self._batch_tasks.add(task)
+            task.add_done_callback(self._batch_tasks.discard)
+
+    async def _tokenize_batch(self, batch: List[_WindowRequest]) -> None:
+        self.batches += 1
+        self.windows += len(batch)
+        sentence_list = [sentence for sentence, _, _ in batch]
+        start_index_list = [start_index for _, start_index, _ in batch]
+        try:
+            if self._tokenizer is None and get_worker_pool().enabled:
+                start = time.perf_counter()
+                result_list = await get_worker_pool().run(
+                    tokenize_sentence_windows_with_process_tokenizer,
+                    sentence_list,
+                    start_index_list,
+                )
+                elapsed = time.perf_counter() - start
+            else:
+                result_list, elapsed = await asyncio.get_running_loop().run_in_executor(
+                    self._executor,
+                    self._run_batch,
+                    sentence_list,
+                    start_index_list,
+                )
+            self.busy_seconds += elapsed
+        except Exception as e:
+            for _, _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        for (_, _, future), result in zip(batch, result_list):
+            if not future.done():
+                future.set_result(result)
+
+    def _submit_window(self, sentence: str, start_index: int) -> "asyncio.Future":
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self._pending.append((sentence, start_index, future))
+        if len(self._pending) >= self.batch_size:
+            self._flush()
+        elif self._flush_handle is None:
+            self._flush_handle = loop.call_later(self.batch_wait, self._flush)
+        return future
+
+    async def tokenize(self, sentence: str) -> TokenizedSentence:
+        """Tokenize one sentence, batched with every other pending sentence"""
+        return (await self.tokenize_many([sentence]))[0]
+
+    async def tokenize_many(self, sentence_list: List[str]) -> List[TokenizedSentence]:
+        """Tokenize many sentences window round by window round, in input order"""
+        window_result_lists: List[List[Any]] = [[] for _ in sentence_list]
+        start_index_list: List[int] = [0] * len(sentence_list)
+        active_list: List[int] = [
+            i for i, sentence in enumerate(sentence_list) if len(sentence.strip()) > 0
+        ]
+        while active_list:
+            # Submitted and gathered a batch at a time, so that other coroutines run
+            # between the batches of a large upsert
+            group_list = []
+            for offset in range(0, len(active_list), self.batch_size):
+                group_list.append(
+                    asyncio.gather(
+                        *[
+                            self._submit_window(sentence_list[i], start_index_list[i])
+                            for i in active_list[offset : offset + self.batch_size]
+                        ]
+                    )
+                )
+                await asyncio.sleep(0)
+            window_result_list = []
+            for group in group_list:
+                window_result_list.extend(await group)
+
+            next_active_list: List[int] = []
+            for i, (token_list, start_array, end_array, next_index, finish) in zip(
+                active_list, window_result_list
+            ):
+                window_result_lists[i].append((token_list, start_array, end_array))
+                start_index_list[i] = next_index
+                if not finish:
+                    next_active_list.append(i)
+            active_list = next_active_list
+        return [
+            concatenate_tokenized_windows(window_results)
+            for window_results in window_result_lists
+        ]
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "batches": self.batches,
+            "windows": self.windows,
+            "average_batch_size": self.windows / self.batches if self.batches else 0.0,
+            "busy_seconds": self.busy_seconds,
+        }
@@ -0,0 +1,214 @@
+import asyncio
+import functools
+import logging
+import threading
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from hirag_prod._utils import log_error_info
+from hirag_prod.configs.shared_variables import MULTIPROCESSING_CONTEXT
+from hirag_prod.singleton_registry import register_singleton, reset_singletons
+
+logger = logging.getLogger("HiRAG")
+
+# Imported once by the fork server, so that workers forked from it start fast
+WORKER_PRELOAD_MODULES: List[str] = [
+    "hirag_prod.resources.worker_pool",
+    "hirag_prod.loader",
+    "hirag_prod.cross_language_search.functions",
+]
+
+
+def _initialize_worker(
+    cli_options_dict: Dict[str, Any],
+    config_dict: Dict[str, Any],
+    shared_variable_dict: Dict[str, Any],
+    preload_models: bool,
+) -> None:
+    """Set up the configuration and CPU-bound models of a worker process once"""
+    from hirag_prod.configs.functions import initialize_config_manager
+    from hirag_prod.resources.functions import get_token_counter
+    from hirag_prod.resources.resource_manager import ResourceManager
+
+    # Singletons created while the fork server preloaded its modules hold state of
+    # that process, every worker starts from fresh ones instead
+    reset_singletons()
+
+    initialize_config_manager(cli_options_dict, config_dict, shared_variable_dict)
+    # Tasks that use the worker pool themselves run inline in the worker
+    WorkerPool(max_workers=0)
+
+    resource_dict: Dict[str, Any] = {}
+    if preload_models:
+        try:
+            from opencc import OpenCC
+
+            resource_dict["chinese_convertor_simplified_to_hk_traditional"] = OpenCC(
+                "s2hk.json"
+            )
+            resource_dict["chinese_convertor_hk_traditional_to_simplified"] = OpenCC(
+                "hk2s.json"
+            )
+        except Exception as e:
+            log_error_info(logging.WARNING, "Failed to preload OpenCC in worker", e)
+        try:
+            import hanlp
+
+            resource_dict["sentence_tokenizer"] = hanlp.load(
+                hanlp.pretrained.tok.UD_TOK_MMINILMV2L12
+            )
+        except Exception as e:
+            log_error_info(logging.WARNING, "Failed to preload hanlp in worker", e)
+        try:
+            get_token_counter().count("warm up")
+        except Exception as e:
+            log_error_info(logging.WARNING, "Failed to preload tiktoken in worker", e)
+    # Only the models, database and Redis stay in the main process
+    ResourceManager(resource_dict)
+
+
+def _timed_call(
+    func: Callable, args: Tuple, kwargs: Dict[str, Any]
+) -> Tuple[Any, float]:
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return result, time.perf_counter() - start
+
+
+class WorkerPool:
+    """
+    Process pool for the CPU-bound ingestion steps (document conversion, chunking,
+    token splitting, OpenCC conversion and hanlp tokenization).
+
+    Workers are forked from a fork server, never from this multi-threaded process.
+    Every worker is started with the configuration and shared rate limiter state of
+    the main process and loads OpenCC, hanlp and tiktoken once. Tasks must be
+    module-level functions with picklable arguments and results. With
+    ``ingestion_worker_processes`` set to 0 tasks run on a thread of this process,
+    as before.
+    """
+
+    _instance: Optional["WorkerPool"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs) -> "WorkerPool":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    register_singleton(cls)
+        return cls._instance
+
+    def __init__(
+        self, max_workers: Optional[int] = None, preload_models: bool = True
+    ) -> None:
+        if getattr(self, "_created", False):
+            return
+        if max_workers is None:
+            from hirag_prod.configs.functions import get_hi_rag_config
+
+            max_workers = get_hi_rag_config().ingestion_worker_processes
+        self.max_workers: int = max(0, max_workers)
+        self.preload_models: bool = preload_models
+        self._executor: Optional[ProcessPoolExecutor] = None
+        self._executor_lock = threading.Lock()
+        self.tasks: int = 0
+        self.failures: int = 0
+        self.busy_seconds: float = 0.0
+        self.restarts: int = 0
+        self._created: bool = True
+
+    @classmethod
+    def reset(cls) -> None:
+        if cls._instance is not None and getattr(cls._instance, "_created", False):
+            cls._instance._shutdown_executor(wait=False)
+        cls._instance = None
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_workers > 0
+
+    def _get_executor(self) -> ProcessPoolExecutor:
+        if self._executor is None:
+            with self._executor_lock:
+                if self._executor is None:
+                    from hirag_prod.configs.functions import get_config_manager
+
+                    config_manager = get_config_manager()
+                    MULTIPROCESSING_CONTEXT.set_forkserver_preload(
+                        WORKER_PRELOAD_MODULES
+                    )
+                    self._executor = ProcessPoolExecutor(
+                        max_workers=self.max_workers,
+                        # The start method the shared rate limiter state was made for
+                        mp_context=MULTIPROCESSING_CONTEXT,
+                        initializer=_initialize_worker,
+                        initargs=(
+                            {"debug": config_manager.debug},
+                            {
+                                **config_manager.envs.model_dump(),
+                                "is_main_process": False,
+                                "language": config_manager.language,
+                            },
+                            config_manager.shared_variables.to_dict(),
+                            self.preload_models,
+                        ),
+                    )
+                    logger.info(
+                        f"🚀 Started ingestion worker pool with {self.max_workers} processes"
+                    )
+        return self._executor
+
+    def _shutdown_executor(self, wait: bool) -> None:
+        with self._executor_lock:
+            executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait, cancel_futures=True)
+
+    async def run(self, func: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Run ``func(*args, **kwargs)`` in a worker process and return its result"""
+        self.tasks += 1
+        if not self.enabled:
+            result, elapsed = await asyncio.to_thread(_timed_call, func, args, kwargs)
+            self.busy_seconds += elapsed
+            return result
+
+        try:
+            result, elapsed = await asyncio.get_running_loop().run_in_executor(
+                self._get_executor(),
+                functools.partial(_timed_call, func, args, kwargs),
+            )
+        except BrokenProcessPool as e:
+            # A worker died (e.g. out of memory), the next task starts a fresh pool
+            self.failures += 1
+            self.restarts += 1
+            self._shutdown_executor(wait=False)
+            log_error_info(
+                logging.ERROR,
+                f"Ingestion worker pool broke while running {getattr(func, '__name__', func)}",
+                e,
+                raise_error=True,
+            )
+        except Exception:
+            self.failures += 1
+            raise
+        self.busy_seconds += elapsed
+        return result
+
+    async def map(self, func: Callable, argument_list: List[Tuple]) -> List[Any]:
+        """Run ``func`` once per argument tuple, spread over the workers, in order"""
+        return await asyncio.gather(*[self.run(func, *args) for args in argument_list])
+
+    async def shutdown(self) -> None:
+        await asyncio.to_thread(self._shutdown_executor, True)
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "workers": self.max_workers,
+            "tasks": self.tasks,
+            "failures": self.failures,
+            "restarts": self.restarts,
+            "busy_seconds": self.busy_seconds,
+        }
@@ -5,8 +5,10 @@ from hirag_prod.schema.entity import Entity
 from hirag_prod.schema.file import File, create_file
 from hirag_prod.schema.graph import Graph, create_graph
 from hirag_prod.schema.item import Item
+from hirag_prod.schema.job_stage import JobStage
 from hirag_prod.schema.loader import LoaderType
 from hirag_prod.schema.node import Node, create_node
+from hirag_prod.schema.records import ChunkRecord, ItemRecord
 from hirag_prod.schema.relation import Relation
 from hirag_prod.schema.triplets import Triplets
 
@@ -22,9 +24,12 @@ __all__ = [
     "Relation",
     "LoaderType",
     "Item",
+    "ChunkRecord",
+    "ItemRecord",
     "file_to_item",
     "Graph",
     "create_graph",
     "Node",
     "create_node",
+    "JobStage",
 ]
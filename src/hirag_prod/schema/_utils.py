@@ -1,12 +1,14 @@
-from hirag_prod.schema.chunk import Chunk
 from hirag_prod.schema.file import File
-from hirag_prod.schema.item import Item
+from hirag_prod.schema.records import ChunkRecord, ItemRecord
+
+CHUNK_COLUMNS = frozenset(ChunkRecord.__slots__)
+ITEM_COLUMNS = frozenset(ItemRecord.__slots__)
 
 
 def file_to_chunk(
     file: File, documentKey: str, text: str, documentId: str, chunkIdx
-) -> Chunk:
-    new_chunk = Chunk(
+) -> ChunkRecord:
+    new_chunk = ChunkRecord(
         # Given
         documentKey=documentKey,
         text=text,
@@ -15,31 +17,26 @@ def file_to_chunk(
     )
 
     # Copy
-    for col in dict(file):
-        if hasattr(new_chunk, col):
+    for col, value in file:
+        if col in CHUNK_COLUMNS:
             # Only copy if attr is none in new_chunk
             if getattr(new_chunk, col) is None:
-                setattr(new_chunk, col, getattr(file, col))
+                setattr(new_chunk, col, value)
     return new_chunk
 
 
-def item_to_chunk(item: Item) -> Chunk:
-    new_chunk = Chunk()
-    for col in dict(item):
-        if hasattr(new_chunk, col):
-            attr = getattr(item, col)
-            if col == "bbox":
-                attr = [attr] if attr is not None else None
-            elif col == "pageNumber":
-                attr = [attr] if attr is not None else None
-            setattr(new_chunk, col, attr)
-    return new_chunk
+def item_to_chunk(item: ItemRecord) -> ChunkRecord:
+    values = {col: value for col, value in item if col in CHUNK_COLUMNS}
+    for col in ("bbox", "pageNumber"):
+        if values.get(col) is not None:
+            values[col] = [values[col]]
+    return ChunkRecord(**values)
 
 
 def file_to_item(
     file: File, documentKey: str, text: str, documentId: str, chunkIdx
-) -> Item:
-    new_item = Item(
+) -> ItemRecord:
+    new_item = ItemRecord(
         # Given
         documentKey=documentKey,
         text=text,
@@ -47,9 +44,9 @@ def file_to_item(
         chunkIdx=chunkIdx,
     )
     # Copy
-    for col in dict(file):
-        if hasattr(new_item, col):
+    for col, value in file:
+        if col in ITEM_COLUMNS:
             # Only copy if attr is none in new_item
             if getattr(new_item, col) is None:
-                setattr(new_item, col, getattr(file, col))
+                setattr(new_item, col, value)
     return new_item
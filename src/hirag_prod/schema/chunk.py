@@ -46,6 +46,8 @@ class Chunk(Base):
     vector_float_array: Mapped[List[float]] = column_property(
         cast(vector, ARRAY(Float(4)))
     )
+    # tiktoken count of the text, for context packing without encoding it again
+    tokenCount: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     # Timestamps and Users
     extractedTimestamp: Mapped[Optional[datetime]] = mapped_column(
         DateTime, nullable=True
@@ -47,6 +47,8 @@ class Item(Base):
     token_end_index_list: Mapped[List[int]] = mapped_column(
         ARRAY(Integer), nullable=False
     )
+    # Detected language of text, see detect_language
+    language: Mapped[Optional[str]] = mapped_column(String, nullable=True)
     translation: Mapped[str] = mapped_column(Text, nullable=False)
     translation_normalized: Mapped[str] = mapped_column(Text, nullable=False)
     translation_token_list: Mapped[List[str]] = mapped_column(
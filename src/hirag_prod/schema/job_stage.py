@@ -0,0 +1,27 @@
+from datetime import datetime
+
+from sqlalchemy import DateTime, String
+from sqlalchemy.orm import Mapped, mapped_column
+
+from hirag_prod.schema.base import Base
+
+
+class JobStage(Base):
+    """Status of one ingestion stage of a job, see IngestionStage"""
+
+    __tablename__ = "JobStages"
+
+    jobId: Mapped[str] = mapped_column(String, primary_key=True, nullable=False)
+    stage: Mapped[str] = mapped_column(String, primary_key=True, nullable=False)
+    status: Mapped[str] = mapped_column(String, nullable=False)
+    documentKey: Mapped[str] = mapped_column(String, nullable=False)
+    workspaceId: Mapped[str] = mapped_column(String, nullable=False)
+    knowledgeBaseId: Mapped[str] = mapped_column(String, nullable=False)
+
+    # Timestamps
+    createdAt: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=False
+    )
+    updatedAt: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=False
+    )
@@ -0,0 +1,102 @@
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Iterator, List, Optional, Tuple
+
+from hirag_prod.schema.chunk import Chunk
+from hirag_prod.schema.item import Item
+
+
+@dataclass(slots=True)
+class ChunkRecord:
+    """
+    In-flight chunk of the ingestion pipeline, with the columns of the Chunks table.
+
+    A plain slotted object, without the attribute instrumentation and instance
+    state of the ORM Chunk. Like the ORM model, iterating it yields its
+    (column, value) pairs, which is how the rows are built at write time.
+    """
+
+    id: Optional[str] = None
+    documentKey: Optional[str] = None
+    knowledgeBaseId: Optional[str] = None
+    workspaceId: Optional[str] = None
+    text: Optional[str] = None
+    fileName: Optional[str] = None
+    uri: Optional[str] = None
+    private: Optional[bool] = None
+    type: Optional[str] = None
+    pageNumber: Optional[List[int]] = None
+    documentId: Optional[str] = None
+    chunkIdx: Optional[int] = None
+    chunkType: Optional[str] = None
+    pageImageUrl: Optional[str] = None
+    pageWidth: Optional[float] = None
+    pageHeight: Optional[float] = None
+    headers: Optional[List[str]] = None
+    children: Optional[List[str]] = None
+    caption: Optional[str] = None
+    bbox: Optional[List[List[float]]] = None
+    vector: Optional[List[float]] = None
+    tokenCount: Optional[int] = None
+    extractedTimestamp: Optional[datetime] = None
+    createdAt: Optional[datetime] = None
+    createdBy: Optional[str] = None
+    updatedAt: Optional[datetime] = None
+    updatedBy: Optional[str] = None
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        for column_name in self.__slots__:
+            yield column_name, getattr(self, column_name)
+
+    def to_orm(self) -> Chunk:
+        return Chunk(**dict(self))
+
+
+@dataclass(slots=True)
+class ItemRecord:
+    """In-flight item of the ingestion pipeline, with the columns of the Items table"""
+
+    id: Optional[str] = None
+    documentKey: Optional[str] = None
+    knowledgeBaseId: Optional[str] = None
+    workspaceId: Optional[str] = None
+    text: Optional[str] = None
+    text_normalized: Optional[str] = None
+    has_traditional_chinese: Optional[bool] = None
+    fileName: Optional[str] = None
+    uri: Optional[str] = None
+    private: Optional[bool] = None
+    type: Optional[str] = None
+    pageNumber: Optional[int] = None
+    documentId: Optional[str] = None
+    chunkIdx: Optional[int] = None
+    chunkType: Optional[str] = None
+    pageImageUrl: Optional[str] = None
+    pageWidth: Optional[float] = None
+    pageHeight: Optional[float] = None
+    headers: Optional[List[str]] = None
+    children: Optional[List[str]] = None
+    caption: Optional[str] = None
+    bbox: Optional[List[float]] = None
+    token_list: Optional[List[str]] = None
+    token_start_index_list: Optional[List[int]] = None
+    token_end_index_list: Optional[List[int]] = None
+    language: Optional[str] = None
+    translation: Optional[str] = None
+    translation_normalized: Optional[str] = None
+    translation_token_list: Optional[List[str]] = None
+    translation_token_start_index_list: Optional[List[int]] = None
+    translation_token_end_index_list: Optional[List[int]] = None
+    vector: Optional[List[float]] = None
+    extractedTimestamp: Optional[datetime] = None
+    createdAt: Optional[datetime] = None
+    createdBy: Optional[str] = None
+    updatedAt: Optional[datetime] = None
+    updatedBy: Optional[str] = None
+
+    def __iter__(self) -> Iterator[Tuple[str, Any]]:
+        for column_name in self.__slots__:
+            yield column_name, getattr(self, column_name)
+
+    def to_orm(self) -> Item:
+        return Item(**dict(self))
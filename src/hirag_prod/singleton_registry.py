@@ -0,0 +1,29 @@
+import threading
+from typing import List
+
+# Singleton classes with an instance in this process, in creation order
+_singleton_classes: List[type] = []
+_registry_lock = threading.Lock()
+
+
+def register_singleton(cls: type) -> None:
+    """Record a singleton class as its instance is created, see reset_singletons"""
+    with _registry_lock:
+        if cls not in _singleton_classes:
+            _singleton_classes.append(cls)
+
+
+def get_singleton_classes() -> List[type]:
+    with _registry_lock:
+        return list(_singleton_classes)
+
+
+def reset_singletons() -> None:
+    """
+    Forget the instance of every registered singleton, without closing it, so that a
+    new process does not use the connections and threads of another one.
+    """
+    with _registry_lock:
+        classes, _singleton_classes[:] = list(_singleton_classes), []
+    for cls in classes:
+        cls._instance = None
@@ -1,5 +1,5 @@
 from abc import ABC, abstractmethod
-from typing import Callable, List, Literal, Optional, Union
+from typing import Awaitable, Callable, List, Literal, Optional, Union
 
 
 class BaseVDB(ABC):
@@ -19,6 +19,7 @@ class BaseVDB(ABC):
         with_tokenization: bool = False,
         with_translation: bool = False,
         mode: Literal["append", "overwrite"] = "append",
+        on_stage_done: Optional[Callable[[str], Awaitable[None]]] = None,
     ):
         raise NotImplementedError
 
@@ -1,10 +1,12 @@
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional, Set
 
-from sqlalchemy import text
+from sqlalchemy import select, text
+from sqlalchemy.dialects.postgresql import insert
 from sqlmodel.ext.asyncio.session import AsyncSession
 
 from hirag_prod.configs.functions import get_envs
+from hirag_prod.schema import JobStage
 
 
 async def update_job_status(
@@ -35,3 +37,54 @@ async def update_job_status(
     result = await session.exec(query)
     await session.commit()
     return result.rowcount or 0
+
+
+async def upsert_job_stage(
+    session: AsyncSession,
+    file_id: str,
+    stage: str,
+    status: str,
+    *,
+    document_key: str,
+    workspace_id: str,
+    knowledge_base_id: str,
+    updated_at: Optional[datetime] = None,
+) -> None:
+    """Insert or update the status of one ingestion stage of a job."""
+    updated_at_value = updated_at if updated_at is not None else datetime.now()
+    stmt = insert(JobStage).values(
+        jobId=file_id,
+        stage=stage,
+        status=status,
+        documentKey=document_key,
+        workspaceId=workspace_id,
+        knowledgeBaseId=knowledge_base_id,
+        createdAt=updated_at_value,
+        updatedAt=updated_at_value,
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[JobStage.jobId, JobStage.stage],
+        set_={"status": stmt.excluded.status, "updatedAt": stmt.excluded.updatedAt},
+    )
+    await session.exec(stmt)
+    await session.commit()
+
+
+async def get_documents_with_pending_stage(
+    session: AsyncSession,
+    workspace_id: str,
+    knowledge_base_id: str,
+    stages: List[str],
+    statuses: List[str],
+) -> Set[str]:
+    """Document keys of a knowledge base with one of ``stages`` in one of ``statuses``."""
+    stmt = (
+        select(JobStage.documentKey)
+        .where(JobStage.workspaceId == workspace_id)
+        .where(JobStage.knowledgeBaseId == knowledge_base_id)
+        .where(JobStage.stage.in_(stages))
+        .where(JobStage.status.in_(statuses))
+        .distinct()
+    )
+    result = await session.exec(stmt)
+    return {row[0] for row in result.all()}
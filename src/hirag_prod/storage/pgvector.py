@@ -2,7 +2,17 @@ import logging
 import math
 import time
 from datetime import datetime
-from typing import Any, Callable, Dict, List, Literal, Optional, Tuple, Union
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    Dict,
+    List,
+    Literal,
+    Optional,
+    Tuple,
+    Union,
+)
 
 import networkx as nx
 from sqlalchemy import Subquery, delete, func, literal, select, text
@@ -10,15 +20,18 @@ from sqlalchemy.dialects.postgresql import insert
 from tqdm import tqdm
 
 from hirag_prod._utils import AsyncEmbeddingFunction, log_error_info
-from hirag_prod.configs.functions import get_envs, get_hi_rag_config
+from hirag_prod.configs.functions import get_hi_rag_config
 from hirag_prod.cross_language_search.functions import (
-    has_traditional_chinese,
-    normalize_tokenize_text,
+    detect_language,
+    has_traditional_chinese_list,
+    needs_translation,
+    normalize_tokenize_texts,
 )
 from hirag_prod.resources.functions import (
     get_db_engine,
     get_db_session_maker,
     get_translator,
+    get_worker_pool,
 )
 from hirag_prod.schema import Base as PGBase
 from hirag_prod.schema import Chunk, Entity, File, Graph, Item, Node, Relation, Triplets
@@ -88,7 +101,12 @@ class PGVector(BaseVDB):
         with_tokenization: bool = False,
         with_translation: bool = False,
         mode: Literal["append", "overwrite"] = "append",
+        on_stage_done: Optional[Callable[[str], Awaitable[None]]] = None,
     ):
+        """
+        ``on_stage_done`` is awaited with "translation" and "tokenization" once these
+        steps are done for all texts, before the rows are written.
+        """
         if len(texts_to_upsert) != len(properties_list):
             raise ValueError(
                 "texts_to_upsert and properties_list must have the same length"
@@ -106,12 +124,50 @@ class PGVector(BaseVDB):
             valid_columns = set(model.__table__.columns.keys())
             translations_text_list = None
 
+            language_list = None
+
             if with_translation:
-                if get_envs().TRANSLATOR_SERVICE_TYPE == "local":
+                # Text already in the target language, numbers and code are copied
+                language_list = [detect_language(t) for t in texts_to_upsert]
+                translations_text_list = list(texts_to_upsert)
+                to_translate_index_list = [
+                    i
+                    for i, language in enumerate(language_list)
+                    if needs_translation(language, "en")
+                ]
+                if to_translate_index_list:
                     translated_list = await get_translator().translate(
-                        texts_to_upsert, dest="en"
+                        [texts_to_upsert[i] for i in to_translate_index_list],
+                        dest="en",
                     )
-                    translations_text_list = [t.text for t in translated_list]
+                    for i, translated in zip(to_translate_index_list, translated_list):
+                        translations_text_list[i] = translated.text
+                logger.info(
+                    f"[upsert_texts] Translation skipped for "
+                    f"{len(texts_to_upsert) - len(to_translate_index_list)}/{len(texts_to_upsert)} texts "
+                    f"already in the target language, numeric or code-like"
+                )
+                if on_stage_done is not None:
+                    await on_stage_done("translation")
+
+            has_traditional_chinese_flag_list = None
+            if with_chinese_type:
+                has_traditional_chinese_flag_list = await get_worker_pool().run(
+                    has_traditional_chinese_list, list(texts_to_upsert)
+                )
+
+            tokenized_list = None
+            translation_tokenized_list = None
+            if with_tokenization:
+                # Batched on the tokenizer thread, texts and translations together
+                tokenized_list = await normalize_tokenize_texts(
+                    list(texts_to_upsert)
+                    + (translations_text_list if with_translation else [])
+                )
+                if with_translation:
+                    translation_tokenized_list = tokenized_list[len(texts_to_upsert) :]
+                if on_stage_done is not None:
+                    await on_stage_done("tokenization")
 
             with tqdm(
                 total=len(properties_list), desc="Processing texts", leave=False
@@ -119,34 +175,36 @@ class PGVector(BaseVDB):
                 for i in range(len(properties_list)):
                     row = dict(properties_list[i] or {})
                     if with_chinese_type:
-                        row["has_traditional_chinese"] = has_traditional_chinese(
-                            texts_to_upsert[i]
+                        row["has_traditional_chinese"] = (
+                            has_traditional_chinese_flag_list[i]
                         )
                     if with_tokenization:
                         (
                             row["text_normalized"],
                             row["token_list"],
-                            row["token_start_index_list"],
-                            row["token_end_index_list"],
-                        ) = normalize_tokenize_text(texts_to_upsert[i])
+                            token_start_index_array,
+                            token_end_index_array,
+                        ) = tokenized_list[i]
+                        row["token_start_index_list"] = token_start_index_array.tolist()
+                        row["token_end_index_list"] = token_end_index_array.tolist()
 
                     if with_translation:
-                        if get_envs().TRANSLATOR_SERVICE_TYPE == "local":
-                            row["translation"] = translations_text_list[i]
-                        else:
-                            row["translation"] = (
-                                await get_translator().translate(
-                                    texts_to_upsert[i], dest="en"
-                                )
-                            ).text
+                        row["language"] = language_list[i]
+                        row["translation"] = translations_text_list[i]
 
                         if with_tokenization:
                             (
                                 row["translation_normalized"],
                                 row["translation_token_list"],
-                                row["translation_token_start_index_list"],
-                                row["translation_token_end_index_list"],
-                            ) = normalize_tokenize_text(row["translation"])
+                                token_start_index_array,
+                                token_end_index_array,
+                            ) = translation_tokenized_list[i]
+                            row["translation_token_start_index_list"] = (
+                                token_start_index_array.tolist()
+                            )
+                            row["translation_token_end_index_list"] = (
+                                token_end_index_array.tolist()
+                            )
 
                     vec = self._to_list(embs[i])
                     row["vector"] = vec
@@ -1,13 +1,14 @@
 import asyncio
 import logging
 from datetime import datetime
-from typing import Any, Dict, List, Literal, Optional, Union
+from typing import Any, Callable, Dict, List, Literal, Optional, Set, Union
 
 import numpy as np
 
 from hirag_prod._utils import log_error_info
 from hirag_prod.cluster import HierarchicalClustering
 from hirag_prod.configs.functions import get_hi_rag_config
+from hirag_prod.job_status_tracker import IngestionStage, JobStatusTracker
 from hirag_prod.reranker.utils import apply_reranking
 from hirag_prod.schema.vector_config import use_halfvec
 from hirag_prod.storage.storage_manager import StorageManager
@@ -18,8 +19,29 @@ logger = logging.getLogger("HiRAG")
 class QueryService:
     """Query service"""
 
-    def __init__(self, storage: StorageManager):
+    def __init__(
+        self,
+        storage: StorageManager,
+        job_status_tracker: Optional[JobStatusTracker] = None,
+    ):
         self.storage = storage
+        self.job_status_tracker = job_status_tracker
+
+    async def get_documents_pending_graph(
+        self, workspace_id: str, knowledge_base_id: str
+    ) -> Set[str]:
+        """Documents that are searchable but not in the knowledge graph yet"""
+        if self.job_status_tracker is None:
+            return set()
+        try:
+            return await self.job_status_tracker.get_pending_documents(
+                workspace_id, knowledge_base_id, stages=[IngestionStage.KG]
+            )
+        except Exception as e:
+            log_error_info(
+                logging.WARNING, "Failed to get documents pending enrichment", e
+            )
+            return set()
 
     async def query_chunks(self, *args, **kwargs) -> List[Dict[str, Any]]:
         """Query chunks via unified storage"""
@@ -188,6 +210,11 @@ class QueryService:
                 - "entity_ids": unique list of entity ids appearing as source/target
         """
         relations = await self.query_triplets(*args, **kwargs)
+        return self.build_triplet_recall(relations)
+
+    @staticmethod
+    def build_triplet_recall(relations: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """Aggregate the entity ids appearing as source/target of the relations."""
         entity_id_set = set()
         for rel in relations:
             src = rel.get("source")
@@ -198,6 +225,29 @@ class QueryService:
                 entity_id_set.add(tgt)
         return {"relations": relations, "entity_ids": list(entity_id_set)}
 
+    @staticmethod
+    def merge_recalled_rows(
+        row_lists: List[List[Dict[str, Any]]],
+        key: Callable[[Dict[str, Any]], Any],
+        limit: int,
+    ) -> List[Dict[str, Any]]:
+        """Merge recall results of separate query batches.
+
+        Keeps the smallest distance per row and the ``limit`` closest rows, which is
+        what a single recall over all query texts (least distance) returns.
+        """
+        best: Dict[Any, Dict[str, Any]] = {}
+        for rows in row_lists:
+            for row in rows:
+                row_key = key(row)
+                current = best.get(row_key)
+                if current is None or row.get("distance", float("inf")) < current.get(
+                    "distance", float("inf")
+                ):
+                    best[row_key] = row
+        merged = sorted(best.values(), key=lambda r: r.get("distance", float("inf")))
+        return merged[:limit]
+
     async def query_chunk_embeddings(
         self, workspace_id: str, knowledge_base_id: str, chunk_ids: List[str]
     ) -> Dict[str, Any]:
@@ -262,11 +312,13 @@ class QueryService:
         passage_node_weight: Optional[float] = None,
         damping: Optional[float] = None,
         file_list: Optional[List[str]] = None,
+        triplet_recall: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Two-path retrieval + PageRank fusion.
 
         - Recall chunks to form passage reset weights
-        - Recall triplets to form phrase (entity) reset weights with frequency penalty
+        - Recall triplets to form phrase (entity) reset weights with frequency penalty,
+          unless an already recalled ``triplet_recall`` is given
         - Build reset = phrase_weights + passage_weights and run Personalized PageRank
         - If no facts, fall back to DPR order (query rerank order)
         """
@@ -285,14 +337,15 @@ class QueryService:
         ]
 
         # Path 2: triplet recall -> entity seeds
-        triplet_recall = await self.recall_triplets(
-            query=query,
-            workspace_id=workspace_id,
-            knowledge_base_id=knowledge_base_id,
-            topk=topk,
-            topn=topn,
-            file_list=file_list,
-        )
+        if triplet_recall is None:
+            triplet_recall = await self.recall_triplets(
+                query=query,
+                workspace_id=workspace_id,
+                knowledge_base_id=knowledge_base_id,
+                topk=topk,
+                topn=topn,
+                file_list=file_list,
+            )
         query_triplets = triplet_recall["relations"]
         query_entity_ids = triplet_recall["entity_ids"]
 
@@ -459,6 +512,7 @@ class QueryService:
         strategy: Literal["pagerank", "reranker", "hybrid"] = "hybrid",
         topk: Optional[int] = None,
         topn: Optional[int] = None,
+        triplet_recall: Optional[Dict[str, Any]] = None,
     ) -> Dict[str, Any]:
         """Apply reranking to an existing list of chunks."""
         if not chunks:
@@ -478,12 +532,28 @@ class QueryService:
                 knowledge_base_id=knowledge_base_id,
                 topk=topk,
                 topn=topn,
+                triplet_recall=triplet_recall,
             )
-            result["chunks"] = (
-                pagerank_result.get("pagerank")
-                if pagerank_result.get("pagerank")
-                else pagerank_result.get("query_top", [])
-            )
+            if pagerank_result.get("pagerank"):
+                # Documents still waiting for KG construction cannot be reached through
+                # the graph, keep their recalled chunks after the ranked ones
+                pending_documents = await self.get_documents_pending_graph(
+                    workspace_id, knowledge_base_id
+                )
+                ranked_ids = {c.get("documentKey") for c in pagerank_result["pagerank"]}
+                pending_chunks = [
+                    c
+                    for c in chunks
+                    if c.get("documentId") in pending_documents
+                    and c.get("documentKey") not in ranked_ids
+                ]
+                result["chunks"] = pagerank_result["pagerank"] + pending_chunks
+                if pending_chunks:
+                    result["pending_enrichment"] = sorted(
+                        {c.get("documentId") for c in pending_chunks}
+                    )
+            else:
+                result["chunks"] = pagerank_result.get("query_top", [])
             logger.info(f"After pagerank: {len(result['chunks'])} chunks")
 
         # If filter by clustering, apply clustering filter
@@ -1,16 +1,17 @@
+import asyncio
 import logging
-from typing import Any, Dict, List, Optional, Union
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Union
 
 from sqlalchemy import select
 
 from hirag_prod._utils import log_error_info, retry_async
 from hirag_prod.configs.functions import get_hi_rag_config
 from hirag_prod.exceptions import StorageError
-from hirag_prod.resources.functions import get_resource_manager
+from hirag_prod.resources.functions import get_resource_manager, get_token_counter
 from hirag_prod.schema import (
-    Chunk,
+    ChunkRecord,
     File,
-    Item,
+    ItemRecord,
     Relation,
 )
 from hirag_prod.storage import (
@@ -64,17 +65,27 @@ class StorageManager:
         return await self.vdb.has_graph_edges(workspace_id, knowledge_base_id)
 
     @retry_async()
-    async def upsert_chunks_to_vdb(self, chunks: List[Chunk]) -> None:
+    async def upsert_chunks_to_vdb(self, chunks: List[ChunkRecord]) -> None:
         if not chunks:
             return
 
-        def _embed_text(c: Chunk) -> str:
+        def _embed_text(c: ChunkRecord) -> str:
             if getattr(c, "chunkType", None) in ["excel_sheet", "table", "picture"]:
                 cap = (getattr(c, "caption", "") or "").strip()
                 if cap:
                     return cap
             return (getattr(c, "text", "") or "").strip()
 
+        # Chunks that were not split have no token count yet
+        uncounted = [c for c in chunks if getattr(c, "tokenCount", None) is None]
+        if uncounted:
+            counts = await asyncio.to_thread(
+                get_token_counter().count_batch,
+                [getattr(c, "text", "") or "" for c in uncounted],
+            )
+            for c, count in zip(uncounted, counts):
+                c.tokenCount = count
+
         texts_to_embed = [_embed_text(c) for c in chunks]
         await self.vdb.upsert_texts(
             texts_to_upsert=texts_to_embed,
@@ -84,11 +95,15 @@ class StorageManager:
         )
 
     @retry_async()
-    async def upsert_items_to_vdb(self, items: List[Item]) -> None:
+    async def upsert_items_to_vdb(
+        self,
+        items: List[ItemRecord],
+        on_stage_done: Optional[Callable[[str], Awaitable[None]]] = None,
+    ) -> None:
         if not items:
             return
 
-        def _embed_text(c: Item) -> str:
+        def _embed_text(c: ItemRecord) -> str:
             if getattr(c, "chunkType", None) in ["excel_sheet", "table", "picture"]:
                 cap = (getattr(c, "caption", "") or "").strip()
                 if cap:
@@ -104,6 +119,7 @@ class StorageManager:
             with_tokenization=True,
             with_translation=True,
             mode="append",
+            on_stage_done=on_stage_done,
         )
 
     @retry_async()
@@ -0,0 +1,317 @@
+import asyncio
+import contextvars
+import logging
+import time
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Deque, Dict, Optional, Tuple
+
+logger = logging.getLogger("HiRAG")
+
+# (workspaceId, knowledgeBaseId)
+TenantKey = Tuple[str, str]
+
+# Tenant of the ingestion job running in the current task, so that sub-tasks
+# scheduled deep inside the pipeline are charged to the right queue
+current_tenant: contextvars.ContextVar[Optional[TenantKey]] = contextvars.ContextVar(
+    "hirag_current_tenant", default=None
+)
+
+
+@dataclass
+class _Waiter:
+    future: asyncio.Future
+    cost: float
+    enqueued_at: float
+
+
+@dataclass
+class _TenantLimits:
+    """Limits set with ``TenantFairScheduler.set_tenant_limit``"""
+
+    max_concurrency: Optional[int] = None
+    weight: float = 1.0
+
+
+@dataclass
+class _TenantState:
+    """Queue and accounting of a tenant while it has queued or running work"""
+
+    weight: float = 1.0
+    max_concurrency: Optional[int] = None
+    deficit: float = 0.0
+    running: int = 0
+    waiters: Deque[_Waiter] = field(default_factory=deque)
+    # Metrics
+    granted_count: int = 0
+    total_wait_time: float = 0.0
+    max_wait_time: float = 0.0
+    last_wait_time: float = 0.0
+
+
+class HeldSlot:
+    """
+    Slot acquired with ``TenantFairScheduler.hold``. It is released exactly once, by
+    whoever owns it last, e.g. a background task it was handed over to.
+    """
+
+    def __init__(self, scheduler: "TenantFairScheduler", tenant: TenantKey):
+        self._scheduler = scheduler
+        self.tenant = tenant
+        self.handed_over: bool = False
+        self.released: bool = False
+
+    def hand_over(self) -> "HeldSlot":
+        """Leave the release to a new owner"""
+        self.handed_over = True
+        return self
+
+    def release(self) -> None:
+        if not self.released:
+            self.released = True
+            self._scheduler.release(self.tenant)
+
+
+class TenantFairScheduler:
+    """
+    Deficit round-robin scheduler across tenants (workspaceId, knowledgeBaseId)
+
+    Every tenant owns a FIFO queue. Free slots of the global concurrency limit are
+    handed out by visiting tenants in round-robin order; on each visit a tenant
+    earns ``quantum * weight`` credits and may start queued work as long as it has
+    enough credits and has not reached its own concurrency cap. A tenant that
+    submits thousands of tasks therefore cannot starve the others.
+
+    The state of a tenant is dropped once it has nothing queued or running, its
+    deficit is reset at that point anyway. Only the limits set for it are kept.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_concurrency: int,
+        default_tenant_concurrency: Optional[int] = None,
+        quantum: float = 1.0,
+    ):
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self.name = name
+        self.max_concurrency = max_concurrency
+        self.default_tenant_concurrency = default_tenant_concurrency
+        self.quantum = quantum
+        self._running = 0
+        self._tenants: Dict[TenantKey, _TenantState] = {}
+        self._tenant_limits: Dict[TenantKey, _TenantLimits] = {}
+        self._active: Deque[TenantKey] = deque()
+
+    # ========================================================================
+    # Runtime configuration
+    # ========================================================================
+
+    def _get_state(self, tenant: TenantKey) -> _TenantState:
+        state = self._tenants.get(tenant)
+        if state is None:
+            limits = self._tenant_limits.get(tenant)
+            if limits is None:
+                state = _TenantState(max_concurrency=self.default_tenant_concurrency)
+            else:
+                state = _TenantState(
+                    max_concurrency=limits.max_concurrency, weight=limits.weight
+                )
+            self._tenants[tenant] = state
+        return state
+
+    def _drop_if_idle(self, tenant: TenantKey) -> None:
+        state = self._tenants.get(tenant)
+        if (
+            state is not None
+            and not state.waiters
+            and state.running == 0
+            and tenant not in self._active
+        ):
+            del self._tenants[tenant]
+
+    def set_max_concurrency(self, max_concurrency: int) -> None:
+        """Change the global concurrency limit"""
+        if max_concurrency <= 0:
+            raise ValueError("max_concurrency must be positive")
+        self.max_concurrency = max_concurrency
+        self._dispatch()
+
+    def set_tenant_limit(
+        self,
+        tenant: TenantKey,
+        max_concurrency: Optional[int] = None,
+        weight: Optional[float] = None,
+    ) -> None:
+        """Change the concurrency cap and/or scheduling weight of a tenant"""
+        limits = self._tenant_limits.get(tenant) or _TenantLimits(
+            max_concurrency=self.default_tenant_concurrency
+        )
+        if max_concurrency is not None:
+            if max_concurrency <= 0:
+                raise ValueError("max_concurrency must be positive")
+            limits.max_concurrency = max_concurrency
+        if weight is not None:
+            if weight <= 0:
+                raise ValueError("weight must be positive")
+            limits.weight = weight
+        self._tenant_limits[tenant] = limits
+        state = self._tenants.get(tenant)
+        if state is not None:
+            state.max_concurrency = limits.max_concurrency
+            state.weight = limits.weight
+        self._dispatch()
+
+    # ========================================================================
+    # Acquire / release
+    # ========================================================================
+
+    def _has_capacity(self, state: _TenantState) -> bool:
+        return state.max_concurrency is None or state.running < state.max_concurrency
+
+    async def acquire(self, tenant: TenantKey, cost: float = 1.0) -> None:
+        state = self._get_state(tenant)
+        waiter = _Waiter(
+            future=asyncio.get_running_loop().create_future(),
+            cost=cost,
+            enqueued_at=time.perf_counter(),
+        )
+        state.waiters.append(waiter)
+        if tenant not in self._active:
+            self._active.append(tenant)
+        self._dispatch()
+
+        try:
+            await waiter.future
+        except asyncio.CancelledError:
+            if waiter.future.done() and not waiter.future.cancelled():
+                # Slot was granted right before the cancellation, give it back
+                self.release(tenant)
+            else:
+                try:
+                    state.waiters.remove(waiter)
+                except ValueError:
+                    pass
+                self._dispatch()
+                self._drop_if_idle(tenant)
+            raise
+
+    def release(self, tenant: TenantKey) -> None:
+        state = self._tenants[tenant]
+        state.running -= 1
+        self._running -= 1
+        self._dispatch()
+        self._drop_if_idle(tenant)
+
+    async def hold(self, tenant: TenantKey, cost: float = 1.0) -> HeldSlot:
+        """Acquire a slot that outlives the current block, see HeldSlot"""
+        await self.acquire(tenant, cost)
+        return HeldSlot(self, tenant)
+
+    @asynccontextmanager
+    async def slot(
+        self, tenant: Optional[TenantKey] = None, cost: float = 1.0
+    ) -> AsyncIterator[None]:
+        """Run the body once the tenant is scheduled (defaults to ``current_tenant``)"""
+        if tenant is None:
+            tenant = current_tenant.get() or ("", "")
+        await self.acquire(tenant, cost)
+        try:
+            yield
+        finally:
+            self.release(tenant)
+
+    def _grant(self, state: _TenantState) -> None:
+        waiter = state.waiters.popleft()
+        state.deficit -= waiter.cost
+        state.running += 1
+        self._running += 1
+
+        wait_time = time.perf_counter() - waiter.enqueued_at
+        state.granted_count += 1
+        state.total_wait_time += wait_time
+        state.last_wait_time = wait_time
+        state.max_wait_time = max(state.max_wait_time, wait_time)
+
+        waiter.future.set_result(None)
+
+    def _dispatch(self) -> None:
+        """Hand out free global slots in deficit round-robin order"""
+        idle_visits = 0
+        while self._running < self.max_concurrency and self._active:
+            if idle_visits >= len(self._active):
+                # Every queued tenant is at its own cap
+                break
+
+            tenant = self._active.popleft()
+            state = self._tenants[tenant]
+
+            # Drop waiters cancelled while queued
+            while state.waiters and state.waiters[0].future.done():
+                state.waiters.popleft()
+            if not state.waiters:
+                state.deficit = 0.0
+                self._drop_if_idle(tenant)
+                continue
+
+            if not self._has_capacity(state):
+                self._active.append(tenant)
+                idle_visits += 1
+                continue
+
+            idle_visits = 0
+            state.deficit += self.quantum * state.weight
+            while (
+                state.waiters
+                and state.deficit >= state.waiters[0].cost
+                and self._has_capacity(state)
+                and self._running < self.max_concurrency
+            ):
+                self._grant(state)
+                while state.waiters and state.waiters[0].future.done():
+                    state.waiters.popleft()
+
+            if state.waiters:
+                self._active.append(tenant)
+            else:
+                state.deficit = 0.0
+                self._drop_if_idle(tenant)
+
+    # ========================================================================
+    # Metrics
+    # ========================================================================
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Per-tenant queue depth, running count and wait time"""
+        now = time.perf_counter()
+        tenants: Dict[str, Dict[str, Any]] = {}
+        for (workspace_id, knowledge_base_id), state in self._tenants.items():
+            pending = [w for w in state.waiters if not w.future.done()]
+            tenants[f"{workspace_id}/{knowledge_base_id}"] = {
+                "workspace_id": workspace_id,
+                "knowledge_base_id": knowledge_base_id,
+                "queue_depth": len(pending),
+                "running": state.running,
+                "max_concurrency": state.max_concurrency,
+                "weight": state.weight,
+                "granted_count": state.granted_count,
+                "avg_wait_time": (
+                    state.total_wait_time / state.granted_count
+                    if state.granted_count
+                    else 0.0
+                ),
+                "max_wait_time": state.max_wait_time,
+                "last_wait_time": state.last_wait_time,
+                "oldest_waiting_time": (
+                    now - pending[0].enqueued_at if pending else 0.0
+                ),
+            }
+        return {
+            "name": self.name,
+            "max_concurrency": self.max_concurrency,
+            "running": self._running,
+            "queue_depth": sum(t["queue_depth"] for t in tenants.values()),
+            "tenants": tenants,
+        }
@@ -1,7 +1,4 @@
-import asyncio
-from typing import Any, Dict, List, Optional, Union
-
-import httpx
+from typing import Any, Dict, List, Optional, Tuple, Union
 
 from hirag_prod._utils import logger
 from hirag_prod.configs.functions import (
@@ -10,7 +7,16 @@ from hirag_prod.configs.functions import (
     get_translator_config,
 )
 from hirag_prod.rate_limiter import RateLimiter
-from hirag_prod.resources.functions import get_chinese_convertor
+from hirag_prod.resources.functions import (
+    get_async_http_client,
+    get_chinese_convertor,
+)
+from hirag_prod.translator.translation_cache import translate_with_cache
+from hirag_prod.translator.translation_scheduler import (
+    TranslationScheduler,
+    build_numbered_segments,
+    parse_numbered_segments,
+)
 
 rate_limiter = RateLimiter()
 
@@ -38,7 +44,6 @@ class LocalTranslatorClient:
         self.model_name: str = config.model_name
         self.entry_point: str = config.entry_point
         self.timeout: float = config.timeout
-        self._http_client = httpx.AsyncClient(timeout=self.timeout)
 
     async def create_translation(
         self, messages: List[Dict[str, str]], **kwargs: Any
@@ -53,8 +58,8 @@ class LocalTranslatorClient:
 
         payload = {"messages": messages, **kwargs}
 
-        response = await self._http_client.post(
-            self.base_url, headers=headers, json=payload
+        response = await get_async_http_client(self.base_url).post(
+            self.base_url, headers=headers, json=payload, timeout=self.timeout
         )
 
         response.raise_for_status()
@@ -63,8 +68,7 @@ class LocalTranslatorClient:
         return result
 
     async def close(self):
-        """Close the HTTP client"""
-        await self._http_client.aclose()
+        """Nothing to close, the shared HTTP clients are closed by the ResourceManager"""
 
 
 class LocalTranslator:
@@ -86,6 +90,7 @@ class LocalTranslator:
 
     def __init__(self) -> None:
         self._client: Optional[LocalTranslatorClient] = None
+        self._scheduler: Optional[TranslationScheduler] = None
 
     def _get_client(self) -> LocalTranslatorClient:
         """Get or create the HTTP client for local translation."""
@@ -118,10 +123,80 @@ class LocalTranslator:
         Returns:
             Translated object or list of Translated objects
         """
-        if isinstance(text, list):
-            return await self._translate_batch(text, dest, src)
+
+        async def translate_missing(
+            missing: list[str],
+        ) -> list["LocalTranslator.LocalTranslated"]:
+            return await self._translate_batch(missing, dest, src)
+
+        def from_cache(
+            origin: str, translated_text: str
+        ) -> "LocalTranslator.LocalTranslated":
+            # Reported like a fresh translation, Chinese variants as "Chinese"
+            _, dest_lang, src_lang = self._resolve_languages(dest, src)
+            return self.LocalTranslated(
+                text=translated_text,
+                src=src_lang,
+                dest=dest_lang,
+                origin=origin,
+                extra_data={"cached": True},
+            )
+
+        translated = await translate_with_cache(
+            text if isinstance(text, list) else [text],
+            dest=dest,
+            model=get_translator_config().model_name,
+            translate_missing=translate_missing,
+            from_cache=from_cache,
+        )
+        return translated if isinstance(text, list) else translated[0]
+
+    def _get_scheduler(self) -> TranslationScheduler:
+        """Get or create the scheduler shared by all translation calls."""
+        if self._scheduler is None:
+            self._scheduler = TranslationScheduler(
+                max_concurrency=get_envs().TRANSLATOR_MAX_CONCURRENCY,
+                pack_token_budget=get_envs().TRANSLATOR_PACK_TOKEN_BUDGET,
+                pack_max_texts=get_envs().TRANSLATOR_PACK_MAX_TEXTS,
+            )
+        return self._scheduler
+
+    def _resolve_languages(self, dest: str, src: str) -> Tuple[str, str, str]:
+        """Get the requested destination, the prompted destination and the source language names"""
+        if dest == "Auto":
+            raise ValueError("Destination language cannot be 'Auto'")
+        original_dest_lang: str = self._get_language_name(dest)
+        if original_dest_lang in [
+            "Simplified Chinese",
+            "Traditional Chinese - Hong Kong",
+        ]:
+            dest_lang = "Chinese"
         else:
-            return await self._translate_single(text, dest, src)
+            dest_lang = original_dest_lang
+        return original_dest_lang, dest_lang, self._get_language_name(src)
+
+    def _convert_chinese(self, translated_text: str, original_dest_lang: str) -> str:
+        if original_dest_lang in [
+            "Simplified Chinese",
+            "Traditional Chinese - Hong Kong",
+        ]:
+            translated_text = get_chinese_convertor(
+                "hk2s" if original_dest_lang == "Simplified Chinese" else "s2hk"
+            ).convert(translated_text)
+        return translated_text
+
+    def _count_tokens(self, response: Dict[str, Any]) -> None:
+        if get_envs().ENABLE_TOKEN_COUNT:
+            get_shared_variables().input_token_count_dict["translator"].value += (
+                response["usage"]["prompt_tokens"]
+                if ("usage" in response) and ("prompt_tokens" in response["usage"])
+                else 0
+            )
+            get_shared_variables().output_token_count_dict["translator"].value += (
+                response["usage"]["completion_tokens"]
+                if ("usage" in response) and ("completion_tokens" in response["usage"])
+                else 0
+            )
 
     @rate_limiter.limit(
         "translator",
@@ -140,15 +215,7 @@ class LocalTranslator:
             raise ValueError("Destination language cannot be 'Auto'")
 
         try:
-            original_dest_lang: str = self._get_language_name(dest)
-            if original_dest_lang in [
-                "Simplified Chinese",
-                "Traditional Chinese - Hong Kong",
-            ]:
-                dest_lang = "Chinese"
-            else:
-                dest_lang = original_dest_lang
-            src_lang: str = self._get_language_name(src)
+            original_dest_lang, dest_lang, src_lang = self._resolve_languages(dest, src)
 
             messages = [
                 {
@@ -161,27 +228,11 @@ class LocalTranslator:
             response = await client.create_translation(
                 messages=messages,
             )
-            if get_envs().ENABLE_TOKEN_COUNT:
-                get_shared_variables().input_token_count_dict["translator"].value += (
-                    response["usage"]["prompt_tokens"]
-                    if ("usage" in response) and ("prompt_tokens" in response["usage"])
-                    else 0
-                )
-                get_shared_variables().output_token_count_dict["translator"].value += (
-                    response["usage"]["completion_tokens"]
-                    if ("usage" in response)
-                    and ("completion_tokens" in response["usage"])
-                    else 0
-                )
-
-            translated_text: str = response["choices"][0]["message"]["content"]
-            if original_dest_lang in [
-                "Simplified Chinese",
-                "Traditional Chinese - Hong Kong",
-            ]:
-                translated_text = get_chinese_convertor(
-                    "hk2s" if original_dest_lang == "Simplified Chinese" else "s2hk"
-                ).convert(translated_text)
+            self._count_tokens(response)
+
+            translated_text: str = self._convert_chinese(
+                response["choices"][0]["message"]["content"], original_dest_lang
+            )
             translated = self.LocalTranslated(
                 text=translated_text,
                 src=src_lang,
@@ -193,25 +244,51 @@ class LocalTranslator:
         except Exception as e:
             raise RuntimeError(f"Translation failed: {e}")
 
-    async def _translate_batch(
-        self,
-        texts: list[str],
-        dest: str = "English",
-        src: str = "Auto",
-        max_concurrency: int = 1000,
+    @rate_limiter.limit(
+        "translator",
+        "TRANSLATOR_RATE_LIMIT_MIN_INTERVAL_SECONDS",
+        "TRANSLATOR_RATE_LIMIT",
+        "TRANSLATOR_RATE_LIMIT_TIME_UNIT",
+    )
+    async def _translate_packed(
+        self, texts: list[str], dest: str = "English", src: str = "Auto"
     ) -> list[LocalTranslated]:
-        if not texts:
-            return []
-        sem = asyncio.Semaphore(max_concurrency)
-
-        async def worker(t: str):
-            async with sem:
-                return await self._translate_single(t, dest, src)
+        """Translate several short texts with one numbered prompt."""
+        if any(not text or not text.strip() for text in texts):
+            raise ValueError("Input text cannot be empty")
 
-        from tqdm.asyncio import tqdm_asyncio
+        original_dest_lang, dest_lang, src_lang = self._resolve_languages(dest, src)
+
+        messages = [
+            {
+                "role": "user",
+                "content": f"Translate each numbered segment below into {dest_lang}, without additional explanation. "
+                f'Reply with the translation of every segment, each in its own <seg id="n"></seg> tags, in order.\n\n'
+                f"{build_numbered_segments(texts)}",
+            }
+        ]
+        response = await self._get_client().create_translation(messages=messages)
+        self._count_tokens(response)
+
+        translated_texts = parse_numbered_segments(
+            response["choices"][0]["message"]["content"], len(texts)
+        )
+        return [
+            self.LocalTranslated(
+                text=self._convert_chinese(translated_text, original_dest_lang),
+                src=src_lang,
+                dest=dest_lang,
+                origin=text,
+                extra_data={"usage": response["usage"], "packed": len(texts)},
+            )
+            for text, translated_text in zip(texts, translated_texts)
+        ]
 
-        results = await tqdm_asyncio.gather(
-            *[worker(t) for t in texts],
-            desc="Translating",
+    async def _translate_batch(
+        self, texts: list[str], dest: str = "English", src: str = "Auto"
+    ) -> list[LocalTranslated]:
+        return await self._get_scheduler().translate(
+            texts,
+            translate_single=lambda text: self._translate_single(text, dest, src),
+            translate_pack=lambda pack: self._translate_packed(pack, dest, src),
         )
-        return results
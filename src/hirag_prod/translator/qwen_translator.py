@@ -1,4 +1,4 @@
-from typing import Optional, Union
+from typing import Optional, Tuple, Union
 
 from openai import AsyncOpenAI
 
@@ -9,6 +9,12 @@ from hirag_prod.configs.functions import (
     get_translator_config,
 )
 from hirag_prod.rate_limiter import RateLimiter
+from hirag_prod.translator.translation_cache import translate_with_cache
+from hirag_prod.translator.translation_scheduler import (
+    TranslationScheduler,
+    build_numbered_segments,
+    parse_numbered_segments,
+)
 
 rate_limiter = RateLimiter()
 
@@ -47,6 +53,7 @@ class QwenTranslator:
 
     def __init__(self):
         self._client = None
+        self._scheduler: Optional[TranslationScheduler] = None
 
     def _get_client(self) -> AsyncOpenAI:
         """Get or create the OpenAI client for Qwen translation."""
@@ -61,6 +68,16 @@ class QwenTranslator:
             logger.info(f"🌐 Using Qwen Translator with model: {config.model_name}")
         return self._client
 
+    def _get_scheduler(self) -> TranslationScheduler:
+        """Get or create the scheduler shared by all translation calls."""
+        if self._scheduler is None:
+            self._scheduler = TranslationScheduler(
+                max_concurrency=get_envs().TRANSLATOR_MAX_CONCURRENCY,
+                pack_token_budget=get_envs().TRANSLATOR_PACK_TOKEN_BUDGET,
+                pack_max_texts=get_envs().TRANSLATOR_PACK_MAX_TEXTS,
+            )
+        return self._scheduler
+
     def _validate_language(self, lang: str) -> None:
         """Validate language code"""
         if not lang:
@@ -77,6 +94,14 @@ class QwenTranslator:
         else:
             raise ValueError(f"Unsupported language: {lang}")
 
+    def _resolve_languages(self, dest: str, src: str) -> Tuple[str, str]:
+        """Get the destination and source language codes of fresh and cached translations"""
+        self._validate_language(src)
+        self._validate_language(dest)
+        if dest == "Auto":
+            raise ValueError("Destination language cannot be 'Auto'")
+        return self._get_language_code(dest), self._get_language_code(src)
+
     async def translate(
         self, text, dest: str = "English", src: str = "Auto"
     ) -> Union[QwenTranslated, list[QwenTranslated]]:
@@ -91,10 +116,32 @@ class QwenTranslator:
         Returns:
             Translated object or list of Translated objects
         """
-        if isinstance(text, list):
-            return await self._translate_batch(text, dest, src)
-        else:
-            return await self._translate_single(text, dest, src)
+
+        async def translate_missing(
+            missing: list[str],
+        ) -> list["QwenTranslator.QwenTranslated"]:
+            return await self._translate_batch(missing, dest, src)
+
+        def from_cache(
+            origin: str, translated_text: str
+        ) -> "QwenTranslator.QwenTranslated":
+            dest_lang, src_lang = self._resolve_languages(dest, src)
+            return self.QwenTranslated(
+                text=translated_text,
+                src=src_lang,
+                dest=dest_lang,
+                origin=origin,
+                extra_data={"cached": True},
+            )
+
+        translated = await translate_with_cache(
+            text if isinstance(text, list) else [text],
+            dest=dest,
+            model=get_translator_config().model_name,
+            translate_missing=translate_missing,
+            from_cache=from_cache,
+        )
+        return translated if isinstance(text, list) else translated[0]
 
     @rate_limiter.limit(
         "translator",
@@ -109,39 +156,13 @@ class QwenTranslator:
         if not text or not text.strip():
             raise ValueError("Input text cannot be empty")
 
-        self._validate_language(src)
-        self._validate_language(dest)
-        if dest == "Auto":
-            raise ValueError("Destination language cannot be 'Auto'")
+        dest_lang, src_lang = self._resolve_languages(dest, src)
 
         try:
-            dest_lang = self._get_language_code(dest)
-            src_lang = self._get_language_code(src)
 
-            messages = [{"role": "user", "content": f"{text}"}]
             translation_options = {"source_lang": src_lang, "target_lang": dest_lang}
 
-            config = get_translator_config()
-            client = self._get_client()
-            response = await client.chat.completions.create(
-                model=config.model_name,
-                messages=messages,
-                max_tokens=config.max_tokens,
-                temperature=config.temperature,
-                timeout=config.timeout,
-                extra_body={"translation_options": translation_options},
-            )
-            if get_envs().ENABLE_TOKEN_COUNT:
-                get_shared_variables().input_token_count_dict["translator"].value += (
-                    response.usage.prompt_tokens
-                    if response.usage.prompt_tokens is not None
-                    else 0
-                )
-                get_shared_variables().output_token_count_dict["translator"].value += (
-                    response.usage.completion_tokens
-                    if response.usage.completion_tokens is not None
-                    else 0
-                )
+            response = await self._create_completion(f"{text}", translation_options)
 
             translated = self.QwenTranslated(
                 text=response.choices[0].message.content,
@@ -154,12 +175,69 @@ class QwenTranslator:
         except Exception as e:
             raise RuntimeError(f"Translation failed: {e}")
 
+    async def _create_completion(self, content: str, translation_options: dict):
+        config = get_translator_config()
+        client = self._get_client()
+        response = await client.chat.completions.create(
+            model=config.model_name,
+            messages=[{"role": "user", "content": content}],
+            max_tokens=config.max_tokens,
+            temperature=config.temperature,
+            timeout=config.timeout,
+            extra_body={"translation_options": translation_options},
+        )
+        if get_envs().ENABLE_TOKEN_COUNT:
+            get_shared_variables().input_token_count_dict["translator"].value += (
+                response.usage.prompt_tokens
+                if response.usage.prompt_tokens is not None
+                else 0
+            )
+            get_shared_variables().output_token_count_dict["translator"].value += (
+                response.usage.completion_tokens
+                if response.usage.completion_tokens is not None
+                else 0
+            )
+        return response
+
+    @rate_limiter.limit(
+        "translator",
+        "TRANSLATOR_RATE_LIMIT_MIN_INTERVAL_SECONDS",
+        "TRANSLATOR_RATE_LIMIT",
+        "TRANSLATOR_RATE_LIMIT_TIME_UNIT",
+    )
+    async def _translate_packed(
+        self, texts: list[str], dest: str = "English", src: str = "Auto"
+    ) -> list[QwenTranslated]:
+        """Translate several short texts with one numbered prompt."""
+        if any(not text or not text.strip() for text in texts):
+            raise ValueError("Input text cannot be empty")
+
+        dest_lang, src_lang = self._resolve_languages(dest, src)
+        response = await self._create_completion(
+            build_numbered_segments(texts),
+            {"source_lang": src_lang, "target_lang": dest_lang},
+        )
+
+        translated_texts = parse_numbered_segments(
+            response.choices[0].message.content, len(texts)
+        )
+        return [
+            self.QwenTranslated(
+                text=translated_text,
+                src=src_lang,
+                dest=dest_lang,
+                origin=text,
+                extra_data={"usage": response.usage, "packed": len(texts)},
+            )
+            for text, translated_text in zip(texts, translated_texts)
+        ]
+
     async def _translate_batch(
         self, texts: list[str], dest: str = "English", src: str = "Auto"
     ) -> list[QwenTranslated]:
-        """Translate a batch of texts. Qwen does not support batch translation, so translate one by one."""
-        results = []
-        for text in texts:
-            translated_text = await self._translate_single(text, dest, src)
-            results.append(translated_text)
-        return results
+        """Translate a batch of texts, packing short texts into numbered prompts."""
+        return await self._get_scheduler().translate(
+            texts,
+            translate_single=lambda text: self._translate_single(text, dest, src),
+            translate_pack=lambda pack: self._translate_packed(pack, dest, src),
+        )
@@ -0,0 +1,201 @@
+import hashlib
+import logging
+import threading
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Tuple
+
+from hirag_prod._utils import log_error_info
+from hirag_prod.configs.functions import get_envs
+from hirag_prod.resources.functions import get_redis
+from hirag_prod.singleton_registry import register_singleton
+
+logger = logging.getLogger("HiRAG")
+
+CacheKey = Tuple[str, str, str]
+
+
+def _text_hash(text: str) -> str:
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+
+class TranslationCache:
+    """
+    Two level cache of translations keyed by (source text hash, target language, model).
+
+    An in-process LRU answers repeated queries and boilerplate Items text without a
+    round trip. Redis shares translations across workers and restarts. Redis is
+    optional, the LRU keeps working when it is not initialized or unreachable.
+    """
+
+    _instance: Optional["TranslationCache"] = None
+    _lock = threading.Lock()
+
+    def __new__(cls, *args, **kwargs) -> "TranslationCache":
+        if cls._instance is None:
+            with cls._lock:
+                if cls._instance is None:
+                    cls._instance = super().__new__(cls)
+                    register_singleton(cls)
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_created", False):
+            return
+        self.max_entries: int = get_envs().TRANSLATION_CACHE_MAX_ENTRIES
+        self._lru: "OrderedDict[CacheKey, str]" = OrderedDict()
+        self._lru_lock = threading.Lock()
+        self.lru_hits: int = 0
+        self.redis_hits: int = 0
+        self.misses: int = 0
+        self.deduplicated: int = 0
+        self._created: bool = True
+
+    @staticmethod
+    def _redis_key(key: CacheKey) -> str:
+        text_hash, dest, model = key
+        return f"{get_envs().REDIS_KEY_PREFIX}:translation:{model}:{dest}:{text_hash}"
+
+    @staticmethod
+    def _redis():
+        try:
+            return get_redis()
+        except RuntimeError:
+            # Redis is not initialized, only the in-process LRU is used
+            return None
+
+    def _lru_get(self, key: CacheKey) -> Optional[str]:
+        with self._lru_lock:
+            value = self._lru.get(key)
+            if value is not None:
+                self._lru.move_to_end(key)
+            return value
+
+    def _lru_set(self, key: CacheKey, value: str) -> None:
+        with self._lru_lock:
+            self._lru[key] = value
+            self._lru.move_to_end(key)
+            while len(self._lru) > self.max_entries:
+                self._lru.popitem(last=False)
+
+    async def get_many(self, texts: List[str], dest: str, model: str) -> Dict[str, str]:
+        """Get the cached translations of distinct ``texts``, missing texts are left out"""
+        found: Dict[str, str] = {}
+        remote: Dict[str, CacheKey] = {}
+        for text in texts:
+            key = (_text_hash(text), dest, model or "")
+            value = self._lru_get(key)
+            if value is not None:
+                found[text] = value
+                self.lru_hits += 1
+            else:
+                remote[text] = key
+
+        redis = self._redis() if remote else None
+        if redis is None:
+            self.misses += len(remote)
+        else:
+            try:
+                values = await redis.mget(
+                    [self._redis_key(key) for key in remote.values()]
+                )
+            except Exception as e:
+                log_error_info(
+                    logging.WARNING, "Translation cache lookup in Redis failed", e
+                )
+                values = [None] * len(remote)
+            for (text, key), value in zip(remote.items(), values):
+                if value is None:
+                    self.misses += 1
+                    continue
+                value = value.decode("utf-8") if isinstance(value, bytes) else value
+                found[text] = value
+                self._lru_set(key, value)
+                self.redis_hits += 1
+
+        return found
+
+    async def set_many(self, translations: Dict[str, str], dest: str, model: str):
+        """Store the translations of ``translations`` (source text -> translated text)"""
+        entries = {
+            (_text_hash(text), dest, model or ""): value
+            for text, value in translations.items()
+            if value
+        }
+        if not entries:
+            return
+        for key, value in entries.items():
+            self._lru_set(key, value)
+
+        redis = self._redis()
+        if redis is None:
+            return
+        try:
+            async with redis.pipeline(transaction=False) as pipe:
+                for key, value in entries.items():
+                    pipe.set(
+                        self._redis_key(key), value, ex=get_envs().REDIS_EXPIRE_TTL
+                    )
+                await pipe.execute()
+        except Exception as e:
+            log_error_info(
+                logging.WARNING, "Translation cache write to Redis failed", e
+            )
+
+    def get_stats(self) -> Dict[str, Any]:
+        hits = self.lru_hits + self.redis_hits
+        lookups = hits + self.misses
+        return {
+            "entries": len(self._lru),
+            "lru_hits": self.lru_hits,
+            "redis_hits": self.redis_hits,
+            "misses": self.misses,
+            "deduplicated": self.deduplicated,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
+
+    def clear(self) -> None:
+        with self._lru_lock:
+            self._lru.clear()
+
+    @classmethod
+    def reset(cls):
+        del cls._instance
+        cls._instance = None
+
+
+async def translate_with_cache(
+    texts: List[str],
+    dest: str,
+    model: str,
+    translate_missing: Callable[[List[str]], Awaitable[List[Any]]],
+    from_cache: Callable[[str, str], Any],
+) -> List[Any]:
+    """
+    Translate ``texts`` in order, sending each distinct text missing from the cache to
+    ``translate_missing`` once. Cache hits are wrapped by ``from_cache(origin, text)``.
+    """
+    if not get_envs().ENABLE_TRANSLATION_CACHE:
+        return await translate_missing(texts)
+
+    cache = TranslationCache()
+    unique_texts = list(dict.fromkeys(texts))
+    cache.deduplicated += len(texts) - len(unique_texts)
+
+    cached = await cache.get_many(unique_texts, dest, model)
+    missing = [text for text in unique_texts if text not in cached]
+    translated: Dict[str, Any] = {}
+    if missing:
+        translated = dict(zip(missing, await translate_missing(missing)))
+        await cache.set_many(
+            {text: result.text for text, result in translated.items()}, dest, model
+        )
+
+    if len(texts) > 1:
+        logger.info(
+            f"🌐 Translation cache: {len(cached)}/{len(unique_texts)} distinct texts cached, "
+            f"{len(texts) - len(unique_texts)} duplicates, hit ratio {cache.get_stats()['hit_ratio']:.2%}"
+        )
+    return [
+        translated[text] if text in translated else from_cache(text, cached[text])
+        for text in texts
+    ]
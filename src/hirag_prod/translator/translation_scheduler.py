@@ -0,0 +1,237 @@
+import asyncio
+import logging
+import re
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Awaitable, Callable, Dict, List, Optional
+
+from tqdm.asyncio import tqdm_asyncio
+
+from hirag_prod._utils import log_error_info
+from hirag_prod.resources.functions import get_token_counter
+
+logger = logging.getLogger("HiRAG")
+
+# Segments of a packed prompt, tags that texts are refused to contain
+NUMBERED_SEGMENT_PATTERN = re.compile(r'<seg id="(\d+)">(.*?)</seg>', re.DOTALL)
+SEGMENT_TAG_PATTERN = re.compile(r"</?seg\b", re.IGNORECASE)
+
+
+class TranslationPackParseError(ValueError):
+    """A packed prompt cannot be built or its reply not split back into segments"""
+
+
+def build_numbered_segments(texts: List[str]) -> str:
+    """Wrap ``texts`` in numbered ``<seg>`` tags, texts containing such tags are refused"""
+    for text in texts:
+        if SEGMENT_TAG_PATTERN.search(text):
+            raise TranslationPackParseError("A text of the pack contains a <seg> tag")
+    return "\n".join(
+        f'<seg id="{i}">{text}</seg>' for i, text in enumerate(texts, start=1)
+    )
+
+
+def parse_numbered_segments(content: str, expected: int) -> List[str]:
+    """Split a reply to a packed prompt back into the translations of its segments"""
+    matches = NUMBERED_SEGMENT_PATTERN.findall(content or "")
+    numbers = [int(number) for number, _ in matches]
+    # Missing, duplicate or reordered segments are not guessed at
+    if numbers != list(range(1, expected + 1)):
+        raise TranslationPackParseError(
+            f"Expected segments 1..{expected} in order, got {numbers}"
+        )
+    segments = [segment.strip() for _, segment in matches]
+    if not all(segments) or any(SEGMENT_TAG_PATTERN.search(s) for s in segments):
+        raise TranslationPackParseError("Empty or malformed segment in the reply")
+    return segments
+
+
+class AdaptiveConcurrencyLimiter:
+    """
+    AIMD concurrency limit: grows by about one slot per round of successful calls, is
+    halved on errors and shrinks slowly while latency is well above the best seen.
+    """
+
+    def __init__(
+        self,
+        max_limit: int,
+        min_limit: int = 1,
+        initial_limit: Optional[int] = None,
+        latency_tolerance: float = 2.0,
+    ):
+        self.max_limit = max(1, max_limit)
+        self.min_limit = max(1, min(min_limit, self.max_limit))
+        self.limit: float = float(
+            initial_limit
+            if initial_limit is not None
+            else max(self.min_limit, min(4, self.max_limit))
+        )
+        self.latency_tolerance = latency_tolerance
+        self.in_flight: int = 0
+        self.max_in_flight: int = 0
+        self._min_latency: Optional[float] = None
+        self._condition: Optional[asyncio.Condition] = None
+
+    def _get_condition(self) -> asyncio.Condition:
+        if self._condition is None:
+            self._condition = asyncio.Condition()
+        return self._condition
+
+    def _on_done(self, latency: float, success: bool) -> None:
+        if not success:
+            self.limit = max(self.min_limit, self.limit / 2)
+            return
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        if latency > self._min_latency * self.latency_tolerance:
+            self.limit = max(self.min_limit, self.limit * 0.9)
+        else:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+    @asynccontextmanager
+    async def slot(self, is_failure: Optional[Callable[[Exception], bool]] = None):
+        condition = self._get_condition()
+        async with condition:
+            await condition.wait_for(lambda: self.in_flight < int(self.limit))
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+
+        start = time.perf_counter()
+        success = True
+        try:
+            yield
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            success = is_failure is not None and not is_failure(e)
+            raise
+        finally:
+            self._on_done(time.perf_counter() - start, success)
+            async with condition:
+                self.in_flight -= 1
+                condition.notify_all()
+
+
+class TranslationScheduler:
+    """
+    Translation scheduler shared by every caller of a translator.
+
+    Short texts are packed into one prompt of numbered segments up to a token budget, long texts
+    are translated on their own. Packs run under an adaptive concurrency limit. When
+    the reply to a pack cannot be split back into its segments, the texts of the pack
+    are translated one by one.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: int,
+        pack_token_budget: int,
+        pack_max_texts: int,
+        count_tokens: Optional[Callable[[str], int]] = None,
+    ):
+        self.pack_token_budget = pack_token_budget
+        self.pack_max_texts = pack_max_texts
+        # The shared token counter, counting a pack's texts in one batch, by default
+        self.count_tokens = count_tokens
+        self.limiter = AdaptiveConcurrencyLimiter(max_limit=max_concurrency)
+        self.packs: int = 0
+        self.packed_texts: int = 0
+        self.single_calls: int = 0
+        self.fallbacks: int = 0
+
+    def pack(self, texts: List[str]) -> List[List[int]]:
+        """Group the indices of ``texts`` into packs, keeping the input order"""
+        packs: List[List[int]] = []
+        current: List[int] = []
+        current_tokens = 0
+        if self.count_tokens is not None:
+            token_counts = [self.count_tokens(text) for text in texts]
+        else:
+            token_counts = get_token_counter().count_batch(texts)
+        for i, tokens in enumerate(token_counts):
+            if tokens >= self.pack_token_budget or self.pack_max_texts <= 1:
+                packs.append([i])
+                continue
+            if current and (
+                current_tokens + tokens > self.pack_token_budget
+                or len(current) >= self.pack_max_texts
+            ):
+                packs.append(current)
+                current, current_tokens = [], 0
+            current.append(i)
+            current_tokens += tokens
+        if current:
+            packs.append(current)
+        return packs
+
+    async def _run_single(
+        self, text: str, translate_single: Callable[[str], Awaitable[Any]]
+    ) -> Any:
+        self.single_calls += 1
+        async with self.limiter.slot():
+            return await translate_single(text)
+
+    async def _run_pack(
+        self,
+        texts: List[str],
+        translate_single: Callable[[str], Awaitable[Any]],
+        translate_pack: Callable[[List[str]], Awaitable[List[Any]]],
+    ) -> List[Any]:
+        if len(texts) == 1:
+            return [await self._run_single(texts[0], translate_single)]
+
+        try:
+            async with self.limiter.slot(
+                is_failure=lambda e: not isinstance(e, TranslationPackParseError)
+            ):
+                results = await translate_pack(texts)
+            self.packs += 1
+            self.packed_texts += len(texts)
+            return results
+        except Exception as e:
+            self.fallbacks += 1
+            log_error_info(
+                logging.WARNING,
+                f"Packed translation of {len(texts)} texts failed, translating them one by one",
+                e,
+            )
+        return await asyncio.gather(
+            *[self._run_single(text, translate_single) for text in texts]
+        )
+
+    async def translate(
+        self,
+        texts: List[str],
+        translate_single: Callable[[str], Awaitable[Any]],
+        translate_pack: Callable[[List[str]], Awaitable[List[Any]]],
+    ) -> List[Any]:
+        """Translate ``texts`` in order with as few model calls as the budget allows"""
+        if not texts:
+            return []
+        packs = self.pack(texts)
+        coroutines = [
+            self._run_pack(
+                [texts[i] for i in pack_indices], translate_single, translate_pack
+            )
+            for pack_indices in packs
+        ]
+        if len(coroutines) > 1:
+            pack_results = await tqdm_asyncio.gather(*coroutines, desc="Translating")
+        else:
+            pack_results = [await coroutines[0]]
+
+        results: List[Any] = [None] * len(texts)
+        for pack_indices, pack_result in zip(packs, pack_results):
+            for i, result in zip(pack_indices, pack_result):
+                results[i] = result
+        return results
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            "packs": self.packs,
+            "packed_texts": self.packed_texts,
+            "single_calls": self.single_calls,
+            "fallbacks": self.fallbacks,
+            "concurrency_limit": self.limiter.limit,
+            "max_in_flight": self.limiter.max_in_flight,
+        }
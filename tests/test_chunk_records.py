@@ -0,0 +1,105 @@
+import pickle
+
+from dotenv import load_dotenv
+
+from hirag_prod.loader.chunk_split import (
+    _copy_chunk_with_updates,
+    _create_item_base,
+    items_to_chunks_recursive,
+)
+from hirag_prod.schema import (
+    Chunk,
+    ChunkRecord,
+    Item,
+    ItemRecord,
+    create_file,
+    item_to_chunk,
+)
+
+load_dotenv("../.env", override=True)
+
+
+def _file():
+    return create_file(
+        metadata={
+            "documentKey": "file-records",
+            "fileName": "report.pdf",
+            "uri": "/tmp/report.pdf",
+            "type": "pdf",
+            "private": False,
+            "knowledgeBaseId": "kb-records",
+            "workspaceId": "ws-records",
+        },
+        text="",
+    )
+
+
+def _items():
+    source_file = _file()
+    return [
+        _create_item_base(
+            text=text,
+            chunk_idx=idx,
+            document_id="file-records",
+            chunk_type=chunk_type,
+            source_file=source_file,
+            page_number=page,
+            page_width=600.0,
+            page_height=800.0,
+            bbox=[10.0, 20.0 * idx, 300.0, 20.0 * idx + 15],
+            caption="Premiums" if chunk_type == "table" else None,
+        )
+        for idx, (text, chunk_type, page) in enumerate(
+            [
+                ("Coverage starts on enrolment.", "text", 1),
+                ("Claims are paid within 30 days.", "text", 1),
+                ("<table><tr><td>Plan</td></tr></table>", "table", 2),
+                ("Renewal is yearly.", "text", 2),
+            ]
+        )
+    ]
+
+
+def test_records_have_the_table_columns():
+    assert ChunkRecord.__slots__ == tuple(Chunk.__table__.columns.keys())
+    assert ItemRecord.__slots__ == tuple(Item.__table__.columns.keys())
+    assert not hasattr(ChunkRecord(), "__dict__")
+
+
+def test_records_convert_to_rows_and_orm_objects():
+    items = _items()
+    item = items[2]
+    assert isinstance(item, ItemRecord)
+    assert item.knowledgeBaseId == "kb-records"
+    assert item.fileName == "report.pdf"
+
+    chunk = item_to_chunk(item)
+    assert isinstance(chunk, ChunkRecord)
+    assert chunk.pageNumber == [2]
+    assert chunk.bbox == [item.bbox]
+    assert chunk.caption == "Premiums"
+
+    orm_chunk = chunk.to_orm()
+    assert dict(orm_chunk) == dict(chunk)
+    assert dict(item.to_orm()) == dict(item)
+    assert pickle.loads(pickle.dumps(chunk)) == chunk
+
+    copied = _copy_chunk_with_updates(orm_chunk, text="part", unknown="ignored")
+    assert isinstance(copied, ChunkRecord)
+    assert copied.text == "part"
+    assert copied.documentKey == chunk.documentKey
+
+
+def test_items_to_chunks_recursive_builds_records():
+    chunks = items_to_chunks_recursive(_items(), chunk_max_tokens=0)
+
+    assert all(isinstance(chunk, ChunkRecord) for chunk in chunks)
+    assert [chunk.chunkType for chunk in chunks] == ["table", "text"]
+    assert chunks[0].pageNumber == [2]
+    assert chunks[0].caption == "Premiums"
+    assert chunks[1].text == (
+        "Coverage starts on enrolment. Claims are paid within 30 days. "
+        "Renewal is yearly."
+    )
+    assert chunks[1].pageNumber == [1, 2]
+    assert {chunk.workspaceId for chunk in chunks} == {"ws-records"}
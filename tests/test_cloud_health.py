@@ -0,0 +1,168 @@
+import asyncio
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+from dotenv import load_dotenv
+
+import hirag_prod.loader as loader_module
+from hirag_prod.configs.document_loader_config import DotsOCRConfig
+from hirag_prod.configs.functions import get_config_manager, initialize_config_manager
+from hirag_prod.loader import load_dots_ocr_document, resolve_loader_type
+from hirag_prod.loader.cloud_health import CircuitBreaker, CloudHealthMonitor
+
+load_dotenv("../.env", override=True)
+
+
+class StubHealthServer(ThreadingHTTPServer):
+    """Dots OCR health endpoint that can be flipped between healthy and unhealthy"""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubHealthHandler)
+        self.healthy = True
+        self.checks = 0
+
+    @property
+    def base_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+
+class StubHealthHandler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        self.server.checks += 1
+        body = b"" if self.server.healthy else b'{"success": "false"}'
+        self.send_response(200 if self.server.healthy else 503)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+def _wait_for(condition, timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not reached in time"
+        time.sleep(0.01)
+
+
+@pytest.fixture
+def health_server(monkeypatch):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    server = StubHealthServer()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    monkeypatch.setattr(
+        get_config_manager(),
+        "_dots_ocr_config",
+        DotsOCRConfig(base_url=server.base_url, api_key="key"),
+    )
+    CloudHealthMonitor.reset()
+    yield server
+    CloudHealthMonitor.reset()
+    server.shutdown()
+    server.server_close()
+
+
+def test_circuit_breaker_states():
+    breaker = CircuitBreaker("stub", failure_threshold=2, open_seconds=0.05)
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.CLOSED
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+    assert not breaker.allow_request()
+
+    time.sleep(0.06)
+    assert breaker.state == CircuitBreaker.HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == CircuitBreaker.OPEN
+
+    time.sleep(0.06)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CircuitBreaker.CLOSED
+    assert breaker.open_count == 2
+
+
+def test_routing_follows_the_cached_health(health_server):
+    monitor = CloudHealthMonitor(probe_interval=0.02)
+    monitor.get_breaker("dots_ocr").open_seconds = 0.5
+
+    assert resolve_loader_type("dots_ocr") == "dots_ocr"
+    checks = health_server.checks
+    for _ in range(50):
+        assert resolve_loader_type("dots_ocr") == "dots_ocr"
+    # Routing reads the cached state, only the prober calls the service
+    assert health_server.checks - checks < 50
+
+    health_server.healthy = False
+    _wait_for(lambda: monitor.get_breaker("dots_ocr").state == "open")
+    assert resolve_loader_type("dots_ocr") == "docling"
+
+    health_server.healthy = True
+    _wait_for(lambda: monitor.get_breaker("dots_ocr").state == "closed")
+    assert resolve_loader_type("dots_ocr") == "dots_ocr"
+
+
+class StubDotsOCRClient:
+    def __init__(self):
+        self.result = None
+        self.error = None
+        self.input_found = True
+
+    async def convert(self, input_file_path, workspace_id=None, knowledge_base_id=None):
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+    async def input_exists(self, input_file_path):
+        return self.input_found
+
+
+class StubDotsOCRLoader:
+    def create_dots_ocr_file(self, processed_doc, document_meta):
+        return processed_doc, None
+
+
+def test_conversions_without_a_result_count_as_failures(health_server, monkeypatch):
+    client = StubDotsOCRClient()
+    monkeypatch.setattr(loader_module, "get_dots_ocr_client", lambda: client)
+    monkeypatch.setattr(
+        loader_module, "get_dots_ocr_document_cache_key", lambda path: None
+    )
+    monitor = CloudHealthMonitor(probe_interval=60)
+    assert monitor.is_available("dots_ocr")
+    breaker = monitor.get_breaker("dots_ocr")
+    breaker.failure_threshold = 10
+
+    def convert():
+        return asyncio.run(
+            load_dots_ocr_document(
+                "s3://bucket/report.pdf",
+                "application/pdf",
+                {"private": False},
+                {"application/pdf": {"loader": StubDotsOCRLoader}},
+            )
+        )
+
+    # A failed, timed out or unpolled job
+    convert()
+    assert breaker.consecutive_failures == 1
+    # A missing input says nothing about the service
+    client.input_found = False
+    convert()
+    assert breaker.consecutive_failures == 1
+
+    client.error = RuntimeError("unexpected response")
+    with pytest.raises(RuntimeError):
+        convert()
+    assert breaker.consecutive_failures == 2
+
+    client.error = None
+    client.result = {"json": [], "md": "", "md_nohf": ""}
+    assert convert()[0] == client.result
+    assert breaker.consecutive_failures == 0
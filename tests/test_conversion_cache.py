@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+
+import pytest
+from dotenv import load_dotenv
+
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.loader import load_document
+from hirag_prod.loader.conversion_cache import ConversionCache
+from hirag_prod.resources.functions import get_document_converter_pool
+
+load_dotenv("../.env", override=True)
+
+TEST_FILES_DIR = os.path.join(os.path.dirname(__file__), "test_files")
+
+
+@pytest.fixture
+def cache():
+    initialize_config_manager(cli_options_dict={"debug": False})
+    cache_dir = tempfile.mkdtemp()
+    ConversionCache.reset()
+    yield ConversionCache(cache_dir=cache_dir, max_size_bytes=1000)
+    ConversionCache.reset()
+    shutil.rmtree(cache_dir)
+
+
+def test_least_recently_used_entries_are_evicted(cache):
+    for i, key in enumerate(["aa01", "bb02", "cc03"]):
+        cache.put(key, str(i) * 300)
+        os.utime(cache._path(key), (i, i))
+    assert cache.get("aa01") == "0" * 300
+
+    cache.put("dd04", "3" * 300)
+
+    assert cache.get("bb02") is None
+    assert cache.get("aa01") == "0" * 300
+    assert cache.get("dd04") == "3" * 300
+    assert cache.get_stats()["evictions"] == 1
+
+
+def test_load_document_converts_a_file_once(cache):
+    document_path = os.path.join(TEST_FILES_DIR, "fresh_wiki_article.md")
+    document_meta = {
+        "type": "md",
+        "fileName": "fresh_wiki_article.md",
+        "uri": document_path,
+        "private": False,
+        "knowledgeBaseId": "kb",
+        "workspaceId": "ws",
+    }
+    cache.max_size_bytes = 10 * 1024 * 1024
+
+    first_doc, first_md = load_document(
+        document_path, "text/markdown", "docling", document_meta
+    )
+    acquisitions = get_document_converter_pool().get_stats()["acquisitions"]
+    second_doc, second_md = load_document(
+        document_path, "text/markdown", "docling", document_meta
+    )
+
+    assert get_document_converter_pool().get_stats()["acquisitions"] == acquisitions
+    assert cache.get_stats()["hits"] == 1
+    assert second_doc.export_to_markdown() == first_doc.export_to_markdown()
+    assert second_md.text == first_md.text
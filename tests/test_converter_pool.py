@@ -0,0 +1,147 @@
+import os
+import threading
+import time
+
+import pytest
+from docling.datamodel.base_models import InputFormat
+from docling.datamodel.pipeline_options import PdfPipelineOptions, TableFormerMode
+from docling.document_converter import PdfFormatOption
+from dotenv import load_dotenv
+
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.loader import load_document
+from hirag_prod.loader.conversion_cache import ConversionCache
+from hirag_prod.loader.converter_pool import (
+    DocumentConverterPool,
+    get_format_options_key,
+)
+from hirag_prod.loader.pdf_loader import PDFLoader
+from hirag_prod.resources.functions import get_document_converter_pool
+
+load_dotenv("../.env", override=True)
+
+TEST_FILES_DIR = os.path.join(os.path.dirname(__file__), "test_files")
+
+
+@pytest.fixture
+def pool():
+    initialize_config_manager(cli_options_dict={"debug": False})
+    DocumentConverterPool.reset()
+    # Every load has to reach a converter
+    ConversionCache.reset()
+    ConversionCache(max_size_bytes=0)
+    yield DocumentConverterPool(max_size=2)
+    DocumentConverterPool.reset()
+    ConversionCache.reset()
+
+
+def _pdf_options(mode: TableFormerMode):
+    pipeline_options = PdfPipelineOptions(do_table_structure=True)
+    pipeline_options.table_structure_options.mode = mode
+    return {InputFormat.PDF: PdfFormatOption(pipeline_options=pipeline_options)}
+
+
+def test_format_options_key():
+    assert get_format_options_key(
+        _pdf_options(TableFormerMode.ACCURATE)
+    ) == get_format_options_key(PDFLoader().docling_format_options)
+    assert get_format_options_key(
+        _pdf_options(TableFormerMode.ACCURATE)
+    ) != get_format_options_key(_pdf_options(TableFormerMode.FAST))
+    assert get_format_options_key({}) != get_format_options_key(
+        _pdf_options(TableFormerMode.ACCURATE)
+    )
+
+
+def test_documents_reuse_the_converter_of_their_thread(pool):
+    document_path = os.path.join(TEST_FILES_DIR, "fresh_wiki_article.md")
+    converters = []
+    for _ in range(3):
+        with pool.acquire() as converter:
+            converters.append(converter)
+        load_document(
+            document_path=document_path,
+            content_type="text/markdown",
+            document_meta={
+                "type": "md",
+                "fileName": "fresh_wiki_article.md",
+                "uri": document_path,
+                "private": False,
+                "knowledgeBaseId": "kb",
+                "workspaceId": "ws",
+            },
+            loader_type="docling",
+        )
+
+    assert get_document_converter_pool() is pool
+    assert converters[0] is converters[1] is converters[2]
+    stats = pool.get_stats()
+    assert stats["converters"] == 1
+    assert stats["acquisitions"] == 6
+    assert stats["affinity_hits"] == 5
+
+
+def test_pool_size_is_bounded(pool):
+    in_use = []
+    max_in_use = []
+    lock = threading.Lock()
+
+    def convert():
+        with pool.acquire() as converter:
+            with lock:
+                assert converter not in in_use
+                in_use.append(converter)
+                max_in_use.append(len(in_use))
+            time.sleep(0.05)
+            with lock:
+                in_use.remove(converter)
+
+    threads = [threading.Thread(target=convert) for _ in range(6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert max(max_in_use) == 2
+    assert pool.get_stats()["converters"] == 2
+    assert pool.get_stats()["waits"] > 0
+
+
+def test_released_converter_wakes_the_waiter_of_its_options():
+    initialize_config_manager(cli_options_dict={"debug": False})
+    DocumentConverterPool.reset()
+    pool = DocumentConverterPool(max_size=1)
+    fast_options = _pdf_options(TableFormerMode.FAST)
+    try:
+        holding_default = pool.acquire()
+        holding_fast = pool.acquire(fast_options)
+        holding_default.__enter__()
+        holding_fast.__enter__()
+
+        acquired = []
+
+        def convert(format_options, name):
+            with pool.acquire(format_options):
+                acquired.append(name)
+
+        # A waiter for the other options queues before the one for the released
+        fast_waiter = threading.Thread(
+            target=convert, args=(fast_options, "fast"), daemon=True
+        )
+        default_waiter = threading.Thread(
+            target=convert, args=(None, "default"), daemon=True
+        )
+        for waits, waiter in enumerate([fast_waiter, default_waiter], start=1):
+            waiter.start()
+            while pool.get_stats()["waits"] < waits:
+                time.sleep(0.01)
+
+        holding_default.__exit__(None, None, None)
+        default_waiter.join(timeout=1)
+        assert acquired == ["default"]
+
+        holding_fast.__exit__(None, None, None)
+        fast_waiter.join(timeout=1)
+        assert acquired == ["default", "fast"]
+    finally:
+        DocumentConverterPool.reset()
@@ -0,0 +1,135 @@
+import asyncio
+import json
+from collections import defaultdict
+from urllib.parse import parse_qs
+
+import pytest
+from dotenv import load_dotenv
+
+from hirag_prod.configs.document_loader_config import DotsOCRConfig
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.loader import dots_ocr_client
+from hirag_prod.loader.dots_ocr_client import DotsOCRClient
+from hirag_prod.resources.functions import get_http_client_registry
+
+load_dotenv("../.env", override=True)
+
+
+class StubDotsOCRServer:
+    """Dots OCR job API stub, jobs stay pending for ``pending_polls`` polls"""
+
+    def __init__(self, pending_polls: int = 2, final_status: str = "completed"):
+        self.pending_polls = pending_polls
+        self.final_status = final_status
+        self.submitted = 0
+        self.polls = defaultdict(int)
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    def _respond(self, entry_point: str, body: bytes) -> dict:
+        if entry_point == "/parse/file":
+            self.submitted += 1
+            return {"OCRJobId": f"job-{self.submitted}"}
+        if entry_point == "/status":
+            job_id = parse_qs(body.decode())["OCRJobId"][0]
+            self.polls[job_id] += 1
+            if self.polls[job_id] <= self.pending_polls:
+                return {"status": "processing"}
+            return {"status": self.final_status}
+        return {"dotsocr": {"prompt_tokens": 10, "completion_tokens": 5}}
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                headers = {}
+                for line in head.decode().split("\r\n")[1:]:
+                    if ":" in line:
+                        key, value = line.split(":", 1)
+                        headers[key.strip().lower()] = value.strip()
+                body = await reader.readexactly(int(headers.get("content-length", 0)))
+                payload = json.dumps(
+                    self._respond(headers["entry-point"], body)
+                ).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+@pytest.fixture
+def bucket(monkeypatch):
+    """In-memory bucket holding the Dots OCR outputs of every input"""
+
+    def read_cloud_file(storage_type, bucket_name, cloud_file_path):
+        if cloud_file_path.endswith(".json"):
+            return json.dumps([{"page_no": 0, "full_layout_info": []}]).encode()
+        return f"# {cloud_file_path}".encode()
+
+    monkeypatch.setattr(dots_ocr_client.utils, "exists_cloud_file", lambda *args: True)
+    monkeypatch.setattr(dots_ocr_client.utils, "read_cloud_file", read_cloud_file)
+
+
+def _client(base_url: str, **config) -> DotsOCRClient:
+    DotsOCRClient.reset()
+    return DotsOCRClient(
+        config=DotsOCRConfig(
+            base_url=base_url,
+            api_key="key",
+            polling_initial_interval=0.01,
+            polling_interval=1,
+            **config,
+        )
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_jobs_stay_within_limit(bucket):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    async with StubDotsOCRServer(pending_polls=3) as server:
+        client = _client(server.base_url, max_concurrent_jobs=3)
+        result_list = await asyncio.gather(
+            *[
+                client.convert(f"s3://bucket/docs/report-{i}.pdf", "ws", "kb")
+                for i in range(8)
+            ]
+        )
+        await get_http_client_registry().aclose()
+
+    assert server.submitted == 8
+    assert all(polls == 4 for polls in server.polls.values())
+    assert client.get_stats()["max_in_flight"] == 3
+    assert client.get_stats()["in_flight"] == 0
+    assert result_list[5]["json"] == [{"page_no": 0, "full_layout_info": []}]
+    assert result_list[5]["md"].endswith("report-5/report-5.md")
+    assert result_list[5]["md_nohf"].endswith("report-5_nohf.md")
+    DotsOCRClient.reset()
+
+
+@pytest.mark.asyncio
+async def test_failed_job_returns_none(bucket):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    async with StubDotsOCRServer(pending_polls=1, final_status="failed") as server:
+        client = _client(server.base_url)
+        assert await client.convert("oss://bucket/report.pdf", "ws", "kb") is None
+        await get_http_client_registry().aclose()
+    assert server.polls["job-1"] == 2
+    DotsOCRClient.reset()
@@ -0,0 +1,110 @@
+import asyncio
+import json
+
+import pytest
+from dotenv import load_dotenv
+from openpyxl import Workbook
+
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.loader import excel_pipeline
+
+load_dotenv("../.env", override=True)
+
+
+class StubChatService:
+    """Answers cell location prompts from a passage -> (x, y) table"""
+
+    def __init__(self, answers):
+        self.answers = answers
+        self.prompts = []
+
+    async def complete(self, prompt: str, **kwargs) -> str:
+        self.prompts.append(prompt)
+        found = [
+            {"x": x, "y": y}
+            for passage, (x, y) in self.answers.items()
+            if passage in prompt
+        ]
+        return json.dumps(found if len(found) > 1 else found[0])
+
+
+@pytest.fixture
+def excel_chunk(tmp_path):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Premiums"
+    sheet.append(["Plan", "2024", "2025"])
+    sheet.append(["Basic plan", 120, 130])
+    sheet.append(["Basic", 90, 95])
+    sheet.append(["Premium plan (family)", 300, 320])
+    path = tmp_path / "premiums.xlsx"
+    workbook.save(path)
+    excel_pipeline._SHEET_INDEX_CACHE.clear()
+    yield {
+        "chunkType": "excel_sheet",
+        "text": r"\begin{tabular}{lll} Plan & 2024 & 2025 \\ \end{tabular}",
+        "headers": ["Premiums"],
+        "uri": f"file://{path}",
+    }
+    excel_pipeline._SHEET_INDEX_CACHE.clear()
+
+
+def test_sheet_index_finds_exact_then_contained_text(excel_chunk):
+    index = excel_pipeline._get_sheet_index(excel_chunk["uri"], "Premiums")
+
+    assert index.find("Basic") == (3, 1)
+    assert index.find(" Basic plan ") == (2, 1)
+    assert index.find("family") == (4, 1)
+    assert index.find("2025") == (1, 3)
+    assert index.find("missing") is None
+    assert excel_pipeline._get_sheet_index(excel_chunk["uri"], "Premiums") is index
+    assert excel_pipeline._get_sheet_index(excel_chunk["uri"], "Other") is None
+
+
+def test_sheet_index_cache_is_bounded_by_size(excel_chunk):
+    cache = excel_pipeline.SheetCellIndexCache(max_size_bytes=1)
+    index = excel_pipeline._get_sheet_index(excel_chunk["uri"], "Premiums")
+    cache.put(("a", 0, 0, "Premiums"), index)
+    cache.put(("b", 0, 0, "Premiums"), index)
+
+    assert cache.get(("a", 0, 0, "Premiums")) is None
+    assert cache.get(("b", 0, 0, "Premiums")) is index
+    assert cache.get_stats()["size_bytes"] == index.size_bytes
+
+
+def test_gathered_citations_share_one_llm_request(excel_chunk, monkeypatch):
+    chat_service = StubChatService(
+        {
+            "basic plan cost 130 in 2025": ("2025", "Basic plan"),
+            "the family plan was 300 in 2024": ("2024", "Premium plan (family)"),
+            "nothing to cite": ("", ""),
+        }
+    )
+    monkeypatch.setattr(excel_pipeline, "get_chat_service", lambda: chat_service)
+
+    async def main():
+        return await asyncio.gather(
+            excel_pipeline.annotate_excel_cell_bbox(
+                "basic plan cost 130 in 2025", excel_chunk
+            ),
+            excel_pipeline.annotate_excel_cell_bbox(
+                "the family plan was 300 in 2024", excel_chunk
+            ),
+            excel_pipeline.annotate_excel_cell_bbox("nothing to cite", excel_chunk),
+            excel_pipeline.annotate_excel_cell_bbox(
+                "basic plan cost 130 in 2025", {**excel_chunk, "chunkType": "text"}
+            ),
+        )
+
+    assert asyncio.run(main()) == [["C", "2"], ["B", "4"], None, None]
+    assert len(chat_service.prompts) == 1
+    assert "3. nothing to cite" in chat_service.prompts[0]
+
+    assert asyncio.run(
+        excel_pipeline.annotate_excel_cell_bbox(
+            "the family plan was 300 in 2024", excel_chunk
+        )
+    ) == ["B", "4"]
+    assert len(chat_service.prompts) == 2
+    assert excel_pipeline._SHEET_INDEX_CACHE.get_stats()["sheets"] == 1
@@ -0,0 +1,131 @@
+import asyncio
+
+import pytest
+from dotenv import load_dotenv
+from openpyxl import Workbook
+
+from hirag_prod.configs.functions import get_envs, initialize_config_manager
+from hirag_prod.loader import excel_loader
+
+load_dotenv("../.env", override=True)
+
+
+class StubChatService:
+    def __init__(self):
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.prompts = []
+
+    async def complete(self, prompt: str, model: str) -> str:
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        self.prompts.append(prompt)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return f"summary {len(self.prompts)}"
+
+
+@pytest.fixture
+def workbook_path(tmp_path, monkeypatch):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    # One token per cell, tiktoken encodings are not needed for the windowing
+    monkeypatch.setattr(excel_loader, "_count_tokens", lambda text: text.count("&") + 1)
+    workbook = Workbook()
+    sheet = workbook.active
+    sheet.title = "Claims"
+    sheet.append([None])
+    sheet.append(["id", "member", "amount"])
+    for i in range(1, 26):
+        sheet.append([i, f"member {i}", i * 10.5])
+    workbook.create_sheet("Only header").append(["a", "b"])
+    workbook.create_sheet("cache").append(["skipped"])
+    path = tmp_path / "claims.xlsx"
+    workbook.save(path)
+    return str(path)
+
+
+def test_row_windows_repeat_the_header_under_the_budget(workbook_path):
+    batch = excel_loader.read_excel_row_windows(
+        workbook_path, max_tokens=3 * 11, max_rows=100
+    )
+    windows = batch.windows
+
+    assert batch.sheet_names == ["Claims", "Only header"]
+    assert batch.next_sheet is None
+    claims = [window for window in windows if window.sheet_name == "Claims"]
+    # The header line takes 3 tokens, so each window has 10 rows of 3 tokens
+    assert [(w.first_row, w.last_row) for w in claims] == [
+        (3, 12),
+        (13, 22),
+        (23, 27),
+    ]
+    for window in claims:
+        lines = window.latex.splitlines()
+        assert lines[:4] == [
+            r"\begin{tabular}{lll}",
+            r"\toprule",
+            r"id & member & amount \\",
+            r"\midrule",
+        ]
+        assert len(lines) == 7 + window.last_row - window.first_row
+    assert r"25 & member 25 & 262.5 \\" in claims[-1].latex
+
+    header_only = windows[-1]
+    assert header_only.sheet_name == "Only header"
+    assert r"a & b \\" in header_only.latex
+
+    windows = excel_loader.read_excel_row_windows(
+        workbook_path, max_tokens=10000, max_rows=8
+    ).windows
+    assert [len(w.latex.splitlines()) - 7 for w in windows[:4]] == [7, 7, 7, 0]
+
+
+def test_windows_are_returned_in_bounded_batches_of_whole_sheets(workbook_path):
+    first = excel_loader.read_excel_row_windows(
+        workbook_path, max_tokens=10000, max_rows=10, max_windows=2
+    )
+    assert [w.sheet_name for w in first.windows] == ["Claims"] * 3
+    assert first.next_sheet == 1
+
+    second = excel_loader.read_excel_row_windows(
+        workbook_path, max_tokens=10000, max_rows=10, first_sheet=1, max_windows=2
+    )
+    assert second.sheet_names == first.sheet_names
+    assert [w.sheet_name for w in second.windows] == ["Only header"]
+    assert second.next_sheet is None
+
+
+def test_windows_are_summarized_with_bounded_concurrency(workbook_path, monkeypatch):
+    chat_service = StubChatService()
+    monkeypatch.setattr(excel_loader, "get_chat_service", lambda: chat_service)
+    monkeypatch.setattr(get_envs(), "EXCEL_WINDOW_MAX_ROWS", 4)
+    monkeypatch.setattr(get_envs(), "EXCEL_SUMMARY_CONCURRENCY", 2)
+    monkeypatch.setattr(get_envs(), "EXCEL_SUMMARIZED_WINDOWS_PER_SHEET", 3)
+    # Every sheet comes back in its own batch
+    monkeypatch.setattr(get_envs(), "EXCEL_WINDOW_BATCH_MAX_WINDOWS", 1)
+
+    chunks, generated_md, items = asyncio.run(
+        excel_loader.load_and_chunk_excel(
+            f"file://{workbook_path}",
+            {
+                "documentKey": "doc-1",
+                "fileName": "claims.xlsx",
+                "knowledgeBaseId": "kb-1",
+                "workspaceId": "ws-1",
+            },
+        )
+    )
+
+    assert generated_md.pageNumber == 2
+    # 25 rows in windows of 4 rows, and the header only sheet
+    assert len(chunks) == len(items) == 8
+    assert len({chunk.documentKey for chunk in chunks}) == 8
+    assert [chunk.chunkIdx for chunk in chunks] == list(range(1, 9))
+    assert all(chunk.chunkType == "excel_sheet" for chunk in chunks)
+    assert [chunk.headers for chunk in chunks] == [["Claims"]] * 7 + [["Only header"]]
+
+    assert len(chat_service.prompts) == 4
+    assert chat_service.max_in_flight == 2
+    assert "Claims (rows 3-6)" in chat_service.prompts[0]
+    assert chunks[3].caption.startswith(chunks[0].caption)
+    assert "rows 15-18 of sheet Claims" in chunks[3].caption
@@ -0,0 +1,67 @@
+import random
+from difflib import SequenceMatcher
+
+from hirag_prod.loader.chunk_split import _fuzzy_find_text
+
+WORDS = (
+    "patient insurance coverage hospital claim premium deductible provider "
+    "network emergency referral pharmacy benefit plan medicare annual"
+).split()
+
+
+def _difflib_fuzzy_find_text(needle, haystack, start_pos=0, threshold=0.8):
+    """The SequenceMatcher scan over every window, before rapidfuzz pruning"""
+    if not needle or not haystack:
+        return None
+    needle_len = len(needle)
+    search_window = haystack[start_pos:]
+    search_text = search_window[: min(len(search_window), needle_len * 3 + 1000)]
+    best_ratio = 0.0
+    best_match_pos = None
+    for i in range(len(search_text) - needle_len + 1):
+        ratio = SequenceMatcher(None, needle, search_text[i : i + needle_len]).ratio()
+        if ratio > best_ratio and ratio >= threshold:
+            best_ratio = ratio
+            best_match_pos = i
+            if ratio > 0.95:
+                break
+    if best_match_pos is None:
+        return None
+    return (start_pos + best_match_pos, start_pos + best_match_pos + needle_len)
+
+
+def _perturb(text: str, rng: random.Random, edits: int) -> str:
+    characters = list(text)
+    for _ in range(edits):
+        position = rng.randrange(len(characters))
+        operation = rng.choice(["replace", "delete", "insert"])
+        if operation == "replace":
+            characters[position] = rng.choice("abcdefghij *-|")
+        elif operation == "delete" and len(characters) > 1:
+            del characters[position]
+        else:
+            characters.insert(position, rng.choice("*_`"))
+    return "".join(characters)
+
+
+def test_matches_equal_the_sequence_matcher_scan():
+    rng = random.Random(7)
+    for _ in range(25):
+        haystack = " ".join(rng.choice(WORDS) for _ in range(rng.randint(60, 400)))
+        start = rng.randrange(len(haystack) // 2)
+        length = rng.randint(5, 120)
+        needle = haystack[start : start + length]
+        needle = _perturb(needle, rng, rng.randint(0, max(1, len(needle) // 6)))
+        start_pos = rng.randrange(start + 1)
+        threshold = rng.choice([0.6, 0.8, 0.9])
+
+        assert _fuzzy_find_text(
+            needle, haystack, start_pos, threshold
+        ) == _difflib_fuzzy_find_text(needle, haystack, start_pos, threshold)
+
+
+def test_edge_cases():
+    assert _fuzzy_find_text("", "text") is None
+    assert _fuzzy_find_text("text", "") is None
+    assert _fuzzy_find_text("completely different", "zzzzzzzzzzzzzzzzzzzzzzz") is None
+    assert _fuzzy_find_text("hosptal claim", "the hospital claim form", 0) == (4, 17)
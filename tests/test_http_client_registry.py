@@ -0,0 +1,155 @@
+import asyncio
+import json
+
+import httpx
+import pytest
+from dotenv import load_dotenv
+
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.reranker import LocalReranker
+from hirag_prod.resources.functions import (
+    get_async_http_client,
+    get_http_client_registry,
+)
+
+load_dotenv("../.env", override=True)
+
+
+class StubRerankServer:
+    """Minimal keep-alive HTTP/1.1 server counting accepted connections"""
+
+    def __init__(self):
+        self.connections = 0
+        self.requests = 0
+        self._server = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.sockets[0].getsockname()[:2]
+        return f"http://{host}:{port}"
+
+    async def _handle(self, reader, writer):
+        self.connections += 1
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                body = json.loads(await reader.readexactly(length) or b"{}")
+                self.requests += 1
+                documents = body.get("documents", [])
+                payload = json.dumps(
+                    {
+                        "results": [
+                            {"index": i, "relevance_score": 1.0 / (i + 1)}
+                            for i in range(len(documents))
+                        ]
+                    }
+                ).encode()
+                writer.write(
+                    b"HTTP/1.1 200 OK\r\nContent-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def __aenter__(self):
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        return self
+
+    async def __aexit__(self, *exc):
+        self._server.close()
+        await self._server.wait_closed()
+
+
+@pytest.mark.asyncio
+async def test_sequential_requests_reuse_one_connection():
+    initialize_config_manager(cli_options_dict={"debug": False})
+    registry = get_http_client_registry()
+
+    async with StubRerankServer() as server:
+        url = f"{server.base_url}/rerank"
+        client = get_async_http_client(url)
+        for _ in range(20):
+            response = await client.post(url, json={"documents": ["a", "b"]})
+            assert response.status_code == 200
+
+        # Same origin resolves to the same pooled client
+        assert get_async_http_client(f"{server.base_url}/other") is client
+        assert server.requests == 20
+        assert server.connections == 1
+
+        # Close the kept-alive connection so that the server can shut down
+        await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_local_reranker_uses_shared_pool():
+    initialize_config_manager(cli_options_dict={"debug": False})
+
+    async with StubRerankServer() as server:
+        reranker = LocalReranker(
+            base_url=server.base_url,
+            model_name="stub",
+            entry_point="/rerank",
+            auth_token="token",
+        )
+        for _ in range(3):
+            results = await reranker._call_api("query", ["doc 1", "doc 2", "doc 3"])
+            assert [r["index"] for r in results] == [0, 1, 2]
+
+        assert server.connections == 1
+
+        await get_http_client_registry().aclose()
+
+
+@pytest.mark.asyncio
+async def test_pooled_client_resolves_through_dns_cache():
+    initialize_config_manager(cli_options_dict={"debug": False})
+    registry = get_http_client_registry()
+
+    async with StubRerankServer() as server:
+        port = server.base_url.rsplit(":", 1)[1]
+        url = f"http://localhost:{port}/rerank"
+        lookups = registry.get_stats()["dns_lookups"]
+        response = await get_async_http_client(url).post(url, json={})
+        assert response.status_code == 200
+        assert registry.get_stats()["dns_lookups"] == lookups + 1
+
+        await registry.aclose()
+
+    # Pool errors surface as httpx errors
+    with pytest.raises(httpx.ConnectError):
+        await get_async_http_client(url).post(url, json={})
+    await registry.aclose()
+
+
+@pytest.mark.asyncio
+async def test_environment_proxies_are_honoured(monkeypatch):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    registry = get_http_client_registry()
+
+    async with StubRerankServer() as proxy:
+        for name in ["HTTP_PROXY", "http_proxy"]:
+            monkeypatch.setenv(name, proxy.base_url)
+        for name in ["NO_PROXY", "no_proxy"]:
+            monkeypatch.setenv(name, "direct.invalid")
+
+        # Unresolvable hosts, only the proxy can answer for them
+        url = "http://proxied.invalid:8080/rerank"
+        response = await get_async_http_client(url).post(url, json={})
+        assert response.status_code == 200
+        assert proxy.requests == 1
+
+        direct_url = "http://direct.invalid:8080/rerank"
+        with pytest.raises(httpx.ConnectError):
+            await get_async_http_client(direct_url).post(direct_url, json={})
+        assert proxy.requests == 1
+
+        await registry.aclose()
@@ -0,0 +1,307 @@
+import asyncio
+import multiprocessing
+import os
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+import pytest
+from dotenv import load_dotenv
+
+from hirag_prod._utils import compute_mdhash_id
+from hirag_prod.configs.functions import (
+    get_envs,
+    get_hi_rag_config,
+    initialize_config_manager,
+)
+from hirag_prod.exceptions import KGConstructionError
+from hirag_prod.hirag import DocumentProcessor, HiRAG
+from hirag_prod.ingestion_checkpoint import IngestionCheckpointStore
+from hirag_prod.job_status_tracker import JobStatus, JobStatusTracker
+from hirag_prod.schema import ChunkRecord, ItemRecord, create_file
+
+load_dotenv("../.env", override=True)
+
+CRASH_EXIT_CODE = 17
+CHUNK_KEYS = [f"chunk-{i}" for i in range(5)]
+DOCUMENT_META = {
+    "documentKey": "doc-checkpoint",
+    "fileName": "report.txt",
+    "uri": "/tmp/report.txt",
+    "type": "txt",
+    "private": False,
+    "knowledgeBaseId": "kb-checkpoint",
+    "workspaceId": "ws-checkpoint",
+}
+
+
+def _log(log_path, lines):
+    # Appended and closed right away, a killed process loses nothing it logged
+    with open(log_path, "a") as f:
+        f.writelines(f"{line}\n" for line in lines)
+
+
+class FakeStorage:
+    """Logs every embedded chunk and stored item"""
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+        self.vdb = SimpleNamespace(upsert_graph=self._store_graph)
+
+    async def _store_graph(self, relations):
+        pass
+
+    async def upsert_file_to_vdb(self, file):
+        pass
+
+    async def upsert_chunks_to_vdb(self, chunks):
+        _log(self.log_path, [f"embed:{chunk.documentKey}" for chunk in chunks])
+
+    async def upsert_items_to_vdb(self, items, on_stage_done=None):
+        _log(self.log_path, [f"item:{item.documentKey}" for item in items])
+        for step in ("translation", "tokenization"):
+            await on_stage_done(step)
+
+    async def upsert_relations_to_vdb(self, relations):
+        pass
+
+
+class FakeKG:
+    """Logs every chunk sent to entity and relation extraction"""
+
+    def __init__(self, log_path):
+        self.log_path = log_path
+
+    async def construct_kg(self, chunks):
+        _log(self.log_path, [f"kg:{chunk.documentKey}" for chunk in chunks])
+        return [], []
+
+
+def _run_job(checkpoint_dir, log_path, crash_after):
+    """One ingestion process, killed right after its first ``crash_after`` checkpoint"""
+    initialize_config_manager(cli_options_dict={"debug": False})
+    get_envs().INGESTION_CHECKPOINT_KG_BATCH_SIZE = 2
+    get_hi_rag_config().tiered_ingestion = False
+    IngestionCheckpointStore.reset()
+    store = IngestionCheckpointStore(checkpoint_dir=checkpoint_dir)
+
+    if crash_after:
+        checkpoint_stage = getattr(store, crash_after)
+
+        def checkpoint_and_crash(*args, **kwargs):
+            checkpoint_stage(*args, **kwargs)
+            os._exit(CRASH_EXIT_CODE)
+
+        setattr(store, crash_after, checkpoint_and_crash)
+
+    processor = DocumentProcessor(
+        storage=FakeStorage(log_path), chunker=None, kg_constructor=FakeKG(log_path)
+    )
+
+    async def load_and_chunk(*args, **kwargs):
+        # Conversion, table summaries and timestamp extraction
+        _log(log_path, ["load"])
+        file = create_file(metadata=DOCUMENT_META, text="report")
+        items = [
+            ItemRecord(documentKey=key.replace("chunk", "item"), text=key)
+            for key in CHUNK_KEYS
+        ]
+        chunks = [ChunkRecord(documentKey=key, text=key) for key in CHUNK_KEYS]
+        return chunks, file, items
+
+    processor._load_and_chunk_document = load_and_chunk
+    asyncio.run(
+        processor.process_document(
+            document_path="/tmp/report.txt",
+            content_type="text/plain",
+            workspace_id="ws-checkpoint",
+            knowledge_base_id="kb-checkpoint",
+            construct_graph=True,
+            document_meta=dict(DOCUMENT_META),
+            file_id="job-checkpoint",
+        )
+    )
+
+
+def _run_in_process(*args):
+    process = multiprocessing.get_context("fork").Process(target=_run_job, args=args)
+    process.start()
+    process.join(timeout=120)
+    return process.exitcode
+
+
+@pytest.mark.parametrize(
+    "crash_after",
+    ["save_documents", "add_embedded_chunks", "mark_items_stored", "add_kg_chunks"],
+)
+def test_resume_after_a_crash_repeats_no_stage(tmp_path, crash_after):
+    checkpoint_dir = str(tmp_path / "checkpoints")
+    log_path = str(tmp_path / "calls.log")
+
+    assert _run_in_process(checkpoint_dir, log_path, crash_after) == CRASH_EXIT_CODE
+    assert os.listdir(checkpoint_dir)
+    assert _run_in_process(checkpoint_dir, log_path, None) == 0
+
+    with open(log_path) as f:
+        calls = Counter(f.read().split())
+    expected = Counter(
+        ["load"]
+        + [f"embed:{key}" for key in CHUNK_KEYS]
+        + [f"item:{key.replace('chunk', 'item')}" for key in CHUNK_KEYS]
+        + [f"kg:{key}" for key in CHUNK_KEYS]
+    )
+    assert calls == expected
+    # The completed job leaves no checkpoint behind
+    assert os.listdir(checkpoint_dir) == []
+
+
+def test_checkpoint_of_another_input_is_not_resumed(tmp_path):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    IngestionCheckpointStore.reset()
+    store = IngestionCheckpointStore(checkpoint_dir=str(tmp_path))
+    try:
+        checkpoint = store.load("job", "fingerprint-a")
+        store.save_documents(checkpoint, None, [ChunkRecord(documentKey="c")], [])
+        store.add_embedded_chunks(checkpoint, ["c"])
+
+        assert store.has_progress("job", "fingerprint-a")
+        resumed = store.load("job", "fingerprint-a")
+        assert resumed.chunks == [ChunkRecord(documentKey="c")]
+        assert resumed.embedded_chunk_keys == {"c"}
+
+        assert not store.has_progress("job", "fingerprint-b")
+        assert not store.load("job", "fingerprint-a").chunked
+    finally:
+        IngestionCheckpointStore.reset()
+
+
+class RowStorage:
+    """Keeps the stored files by document with the job that wrote them, and chunks"""
+
+    def __init__(self):
+        self.files = {}
+        self.chunks = {}
+        self.vdb = SimpleNamespace(upsert_graph=self._store_graph)
+
+    async def _store_graph(self, relations):
+        pass
+
+    async def upsert_file_to_vdb(self, file):
+        self.files[file.documentKey] = file.id
+
+    async def get_existing_chunks(self, *args):
+        return []
+
+    async def upsert_chunks_to_vdb(self, chunks):
+        for chunk in chunks:
+            self.chunks.setdefault(chunk.documentId, set()).add(chunk.documentKey)
+
+    async def upsert_items_to_vdb(self, items, on_stage_done=None):
+        for step in ("translation", "tokenization"):
+            await on_stage_done(step)
+
+    async def upsert_relations_to_vdb(self, relations):
+        pass
+
+    async def clean_vdb_file(self, where):
+        file_id = self.files.get(where["documentKey"])
+        if file_id is None or where.get("id", file_id) != file_id:
+            return False
+        del self.files[where["documentKey"]]
+        return True
+
+    async def clean_vdb_document(self, where):
+        self.chunks.pop(where["documentId"], None)
+
+
+class FlakyKG:
+    def __init__(self):
+        self.fail = False
+
+    async def construct_kg(self, chunks):
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        return [], []
+
+
+class StatusTracker(JobStatusTracker):
+    def __init__(self):
+        super().__init__()
+        self.job_statuses = {}
+
+    async def set_job_status(self, file_id, status):
+        self.job_statuses[file_id] = status
+
+    async def set_stage_status(self, *args, **kwargs):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_partial_rows_of_a_job_never_retried_are_cleared(tmp_path, monkeypatch):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    monkeypatch.setattr(get_hi_rag_config(), "tiered_ingestion", False)
+    IngestionCheckpointStore.reset()
+    store = IngestionCheckpointStore(checkpoint_dir=str(tmp_path))
+
+    storage, kg, tracker = RowStorage(), FlakyKG(), StatusTracker()
+    hirag = HiRAG()
+    hirag._processor = DocumentProcessor(
+        storage=storage, chunker=None, kg_constructor=kg, job_status_tracker=tracker
+    )
+
+    async def load_and_chunk(document_path, content_type, document_meta, *args):
+        file = create_file(metadata=document_meta, text="report")
+        chunks = [
+            ChunkRecord(
+                documentKey=f"{document_meta['documentKey']}-{i}",
+                documentId=document_meta["documentKey"],
+            )
+            for i in range(2)
+        ]
+        return chunks, file, []
+
+    hirag._processor._load_and_chunk_document = load_and_chunk
+
+    async def ingest(uri, file_id, fail):
+        kg.fail = fail
+        await hirag._insert_to_kb(
+            document_path=uri,
+            workspace_id="ws-checkpoint",
+            knowledge_base_id="kb-checkpoint",
+            content_type="text/plain",
+            construct_graph=True,
+            file_id=file_id,
+            document_meta=dict(DOCUMENT_META, uri=uri),
+            loader_configs=None,
+            loader_type=None,
+        )
+        return compute_mdhash_id(f"{uri}:kb-checkpoint:ws-checkpoint", prefix="doc-")
+
+    try:
+        document_a = compute_mdhash_id(
+            "/tmp/a.txt:kb-checkpoint:ws-checkpoint", prefix="doc-"
+        )
+        with pytest.raises(KGConstructionError):
+            await ingest("/tmp/a.txt", "job-a", fail=True)
+        with pytest.raises(KGConstructionError):
+            await ingest("/tmp/b.txt", "job-b", fail=True)
+        # The rows of a failed job stay for its retry to resume from
+        assert storage.chunks[document_a]
+        assert storage.files[document_a] == "job-a"
+        assert tracker.job_statuses["job-a"] == JobStatus.FAILED
+
+        # Another job ingests the second document again, then both checkpoints expire
+        document_b = await ingest("/tmp/b.txt", "job-b2", fail=False)
+        expired_at = time.time() - store.max_age_seconds - 1
+        for entry in os.scandir(str(tmp_path)):
+            os.utime(entry.path, (expired_at, expired_at))
+
+        document_c = await ingest("/tmp/c.txt", "job-c", fail=False)
+
+        assert document_a not in storage.files
+        assert document_a not in storage.chunks
+        assert storage.files == {document_b: "job-b2", document_c: "job-c"}
+        assert set(storage.chunks) == {document_b, document_c}
+        assert os.listdir(str(tmp_path)) == []
+    finally:
+        IngestionCheckpointStore.reset()
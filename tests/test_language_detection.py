@@ -0,0 +1,44 @@
+import pytest
+
+from hirag_prod.cross_language_search.functions import (
+    detect_language,
+    needs_translation,
+)
+
+
+@pytest.mark.parametrize(
+    "text, language",
+    [
+        ("The revenue of the company increased in the third quarter.", "en"),
+        ("Revenue of the year", "en"),
+        # Short labels without stopwords are not assumed to be English
+        ("Total Revenue", "latin"),
+        ("Umsatz Gesamt", "latin"),
+        ("Chiffre d'affaires", "latin"),
+        ("Revenue 收入 growth strong in the year", "mixed"),
+        ("公司第三季度的收入有所增加。", "zh"),
+        ("第三四半期の売上高は増加しました。", "ja"),
+        ("3분기 매출이 증가했습니다.", "ko"),
+        ("12,345.67 | 2024-01-31 | 8.5%", "numeric"),
+        ("def foo(x):\n    return x.bar() + len(items)", "code"),
+        ("SELECT id FROM items WHERE key_id = 1;", "code"),
+        (
+            "Le chiffre d'affaires de l'entreprise a augmenté au troisième trimestre.",
+            "latin",
+        ),
+        ("Der Umsatz des Unternehmens stieg im dritten Quartal deutlich.", "latin"),
+    ],
+)
+def test_detect_language(text, language):
+    assert detect_language(text) == language
+
+
+def test_needs_translation():
+    assert not needs_translation("en", "en")
+    assert not needs_translation("zh", "zh-CN")
+    assert not needs_translation("numeric", "en")
+    assert not needs_translation("code", "en")
+    assert needs_translation("zh", "en")
+    assert needs_translation("latin", "en")
+    assert needs_translation("unknown", "en")
+    assert needs_translation("mixed", "en")
@@ -0,0 +1,181 @@
+import asyncio
+import json
+import time
+
+import httpx
+import openai
+import pytest
+
+from hirag_prod.load_balancer import (
+    EndpointPool,
+    is_endpoint_failure,
+    parse_endpoint_list,
+)
+
+
+class DelayedStubServer:
+    """Local HTTP stub answering every request after ``delay`` seconds with ``status``"""
+
+    def __init__(self, delay: float = 0.0, status: int = 200):
+        self.delay = delay
+        self.status = status
+        self.requests = 0
+        self.url = ""
+        self._server = None
+
+    async def _handle(self, reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                length = 0
+                for line in head.decode().split("\r\n"):
+                    if line.lower().startswith("content-length:"):
+                        length = int(line.split(":", 1)[1])
+                await reader.readexactly(length)
+                self.requests += 1
+                await asyncio.sleep(self.delay)
+                payload = json.dumps({"server": self.url}).encode()
+                writer.write(
+                    f"HTTP/1.1 {self.status} STUB\r\n".encode()
+                    + b"Content-Type: application/json\r\n"
+                    + f"Content-Length: {len(payload)}\r\n\r\n".encode()
+                    + payload
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionResetError):
+            pass
+        finally:
+            writer.close()
+
+    async def start(self) -> "DelayedStubServer":
+        self._server = await asyncio.start_server(self._handle, "127.0.0.1", 0)
+        host, port = self._server.sockets[0].getsockname()[:2]
+        self.url = f"http://{host}:{port}"
+        return self
+
+    async def stop(self) -> None:
+        self._server.close()
+        await self._server.wait_closed()
+
+
+async def _start(*servers: DelayedStubServer):
+    return [await server.start() for server in servers]
+
+
+def _sender(client: httpx.AsyncClient):
+    async def send(url: str):
+        response = await client.post(f"{url}/v1/embeddings", json={"input": ["x"]})
+        response.raise_for_status()
+        return response.json()["server"]
+
+    return send
+
+
+def test_parse_endpoint_list():
+    assert parse_endpoint_list("http://a:1, http://b:2,,") == [
+        "http://a:1",
+        "http://b:2",
+    ]
+    assert parse_endpoint_list(None) == []
+
+
+def test_only_transport_errors_5xx_and_429_are_endpoint_failures():
+    request = httpx.Request("POST", "http://a:1")
+
+    def status_error(status):
+        response = httpx.Response(status, request=request)
+        return httpx.HTTPStatusError("error", request=request, response=response)
+
+    assert is_endpoint_failure(httpx.ConnectError("refused", request=request))
+    assert is_endpoint_failure(httpx.ReadTimeout("timeout", request=request))
+    assert is_endpoint_failure(openai.APIConnectionError(request=request))
+    assert is_endpoint_failure(openai.APITimeoutError(request=request))
+    assert is_endpoint_failure(status_error(503))
+    assert is_endpoint_failure(status_error(429))
+
+    assert not is_endpoint_failure(status_error(400))
+    assert not is_endpoint_failure(KeyError("server"))
+    assert not is_endpoint_failure(ValueError("invalid response"))
+
+
+@pytest.mark.asyncio
+async def test_least_outstanding_prefers_fast_endpoints():
+    servers = await _start(
+        DelayedStubServer(delay=0.01),
+        DelayedStubServer(delay=0.01),
+        DelayedStubServer(delay=0.3),
+    )
+    pool = EndpointPool("embedding", [s.url for s in servers])
+    try:
+        async with httpx.AsyncClient() as client:
+            send = _sender(client)
+            for _ in range(3):
+                await asyncio.gather(*[pool.request(send) for _ in range(10)])
+    finally:
+        for server in servers:
+            await server.stop()
+
+    fast, slow = servers[0].requests + servers[1].requests, servers[2].requests
+    assert fast + slow == 30
+    assert slow < fast / 3
+
+
+@pytest.mark.asyncio
+async def test_failing_endpoint_is_ejected_and_requests_fail_over():
+    healthy, broken = await _start(DelayedStubServer(), DelayedStubServer(status=503))
+    pool = EndpointPool(
+        "llm", [broken.url, healthy.url], ejection_failures=2, ejection_seconds=60
+    )
+    try:
+        async with httpx.AsyncClient() as client:
+            send = _sender(client)
+            results = [await pool.request(send) for _ in range(10)]
+    finally:
+        await healthy.stop()
+        await broken.stop()
+
+    assert all(result == healthy.url for result in results)
+    assert broken.requests <= 2
+    stats = {e["url"]: e for e in pool.get_stats()["endpoints"]}
+    assert stats[broken.url]["ejected"]
+    assert not stats[healthy.url]["ejected"]
+
+
+@pytest.mark.asyncio
+async def test_client_errors_do_not_eject():
+    server = (await _start(DelayedStubServer(status=400)))[0]
+    pool = EndpointPool("reranker", [server.url], ejection_failures=1)
+    try:
+        async with httpx.AsyncClient() as client:
+            for _ in range(3):
+                with pytest.raises(httpx.HTTPStatusError):
+                    await pool.request(_sender(client))
+    finally:
+        await server.stop()
+
+    assert not pool.get_stats()["endpoints"][0]["ejected"]
+    assert server.requests == 3
+
+
+@pytest.mark.asyncio
+async def test_hedged_requests_cut_tail_latency():
+    slow, fast = await _start(
+        DelayedStubServer(delay=1.0), DelayedStubServer(delay=0.01)
+    )
+    pool = EndpointPool("reranker", [slow.url, fast.url], hedge_delay=0.05)
+    # Make the slow endpoint look best so that it is always tried first
+    pool.endpoints[0].latency_ewma = 0.001
+    pool.endpoints[1].latency_ewma = 0.01
+    try:
+        async with httpx.AsyncClient() as client:
+            start = time.perf_counter()
+            result = await pool.request(_sender(client))
+            elapsed = time.perf_counter() - start
+    finally:
+        await slow.stop()
+        await fast.stop()
+
+    assert result == fast.url
+    assert elapsed < 0.5
+    assert pool.hedged_count == 1
+    assert pool.hedge_win_count == 1
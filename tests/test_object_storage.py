@@ -0,0 +1,168 @@
+import hashlib
+import re
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import boto3
+import pytest
+from botocore.config import Config
+from dotenv import load_dotenv
+
+from hirag_prod.configs.functions import get_envs, initialize_config_manager
+from hirag_prod.loader import utils
+from hirag_prod.resources.http_client_registry import HttpClientRegistry
+
+load_dotenv("../.env", override=True)
+
+
+class StubS3Server(ThreadingHTTPServer):
+    """Path-style S3 stand-in serving HEAD and ranged GET of in-memory objects"""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubS3Handler)
+        self.objects = {}
+        self.get_ranges = []
+        self.lock = threading.Lock()
+
+    @property
+    def endpoint_url(self) -> str:
+        host, port = self.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @staticmethod
+    def etag(body: bytes) -> str:
+        return hashlib.md5(body).hexdigest()
+
+
+class StubS3Handler(BaseHTTPRequestHandler):
+    def log_message(self, *args):
+        pass
+
+    def _object(self):
+        body = self.server.objects.get(self.path.lstrip("/").split("?")[0])
+        if body is None:
+            self.send_response(404)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+        return body
+
+    def _send_headers(self, status: int, body: bytes, length: int) -> None:
+        self.send_response(status)
+        self.send_header("ETag", f'"{StubS3Server.etag(body)}"')
+        self.send_header("Content-Length", str(length))
+        self.send_header("Last-Modified", "Mon, 19 Oct 2026 00:00:00 GMT")
+
+    def do_HEAD(self):
+        body = self._object()
+        if body is not None:
+            self._send_headers(200, body, len(body))
+            self.end_headers()
+
+    def do_GET(self):
+        body = self._object()
+        if body is None:
+            return
+        if_match = self.headers.get("If-Match")
+        if if_match and if_match.strip('"') != StubS3Server.etag(body):
+            self.send_response(412)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        match = re.match(r"bytes=(\d+)-(\d*)", self.headers.get("Range", ""))
+        if match:
+            start, end = int(match.group(1)), len(body) - 1
+            if match.group(2):
+                end = min(int(match.group(2)), end)
+            with self.server.lock:
+                self.server.get_ranges.append((start, end))
+            self._send_headers(206, body, end - start + 1)
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(body)}")
+            self.end_headers()
+            self.wfile.write(body[start : end + 1])
+        else:
+            with self.server.lock:
+                self.server.get_ranges.append(None)
+            self._send_headers(200, body, len(body))
+            self.end_headers()
+            self.wfile.write(body)
+
+
+@pytest.fixture
+def s3(monkeypatch, tmp_path):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    server = StubS3Server()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    created = []
+
+    def create_s3_client(storage_type):
+        created.append(storage_type)
+        return boto3.client(
+            "s3",
+            endpoint_url=server.endpoint_url,
+            aws_access_key_id="key",
+            aws_secret_access_key="secret",
+            region_name="us-east-1",
+            config=Config(s3={"addressing_style": "path"}),
+        )
+
+    monkeypatch.setattr(utils, "create_s3_client", create_s3_client)
+    monkeypatch.setattr(utils, "S3_DOWNLOAD_DIR", str(tmp_path))
+    monkeypatch.setattr(get_envs(), "OBJECT_STORAGE_MULTIPART_THRESHOLD_MB", 1)
+    monkeypatch.setattr(get_envs(), "OBJECT_STORAGE_MULTIPART_CHUNK_SIZE_MB", 1)
+    HttpClientRegistry.reset()
+    server.created = created
+    yield server
+    HttpClientRegistry.reset()
+    server.shutdown()
+    server.server_close()
+
+
+def test_large_object_is_downloaded_in_ranges_with_one_client(s3):
+    body = bytes(range(256)) * (14 * 1024)  # 3.5 MB
+    s3.objects["bucket/docs/large.pdf"] = body
+
+    local_path = utils.route_file_path("docling", "s3://bucket/docs/large.pdf")
+
+    with open(local_path, "rb") as f:
+        assert f.read() == body
+    assert local_path.endswith("/large.pdf")
+    assert sorted(s3.get_ranges) == [
+        (0, 1048575),
+        (1048576, 2097151),
+        (2097152, 3145727),
+        (3145728, 3670015),
+    ]
+    assert s3.created == ["s3"]
+
+
+def test_download_is_reused_while_etag_is_unchanged(s3):
+    s3.objects["bucket/a/report.pdf"] = b"first version"
+    s3.objects["bucket/b/report.pdf"] = b"other report"
+
+    first_path = utils.route_file_path("docling", "s3://bucket/a/report.pdf")
+    assert utils.route_file_path("docling", "s3://bucket/a/report.pdf") == first_path
+    assert len(s3.get_ranges) == 1
+
+    other_path = utils.route_file_path("docling", "s3://bucket/b/report.pdf")
+    assert other_path != first_path
+
+    s3.objects["bucket/a/report.pdf"] = b"second version"
+    assert utils.route_file_path("docling", "s3://bucket/a/report.pdf") == first_path
+    with open(first_path, "rb") as f:
+        assert f.read() == b"second version"
+    assert len(s3.get_ranges) == 3
+
+
+def test_least_recently_used_downloads_are_evicted(s3, monkeypatch):
+    monkeypatch.setattr(get_envs(), "CLOUD_DOWNLOAD_CACHE_MAX_SIZE_MB", 0)
+    s3.objects["bucket/one.pdf"] = b"one"
+    s3.objects["bucket/two.pdf"] = b"two"
+
+    one_path = utils.route_file_path("docling", "s3://bucket/one.pdf")
+    two_path = utils.route_file_path("docling", "s3://bucket/two.pdf")
+
+    with open(two_path, "rb") as f:
+        assert f.read() == b"two"
+    with pytest.raises(FileNotFoundError):
+        open(one_path, "rb")
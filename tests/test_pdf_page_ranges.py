@@ -0,0 +1,87 @@
+import os
+
+import pytest
+from docling_core.types.doc import (
+    BoundingBox,
+    DocItemLabel,
+    DoclingDocument,
+    ProvenanceItem,
+    Size,
+)
+from dotenv import load_dotenv
+
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.loader.pdf_page_ranges import (
+    get_pdf_page_count,
+    load_pdf_in_page_ranges,
+    merge_docling_documents,
+    split_page_ranges,
+)
+from hirag_prod.resources.worker_pool import WorkerPool
+
+load_dotenv("../.env", override=True)
+
+TEST_PDF = os.path.join(
+    os.path.dirname(__file__), "test_files", "Guide-to-U.S.-Healthcare-System.pdf"
+)
+
+
+def _page_range_document(first_page: int, last_page: int) -> DoclingDocument:
+    """What docling returns for a page range: original page numbers"""
+    document = DoclingDocument(name="report")
+    for page_no in range(first_page, last_page + 1):
+        document.add_page(page_no=page_no, size=Size(width=600, height=800))
+        bbox = BoundingBox(l=10, t=790 - page_no, r=500, b=700)
+        heading = f"Section {page_no}"
+        document.add_heading(
+            heading,
+            prov=ProvenanceItem(page_no=page_no, bbox=bbox, charspan=(0, len(heading))),
+        )
+        text = f"Body of page {page_no}"
+        document.add_text(
+            DocItemLabel.TEXT,
+            text,
+            prov=ProvenanceItem(page_no=page_no, bbox=bbox, charspan=(0, len(text))),
+        )
+    return document
+
+
+def test_split_page_ranges():
+    assert split_page_ranges(120, 50) == [(1, 50), (51, 100), (101, 120)]
+    assert split_page_ranges(50, 50) == [(1, 50)]
+    assert get_pdf_page_count(TEST_PDF) > 0
+
+
+def test_merge_keeps_order_pages_and_bboxes():
+    whole = _page_range_document(1, 5)
+    merged = merge_docling_documents(
+        [
+            _page_range_document(1, 2),
+            _page_range_document(3, 4),
+            _page_range_document(5, 5),
+        ]
+    )
+
+    assert merged.name == "report"
+    assert sorted(merged.pages) == [1, 2, 3, 4, 5]
+    assert [(t.text, t.label) for t in merged.texts] == [
+        (t.text, t.label) for t in whole.texts
+    ]
+    assert [t.prov[0].page_no for t in merged.texts] == [
+        t.prov[0].page_no for t in whole.texts
+    ]
+    assert [t.prov[0].bbox for t in merged.texts] == [
+        t.prov[0].bbox for t in whole.texts
+    ]
+    assert merged.export_to_markdown() == whole.export_to_markdown()
+
+
+@pytest.mark.asyncio
+async def test_in_process_loading_is_not_split():
+    initialize_config_manager(cli_options_dict={"debug": False})
+    WorkerPool.reset()
+    WorkerPool(max_workers=0)
+    try:
+        assert await load_pdf_in_page_ranges(TEST_PDF, {"private": False}) is None
+    finally:
+        WorkerPool.reset()
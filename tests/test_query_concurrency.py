@@ -0,0 +1,128 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import hirag_prod.hirag as hirag_module
+import hirag_prod.storage.query_service as query_service_module
+from hirag_prod.configs.hi_rag_config import HiRAGConfig
+from hirag_prod.hirag import HiRAG
+from hirag_prod.storage.query_service import QueryService
+
+# Distinct delays, so that no two chains of stages take about as long
+TRANSLATION_DELAYS = {"en": 0.06, "ja": 0.07, "ko": 0.08}
+CHUNK_RECALL_DELAYS = {"original": 0.02, "translated": 0.06}
+TRIPLET_RECALL_DELAYS = {"original": 0.03, "translated": 0.01}
+
+
+class StubTranslator:
+    def __init__(self, events):
+        self.calls = 0
+        self.events = events
+
+    async def translate(self, text: str, dest: str):
+        self.calls += 1
+        self.events.append(("start", f"translation:{dest}"))
+        await asyncio.sleep(TRANSLATION_DELAYS[dest])
+        self.events.append(("end", f"translation:{dest}"))
+        return SimpleNamespace(text=f"{text} [{dest}]")
+
+
+class StubStorage:
+    """Recall stub: every text scores its own chunk closest, plus one shared chunk"""
+
+    def __init__(self, events):
+        self.chunk_queries = []
+        self.events = events
+
+    async def _recall(self, stage, query, delays):
+        texts = [query] if isinstance(query, str) else query
+        kind = "translated" if any("[" in t for t in texts) else "original"
+        self.events.append(("start", f"{stage}:{kind}"))
+        await asyncio.sleep(delays[kind])
+        self.events.append(("end", f"{stage}:{kind}"))
+        return texts
+
+    async def query_chunks(self, query, **kwargs):
+        texts = await self._recall("chunk_recall", query, CHUNK_RECALL_DELAYS)
+        self.chunk_queries.append(texts)
+        rows = [{"documentKey": f"chunk-{t}", "distance": 0.1} for t in texts]
+        rows.append({"documentKey": "chunk-shared", "distance": 0.5 / len(texts)})
+        return rows
+
+    async def query_triplets(self, query, **kwargs):
+        await self._recall("triplet_recall", query, TRIPLET_RECALL_DELAYS)
+        return []
+
+
+@pytest.fixture
+def stub_hirag(monkeypatch):
+    config = HiRAGConfig(embedding_dimension=1024)
+    events = []
+    translator = StubTranslator(events)
+    monkeypatch.setattr(hirag_module, "get_hi_rag_config", lambda: config)
+    monkeypatch.setattr(query_service_module, "get_hi_rag_config", lambda: config)
+    monkeypatch.setattr(hirag_module, "get_translator", lambda: translator)
+
+    instance = HiRAG()
+    instance._query_service = QueryService(StubStorage(events))
+    return instance, translator, events
+
+
+@pytest.mark.asyncio
+async def test_translation_overlaps_original_recall(stub_hirag):
+    instance, translator, events = stub_hirag
+
+    result = await instance.query(
+        "query",
+        workspace_id="ws",
+        knowledge_base_id="kb",
+        translation=["en", "ja", "ko"],
+        strategy="pagerank",
+        filter_by_clustering=False,
+    )
+
+    # Translations run concurrently and overlap the recall of the original query
+    assert translator.calls == 3
+    order = {event: i for i, event in enumerate(events)}
+    first_translation_end = min(
+        order[("end", f"translation:{dest}")] for dest in TRANSLATION_DELAYS
+    )
+    last_translation_end = max(
+        order[("end", f"translation:{dest}")] for dest in TRANSLATION_DELAYS
+    )
+    for dest in TRANSLATION_DELAYS:
+        assert order[("start", f"translation:{dest}")] < first_translation_end
+    for stage in ("chunk_recall", "triplet_recall"):
+        assert order[("start", f"{stage}:original")] < first_translation_end
+        # Translated texts are recalled once every translation is done
+        assert order[("start", f"{stage}:translated")] > last_translation_end
+
+    # translation -> translated chunk recall is the critical path
+    timings = result["timings"]
+    assert timings["critical_path_stages"][:2] == [
+        "translation",
+        "translated_chunk_recall",
+    ]
+    assert timings["critical_path"] <= timings["total"]
+
+    assert result["query"] == ["query", "query [en]", "query [ja]", "query [ko]"]
+    keys = [c["documentKey"] for c in result["chunks"]]
+    assert set(keys) == {f"chunk-{q}" for q in result["query"]} | {"chunk-shared"}
+    # The shared chunk keeps its best distance across both recall batches
+    shared = next(c for c in result["chunks"] if c["documentKey"] == "chunk-shared")
+    assert shared["distance"] == pytest.approx(0.5 / 3)
+
+
+@pytest.mark.asyncio
+async def test_raw_query_without_translation(stub_hirag):
+    instance, translator, events = stub_hirag
+
+    result = await instance.query(
+        "query", workspace_id="ws", knowledge_base_id="kb", strategy="raw"
+    )
+
+    assert translator.calls == 0
+    assert result["chunk_ids"] == ["chunk-query", "chunk-shared"]
+    assert result["timings"]["critical_path_stages"] == ["chunk_recall"]
+    assert "triplet_recall" not in result["timings"]
@@ -0,0 +1,95 @@
+import asyncio
+import json
+import re
+
+import pytest
+from dotenv import load_dotenv
+
+from hirag_prod.configs.functions import get_envs, initialize_config_manager
+from hirag_prod.loader import table_summary
+from hirag_prod.loader.table_summary import TableSummarizer
+
+load_dotenv("../.env", override=True)
+
+
+class StubChatService:
+    """Summarizes every table of a prompt as "summary of <first cell>" """
+
+    def __init__(self, broken_packs: bool = False):
+        self.broken_packs = broken_packs
+        self.prompts = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def complete(self, prompt: str, model: str) -> str:
+        self.prompts.append(prompt)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        first_cells = re.findall(r"<td>(\w+)</td>", prompt)
+        if '<table id="' not in prompt:
+            return f"summary of {first_cells[0]}"
+        tables = re.findall(r'<table id="\d+">\n<table><tr><td>(\w+)</td>', prompt)
+        if self.broken_packs:
+            return json.dumps([f"summary of {tables[0]}"])
+        return json.dumps([f"summary of {table}" for table in tables])
+
+
+def _table(name: str, rows: int) -> str:
+    body = "".join(f"<tr><td>{name}</td><td>{i}</td></tr>\n" for i in range(rows))
+    return f"<table>{body}</table>"
+
+
+@pytest.fixture
+def summarizer(monkeypatch):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    TableSummarizer.reset()
+    monkeypatch.setattr(get_envs(), "TABLE_SUMMARY_MIN_CHARS", 200)
+    monkeypatch.setattr(get_envs(), "TABLE_SUMMARY_PACK_MAX_CHARS", 1500)
+    monkeypatch.setattr(get_envs(), "TABLE_SUMMARY_PACK_MAX_TABLES", 3)
+    monkeypatch.setattr(get_envs(), "TABLE_SUMMARY_CONCURRENCY", 2)
+    # Redis is not initialized in the tests, only the in-process cache is used
+    monkeypatch.setattr(TableSummarizer, "_redis", staticmethod(lambda: None))
+    yield TableSummarizer()
+    TableSummarizer.reset()
+
+
+def test_tables_are_packed_deduplicated_and_cached(summarizer, monkeypatch):
+    chat_service = StubChatService()
+    monkeypatch.setattr(table_summary, "get_chat_service", lambda: chat_service)
+    tiny = "<table><tr><td>tiny</td></tr></table>"
+    small = [_table(f"small{i}", 8) for i in range(7)]
+    large = _table("large", 60)
+    reformatted = small[0].replace("\n", "\n    ")
+    tables = [tiny, *small, large, reformatted]
+
+    captions = asyncio.run(summarizer.summarize(tables))
+
+    assert captions[0] == tiny
+    assert captions[1:8] == [f"summary of small{i}" for i in range(7)]
+    assert captions[8] == "summary of large"
+    assert captions[9] == "summary of small0"
+    # 7 small tables in packs of 3 and the large table alone
+    assert len(chat_service.prompts) == 4
+    assert chat_service.max_in_flight == 2
+    assert summarizer.get_stats()["packed_tables"] == 6
+    assert summarizer.get_stats()["deduplicated"] == 1
+
+    assert asyncio.run(summarizer.summarize([large, small[3]])) == [
+        "summary of large",
+        "summary of small3",
+    ]
+    assert len(chat_service.prompts) == 4
+
+
+def test_packs_fall_back_to_one_prompt_per_table(summarizer, monkeypatch):
+    chat_service = StubChatService(broken_packs=True)
+    monkeypatch.setattr(table_summary, "get_chat_service", lambda: chat_service)
+    tables = [_table(f"small{i}", 8) for i in range(3)]
+
+    captions = asyncio.run(summarizer.summarize(tables))
+
+    assert captions == [f"summary of small{i}" for i in range(3)]
+    assert len(chat_service.prompts) == 4
+    assert summarizer.get_stats()["packed_tables"] == 0
@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+
+from hirag_prod.tenant_scheduler import TenantFairScheduler, current_tenant
+
+TENANT_A = ("ws-a", "kb-a")
+TENANT_B = ("ws-b", "kb-b")
+
+
+async def _run_jobs(scheduler, jobs, order):
+    async def job(tenant, idx):
+        async with scheduler.slot(tenant):
+            order.append((tenant, idx))
+            await asyncio.sleep(0.01)
+
+    await asyncio.gather(*[job(tenant, idx) for tenant, idx in jobs])
+
+
+@pytest.mark.asyncio
+async def test_round_robin_across_tenants():
+    """A tenant flooding the queue does not starve a tenant arriving later"""
+    scheduler = TenantFairScheduler(name="test", max_concurrency=1)
+    order = []
+    jobs = [(TENANT_A, i) for i in range(20)] + [(TENANT_B, i) for i in range(3)]
+
+    await _run_jobs(scheduler, jobs, order)
+
+    # All of B's jobs are served within the first few grants, interleaved with A
+    positions_b = [i for i, (tenant, _) in enumerate(order) if tenant == TENANT_B]
+    assert positions_b[-1] <= 7
+    assert len(order) == 23
+
+
+@pytest.mark.asyncio
+async def test_per_tenant_cap_and_runtime_update():
+    scheduler = TenantFairScheduler(
+        name="test", max_concurrency=10, default_tenant_concurrency=2
+    )
+    running = {TENANT_A: 0, TENANT_B: 0}
+    peak = {TENANT_A: 0, TENANT_B: 0}
+
+    async def job(tenant):
+        async with scheduler.slot(tenant):
+            running[tenant] += 1
+            peak[tenant] = max(peak[tenant], running[tenant])
+            await asyncio.sleep(0.02)
+            running[tenant] -= 1
+
+    scheduler.set_tenant_limit(TENANT_B, max_concurrency=5)
+    await asyncio.gather(*[job(TENANT_A) for _ in range(8)])
+    await asyncio.gather(*[job(TENANT_B) for _ in range(8)])
+
+    assert peak[TENANT_A] == 2
+    assert peak[TENANT_B] == 5
+
+
+@pytest.mark.asyncio
+async def test_weighted_share():
+    scheduler = TenantFairScheduler(name="test", max_concurrency=1)
+    scheduler.set_tenant_limit(TENANT_A, weight=3.0)
+    order = []
+    jobs = [(TENANT_A, i) for i in range(12)] + [(TENANT_B, i) for i in range(12)]
+
+    await _run_jobs(scheduler, jobs, order)
+
+    first_eight = [tenant for tenant, _ in order[:8]]
+    assert first_eight.count(TENANT_A) >= 5
+
+
+@pytest.mark.asyncio
+async def test_metrics_and_context_tenant():
+    scheduler = TenantFairScheduler(name="test", max_concurrency=1)
+    release = asyncio.Event()
+
+    async def blocker():
+        async with scheduler.slot(TENANT_A):
+            await release.wait()
+
+    granted_metrics = []
+
+    async def subtask():
+        token = current_tenant.set(TENANT_B)
+        try:
+            async with scheduler.slot():
+                granted_metrics.append(scheduler.get_metrics()["tenants"]["ws-b/kb-b"])
+        finally:
+            current_tenant.reset(token)
+
+    blocker_task = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    waiting = [asyncio.create_task(subtask()) for _ in range(3)]
+    await asyncio.sleep(0.02)
+
+    metrics = scheduler.get_metrics()
+    assert metrics["running"] == 1
+    tenant_b = metrics["tenants"]["ws-b/kb-b"]
+    assert tenant_b["queue_depth"] == 3
+    assert tenant_b["oldest_waiting_time"] > 0
+
+    release.set()
+    await asyncio.gather(blocker_task, *waiting)
+
+    assert granted_metrics[-1]["granted_count"] == 3
+    assert granted_metrics[-1]["max_wait_time"] > 0
+    # Tenants with nothing queued or running are forgotten
+    metrics = scheduler.get_metrics()
+    assert metrics["queue_depth"] == 0
+    assert metrics["tenants"] == {}
+
+
+@pytest.mark.asyncio
+async def test_cancelled_waiter_releases_queue():
+    scheduler = TenantFairScheduler(name="test", max_concurrency=1)
+    await scheduler.acquire(TENANT_A)
+
+    waiter = asyncio.create_task(scheduler.acquire(TENANT_B))
+    await asyncio.sleep(0)
+    waiter.cancel()
+    with pytest.raises(asyncio.CancelledError):
+        await waiter
+
+    scheduler.release(TENANT_A)
+    await asyncio.wait_for(scheduler.acquire(TENANT_B), timeout=1)
+    scheduler.release(TENANT_B)
+    assert scheduler.get_metrics()["running"] == 0
+    assert scheduler.get_metrics()["tenants"] == {}
+
+
+@pytest.mark.asyncio
+async def test_idle_tenants_keep_their_limits():
+    scheduler = TenantFairScheduler(name="test", max_concurrency=10)
+    scheduler.set_tenant_limit(TENANT_A, max_concurrency=1, weight=2.0)
+
+    for i in range(100):
+        async with scheduler.slot((f"ws-{i}", "kb")):
+            pass
+    assert scheduler.get_metrics()["tenants"] == {}
+
+    await scheduler.acquire(TENANT_A)
+    waiter = asyncio.create_task(scheduler.acquire(TENANT_A))
+    await asyncio.sleep(0.01)
+    tenant_a = scheduler.get_metrics()["tenants"]["ws-a/kb-a"]
+    assert (tenant_a["max_concurrency"], tenant_a["weight"]) == (1, 2.0)
+    assert tenant_a["queue_depth"] == 1
+
+    scheduler.release(TENANT_A)
+    await asyncio.wait_for(waiter, timeout=1)
+    scheduler.release(TENANT_A)
+    assert scheduler.get_metrics()["tenants"] == {}
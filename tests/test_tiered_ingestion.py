@@ -0,0 +1,208 @@
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+from dotenv import load_dotenv
+
+import hirag_prod.hirag as hirag_module
+import hirag_prod.storage.query_service as query_service_module
+from hirag_prod.configs.functions import get_envs, initialize_config_manager
+from hirag_prod.configs.hi_rag_config import HiRAGConfig
+from hirag_prod.hirag import DocumentProcessor
+from hirag_prod.job_status_tracker import IngestionStage, JobStatus, JobStatusTracker
+from hirag_prod.storage.query_service import QueryService
+from hirag_prod.tenant_scheduler import TenantFairScheduler
+
+load_dotenv("../.env", override=True)
+
+DELAY = 0.05
+
+
+class StubTracker(JobStatusTracker):
+    def __init__(self, pending_documents=()):
+        super().__init__()
+        self.job_statuses = []
+        self.stage_statuses = {}
+        self.pending_documents = set(pending_documents)
+
+    async def set_job_status(self, file_id, status):
+        self.job_statuses.append(status)
+
+    async def set_stage_status(self, file_id, stage, status, **kwargs):
+        self.stage_statuses[stage] = status
+
+    async def get_pending_documents(self, workspace_id, knowledge_base_id, stages):
+        return self.pending_documents
+
+
+class StubStorage:
+    def __init__(self):
+        self.stored = []
+
+    async def upsert_file_to_vdb(self, file):
+        self.stored.append("file")
+
+    async def get_existing_chunks(self, *args):
+        return []
+
+    async def upsert_chunks_to_vdb(self, chunks):
+        await asyncio.sleep(DELAY)
+        self.stored.append("chunks")
+
+    async def upsert_items_to_vdb(self, items, on_stage_done=None):
+        for step in ["translation", "tokenization"]:
+            await asyncio.sleep(DELAY)
+            await on_stage_done(step)
+        self.stored.append("items")
+
+
+class StubKG:
+    def __init__(self, fail=False):
+        self.fail = fail
+
+    async def construct_kg(self, chunks):
+        await asyncio.sleep(DELAY)
+        if self.fail:
+            raise RuntimeError("LLM unavailable")
+        return [], []
+
+
+def _processor(monkeypatch, tiered=True, fail_kg=False):
+    config = HiRAGConfig(embedding_dimension=1024, tiered_ingestion=tiered)
+    monkeypatch.setattr(hirag_module, "get_hi_rag_config", lambda: config)
+    initialize_config_manager(cli_options_dict={"debug": False})
+    # Resuming from checkpoints is covered by test_ingestion_checkpoint
+    monkeypatch.setattr(get_envs(), "ENABLE_INGESTION_CHECKPOINTS", False)
+    processor = DocumentProcessor(
+        storage=StubStorage(),
+        chunker=None,
+        kg_constructor=StubKG(fail=fail_kg),
+        job_status_tracker=StubTracker(),
+    )
+
+    async def _load_and_chunk_document(*args):
+        chunks = [SimpleNamespace(documentKey="chunk-1", uri="file.pdf")]
+        return chunks, SimpleNamespace(), [SimpleNamespace(documentKey="item-1")]
+
+    monkeypatch.setattr(processor, "_load_and_chunk_document", _load_and_chunk_document)
+    return processor
+
+
+async def _process(processor, **kwargs):
+    return await processor.process_document(
+        document_path="file.pdf",
+        content_type="application/pdf",
+        workspace_id="ws",
+        knowledge_base_id="kb",
+        construct_graph=True,
+        document_meta={"documentKey": "doc-1"},
+        file_id="job-1",
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_document_is_searchable_before_enrichment(monkeypatch):
+    processor = _processor(monkeypatch)
+    tracker = processor.job_status_tracker
+
+    metrics = await _process(processor)
+
+    assert processor.storage.stored == ["file", "chunks"]
+    assert tracker.stage_statuses[IngestionStage.SEARCHABLE] == JobStatus.COMPLETED
+    assert tracker.stage_statuses[IngestionStage.KG] == JobStatus.PENDING
+    assert tracker.job_statuses == [JobStatus.PROCESSING]
+
+    await processor.wait_for_enrichment()
+
+    assert processor.storage.stored == ["file", "chunks", "items"]
+    assert set(tracker.stage_statuses.values()) == {JobStatus.COMPLETED}
+    assert tracker.job_statuses[-1] == JobStatus.COMPLETED
+    # Timings of the job are kept in its own metrics
+    assert metrics is not processor.metrics.metrics
+    assert metrics.time_to_searchable < DELAY * 2
+    assert metrics.time_to_complete >= metrics.time_to_searchable + DELAY * 3
+
+
+@pytest.mark.asyncio
+async def test_inline_ingestion_waits_for_enrichment(monkeypatch):
+    processor = _processor(monkeypatch, tiered=False)
+
+    await _process(processor)
+
+    assert processor.storage.stored == ["file", "chunks", "items"]
+    assert processor.job_status_tracker.job_statuses[-1] == JobStatus.COMPLETED
+
+
+@pytest.mark.asyncio
+async def test_failed_enrichment_keeps_document_searchable(monkeypatch):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    processor = _processor(monkeypatch, fail_kg=True)
+    tracker = processor.job_status_tracker
+
+    await _process(processor)
+    await processor.wait_for_enrichment()
+
+    assert processor.storage.stored == ["file", "chunks", "items"]
+    assert tracker.stage_statuses[IngestionStage.ITEMS] == JobStatus.COMPLETED
+    assert tracker.stage_statuses[IngestionStage.KG] == JobStatus.FAILED
+    assert tracker.job_statuses[-1] == JobStatus.FAILED
+
+
+@pytest.mark.asyncio
+async def test_enrichment_holds_the_job_slot_and_reports_failure(monkeypatch):
+    processor = _processor(monkeypatch, fail_kg=True)
+    scheduler = TenantFairScheduler("jobs", max_concurrency=1)
+    failed_jobs = []
+
+    async def on_enrichment_failure():
+        failed_jobs.append("job-1")
+
+    job_slot = await scheduler.hold(("ws", "kb"))
+    metrics = await _process(
+        processor, job_slot=job_slot, on_enrichment_failure=on_enrichment_failure
+    )
+
+    # The next job of the tenant waits for the enrichment of this one
+    assert job_slot.handed_over
+    assert scheduler.get_metrics()["running"] == 1
+    next_job = asyncio.create_task(scheduler.hold(("ws", "kb")))
+    await asyncio.sleep(0)
+    assert not next_job.done()
+    await processor.wait_for_enrichment()
+    next_slot = await asyncio.wait_for(next_job, timeout=1)
+    next_slot.release()
+
+    assert job_slot.released
+    assert scheduler.get_metrics()["running"] == 0
+    assert failed_jobs == ["job-1"]
+    assert metrics.error_count == 1
+
+
+@pytest.mark.asyncio
+async def test_query_keeps_chunks_of_documents_pending_graph(monkeypatch):
+    config = HiRAGConfig(embedding_dimension=1024)
+    monkeypatch.setattr(query_service_module, "get_hi_rag_config", lambda: config)
+    service = QueryService(None, job_status_tracker=StubTracker({"doc-new"}))
+    recalled = [
+        {"documentKey": "chunk-new", "documentId": "doc-new"},
+        {"documentKey": "chunk-old", "documentId": "doc-old"},
+        {"documentKey": "chunk-other", "documentId": "doc-old"},
+    ]
+
+    async def pagerank_chunks(query_chunks, **kwargs):
+        return {"pagerank": [recalled[2]], "query_top": query_chunks}
+
+    monkeypatch.setattr(service, "pagerank_chunks", pagerank_chunks)
+
+    result = await service.apply_strategy_to_chunks(
+        chunks=recalled,
+        workspace_id="ws",
+        knowledge_base_id="kb",
+        query="query",
+        filter_by_clustering=False,
+        strategy="pagerank",
+    )
+
+    assert [c["documentKey"] for c in result["chunks"]] == ["chunk-other", "chunk-new"]
+    assert result["pending_enrichment"] == ["doc-new"]
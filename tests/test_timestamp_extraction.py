@@ -0,0 +1,96 @@
+import asyncio
+import json
+from datetime import datetime
+from types import SimpleNamespace
+
+import pytest
+from dotenv import load_dotenv
+
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.loader import chunk_split
+from hirag_prod.loader.chunk_split import extract_timestamp_from_items, find_dates
+
+load_dotenv("../.env", override=True)
+
+
+class StubChatService:
+    def __init__(self, timestamp: str):
+        self.timestamp = timestamp
+        self.calls = 0
+
+    async def complete(self, prompt: str, **kwargs) -> str:
+        self.calls += 1
+        return json.dumps({"timestamp": self.timestamp, "confidence": 0.8})
+
+
+def _item(text: str, chunk_type: str = "text", file_name: str = "report.pdf"):
+    return SimpleNamespace(text=text, chunkType=chunk_type, fileName=file_name)
+
+
+@pytest.fixture
+def chat_service(monkeypatch):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    chat_service = StubChatService("2019-06-30")
+    monkeypatch.setattr(chunk_split, "get_chat_service", lambda: chat_service)
+    return chat_service
+
+
+def test_find_dates_across_locales():
+    dates = find_dates(
+        "Published 2023-10-15, revised October 3rd, 2023 and 5 Nov. 2023; "
+        "生效日期 2024年3月5日, 2024年4月, 25/12/2022, 03/04/2022, June 2021, 2020, "
+        "12345 and 2999-01-01"
+    )
+    found = {
+        (date.strftime("%Y-%m-%d"), granularity, ambiguous)
+        for _, date, granularity, ambiguous in dates
+    }
+
+    assert found == {
+        ("2023-10-15", "day", False),
+        ("2023-10-03", "day", False),
+        ("2023-11-05", "day", False),
+        ("2024-03-05", "day", False),
+        ("2024-04-01", "month", False),
+        ("2022-12-25", "day", False),
+        ("2022-03-04", "day", True),
+        ("2021-06-01", "month", False),
+        ("2020-01-01", "year", False),
+    }
+    assert [date for _, date, _, _ in find_dates("minutes_20220301_v2.docx", True)] == [
+        datetime(2022, 3, 1)
+    ]
+    assert find_dates("minutes_20220301_v2.docx") == []
+
+
+def test_confident_dates_skip_the_llm(chat_service):
+    header_items = [
+        _item("Annual Claims Report", "title"),
+        _item("Published: 2023-10-15", "page_header"),
+        _item("Claims filed between 2021-01-01 and 2022-12-31 are covered."),
+    ]
+    assert asyncio.run(extract_timestamp_from_items(header_items)) == datetime(
+        2023, 10, 15
+    )
+
+    chinese_items = [_item("发布日期：2024年3月5日", "page_footer"), _item("正文")]
+    assert asyncio.run(extract_timestamp_from_items(chinese_items)) == datetime(
+        2024, 3, 5
+    )
+
+    filename_items = [_item("Attendees and agenda", file_name="minutes_20220301.docx")]
+    assert asyncio.run(extract_timestamp_from_items(filename_items)) == datetime(
+        2022, 3, 1
+    )
+
+    assert asyncio.run(extract_timestamp_from_items([_item("No dates here")])) is None
+    assert chat_service.calls == 0
+
+
+def test_uncertain_dates_are_left_to_the_llm(chat_service):
+    items = [_item("Introduction")] * 10 + [
+        _item("The plan changed on 2019-06-30 after the review of 2018-02-11."),
+    ]
+
+    assert asyncio.run(extract_timestamp_from_items(items)) == datetime(2019, 6, 30)
+    assert chat_service.calls == 1
@@ -0,0 +1,150 @@
+import asyncio
+
+import pytest
+from dotenv import load_dotenv
+
+from hirag_prod import _utils
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.loader.chunk_split import split_long_text_chunks
+from hirag_prod.resources.token_counter import TokenCounter
+from hirag_prod.schema import Chunk, ChunkRecord
+from hirag_prod.storage import pgvector
+from hirag_prod.storage.pgvector import PGVector
+from hirag_prod.storage.storage_manager import StorageManager
+
+load_dotenv("../.env", override=True)
+
+
+class StubEncoder:
+    """One token per word, records what is encoded"""
+
+    def __init__(self):
+        self.vocabulary = {}
+        self.words = []
+        self.encoded = []
+        self.batches = 0
+
+    def encode(self, text):
+        self.encoded.append(text)
+        tokens = []
+        for word in text.split():
+            if word not in self.vocabulary:
+                self.vocabulary[word] = len(self.words)
+                self.words.append(word)
+            tokens.append(self.vocabulary[word])
+        return tokens
+
+    def encode_batch(self, texts, num_threads=8):
+        self.batches += 1
+        return [self.encode(text) for text in texts]
+
+    def decode(self, tokens):
+        return " ".join(self.words[token] for token in tokens)
+
+
+class RecordingSession:
+    """Database session that keeps the executed insert statements"""
+
+    def __init__(self):
+        self.statements = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        return False
+
+    async def execute(self, statement):
+        self.statements.append(statement)
+
+    async def commit(self):
+        pass
+
+    async def flush(self):
+        pass
+
+
+@pytest.fixture
+def encoder(monkeypatch):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    TokenCounter.reset()
+    encoder = StubEncoder()
+    # tiktoken downloads its encodings, the tests count words instead
+    monkeypatch.setattr(_utils, "ENCODER", encoder)
+    yield encoder
+    TokenCounter.reset()
+
+
+def test_counts_are_batched_and_cached(encoder):
+    counter = TokenCounter()
+    texts = ["one two three", "four five", "one two three", ""]
+
+    assert counter.count_batch(texts) == [3, 2, 3, 0]
+    assert encoder.batches == 1
+    assert encoder.encoded == ["one two three", "four five", ""]
+
+    assert counter.count_batch(["four five", "six"]) == [2, 1]
+    assert counter.count("one two three") == 3
+    assert encoder.encoded[3:] == ["six"]
+    assert counter.get_stats()["hits"] == 2
+
+
+def test_uncached_counts_leave_the_cache_alone(encoder):
+    counter = TokenCounter()
+    counter.count("one two three")
+
+    assert counter.count_uncached("a b & c d") == 5
+    assert counter.count_uncached("a b & c d") == 5
+    assert counter.get_stats()["entries"] == 1
+    assert encoder.encoded == ["one two three", "a b & c d", "a b & c d"]
+
+
+def test_split_chunks_encode_once_and_keep_their_counts(encoder):
+    long_text = " ".join(f"w{i}" for i in range(10))
+    chunks = [
+        ChunkRecord(documentKey="short", text="a b c", chunkType="text"),
+        ChunkRecord(documentKey="long", text=long_text, chunkType="text"),
+        ChunkRecord(documentKey="table", text="<table></table>", chunkType="table"),
+    ]
+
+    split = split_long_text_chunks(chunks, chunk_max_tokens=4)
+
+    assert [chunk.text for chunk in split] == [
+        "a b c",
+        "w0 w1 w2 w3",
+        "w4 w5 w6 w7",
+        "w8 w9",
+        "<table></table>",
+    ]
+    assert [chunk.tokenCount for chunk in split] == [3, 4, 4, 2, None]
+    assert encoder.batches == 1
+    assert encoder.encoded == ["a b c", long_text]
+
+    # Counting the short chunk again for storage does not encode it again
+    assert TokenCounter().count("a b c") == 3
+    assert len(encoder.encoded) == 2
+
+
+def test_token_count_column():
+    assert "tokenCount" in Chunk.__table__.columns
+    assert ChunkRecord.__slots__ == tuple(Chunk.__table__.columns.keys())
+
+
+def test_token_counts_are_written_with_the_chunks(encoder, monkeypatch):
+    session = RecordingSession()
+    monkeypatch.setattr(pgvector, "get_db_session_maker", lambda: lambda: session)
+
+    async def embed(texts):
+        return [[0.0] for _ in texts]
+
+    storage = StorageManager(PGVector(embedding_func=embed))
+    chunks = [
+        ChunkRecord(id="split", documentKey="split", text="w0 w1", tokenCount=2),
+        ChunkRecord(id="whole", documentKey="whole", text="a b c"),
+    ]
+
+    asyncio.run(storage.upsert_chunks_to_vdb(chunks))
+
+    (statement,) = session.statements
+    rows = statement.compile().params
+    assert [rows["tokenCount_m0"], rows["tokenCount_m1"]] == [2, 3]
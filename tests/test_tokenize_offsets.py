@@ -0,0 +1,106 @@
+import random
+
+import numpy as np
+import pytest
+
+import hirag_prod.resources.functions as resource_functions
+from hirag_prod.resources.functions import align_tokens, tokenize_sentence
+
+ALPHABET = "abcdefghij" + "ABC" + "0123456789" + "收入增加第三季度公司" + "  \n,.-"
+
+
+def _reference_tokenize_sentence(sentence, tokenizer):
+    """tokenize_sentence before the cursor based alignment, for comparison"""
+    if len(sentence.strip()) == 0:
+        return [], [], []
+    result_list, token_start_index_list, token_end_index_list = [], [], []
+    current_text_index = 0
+    current_result_list_index = 0
+    finish = False
+    while (not finish) and (current_text_index < len(sentence)):
+        if current_text_index + 510 < len(sentence):
+            result_list.extend(
+                tokenizer(sentence[current_text_index : current_text_index + 510])[:-1]
+            )
+        else:
+            result_list.extend(tokenizer(sentence[current_text_index:]))
+            finish = True
+        for token in result_list[current_result_list_index:]:
+            token_start_index_list.append(
+                current_text_index + sentence[current_text_index:].find(token[0])
+            )
+            for char in token:
+                current_text_index += sentence[current_text_index:].find(char) + 1
+            token_end_index_list.append(current_text_index)
+        current_result_list_index = len(result_list)
+    return result_list, token_start_index_list, token_end_index_list
+
+
+class RandomTokenizer:
+    """Splits the non-space runs of a text at random points, like a hanlp model"""
+
+    def __init__(self, seed):
+        self.seed = seed
+
+    def _tokenize(self, text):
+        rng = random.Random(f"{self.seed}:{text}")
+        tokens = []
+        for word in text.split():
+            while word:
+                size = rng.randint(1, 4)
+                tokens.append(word[:size])
+                word = word[size:]
+        return tokens
+
+    def __call__(self, text):
+        if isinstance(text, list):
+            return [self._tokenize(t) for t in text]
+        return self._tokenize(text)
+
+
+def _random_text(rng, length):
+    return "".join(rng.choice(ALPHABET) for _ in range(length))
+
+
+@pytest.mark.parametrize("seed", range(200))
+def test_offsets_match_reference(seed, monkeypatch):
+    rng = random.Random(seed)
+    text = _random_text(rng, rng.choice([0, 5, 50, 509, 510, 511, 1500, 4000]))
+    tokenizer = RandomTokenizer(seed)
+    monkeypatch.setattr(resource_functions, "get_sentence_tokenizer", lambda: tokenizer)
+
+    tokens, starts, ends = tokenize_sentence(text)
+
+    expected_tokens, expected_starts, expected_ends = _reference_tokenize_sentence(
+        text, tokenizer
+    )
+    assert tokens == expected_tokens
+    assert starts.dtype == np.int32 and ends.dtype == np.int32
+    assert starts.tolist() == expected_starts
+    assert ends.tolist() == expected_ends
+
+
+@pytest.mark.parametrize("seed", range(100))
+def test_align_tokens_matches_reference_on_unaligned_tokens(seed):
+    # Tokens that are not substrings, e.g. normalized by the model, take the
+    # character by character path, including characters that are not found
+    rng = random.Random(seed)
+    text = _random_text(rng, 200)
+    token_list = [
+        _random_text(rng, rng.randint(1, 3)).strip() or "x" for _ in range(40)
+    ]
+    start_index = rng.randint(0, 50)
+
+    starts, ends, cursor = align_tokens(text, token_list, start_index)
+
+    expected_starts, expected_ends, current_text_index = [], [], start_index
+    for token in token_list:
+        expected_starts.append(
+            current_text_index + text[current_text_index:].find(token[0])
+        )
+        for char in token:
+            current_text_index += text[current_text_index:].find(char) + 1
+        expected_ends.append(current_text_index)
+    assert starts.tolist() == expected_starts
+    assert ends.tolist() == expected_ends
+    assert cursor == current_text_index
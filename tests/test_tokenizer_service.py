@@ -0,0 +1,95 @@
+import asyncio
+import time
+
+import pytest
+
+import hirag_prod.resources.functions as resource_functions
+from hirag_prod.resources.functions import tokenize_sentence
+from hirag_prod.resources.tokenizer_service import TokenizerService
+
+
+class StubTokenizer:
+    """Splits every window into words of at most 3 characters, like a batched hanlp call"""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.calls = []
+
+    def __call__(self, window_list):
+        self.calls.append(len(window_list))
+        time.sleep(self.delay)
+        return [
+            [word[i : i + 3] for word in window.split() for i in range(0, len(word), 3)]
+            for window in window_list
+        ]
+
+
+def _as_lists(tokenized):
+    tokens, starts, ends = tokenized
+    return tokens, list(starts), list(ends)
+
+
+@pytest.fixture
+def service():
+    TokenizerService.reset()
+    tokenizer = StubTokenizer()
+    yield TokenizerService(tokenizer=tokenizer, batch_size=16, batch_wait_ms=2)
+    TokenizerService.reset()
+
+
+@pytest.mark.asyncio
+async def test_matches_sequential_tokenization(service, monkeypatch):
+    monkeypatch.setattr(
+        resource_functions, "get_sentence_tokenizer", lambda: StubTokenizer()
+    )
+    texts = [
+        "revenue grew in the third quarter",
+        "",
+        " ".join(f"word{i}" for i in range(300)),  # spans several 510 char windows
+        "第三季度 收入 增加",
+    ]
+
+    results = await service.tokenize_many(texts)
+
+    assert [_as_lists(r) for r in results] == [
+        _as_lists(tokenize_sentence(text)) for text in texts
+    ]
+    tokens, starts, ends = results[2]
+    assert [texts[2][s:e] for s, e in zip(starts, ends)] == tokens
+
+
+@pytest.mark.asyncio
+async def test_texts_are_batched(service):
+    texts = [f"text number {i}" for i in range(100)]
+
+    results = await service.tokenize_many(texts)
+
+    assert [r[0] for r in results] == [
+        ["tex", "t", "num", "ber", str(i)] for i in range(100)
+    ]
+    assert service._tokenizer.calls == [16] * 6 + [4]
+    assert service.get_stats()["batches"] == 7
+
+
+@pytest.mark.asyncio
+async def test_event_loop_stays_responsive():
+    TokenizerService.reset()
+    service = TokenizerService(
+        tokenizer=StubTokenizer(delay=0.05), batch_size=8, batch_wait_ms=2
+    )
+    lags = []
+
+    async def ticker():
+        while True:
+            start = time.perf_counter()
+            await asyncio.sleep(0.005)
+            lags.append(time.perf_counter() - start - 0.005)
+
+    ticker_task = asyncio.create_task(ticker())
+    await service.tokenize_many([f"text {i}" for i in range(80)])
+    ticker_task.cancel()
+    TokenizerService.reset()
+
+    # Ten batches of 50ms ran while the loop kept ticking
+    assert len(lags) > 50
+    assert max(lags) < 0.03
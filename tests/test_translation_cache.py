@@ -0,0 +1,109 @@
+from types import SimpleNamespace
+
+import pytest
+from dotenv import load_dotenv
+
+from hirag_prod import _utils
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.resources.functions import get_translation_cache
+from hirag_prod.resources.token_counter import TokenCounter
+from hirag_prod.translator import local_translator
+from hirag_prod.translator.local_translator import LocalTranslator
+from hirag_prod.translator.translation_cache import TranslationCache
+
+load_dotenv("../.env", override=True)
+
+
+@pytest.fixture
+def translator(monkeypatch):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    TranslationCache.reset()
+    translator = LocalTranslator()
+    translator.sent = []
+
+    async def _translate_batch(texts, dest="English", src="Auto"):
+        translator.sent.extend(texts)
+        return [
+            LocalTranslator.LocalTranslated(
+                text=f"<{dest}>{text}", src=src, dest=dest, origin=text
+            )
+            for text in texts
+        ]
+
+    monkeypatch.setattr(translator, "_translate_batch", _translate_batch)
+    yield translator
+    TranslationCache.reset()
+
+
+@pytest.mark.asyncio
+async def test_batch_is_deduplicated_and_cached(translator):
+    texts = ["Header", "Body one", "Header", "Footer", "Header"]
+
+    first = await translator.translate(texts, dest="en")
+    assert [t.text for t in first] == [f"<en>{t}" for t in texts]
+    assert sorted(translator.sent) == ["Body one", "Footer", "Header"]
+
+    second = await translator.translate(["Footer", "Header", "New"], dest="en")
+    assert [t.text for t in second] == ["<en>Footer", "<en>Header", "<en>New"]
+    assert second[0].extra_data == {"cached": True}
+    assert translator.sent[3:] == ["New"]
+
+    stats = get_translation_cache().get_stats()
+    assert stats["deduplicated"] == 2
+    assert stats["lru_hits"] == 2
+    assert stats["misses"] == 4
+    assert stats["hit_ratio"] == pytest.approx(2 / 6)
+
+
+@pytest.mark.asyncio
+async def test_cache_is_keyed_by_target_language(translator):
+    assert (await translator.translate("query", dest="en")).text == "<en>query"
+    assert (await translator.translate("query", dest="ja")).text == "<ja>query"
+    assert (await translator.translate("query", dest="en")).text == "<en>query"
+
+    assert translator.sent == ["query", "query"]
+
+
+@pytest.mark.asyncio
+async def test_cached_translation_reports_the_fresh_languages(monkeypatch):
+    initialize_config_manager(cli_options_dict={"debug": False})
+    TranslationCache.reset()
+    translator = LocalTranslator()
+
+    class StubClient:
+        async def create_translation(self, messages):
+            return {
+                "choices": [{"message": {"content": "查询"}}],
+                "usage": {"prompt_tokens": 1, "completion_tokens": 1},
+            }
+
+    class StubEncoder:
+        def encode_batch(self, texts, num_threads=8):
+            return [text.split() for text in texts]
+
+        def encode(self, text):
+            return text.split()
+
+    monkeypatch.setattr(translator, "_get_client", lambda: StubClient())
+    monkeypatch.setattr(
+        local_translator,
+        "get_chinese_convertor",
+        lambda name: SimpleNamespace(convert=lambda text: text),
+    )
+    # tiktoken downloads its encodings, the scheduler counts words instead
+    monkeypatch.setattr(_utils, "ENCODER", StubEncoder())
+    TokenCounter.reset()
+    try:
+        fresh = await translator.translate("query", dest="zh-s")
+        cached = await translator.translate("query", dest="zh-s")
+    finally:
+        TranslationCache.reset()
+        TokenCounter.reset()
+
+    assert cached.extra_data == {"cached": True}
+    assert (cached.text, cached.src, cached.dest) == (
+        fresh.text,
+        fresh.src,
+        fresh.dest,
+    )
+    assert cached.dest == "Chinese"
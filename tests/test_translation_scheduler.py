@@ -0,0 +1,172 @@
+import asyncio
+
+import pytest
+from dotenv import load_dotenv
+
+from hirag_prod.configs.functions import initialize_config_manager
+from hirag_prod.translator.translation_scheduler import (
+    TranslationPackParseError,
+    TranslationScheduler,
+    build_numbered_segments,
+    parse_numbered_segments,
+)
+
+load_dotenv("../.env", override=True)
+
+
+def _scheduler(**kwargs) -> TranslationScheduler:
+    options = {
+        "max_concurrency": 4,
+        "pack_token_budget": 10,
+        "pack_max_texts": 3,
+        "count_tokens": lambda text: len(text.split()),
+    }
+    options.update(kwargs)
+    return TranslationScheduler(**options)
+
+
+class StubModel:
+    def __init__(self, garble_packs: bool = False, delay: float = 0.01):
+        self.garble_packs = garble_packs
+        self.delay = delay
+        self.single_calls = []
+        self.pack_calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def _call(self):
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+
+    async def translate_single(self, text):
+        self.single_calls.append(text)
+        await self._call()
+        return text.upper()
+
+    async def translate_pack(self, texts):
+        self.pack_calls.append(texts)
+        await self._call()
+        reply = build_numbered_segments([t.upper() for t in texts])
+        if self.garble_packs:
+            reply = reply.replace('<seg id="2">', "")
+        return parse_numbered_segments(reply, len(texts))
+
+
+def test_pack_respects_budget_and_keeps_long_texts_alone():
+    scheduler = _scheduler()
+    texts = [
+        "a b",
+        "c d e",
+        "f",
+        "g h",
+        "one two three four five six seven eight nine ten",
+        "i",
+    ]
+
+    assert scheduler.pack(texts) == [[0, 1, 2], [4], [3, 5]]
+
+
+def test_parse_numbered_segments():
+    reply = 'Sure:\n<seg id="1">first line\ncontinued</seg>\n<seg id="2">second</seg>'
+    assert parse_numbered_segments(reply, 2) == ["first line\ncontinued", "second"]
+    with pytest.raises(TranslationPackParseError):
+        parse_numbered_segments('<seg id="1">only one</seg>', 2)
+    with pytest.raises(TranslationPackParseError):
+        parse_numbered_segments('<seg id="1">one</seg><seg id="2"> </seg>', 2)
+    # Duplicate and reordered segments are refused, not overwritten
+    with pytest.raises(TranslationPackParseError):
+        parse_numbered_segments('<seg id="1">a</seg><seg id="1">b</seg>', 2)
+    with pytest.raises(TranslationPackParseError):
+        parse_numbered_segments('<seg id="2">b</seg><seg id="1">a</seg>', 2)
+
+
+def test_bracketed_references_survive_the_pack():
+    texts = ["References:\n[2] Smith 2020\n[3] Doe 2021", "Revenue grew"]
+
+    packed = build_numbered_segments(texts)
+
+    assert parse_numbered_segments(packed, 2) == texts
+    with pytest.raises(TranslationPackParseError):
+        build_numbered_segments(['<seg id="1">injected</seg>', "Revenue grew"])
+
+
+@pytest.mark.asyncio
+async def test_text_with_segment_tags_is_translated_alone():
+    initialize_config_manager(cli_options_dict={"debug": False})
+    scheduler = _scheduler()
+    model = StubModel()
+    texts = ["a </seg> b", "c"]
+
+    results = await scheduler.translate(
+        texts, model.translate_single, model.translate_pack
+    )
+
+    assert results == ["A </SEG> B", "C"]
+    assert sorted(model.single_calls) == texts
+    assert scheduler.get_stats()["fallbacks"] == 1
+
+
+@pytest.mark.asyncio
+async def test_short_texts_are_packed_and_order_is_kept():
+    scheduler = _scheduler()
+    model = StubModel()
+    texts = [f"text {i}" for i in range(10)]
+
+    results = await scheduler.translate(
+        texts, model.translate_single, model.translate_pack
+    )
+
+    assert results == [t.upper() for t in texts]
+    assert len(model.pack_calls) == 3
+    assert model.single_calls == ["text 9"]
+    assert scheduler.get_stats()["packed_texts"] == 9
+
+
+@pytest.mark.asyncio
+async def test_unparsable_pack_falls_back_to_single_texts():
+    initialize_config_manager(cli_options_dict={"debug": False})
+    scheduler = _scheduler()
+    model = StubModel(garble_packs=True)
+    texts = ["a", "b", "c", "d"]
+
+    results = await scheduler.translate(
+        texts, model.translate_single, model.translate_pack
+    )
+
+    assert results == ["A", "B", "C", "D"]
+    assert sorted(model.single_calls) == texts
+    assert scheduler.get_stats()["fallbacks"] == 1
+    # A parse failure is not a capacity signal
+    assert scheduler.limiter.limit >= 4
+
+
+@pytest.mark.asyncio
+async def test_concurrency_is_bounded_and_adapts():
+    scheduler = _scheduler(max_concurrency=8, pack_max_texts=1)
+    model = StubModel()
+
+    await scheduler.translate(
+        [f"text {i}" for i in range(200)],
+        model.translate_single,
+        model.translate_pack,
+    )
+
+    assert model.max_in_flight <= 8
+    # Starts at 4 in flight and grows while latency stays flat
+    assert scheduler.limiter.max_in_flight > 4
+
+
+@pytest.mark.asyncio
+async def test_errors_shrink_the_concurrency_limit():
+    scheduler = _scheduler(max_concurrency=8)
+
+    async def failing(text):
+        raise RuntimeError("503")
+
+    for _ in range(3):
+        with pytest.raises(RuntimeError):
+            await scheduler.translate(["x"], failing, None)
+
+    assert scheduler.limiter.limit == 1
@@ -0,0 +1,80 @@
+import math
+import os
+import warnings
+
+import pytest
+from dotenv import load_dotenv
+
+from hirag_prod.configs.functions import initialize_config_manager, is_main_process
+from hirag_prod.resources.token_counter import TokenCounter
+from hirag_prod.resources.worker_pool import WorkerPool
+from hirag_prod.singleton_registry import get_singleton_classes, reset_singletons
+
+load_dotenv("../.env", override=True)
+
+
+@pytest.fixture
+def config():
+    initialize_config_manager(cli_options_dict={"debug": False})
+    WorkerPool.reset()
+    yield
+    WorkerPool.reset()
+
+
+@pytest.mark.asyncio
+async def test_disabled_pool_runs_in_this_process(config):
+    pool = WorkerPool(max_workers=0)
+
+    assert not pool.enabled
+    assert await pool.run(os.getpid) == os.getpid()
+    assert await pool.run(is_main_process)
+    assert pool.get_stats()["tasks"] == 2
+
+
+@pytest.mark.asyncio
+async def test_tasks_run_in_configured_worker_processes(config):
+    pool = WorkerPool(max_workers=2, preload_models=False)
+
+    try:
+        assert await pool.run(math.factorial, 20) == math.factorial(20)
+        assert await pool.map(pow, [(2, 10), (3, 3)]) == [1024, 27]
+        assert await pool.run(os.getpid) != os.getpid()
+        # Workers are initialized with the configuration of the main process
+        assert not await pool.run(is_main_process)
+
+        with pytest.raises(ValueError):
+            await pool.run(math.factorial, -1)
+        assert pool.get_stats()["failures"] == 1
+        assert pool.get_stats()["tasks"] == 6
+    finally:
+        await pool.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_workers_do_not_inherit_singletons(config):
+    TokenCounter()
+    pool = WorkerPool(max_workers=1, preload_models=False)
+
+    try:
+        with warnings.catch_warnings():
+            # Forking this multi-threaded process would warn about deadlocks
+            warnings.simplefilter("error", DeprecationWarning)
+            worker_singletons = await pool.run(get_singleton_classes)
+    finally:
+        await pool.shutdown()
+
+    assert TokenCounter in get_singleton_classes()
+    assert TokenCounter not in worker_singletons
+    assert WorkerPool in worker_singletons
+
+
+def test_singletons_join_the_registry_on_creation(config):
+    counter = TokenCounter()
+    assert TokenCounter in get_singleton_classes()
+
+    reset_singletons()
+
+    assert TokenCounter._instance is None
+    initialize_config_manager(cli_options_dict={"debug": False})
+    assert TokenCounter() is not counter
+    TokenCounter.reset()